@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 from .workflow_graph import iter_workflow_nodes
 
@@ -50,6 +50,31 @@ _WIDGET_TYPE_ALIASES: Dict[str, str] = {
 _CONTROL_WIDGET_SENTINELS = {"fixed", "increment", "decrement", "randomize"}
 
 
+class ObjectInfoIndex(dict):
+    """An ``/object_info`` payload that remembers each class's normalized widget specs.
+
+    Cached schemas are shared across parameter discoveries, so each node class
+    is normalized once per schema instead of once per lookup.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._widget_specs: Dict[str, Tuple[NodeWidgetSpec, ...]] = {}
+
+    def widget_specs(self, node_type: str) -> Tuple[NodeWidgetSpec, ...]:
+        specs = self._widget_specs.get(node_type)
+        if specs is None:
+            specs = _build_widget_specs(node_type, self)
+            self._widget_specs[node_type] = specs
+        return specs
+
+    def subset(self, node_types: Iterable[str]) -> "ObjectInfoIndex":
+        """Return a snapshot of ``node_types`` that shares this index's normalized specs."""
+        snapshot = ObjectInfoIndex({name: self[name] for name in node_types if name in self})
+        snapshot._widget_specs = self._widget_specs
+        return snapshot
+
+
 def _is_type_mismatch(spec: NodeWidgetSpec, value: Any) -> bool:
     """Return True if the value is structurally incompatible with the spec type."""
     if spec.value_type in ("integer", "float", "number"):
@@ -73,6 +98,15 @@ def get_node_widget_specs_from_schema(
     """
     Return ordered widget specifications for the given node type using the object_info schema.
     """
+    if isinstance(object_info, ObjectInfoIndex):
+        return object_info.widget_specs(node_type)
+    return _build_widget_specs(node_type, object_info)
+
+
+def _build_widget_specs(
+    node_type: str,
+    object_info: Dict[str, Any]
+) -> Tuple[NodeWidgetSpec, ...]:
     node_def = object_info.get(node_type)
     if not node_def:
         return tuple()
@@ -276,6 +310,16 @@ def map_node_widgets(
     return tuple(bindings)
 
 
+def workflow_node_types(workflow_document: Dict[str, Any]) -> Tuple[str, ...]:
+    """Return the distinct node classes used by the workflow, for per-class schema lookups."""
+    node_types = set()
+    for _node_id, node_data in iter_workflow_nodes(workflow_document):
+        node_type = node_data.get("type") or node_data.get("class_type")
+        if node_type:
+            node_types.add(str(node_type))
+    return tuple(sorted(node_types))
+
+
 def collect_workflow_widget_bindings_from_api(
     workflow_document: Dict[str, Any],
     object_info: Dict[str, Any]
@@ -3,7 +3,9 @@ Persistent memory cache manager for Charon.
 Manages in-memory caching of metadata, folder contents, and tags to minimize network reads.
 """
 
+import heapq
 import os
+import sys
 import time
 from typing import Dict, List, Optional, Set, Tuple, Any
 from collections import OrderedDict
@@ -13,19 +15,53 @@ from concurrent.futures import ThreadPoolExecutor
 
 from .metadata_manager import get_charon_config, get_folder_tags
 from .charon_logger import system_debug, system_error, system_info
+from .library_index import invalidate_library_paths
 from . import config
 
 
+# Entries promoted by a second hit may fill at most this share of the memory
+# budget, so a prefetch pass over the whole library cannot flush them.
+_PROTECTED_SHARE = 0.8
+_VALIDATION_TTL_SECONDS = 600
+
+
+def approximate_size(obj: Any) -> int:
+    """Approximate deep size of ``obj`` in bytes, counting shared objects once."""
+    seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item, 64)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif hasattr(item, "__dict__") and not isinstance(item, type):
+            stack.append(vars(item))
+    return total
+
+
 class CacheEntry:
-    """Single cache entry with timestamp and data."""
-    def __init__(self, data: Any, timestamp: float = None):
+    """Single cache entry with timestamp, data, approximate size and optional expiry."""
+    def __init__(self, data: Any, timestamp: float = None, size: int = 0, ttl_seconds: float = None):
         self.data = data
         self.timestamp = timestamp or time.time()
+        self.size = size
+        self.expires_at = self.timestamp + ttl_seconds if ttl_seconds is not None else None
         
     def age(self) -> float:
         """Return age of entry in seconds."""
         return time.time() - self.timestamp
 
+    def expired(self, now: float = None) -> bool:
+        """Return True once the entry's time-to-live has passed."""
+        return self.expires_at is not None and (now or time.time()) >= self.expires_at
+
 
 class PersistentCacheManager:
     """
@@ -37,7 +73,12 @@ class PersistentCacheManager:
     - Tag collection caching
     - Background pre-fetching
     - Hot cache for recently visited folders
-    - Memory usage monitoring
+    - Size-aware eviction within a memory budget
+
+    Every entry is sized when it is stored and tracked in a segmented LRU:
+    new entries start on probation and move to the protected segment on
+    their second hit. Over budget, expired entries go first, then the least
+    recently used probation entries, then protected ones.
     """
     
     def __init__(self, max_memory_mb: int = None):
@@ -68,7 +109,19 @@ class PersistentCacheManager:
         
         # Memory management
         self.max_memory_mb = max_memory_mb or config.CACHE_MAX_MEMORY_MB
-        self.estimated_memory_usage = 0  # Rough estimate in bytes
+        self.estimated_memory_usage = 0  # Sum of entry sizes in bytes
+        self._caches: Dict[str, Dict[str, CacheEntry]] = {
+            "folder": self.folder_cache,
+            "tag": self.tag_cache,
+            "general": self.general_cache,
+            "validation": self.validation_cache,
+        }
+        # Recency order of (kind, key) slots, least recently used first
+        self._probation: OrderedDict[Tuple[str, str], None] = OrderedDict()
+        self._protected: OrderedDict[Tuple[str, str], None] = OrderedDict()
+        self._protected_bytes = 0
+        self._expiry_heap: List[Tuple[float, str, str]] = []
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
         
         # Start background prefetch worker
         self._start_prefetch_worker()
@@ -107,8 +160,8 @@ class PersistentCacheManager:
         Returns list of (script_path, script_name) tuples or None if not cached.
         """
         with self.cache_lock:
-            if folder_path in self.folder_cache:
-                entry = self.folder_cache[folder_path]
+            entry = self._lookup("folder", folder_path)
+            if entry is not None:
                 # Update hot cache
                 self._mark_hot(folder_path)
                 system_debug(f"Cache hit for folder: {folder_path} (age: {entry.age():.1f}s)")
@@ -118,15 +171,14 @@ class PersistentCacheManager:
     def cache_folder_contents(self, folder_path: str, contents: List[Tuple[str, str]]):
         """Cache folder contents."""
         with self.cache_lock:
-            self.folder_cache[folder_path] = CacheEntry(contents)
+            self._store("folder", folder_path, contents)
             self._mark_hot(folder_path)
-            self._estimate_memory_usage()
             
     def get_folder_tags(self, folder_path: str) -> Optional[Set[str]]:
         """Get cached folder tags if available."""
         with self.cache_lock:
-            if folder_path in self.tag_cache:
-                entry = self.tag_cache[folder_path]
+            entry = self._lookup("tag", folder_path)
+            if entry is not None:
                 system_debug(f"Tag cache hit for folder: {folder_path}")
                 return entry.data
         return None
@@ -134,35 +186,42 @@ class PersistentCacheManager:
     def cache_folder_tags(self, folder_path: str, tags: Set[str]):
         """Cache folder tags."""
         with self.cache_lock:
-            self.tag_cache[folder_path] = CacheEntry(tags)
-            self._estimate_memory_usage()
+            self._store("tag", folder_path, tags)
             
+    def invalidate_folder_tags(self, folder_path: str):
+        """Drop only the cached tag set of a folder."""
+        with self.cache_lock:
+            self._drop("tag", folder_path)
+
     def invalidate_folder(self, folder_path: str):
         """Invalidate all caches for a specific folder."""
+        self._invalidate_folder_entries(folder_path)
+        invalidate_library_paths([folder_path])
+
+    def _invalidate_folder_entries(self, folder_path: str):
+        """Drop the in-memory entries for a folder, leaving the library index alone."""
         with self.cache_lock:
-            if folder_path in self.folder_cache:
-                del self.folder_cache[folder_path]
-            if folder_path in self.tag_cache:
-                del self.tag_cache[folder_path]
+            self._drop("folder", folder_path)
+            self._drop("tag", folder_path)
             if folder_path in self.hot_folders:
                 del self.hot_folders[folder_path]
             
             # Also invalidate batch metadata cache
-            batch_cache_key = f"batch_metadata:{folder_path}"
-            if batch_cache_key in self.general_cache:
-                del self.general_cache[batch_cache_key]
+            self._drop("general", f"batch_metadata:{folder_path}")
             
             # Invalidate validation cache for all scripts in this folder
             scripts_to_remove = [path for path in self.validation_cache.keys() 
                                if path.startswith(folder_path + os.sep)]
             for script_path in scripts_to_remove:
-                del self.validation_cache[script_path]
+                self._drop("validation", script_path)
                 
     def invalidate_script(self, script_path: str):
         """Invalidate cache entries related to a specific script."""
-        # When a script changes, invalidate its parent folder
+        # When a script changes, invalidate its parent folder's in-memory
+        # entries; the library index only needs to re-read this workflow.
         folder_path = os.path.dirname(script_path)
-        self.invalidate_folder(folder_path)
+        self._invalidate_folder_entries(folder_path)
+        invalidate_library_paths([script_path])
 
     def invalidate_base_path(self, base_path: str):
         """Invalidate all cached entries under a repository root without touching disk."""
@@ -173,19 +232,10 @@ class PersistentCacheManager:
         prefix = normalized_base + os.sep
 
         with self.cache_lock:
-            folder_keys = [path for path in self.folder_cache if os.path.normcase(path).startswith(prefix)]
-            for key in folder_keys:
-                del self.folder_cache[key]
-
-            tag_keys = [path for path in self.tag_cache if os.path.normcase(path).startswith(prefix)]
-            for key in tag_keys:
-                del self.tag_cache[key]
-
-            validation_keys = [
-                path for path in self.validation_cache if os.path.normcase(path).startswith(prefix)
-            ]
-            for key in validation_keys:
-                del self.validation_cache[key]
+            for kind in ("folder", "tag", "validation"):
+                keys = [path for path in self._caches[kind] if os.path.normcase(path).startswith(prefix)]
+                for key in keys:
+                    self._drop(kind, key)
 
             hot_keys = [path for path in self.hot_folders if os.path.normcase(path).startswith(prefix)]
             for key in hot_keys:
@@ -195,9 +245,9 @@ class PersistentCacheManager:
                 key for key in self.general_cache if normalized_base in os.path.normcase(str(key))
             ]
             for key in general_keys:
-                del self.general_cache[key]
+                self._drop("general", key)
 
-            self._estimate_memory_usage()
+        invalidate_library_paths([base_path])
         
     def queue_folder_prefetch(self, folder_path: str):
         """Queue a folder for background pre-fetching."""
@@ -220,10 +270,10 @@ class PersistentCacheManager:
             
         # Check if already fully cached
         with self.cache_lock:
-            if folder_path in self.folder_cache:
+            if self._is_cached("folder", folder_path):
                 # Already have folder contents, but check if we have metadata
                 cache_key = f"batch_metadata:{folder_path}"
-                if cache_key in self.general_cache:
+                if self._is_cached("general", cache_key):
                     return  # Already fully cached
                 
         try:
@@ -318,11 +368,11 @@ class PersistentCacheManager:
                 # Check if already cached to skip
                 with self.cache_lock:
                     cache_key = f"batch_metadata:{folder_path}"
-                    if folder_path in self.folder_cache and cache_key in self.general_cache:
+                    if self._is_cached("folder", folder_path) and self._is_cached("general", cache_key):
                         # Still check if we need to cache compatibility
                         folder_name = os.path.basename(folder_path)
                         compat_cache_key = f"compat:{base_path}:{folder_name}:{host}"
-                        if compat_cache_key not in self.general_cache:
+                        if not self._is_cached("general", compat_cache_key):
                             # Cache compatibility
                             is_compatible = is_folder_compatible_with_host(folder_path, host)
                             self.cache_data(compat_cache_key, is_compatible, ttl_seconds=600)
@@ -364,53 +414,114 @@ class PersistentCacheManager:
         with self.cache_lock:
             return list(self.hot_folders.keys())
             
-    def _estimate_memory_usage(self):
-        """Rough estimate of memory usage."""
-        # Very rough estimates
-        folder_size = len(self.folder_cache) * 1000  # ~1KB per folder entry
-        tag_size = len(self.tag_cache) * 500  # ~500B per tag set
-        validation_size = len(self.validation_cache) * 200  # ~200B per validation entry
-        general_size = len(self.general_cache) * 500  # ~500B per general entry
-        
-        self.estimated_memory_usage = folder_size + tag_size + validation_size + general_size
-        
-        # If over limit, evict oldest entries
-        if self.estimated_memory_usage > self.max_memory_mb * 1024 * 1024:
-            self._evict_old_entries()
-            
-    def _evict_old_entries(self):
-        """Evict oldest cache entries to free memory."""
-        # Find oldest entries
-        all_entries = []
-        
-        for path, entry in self.folder_cache.items():
-            if path not in self.hot_folders:  # Don't evict hot folders
-                all_entries.append((entry.timestamp, 'folder', path))
-                
-        for path, entry in self.tag_cache.items():
-            all_entries.append((entry.timestamp, 'tag', path))
-            
-        for key, entry in self.general_cache.items():
-            all_entries.append((entry.timestamp, 'general', key))
-            
-        # Sort by age (oldest first)
-        all_entries.sort()
-        
-        # Evict oldest 20%
-        evict_count = len(all_entries) // 5
-        for _, cache_type, key in all_entries[:evict_count]:
-            if cache_type == 'folder':
-                del self.folder_cache[key]
-            elif cache_type == 'tag':
-                del self.tag_cache[key]
-            else:
-                del self.general_cache[key]
-                
-        system_debug(f"Evicted {evict_count} old cache entries")
+    def _budget_bytes(self) -> float:
+        return self.max_memory_mb * 1024 * 1024
+
+    def _is_cached(self, kind: str, key: str) -> bool:
+        """Return True if a live entry exists, without touching recency or counters."""
+        entry = self._caches[kind].get(key)
+        return entry is not None and not entry.expired()
+
+    def _lookup(self, kind: str, key: str, max_age_seconds: float = None) -> Optional[CacheEntry]:
+        """Return a live entry and record the hit, or drop a stale one and record a miss."""
+        entry = self._caches[kind].get(key)
+        if entry is None:
+            self._counters["misses"] += 1
+            return None
+        if entry.expired() or (max_age_seconds is not None and entry.age() > max_age_seconds):
+            self._drop(kind, key)
+            self._counters["expirations"] += 1
+            self._counters["misses"] += 1
+            return None
+        self._counters["hits"] += 1
+        self._promote((kind, key), entry)
+        return entry
+
+    def _promote(self, slot: Tuple[str, str], entry: CacheEntry):
+        """Move a hit entry to the protected segment's most recent end."""
+        if slot in self._protected:
+            self._protected.move_to_end(slot)
+            return
+        self._probation.pop(slot, None)
+        self._protected[slot] = None
+        self._protected_bytes += entry.size
+
+        # Demote the oldest protected entries back to probation when the segment is full
+        limit = self._budget_bytes() * _PROTECTED_SHARE
+        while self._protected_bytes > limit and len(self._protected) > 1:
+            demoted, _ = self._protected.popitem(last=False)
+            kind, key = demoted
+            self._protected_bytes -= self._caches[kind][key].size
+            self._probation[demoted] = None
+
+    def _store(self, kind: str, key: str, data: Any, ttl_seconds: float = None):
+        """Insert or replace an entry, sizing it and evicting others if over budget."""
+        self._drop(kind, key)
+        entry = CacheEntry(data, size=approximate_size(key) + approximate_size(data), ttl_seconds=ttl_seconds)
+        self._caches[kind][key] = entry
+        self._probation[(kind, key)] = None
+        self.estimated_memory_usage += entry.size
+        if entry.expires_at is not None:
+            heapq.heappush(self._expiry_heap, (entry.expires_at, kind, key))
+            if len(self._expiry_heap) > 2 * (len(self._probation) + len(self._protected)) + 64:
+                self._rebuild_expiry_heap()
+        self._enforce_budget()
+
+    def _drop(self, kind: str, key: str) -> Optional[CacheEntry]:
+        """Remove an entry and its accounting; return it if it existed."""
+        entry = self._caches[kind].pop(key, None)
+        if entry is None:
+            return None
+        slot = (kind, key)
+        if slot in self._protected:
+            del self._protected[slot]
+            self._protected_bytes -= entry.size
+        else:
+            self._probation.pop(slot, None)
+        self.estimated_memory_usage -= entry.size
+        return entry
+
+    def _rebuild_expiry_heap(self):
+        """Drop heap records left behind by replaced or removed entries."""
+        self._expiry_heap = [
+            (entry.expires_at, kind, key)
+            for kind, cache in self._caches.items()
+            for key, entry in cache.items()
+            if entry.expires_at is not None
+        ]
+        heapq.heapify(self._expiry_heap)
+
+    def _purge_expired(self):
+        """Drop every entry whose time-to-live has passed."""
+        now = time.time()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, kind, key = heapq.heappop(self._expiry_heap)
+            entry = self._caches[kind].get(key)
+            if entry is not None and entry.expires_at == expires_at:
+                self._drop(kind, key)
+                self._counters["expirations"] += 1
+
+    def _enforce_budget(self):
+        """Evict expired, then least recently used entries until within the memory budget."""
+        budget = self._budget_bytes()
+        if self.estimated_memory_usage <= budget:
+            return
+        self._purge_expired()
+
+        evicted = 0
+        while self.estimated_memory_usage > budget and (self._probation or self._protected):
+            segment = self._probation if self._probation else self._protected
+            kind, key = next(iter(segment))
+            self._drop(kind, key)
+            evicted += 1
+        if evicted:
+            self._counters["evictions"] += evicted
+            system_debug(f"Evicted {evicted} cache entries to stay within {self.max_memory_mb} MB")
         
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         with self.cache_lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
             return {
                 'folder_cache_size': len(self.folder_cache),
                 'tag_cache_size': len(self.tag_cache),
@@ -418,7 +529,13 @@ class PersistentCacheManager:
                 'general_cache_size': len(self.general_cache),
                 'hot_folders': len(self.hot_folders),
                 'prefetch_queue_size': self.prefetch_queue.qsize(),
-                'estimated_memory_mb': self.estimated_memory_usage / (1024 * 1024)
+                'estimated_memory_mb': self.estimated_memory_usage / (1024 * 1024),
+                'protected_entries': len(self._protected),
+                'hits': self._counters["hits"],
+                'misses': self._counters["misses"],
+                'hit_rate': self._counters["hits"] / lookups if lookups else 0.0,
+                'evictions': self._counters["evictions"],
+                'expirations': self._counters["expirations"],
             }
     
     def cache_data(self, key: str, data: Any, ttl_seconds: int = 300):
@@ -431,15 +548,12 @@ class PersistentCacheManager:
             ttl_seconds: Time to live in seconds (default 5 minutes)
         """
         with self.cache_lock:
-            self.general_cache[key] = CacheEntry(data)
-            # Rough memory estimate
-            self.estimated_memory_usage += len(str(data))
+            self._store("general", key, data, ttl_seconds=ttl_seconds)
 
     def invalidate_cached_data(self, key: str):
         """Remove a general cache entry if present."""
         with self.cache_lock:
-            if key in self.general_cache:
-                del self.general_cache[key]
+            self._drop("general", key)
             
     def get_cached_data(self, key: str, max_age_seconds: int = None) -> Optional[Any]:
         """
@@ -453,12 +567,8 @@ class PersistentCacheManager:
             Cached data or None if not found/expired
         """
         with self.cache_lock:
-            if key in self.general_cache:
-                entry = self.general_cache[key]
-                # Check age if max_age specified
-                if max_age_seconds is not None and entry.age() > max_age_seconds:
-                    del self.general_cache[key]
-                    return None
+            entry = self._lookup("general", key, max_age_seconds)
+            if entry is not None:
                 return entry.data
         return None
     
@@ -475,26 +585,21 @@ class PersistentCacheManager:
             - validation_time: float
         """
         with self.cache_lock:
-            if script_path in self.validation_cache:
-                entry = self.validation_cache[script_path]
-                # Validation cache has longer TTL (10 minutes)
-                if entry.age() < 600:
-                    return entry.data
-                else:
-                    del self.validation_cache[script_path]
+            entry = self._lookup("validation", script_path)
+            if entry is not None:
+                return entry.data
         return None
     
     def cache_script_validation(self, script_path: str, validation_data: Dict[str, Any]):
         """Cache validation results for a script."""
         with self.cache_lock:
-            self.validation_cache[script_path] = CacheEntry(validation_data)
-            self._estimate_memory_usage()
+            # Validation cache has longer TTL (10 minutes)
+            self._store("validation", script_path, validation_data, ttl_seconds=_VALIDATION_TTL_SECONDS)
     
     def invalidate_script_validation(self, script_path: str):
         """Invalidate validation cache for a specific script."""
         with self.cache_lock:
-            if script_path in self.validation_cache:
-                del self.validation_cache[script_path]
+            self._drop("validation", script_path)
 
 
 # Global instance
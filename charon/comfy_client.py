@@ -8,12 +8,27 @@ import urllib.request
 import socket
 
 from . import config
+from .comfy_events import PROMPT_PENDING, get_event_stream
+from .comfy_transport import MultipartFileStream, get_connection_pool
 from .paths import get_temp_file
 
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_content_range(value):
+    """Return ``(start, total)`` from a ``Content-Range: bytes a-b/n`` header."""
+    try:
+        unit, _, spec = (value or "").partition(" ")
+        span, _, total = spec.partition("/")
+        start = int(span.split("-", 1)[0])
+        if unit.strip().lower() != "bytes":
+            raise ValueError(value)
+        return start, (int(total) if total.strip().isdigit() else None)
+    except ValueError:
+        raise IOError(f"Malformed Content-Range header: {value!r}")
+
+
 class ComfyUIClient:
     """Client for interacting with ComfyUI API."""
 
@@ -32,6 +47,36 @@ class ComfyUIClient:
         self.retry_delay = 0.35
         self.retry_backoff = 1.8
         self.last_error = ""
+        self.use_connection_pool = bool(getattr(config, "COMFY_HTTP_KEEP_ALIVE", True))
+        self.client_id = ""
+        self._event_stream = None
+
+    def events(self):
+        """Subscribe to ComfyUI's ``/ws`` events and tag later submissions with its client id."""
+        if self._event_stream is None:
+            stream = get_event_stream(self.base_url)
+            self.client_id = stream.client_id
+            self._event_stream = stream
+        return self._event_stream
+
+    def _connection_pool(self):
+        return get_connection_pool(
+            self.base_url,
+            max_size=int(getattr(config, "COMFY_HTTP_POOL_SIZE", 8)),
+            idle_timeout=float(getattr(config, "COMFY_HTTP_POOL_IDLE_SEC", 30.0)),
+        )
+
+    def _open(self, request, *, timeout):
+        """Send ``request`` over a pooled keep-alive socket when enabled."""
+        if not self.use_connection_pool:
+            return urllib.request.urlopen(request, timeout=timeout)
+        return self._connection_pool().urlopen(
+            request.get_method(),
+            request.full_url,
+            body=request.data,
+            headers=dict(request.header_items()),
+            timeout=timeout,
+        )
 
     def _is_transient_network_error(self, exc):
         if isinstance(exc, (ConnectionResetError, TimeoutError, socket.timeout)):
@@ -57,8 +102,10 @@ class ComfyUIClient:
         delay = max(0.0, float(self.retry_delay))
         last_exc = None
         for attempt in range(max_retries + 1):
+            if attempt and hasattr(request.data, "seek"):
+                request.data.seek(0)
             try:
-                return urllib.request.urlopen(request, timeout=timeout)
+                return self._open(request, timeout=timeout)
             except urllib.error.HTTPError as exc:
                 last_exc = exc
                 if attempt < max_retries and self._should_retry_http_error(exc):
@@ -115,48 +162,97 @@ class ComfyUIClient:
             logger.error("Failed to get object info: %s", exc)
             return None
 
-    def upload_image(self, image_path):
+    def get_object_info_for_class(self, node_class):
+        """Fetch one node class's definition from ``/object_info/<class>``.
+
+        Returns ``{}`` for classes the server does not know, and None when the
+        server lacks per-class lookups or cannot be reached.
+        """
+        try:
+            quoted = urllib.parse.quote(str(node_class), safe="")
+            request = urllib.request.Request(f"{self.base_url}/object_info/{quoted}")
+            with self._urlopen_with_retry(request, timeout=self.request_timeout) as response:
+                if response.getcode() == 200:
+                    payload = json.loads(response.read().decode("utf-8"))
+                    return payload if isinstance(payload, dict) else None
+            return None
+        except Exception as exc:
+            logger.debug("Per-class object info unavailable for %s: %s", node_class, exc)
+            return None
+
+    def resolve_models(self, references):
+        """Resolve model references through the ComfyUI-Charon server route.
+
+        Returns the resolver payload, or None when the route is missing (older
+        node pack) or the server cannot be reached.
+        """
+        request = urllib.request.Request(
+            f"{self.base_url}/charon/resolve_models",
+            data=json.dumps({"references": list(references)}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with self._urlopen_with_retry(request, timeout=self.request_timeout, retries=0) as response:
+                if response.getcode() != 200:
+                    return None
+                payload = json.loads(response.read().decode("utf-8"))
+        except Exception as exc:
+            logger.debug("Model resolver route unavailable: %s", exc)
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    def input_file_exists(self, filename, subfolder="", size=None):
+        """Return True when ComfyUI's input folder already holds ``filename``."""
+        params = urllib.parse.urlencode(
+            {"filename": filename, "subfolder": subfolder or "", "type": "input"}
+        )
+        request = urllib.request.Request(f"{self.base_url}/view?{params}", method="HEAD")
+        try:
+            with self._urlopen_with_retry(request, timeout=self.connect_timeout, retries=0) as response:
+                response.read()
+                if response.getcode() != 200:
+                    return False
+                length = response.getheader("Content-Length")
+        except Exception:
+            return False
+        if size is None or not length:
+            return True
+        try:
+            return int(length) == int(size)
+        except ValueError:
+            return True
+
+    def upload_image(self, image_path, upload_name=None, progress_callback=None):
         try:
             self.last_error = ""
             if not os.path.exists(image_path):
                 raise FileNotFoundError(f"Image file not found: {image_path}")
 
-            filename = os.path.basename(image_path)
+            filename = upload_name or os.path.basename(image_path)
             logger.info("Uploading image: %s (%s bytes)", filename, os.path.getsize(image_path))
 
-            with open(image_path, "rb") as handle:
-                image_data = handle.read()
-
-            boundary = "----WebKitFormBoundary" + time.strftime("%Y%m%d%H%M%S")
-            body = []
-            body.append(f"--{boundary}".encode())
-            body.append(f'Content-Disposition: form-data; name="image"; filename="{filename}"'.encode())
-            body.append(b"Content-Type: image/png")
-            body.append(b"")
-            body.append(image_data)
-
-            body.append(f"--{boundary}".encode())
-            body.append(b'Content-Disposition: form-data; name="overwrite"')
-            body.append(b"")
-            body.append(b"true")
-
-            body.append(f"--{boundary}--".encode())
-            body_data = b"\r\n".join(body)
-
-            request = urllib.request.Request(
-                f"{self.base_url}/upload/image",
-                data=body_data,
-                headers={
-                    "Content-Type": f"multipart/form-data; boundary={boundary}",
-                    "Content-Length": str(len(body_data)),
-                },
-            )
+            with MultipartFileStream(
+                image_path,
+                field_name="image",
+                filename=filename,
+                content_type="image/png",
+                fields={"overwrite": "true"},
+                progress=progress_callback,
+            ) as body:
+                request = urllib.request.Request(
+                    f"{self.base_url}/upload/image",
+                    data=body,
+                    headers={
+                        "Content-Type": body.content_type,
+                        "Content-Length": str(len(body)),
+                    },
+                )
 
-            # Uploads might take longer than standard requests
-            with self._urlopen_with_retry(request, timeout=self.request_timeout) as response:
-                if response.getcode() == 200:
-                    reply = json.loads(response.read().decode("utf-8"))
-                    return reply.get("name") or reply.get("filename")
+                # Uploads might take longer than standard requests
+                with self._urlopen_with_retry(request, timeout=self.request_timeout) as response:
+                    if response.getcode() == 200:
+                        reply = json.loads(response.read().decode("utf-8"))
+                        return reply.get("name") or reply.get("filename")
             self.last_error = "upload_image_http_non_200"
             return None
         except Exception as exc:
@@ -167,6 +263,9 @@ class ComfyUIClient:
     def submit_workflow(self, workflow):
         try:
             payload = {"prompt": workflow}
+            if self.client_id:
+                # Prompt events are only pushed to the socket that owns the client id.
+                payload["client_id"] = self.client_id
             data_text = json.dumps(payload)
             try:
                 payload_path = get_temp_file(suffix=".json", subdir="temp")
@@ -232,8 +331,30 @@ class ComfyUIClient:
             logger.error("Failed to get queue status: %s", exc)
             return None
 
+    def delete_queued_prompts(self, prompt_ids):
+        """Withdraw pending prompts from the ComfyUI queue."""
+        try:
+            data = json.dumps({"delete": list(prompt_ids)}).encode("utf-8")
+            request = urllib.request.Request(
+                f"{self.base_url}/queue",
+                data=data,
+                headers={"Content-Type": "application/json"},
+            )
+            with self._urlopen_with_retry(request, timeout=self.request_timeout) as response:
+                response.read()
+                return response.getcode() == 200
+        except Exception as exc:
+            logger.error("Failed to delete queued prompts: %s", exc)
+            return False
+
     def get_progress_for_prompt(self, prompt_id):
         """Get progress percentage for a specific prompt ID."""
+        stream = self._event_stream
+        if stream is not None and stream.connected:
+            state = stream.snapshot(prompt_id)
+            if state is not None and state.status != PROMPT_PENDING:
+                return state.progress
+
         queue_data = self.get_queue_status()
         if not queue_data:
             return 0.0
@@ -297,44 +418,94 @@ class ComfyUIClient:
         retries: int = 0,
         retry_delay: float = 0.5,
         min_bytes: int = 1,
+        progress_callback=None,
     ):
+        """Stream a ComfyUI file to ``output_path``, resuming partial transfers.
+
+        Bytes land in ``<output_path>.part`` and are published with an atomic
+        rename. Retries continue from the partial file with a Range request
+        when the server honours it.
+        """
         attempts = max(1, int(retries) + 1)
+        chunk_size = max(4096, int(getattr(config, "COMFY_DOWNLOAD_CHUNK_BYTES", 1024 * 1024)))
+        partial_path = f"{output_path}.part"
+        params = urllib.parse.urlencode(
+            {
+                "filename": filename,
+                "subfolder": subfolder or "",
+                "type": file_type or "output",
+            }
+        )
+        url = f"{self.base_url}/view?{params}"
+        if os.path.exists(partial_path):
+            # Only resume bytes fetched by this call; older partials may be another file.
+            os.remove(partial_path)
         last_error = None
         for attempt in range(attempts):
             try:
-                params = urllib.parse.urlencode(
-                    {
-                        "filename": filename,
-                        "subfolder": subfolder or "",
-                        "type": file_type or "output",
-                    }
-                )
-                request = urllib.request.Request(f"{self.base_url}/view?{params}")
-                with self._urlopen_with_retry(request, timeout=self.request_timeout) as response:
-                    if response.getcode() == 200:
-                        with open(output_path, "wb") as handle:
-                            handle.write(response.read())
-                        if min_bytes and os.path.exists(output_path):
-                            size = os.path.getsize(output_path)
-                            if size < min_bytes:
-                                raise IOError(f"Downloaded file too small ({size} bytes)")
-                        return True
-                    last_error = f"HTTP {response.getcode()}"
-                    logger.error("Failed to download file: %s", last_error)
+                self._download_to_partial(url, partial_path, chunk_size, progress_callback)
+                size = os.path.getsize(partial_path)
+                if min_bytes and size < min_bytes:
+                    os.remove(partial_path)
+                    raise IOError(f"Downloaded file too small ({size} bytes)")
+                os.replace(partial_path, output_path)
+                return True
             except Exception as exc:
                 last_error = exc
                 logger.error("Failed to download file: %s", exc)
+            if attempt < attempts - 1:
+                time.sleep(retry_delay)
+        for stale_path in (partial_path, output_path):
             try:
-                if os.path.exists(output_path):
-                    os.remove(output_path)
+                if os.path.exists(stale_path):
+                    os.remove(stale_path)
             except Exception:
                 pass
-            if attempt < attempts - 1:
-                time.sleep(retry_delay)
         if last_error:
             logger.error("Download failed after retries: %s", last_error)
         return False
 
+    def _download_to_partial(self, url, partial_path, chunk_size, progress_callback):
+        """Append the remainder of ``url`` to ``partial_path``; raise if it ends short."""
+        offset = os.path.getsize(partial_path) if os.path.exists(partial_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            response = self._urlopen_with_retry(request, timeout=self.request_timeout)
+        except urllib.error.HTTPError as exc:
+            if exc.code == 416 and offset:
+                # The partial no longer matches the server file; start over.
+                os.remove(partial_path)
+            raise
+        with response:
+            status = response.getcode()
+            if status not in (200, 206):
+                raise IOError(f"HTTP {status}")
+            total = None
+            if status == 206 and offset:
+                start, total = _parse_content_range(response.getheader("Content-Range"))
+                if start != offset:
+                    raise IOError(f"Server resumed at byte {start}, expected {offset}")
+                mode = "ab"
+            else:
+                offset = 0
+                mode = "wb"
+                length = response.getheader("Content-Length")
+                if length and length.isdigit():
+                    total = int(length)
+            written = offset
+            with open(partial_path, mode) as handle:
+                while True:
+                    chunk = response.read(chunk_size)
+                    if not chunk:
+                        break
+                    handle.write(chunk)
+                    written += len(chunk)
+                    if progress_callback is not None:
+                        progress_callback(written, total or 0)
+            if total is not None and written < total:
+                raise IOError(f"Transfer ended after {written} of {total} bytes")
+
     def process_workflow_with_image(self, workflow, image_path, output_dir=None):
         upload_name = self.upload_image(image_path)
         if not upload_name:
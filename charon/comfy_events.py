@@ -0,0 +1,468 @@
+"""ComfyUI ``/ws`` event subscriber used to track prompt execution without polling.
+
+Nuke's Python does not ship a WebSocket client, so this module carries the
+small subset of RFC 6455 that ComfyUI needs: a client handshake, unmasked
+server frames, masked client control frames, and fragmented messages.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import socket
+import struct
+import threading
+import time
+import urllib.parse
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .background_jobs import start_daemon_job
+
+
+logger = logging.getLogger(__name__)
+
+_WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_OPCODE_CONTINUATION = 0x0
+_OPCODE_TEXT = 0x1
+_OPCODE_BINARY = 0x2
+_OPCODE_CLOSE = 0x8
+_OPCODE_PING = 0x9
+_OPCODE_PONG = 0xA
+
+PROMPT_PENDING = "pending"
+PROMPT_RUNNING = "running"
+PROMPT_SUCCESS = "success"
+PROMPT_ERROR = "error"
+PROMPT_INTERRUPTED = "interrupted"
+_FINISHED_STATES = {PROMPT_SUCCESS, PROMPT_ERROR, PROMPT_INTERRUPTED}
+
+
+class WebSocketClosed(ConnectionError):
+    """Raised when the server closes the event socket."""
+
+
+class _WebSocket:
+    """Blocking WebSocket client connection that only receives data messages."""
+
+    def __init__(self, sock: socket.socket, stop_event: threading.Event):
+        self._sock = sock
+        self._stop = stop_event
+        self._buffer = b""
+        self._send_lock = threading.Lock()
+        self._idle_timeouts_allowed = False
+
+    @classmethod
+    def connect(cls, url: str, *, timeout: float, stop_event: threading.Event) -> "_WebSocket":
+        parsed = urllib.parse.urlsplit(url)
+        host = parsed.hostname or "127.0.0.1"
+        port = parsed.port or (443 if parsed.scheme == "wss" else 80)
+        if parsed.scheme == "wss":
+            raise ValueError("Secure WebSocket endpoints are not supported")
+        target = parsed.path or "/"
+        if parsed.query:
+            target = f"{target}?{parsed.query}"
+
+        sock = socket.create_connection((host, port), timeout=timeout)
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        handshake = (
+            f"GET {target} HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n"
+            "\r\n"
+        )
+        connection = cls(sock, stop_event)
+        try:
+            sock.sendall(handshake.encode("ascii"))
+            header_blob = connection._read_until(b"\r\n\r\n")
+            status_line, _sep, header_text = header_blob.decode("latin-1").partition("\r\n")
+            parts = status_line.split(" ", 2)
+            if len(parts) < 2 or parts[1] != "101":
+                raise ConnectionError(f"WebSocket upgrade rejected: {status_line.strip()}")
+            headers = {}
+            for line in header_text.split("\r\n"):
+                name, _colon, value = line.partition(":")
+                if name:
+                    headers[name.strip().lower()] = value.strip()
+            expected = base64.b64encode(
+                hashlib.sha1((key + _WEBSOCKET_GUID).encode("ascii")).digest()
+            ).decode("ascii")
+            if headers.get("sec-websocket-accept") != expected:
+                raise ConnectionError("WebSocket upgrade returned an invalid accept key")
+        except BaseException:
+            sock.close()
+            raise
+        # ComfyUI sends no heartbeats; short receive timeouts only let the
+        # reader notice ``stop_event`` while the queue is idle.
+        sock.settimeout(1.0)
+        connection._idle_timeouts_allowed = True
+        return connection
+
+    def _recv_some(self) -> bytes:
+        while True:
+            if self._stop.is_set():
+                raise WebSocketClosed("Event stream stopped")
+            try:
+                chunk = self._sock.recv(65536)
+            except socket.timeout:
+                if self._idle_timeouts_allowed:
+                    continue
+                raise
+            if not chunk:
+                raise WebSocketClosed("Event socket closed by server")
+            return chunk
+
+    def _read_exact(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            self._buffer += self._recv_some()
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def _read_until(self, marker: bytes) -> bytes:
+        while marker not in self._buffer:
+            self._buffer += self._recv_some()
+        data, _marker, self._buffer = self._buffer.partition(marker)
+        return data
+
+    def _read_frame(self) -> Tuple[bool, int, bytes]:
+        first, second = self._read_exact(2)
+        fin = bool(first & 0x80)
+        opcode = first & 0x0F
+        masked = bool(second & 0x80)
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", self._read_exact(2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", self._read_exact(8))
+        mask = self._read_exact(4) if masked else b""
+        payload = self._read_exact(length) if length else b""
+        if masked:
+            payload = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+        return fin, opcode, payload
+
+    def send_frame(self, opcode: int, payload: bytes = b"") -> None:
+        header = bytearray([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header.append(0x80 | length)
+        elif length < 65536:
+            header.append(0x80 | 126)
+            header += struct.pack("!H", length)
+        else:
+            header.append(0x80 | 127)
+            header += struct.pack("!Q", length)
+        mask = os.urandom(4)
+        header += mask
+        masked = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+        with self._send_lock:
+            self._sock.sendall(bytes(header) + masked)
+
+    def receive(self) -> Tuple[int, bytes]:
+        """Return the next complete data message as ``(opcode, payload)``."""
+        message_opcode = None
+        fragments = []
+        while True:
+            fin, opcode, payload = self._read_frame()
+            if opcode == _OPCODE_PING:
+                self.send_frame(_OPCODE_PONG, payload)
+                continue
+            if opcode == _OPCODE_PONG:
+                continue
+            if opcode == _OPCODE_CLOSE:
+                try:
+                    self.send_frame(_OPCODE_CLOSE, payload[:2])
+                except OSError:
+                    pass
+                raise WebSocketClosed("Event socket closed by server")
+            if opcode != _OPCODE_CONTINUATION:
+                message_opcode = opcode
+                fragments = []
+            fragments.append(payload)
+            if fin and message_opcode is not None:
+                return message_opcode, b"".join(fragments)
+
+    def close(self) -> None:
+        try:
+            self.send_frame(_OPCODE_CLOSE, struct.pack("!H", 1000))
+        except OSError:
+            pass
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+@dataclass
+class PromptEvents:
+    """Execution state for one prompt assembled from ComfyUI socket events."""
+
+    prompt_id: str
+    status: str = PROMPT_PENDING
+    node_total: int = 0
+    completed_nodes: Set[str] = field(default_factory=set)
+    current_node: Optional[str] = None
+    node_value: float = 0.0
+    node_max: float = 0.0
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    error: Dict[str, Any] = field(default_factory=dict)
+    version: int = 0
+    updated_at: float = 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in _FINISHED_STATES
+
+    @property
+    def progress(self) -> float:
+        """Return 0..1 progress across the prompt, or -1.0 when it failed."""
+        if self.status == PROMPT_SUCCESS:
+            return 1.0
+        if self.status in (PROMPT_ERROR, PROMPT_INTERRUPTED):
+            return -1.0
+        if self.status == PROMPT_PENDING:
+            return 0.0
+        node_fraction = 0.0
+        if self.node_max > 0:
+            node_fraction = max(0.0, min(1.0, self.node_value / self.node_max))
+        if self.node_total <= 0:
+            return node_fraction
+        done = len(self.completed_nodes)
+        if self.current_node is not None and self.current_node not in self.completed_nodes:
+            done += node_fraction
+        return max(0.0, min(0.99, done / self.node_total))
+
+    @property
+    def error_message(self) -> str:
+        message = self.error.get("exception_message") or self.error.get("message") or ""
+        node_type = self.error.get("node_type") or ""
+        if message and node_type:
+            return f"{node_type}: {message}"
+        return message or ("Prompt interrupted" if self.status == PROMPT_INTERRUPTED else "Unknown error")
+
+
+class ComfyEventStream:
+    """Background ``/ws`` subscriber that records per-prompt execution events."""
+
+    def __init__(
+        self,
+        base_url: str,
+        client_id: Optional[str] = None,
+        *,
+        connect_timeout: float = 5.0,
+        reconnect_delay: float = 2.0,
+        max_tracked: int = 256,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.client_id = client_id or uuid.uuid4().hex
+        self.connect_timeout = float(connect_timeout)
+        self.reconnect_delay = float(reconnect_delay)
+        self.max_tracked = max(1, int(max_tracked))
+        self._prompts: "OrderedDict[str, PromptEvents]" = OrderedDict()
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._connected = threading.Event()
+        self._socket: Optional[_WebSocket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        parsed = urllib.parse.urlsplit(self.base_url)
+        scheme = "wss" if parsed.scheme == "https" else "ws"
+        query = urllib.parse.urlencode({"clientId": self.client_id})
+        return urllib.parse.urlunsplit((scheme, parsed.netloc, f"{parsed.path}/ws", query, ""))
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    def start(self) -> "ComfyEventStream":
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            self._stop.clear()
+            self._thread = start_daemon_job(
+                self._run,
+                thread_name=f"charon-comfy-events-{self.client_id[:8]}",
+            )
+        return self
+
+    def wait_connected(self, timeout: float) -> bool:
+        return self._connected.wait(timeout=max(0.0, float(timeout)))
+
+    def stop(self) -> None:
+        self._stop.set()
+        sock = self._socket
+        if sock is not None:
+            sock.close()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def track(self, prompt_id: str, *, node_total: int = 0) -> PromptEvents:
+        """Return the live state for ``prompt_id``, registering its node count."""
+        with self._condition:
+            state = self._state(prompt_id)
+            if node_total:
+                state.node_total = int(node_total)
+            return state
+
+    def snapshot(self, prompt_id: str) -> Optional[PromptEvents]:
+        with self._condition:
+            state = self._prompts.get(prompt_id)
+            if state is None:
+                return None
+            return PromptEvents(
+                prompt_id=state.prompt_id,
+                status=state.status,
+                node_total=state.node_total,
+                completed_nodes=set(state.completed_nodes),
+                current_node=state.current_node,
+                node_value=state.node_value,
+                node_max=state.node_max,
+                outputs=dict(state.outputs),
+                error=dict(state.error),
+                version=state.version,
+                updated_at=state.updated_at,
+            )
+
+    def wait(self, prompt_id: str, *, since_version: int, timeout: float) -> Optional[PromptEvents]:
+        """Block until ``prompt_id`` changes past ``since_version`` or ``timeout`` elapses."""
+        deadline = time.monotonic() + max(0.0, float(timeout))
+        with self._condition:
+            while True:
+                state = self._prompts.get(prompt_id)
+                if state is not None and (state.version > since_version or state.finished):
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.connected:
+                    break
+                self._condition.wait(timeout=remaining)
+        return self.snapshot(prompt_id)
+
+    def _state(self, prompt_id: str) -> PromptEvents:
+        state = self._prompts.get(prompt_id)
+        if state is None:
+            state = PromptEvents(prompt_id=prompt_id)
+            self._prompts[prompt_id] = state
+            while len(self._prompts) > self.max_tracked:
+                self._prompts.popitem(last=False)
+        else:
+            self._prompts.move_to_end(prompt_id)
+        return state
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                sock = _WebSocket.connect(
+                    self.url,
+                    timeout=self.connect_timeout,
+                    stop_event=self._stop,
+                )
+            except Exception as exc:
+                logger.debug("ComfyUI event socket unavailable: %s", exc)
+                self._stop.wait(self.reconnect_delay)
+                continue
+            self._socket = sock
+            try:
+                self._connected.set()
+                while not self._stop.is_set():
+                    opcode, payload = sock.receive()
+                    if opcode != _OPCODE_TEXT:
+                        continue  # binary frames carry preview images
+                    try:
+                        message = json.loads(payload.decode("utf-8"))
+                    except (UnicodeDecodeError, ValueError):
+                        continue
+                    self.dispatch(message)
+            except Exception as exc:
+                if not self._stop.is_set():
+                    logger.debug("ComfyUI event socket dropped: %s", exc)
+            finally:
+                self._connected.clear()
+                self._socket = None
+                sock.close()
+                with self._condition:
+                    self._condition.notify_all()
+            self._stop.wait(self.reconnect_delay)
+
+    def dispatch(self, message: Dict[str, Any]) -> None:
+        """Apply one decoded ComfyUI event message to the tracked prompt state."""
+        if not isinstance(message, dict):
+            return
+        event = message.get("type")
+        data = message.get("data")
+        if not isinstance(data, dict):
+            return
+        prompt_id = data.get("prompt_id")
+        if not prompt_id:
+            return
+        with self._condition:
+            state = self._state(str(prompt_id))
+            if event == "execution_start":
+                state.status = PROMPT_RUNNING
+            elif event == "execution_cached":
+                state.status = PROMPT_RUNNING
+                state.completed_nodes.update(str(node) for node in data.get("nodes") or [])
+            elif event == "executing":
+                node = data.get("node")
+                if state.current_node is not None:
+                    state.completed_nodes.add(state.current_node)
+                if node is None:
+                    if state.status not in (PROMPT_ERROR, PROMPT_INTERRUPTED):
+                        state.status = PROMPT_SUCCESS
+                    state.current_node = None
+                else:
+                    state.status = PROMPT_RUNNING
+                    state.current_node = str(node)
+                state.node_value = 0.0
+                state.node_max = 0.0
+            elif event == "progress":
+                state.status = PROMPT_RUNNING
+                if data.get("node") is not None:
+                    state.current_node = str(data.get("node"))
+                try:
+                    state.node_value = float(data.get("value") or 0.0)
+                    state.node_max = float(data.get("max") or 0.0)
+                except (TypeError, ValueError):
+                    pass
+            elif event == "executed":
+                node = data.get("node")
+                if node is not None:
+                    state.completed_nodes.add(str(node))
+                    if isinstance(data.get("output"), dict):
+                        state.outputs[str(node)] = data["output"]
+            elif event == "execution_success":
+                state.status = PROMPT_SUCCESS
+            elif event == "execution_error":
+                state.status = PROMPT_ERROR
+                state.error = dict(data)
+            elif event == "execution_interrupted":
+                state.status = PROMPT_INTERRUPTED
+                state.error = dict(data)
+            else:
+                return
+            state.version += 1
+            state.updated_at = time.time()
+            self._condition.notify_all()
+
+
+_STREAMS: Dict[str, ComfyEventStream] = {}
+_STREAMS_LOCK = threading.Lock()
+
+
+def get_event_stream(base_url: str) -> ComfyEventStream:
+    """Return the started process-wide event stream for a ComfyUI server."""
+    key = base_url.rstrip("/").lower()
+    with _STREAMS_LOCK:
+        stream = _STREAMS.get(key)
+        if stream is None:
+            stream = ComfyEventStream(base_url)
+            _STREAMS[key] = stream
+    return stream.start()
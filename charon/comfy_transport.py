@@ -0,0 +1,351 @@
+"""Shared keep-alive HTTP connection pools for ComfyUI requests."""
+
+from __future__ import annotations
+
+import http.client
+import io
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Tuple
+
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_IDLE_TIMEOUT = 30.0
+DEFAULT_BLOCK_SIZE = 256 * 1024
+
+# Errors raised when a reused keep-alive socket was closed by the server while
+# idle. Raised while sending, the request never reached ComfyUI and is replayed
+# on a new socket. Raised while awaiting the response, the server may already
+# have accepted the body, so only idempotent methods are replayed.
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+
+class MultipartFileStream:
+    """Seekable multipart/form-data body that reads its file part lazily.
+
+    ``http.client`` and ``urllib`` send any object with ``read`` in blocks, so
+    only one block of the file is in memory at a time. ``progress`` is called
+    with ``(sent_bytes, total_bytes)`` as the body is consumed.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        field_name: str,
+        filename: str,
+        content_type: str = "application/octet-stream",
+        fields: Optional[Dict[str, str]] = None,
+        boundary: Optional[str] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ):
+        self.boundary = boundary or f"----CharonBoundary{uuid.uuid4().hex}"
+        parts = []
+        for name, value in (fields or {}).items():
+            parts.append(
+                f"--{self.boundary}\r\n"
+                f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+                f"{value}\r\n"
+            )
+        parts.append(
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field_name}"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        )
+        self._preamble = "".join(parts).encode("utf-8")
+        self._epilogue = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+        self._file_size = os.path.getsize(path)
+        self._handle = open(path, "rb")
+        self._progress = progress
+        self.total = len(self._preamble) + self._file_size + len(self._epilogue)
+        self._position = 0
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self.total
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence != 0 or offset != 0:
+            raise io.UnsupportedOperation("multipart bodies can only rewind to the start")
+        self._position = 0
+        self._handle.seek(0)
+        return 0
+
+    def read(self, amt: Optional[int] = -1) -> bytes:
+        if amt is None or amt < 0:
+            amt = self.total - self._position
+        chunks = []
+        while amt > 0 and self._position < self.total:
+            chunk = self._read_segment(amt)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            amt -= len(chunk)
+            self._position += len(chunk)
+        data = b"".join(chunks)
+        if data and self._progress is not None:
+            self._progress(self._position, self.total)
+        return data
+
+    def _read_segment(self, amt: int) -> bytes:
+        preamble_end = len(self._preamble)
+        file_end = preamble_end + self._file_size
+        if self._position < preamble_end:
+            return self._preamble[self._position : self._position + amt]
+        if self._position < file_end:
+            data = self._handle.read(min(amt, file_end - self._position))
+            if not data:
+                raise IOError("Upload source shrank while it was being sent")
+            return data
+        offset = self._position - file_end
+        return self._epilogue[offset : offset + amt]
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        self.close()
+        return False
+
+
+class PooledResponse:
+    """File-like response that hands its connection back to the pool on close."""
+
+    def __init__(self, pool: "HTTPConnectionPool", connection, response, url: str):
+        self._pool = pool
+        self._connection = connection
+        self._response = response
+        self.url = url
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+
+    def getcode(self) -> int:
+        return self.status
+
+    def info(self):
+        return self.headers
+
+    def getheader(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self._response.getheader(name, default)
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        if amt is None:
+            data = self._response.read()
+        else:
+            data = self._response.read(amt)
+        if self._response.isclosed():
+            self._release()
+        return data
+
+    def readinto(self, buffer) -> int:
+        count = self._response.readinto(buffer)
+        if self._response.isclosed():
+            self._release()
+        return count
+
+    def close(self) -> None:
+        if self._connection is None:
+            return
+        if not self._response.isclosed():
+            # Unread body bytes would corrupt the next response on this socket.
+            self._pool.discard(self._connection)
+            self._connection = None
+            self._response.close()
+            return
+        self._release()
+
+    def _release(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        reusable = not self._response.will_close
+        self._pool.release(connection, reusable=reusable)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        self.close()
+        return False
+
+
+class HTTPConnectionPool:
+    """Thread-safe pool of keep-alive connections to one host.
+
+    ``max_size`` bounds only the idle sockets kept for reuse. Requests are never
+    queued behind one another: when every pooled socket is busy, for example
+    with streaming downloads, the next request opens a fresh connection.
+    """
+
+    def __init__(
+        self,
+        scheme: str,
+        host: str,
+        port: Optional[int],
+        *,
+        max_size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.max_size = max(1, int(max_size))
+        self.idle_timeout = max(0.0, float(idle_timeout))
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def _new_connection(self, timeout: float):
+        connection_class = (
+            http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        )
+        with self._lock:
+            self.created += 1
+        return connection_class(
+            self.host,
+            self.port,
+            timeout=timeout,
+            blocksize=DEFAULT_BLOCK_SIZE,
+        )
+
+    def _checkout(self, timeout: float):
+        """Return ``(connection, reused)``, preferring an idle keep-alive socket."""
+        now = time.monotonic()
+        with self._lock:
+            while self._idle:
+                connection, released_at = self._idle.pop()
+                if self.idle_timeout and now - released_at > self.idle_timeout:
+                    connection.close()
+                    continue
+                return connection, True
+        return self._new_connection(timeout), False
+
+    def release(self, connection, *, reusable: bool = True) -> None:
+        if reusable and connection.sock is not None:
+            with self._lock:
+                if len(self._idle) < self.max_size:
+                    self._idle.append((connection, time.monotonic()))
+                    return
+        connection.close()
+
+    def discard(self, connection) -> None:
+        self.release(connection, reusable=False)
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return len(self._idle)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for connection, _released_at in idle:
+            connection.close()
+
+    def urlopen(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float,
+    ) -> PooledResponse:
+        """Send one request and return its response, raising ``HTTPError`` on >= 400."""
+        parsed = urllib.parse.urlsplit(url)
+        target = parsed.path or "/"
+        if parsed.query:
+            target = f"{target}?{parsed.query}"
+        request_headers = dict(headers or {})
+
+        while True:
+            connection, reused = self._checkout(timeout)
+            connection.timeout = timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout)
+            sent = False
+            try:
+                connection.request(method, target, body=body, headers=request_headers)
+                sent = True
+                response = connection.getresponse()
+            except _STALE_CONNECTION_ERRORS:
+                self.discard(connection)
+                if reused and (not sent or method.upper() in _IDEMPOTENT_METHODS):
+                    if hasattr(body, "seek"):
+                        body.seek(0)
+                    continue
+                raise
+            except BaseException:
+                self.discard(connection)
+                raise
+            break
+
+        pooled = PooledResponse(self, connection, response, url)
+        if pooled.status >= 400:
+            try:
+                payload = pooled.read()
+            finally:
+                pooled.close()
+            raise urllib.error.HTTPError(
+                url, pooled.status, pooled.reason, pooled.headers, io.BytesIO(payload)
+            )
+        return pooled
+
+
+_POOLS: Dict[Tuple[str, str, Optional[int]], HTTPConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_connection_pool(
+    url: str,
+    *,
+    max_size: int = DEFAULT_POOL_SIZE,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+) -> HTTPConnectionPool:
+    """Return the process-wide pool for the scheme/host/port of ``url``."""
+    parsed = urllib.parse.urlsplit(url)
+    scheme = (parsed.scheme or "http").lower()
+    if scheme not in {"http", "https"}:
+        raise ValueError(f"Unsupported URL scheme for pooled transport: {scheme}")
+    key = (scheme, (parsed.hostname or "").lower(), parsed.port)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = HTTPConnectionPool(
+                scheme,
+                key[1],
+                parsed.port,
+                max_size=max_size,
+                idle_timeout=idle_timeout,
+            )
+            _POOLS[key] = pool
+        return pool
+
+
+def close_connection_pools(pools: Optional[Iterable[HTTPConnectionPool]] = None) -> None:
+    """Close idle sockets for the given pools, or for every known pool."""
+    with _POOLS_LOCK:
+        targets = list(pools) if pools is not None else list(_POOLS.values())
+    for pool in targets:
+        pool.close()
@@ -16,10 +16,16 @@ from . import config, preferences
 from .charon_logger import system_debug, system_error, system_info, system_warning
 from .comfy_client import ComfyUIClient
 from .comfy_environment import resolve_comfy_runtime
+from .model_file_index import extra_model_roots, model_name_table
 from .model_manifest import load_model_manifest, manifest_entry_for_name
 from .model_paths import derive_workflow_value_from_path
 from .paths import get_charon_temp_dir, resolve_comfy_environment
 from .validation_resolver import locate_manager_cli
+from .workflow_conversion_daemon import (
+    ConversionDaemonError,
+    ConversionJobError,
+    get_conversion_daemon,
+)
 from .workflow_graph import iter_workflow_node_dicts, iter_workflow_nodes
 
 
@@ -39,6 +45,18 @@ IGNORED_NODE_TYPES = {
     "setnode",
     "getnode",
 }
+# The resolution logic itself ships with the ComfyUI-Charon node pack, which
+# serves it from the running server at /charon/resolve_models; this script
+# only loads the same module into the embedded interpreter as a fallback.
+MODEL_RESOLVER_MODULE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "custom_nodes",
+    "comfyUI",
+    "ComfyUI-Charon",
+    "model_resolver.py",
+)
+MODEL_RESOLVER_ROUTE = "/charon/resolve_models"
+BROWSER_EXPORTER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "workflow_browser_exporter.py")
 MODEL_RESOLVER_SCRIPT = """import json
 import os
 import sys
@@ -47,6 +65,7 @@ import traceback
 input_path = sys.argv[1]
 output_path = sys.argv[2]
 comfy_dir = sys.argv[3]
+resolver_module = sys.argv[4]
 
 payload = {
     "resolved": [],
@@ -92,197 +111,331 @@ try:
         except Exception:
             pass
 
-    models_dir = os.path.join(comfy_dir, "models")
-
     with open(input_path, "r", encoding="utf-8") as handle:
         references = json.load(handle)
 
-    def _normalize(name):
-        return name.replace("/", os.sep).replace("\\\\", os.sep)
-
-    def _iter_folder_entries(category):
-        mapping = getattr(folder_paths, "folder_names_and_paths", {})
-        entry = mapping.get(category)
-        if isinstance(entry, dict):
-            for key in ("folders", "paths", "path"):
-                values = entry.get(key)
-                if isinstance(values, str):
-                    yield values
-                elif isinstance(values, (list, tuple, set)):
-                    for value in values:
-                        if isinstance(value, str):
-                            yield value
-        elif isinstance(entry, (list, tuple, set)):
-            for value in entry:
-                if isinstance(value, str):
-                    yield value
-                elif isinstance(value, (list, tuple, set)):
-                    for sub in value:
-                        if isinstance(sub, str):
-                            yield sub
-
-    def _iter_folder_paths(category):
-        seen = set()
-        candidate_getters = (
-            "get_folder_paths",
-            "get_folder_paths_for",
-            "get_input_directory",
-        )
-        for attr in candidate_getters:
-            getter = getattr(folder_paths, attr, None)
-            if callable(getter):
-                try:
-                    paths = getter(category)
-                except TypeError:
-                    try:
-                        paths = getter(category, "")
-                    except Exception:
-                        paths = None
-                except Exception:
-                    paths = None
-                if isinstance(paths, str):
-                    paths = [paths]
-                if isinstance(paths, (list, tuple, set)):
-                    for path in paths:
-                        if isinstance(path, str):
-                            if not os.path.isabs(path):
-                                path = os.path.join(comfy_dir, path)
-                            norm = os.path.abspath(path)
-                            if norm not in seen and os.path.isdir(norm):
-                                seen.add(norm)
-                                yield norm
-        for path in _iter_folder_entries(category):
-            if isinstance(path, str):
-                if not os.path.isabs(path):
-                    path = os.path.join(comfy_dir, path)
-                norm = os.path.abspath(path)
-                if norm not in seen and os.path.isdir(norm):
-                    seen.add(norm)
-                    yield norm
-
-    def _try_resolve(category, name, attempted, attempted_dirs):
-        category = (category or "").strip()
-        if not category:
-            return None
-        if category not in attempted:
-            attempted.append(category)
-        getter = getattr(folder_paths, "get_full_path", None)
-        if callable(getter):
-            try:
-                candidate = getter(category, name)
-                if candidate and os.path.exists(candidate):
-                    directory = os.path.dirname(candidate)
-                    if directory:
-                        abs_dir = os.path.abspath(directory)
-                        if abs_dir not in attempted_dirs:
-                            attempted_dirs.append(abs_dir)
-                    return os.path.abspath(candidate)
-            except Exception:
-                pass
-        getter = getattr(folder_paths, "get_file_path", None)
-        if callable(getter):
-            try:
-                candidate = getter(category, name)
-                if candidate and os.path.exists(candidate):
-                    directory = os.path.dirname(candidate)
-                    if directory:
-                        abs_dir = os.path.abspath(directory)
-                        if abs_dir not in attempted_dirs:
-                            attempted_dirs.append(abs_dir)
-                    return os.path.abspath(candidate)
-            except Exception:
-                pass
-        normalized = _normalize(name)
-        basename = os.path.basename(normalized)
-        for base in _iter_folder_paths(category):
-            abs_base = os.path.abspath(base)
-            if abs_base not in attempted_dirs:
-                attempted_dirs.append(abs_base)
-            candidate = os.path.join(abs_base, normalized)
-            if os.path.exists(candidate):
-                return os.path.abspath(candidate)
-            candidate = os.path.join(abs_base, basename)
-            if os.path.exists(candidate):
-                return os.path.abspath(candidate)
-        return None
+    resolver_spec = importlib.util.spec_from_file_location("charon_model_resolver", resolver_module)
+    resolver = importlib.util.module_from_spec(resolver_spec)
+    resolver_spec.loader.exec_module(resolver)
+    payload = resolver.resolve_model_references(references, folder_paths, comfy_dir)
+except Exception as exc:  # pragma: no cover - defensive path
+    payload["errors"].append(f"{exc.__class__.__name__}: {exc}")
+    payload["traceback"] = traceback.format_exc()
+
+with open(output_path, "w", encoding="utf-8") as handle:
+    json.dump(payload, handle, indent=2)
+"""
 
-    for entry in references:
-        index = entry.get("index")
-        name = entry.get("name") or ""
-        category = entry.get("category") or ""
-        node_type = entry.get("node_type") or ""
-        attempted_dirs = []
-        attempted = []
+# Evaluated inside a settled ComfyUI page, either by the one-shot validator
+# script below or on the warm browser-export worker.
+BROWSER_VALIDATION_JS = r"""async ({ workflow, mode, catalogKey }) => {
+    const app = window.comfyAPI.app.app;
+
+    const capturedModels = { items: null, paths: null, seen: false };
+    const clone = (value) => {
+        try {
+            return JSON.parse(JSON.stringify(value));
+        } catch (err) {
+            return value;
+        }
+    };
+    const captureMissing = (missingModels, paths) => {
+        capturedModels.seen = true;
+        if (capturedModels.items === null && Array.isArray(missingModels)) {
+            capturedModels.items = missingModels.map((item) => ({ ...(item || {}) }));
+        }
+        if (capturedModels.paths === null && paths && typeof paths === "object") {
+            capturedModels.paths = clone(paths);
+        }
+    };
+    // Warm pages validate many workflows; undo the hooks so they never stack.
+    const unwrap = [];
+    const wrapMissing = (owner, attr) => {
+        if (!owner || typeof owner[attr] !== "function") return;
+        const previous = owner[attr];
+        const original = previous.bind(owner);
+        unwrap.push(() => { owner[attr] = previous; });
+        owner[attr] = (...args) => {
+            try {
+                captureMissing(args[0], args[1]);
+            } catch (err) {}
+            try {
+                return original(...args);
+            } catch (err) {
+                return undefined;
+            }
+        };
+    };
+
+    const dialogService = app?.dialogService || window.comfyAPI?.app?.dialogService || null;
+    wrapMissing(dialogService, "showMissingModelsWarning");
+    wrapMissing(app, "showMissingModelsError");
+    wrapMissing(app, "showMissingModelsWarning");
+
+    let graphData;
+    try {
+        graphData = await app.loadGraphData(workflow, true);
+    } finally {
+        for (const restore of unwrap) restore();
+    }
 
-        if not name:
-            payload["missing"].append(
-                {
-                    "index": index,
-                    "reason": "empty",
-                    "category": category,
-                    "node_type": node_type,
-                    "attempted": list(attempted),
+    let resolvedMissingModels = capturedModels.items;
+    let resolvedPaths = capturedModels.paths;
+    if (!resolvedMissingModels && graphData && Array.isArray(graphData?.missing_models)) {
+        resolvedMissingModels = graphData.missing_models;
+    } else if (!resolvedMissingModels && graphData && Array.isArray(graphData?.models_missing)) {
+        resolvedMissingModels = graphData.models_missing;
+    }
+    if (!resolvedPaths && graphData && graphData?.model_paths && typeof graphData.model_paths === "object") {
+        resolvedPaths = graphData.model_paths;
+    }
+    if (!resolvedMissingModels && typeof app.getMissingModelsFromGraph === "function") {
+        try {
+            const data = await app.getMissingModelsFromGraph(workflow);
+            if (data) {
+                if (!resolvedMissingModels && Array.isArray(data.missing)) {
+                    resolvedMissingModels = data.missing.map((item) => ({ ...(item || {}) }));
                 }
-            )
-            continue
+                if (!resolvedPaths && data.paths && typeof data.paths === "object") {
+                    resolvedPaths = clone(data.paths);
+                }
+            }
+        } catch (err) {}
+    }
 
-        resolved_path = None
-        resolved_category = None
-
-        if category:
-            resolved_path = _try_resolve(category, name, attempted, attempted_dirs)
-            if resolved_path:
-                resolved_category = category
-
-        if not resolved_path:
-            fallback_categories = [
-                "checkpoints",
-                "diffusion_models",
-                "unet",
-                "loras",
-                "vae",
-                "text_encoders",
-                "clip",
-                "clip_vision",
-                "latent_upscale_models",
-                "upscale_models",
-                "embeddings",
-            ]
-            safe_fallbacks = [c for c in fallback_categories if c != category]
-            for fallback in safe_fallbacks:
-                path = _try_resolve(fallback, name, attempted, attempted_dirs)
-                if path:
-                    resolved_path = path
-                    resolved_category = fallback
-                    break
+    const registry = window.LiteGraph?.registered_node_types || {};
+    const registered = new Set(Object.keys(registry));
+
+    const collectNodes = (document) => {
+        const collected = [];
+        const visitGraph = (graph) => {
+            if (!graph || typeof graph !== "object") return;
+            const nodes = Array.isArray(graph.nodes)
+                ? graph.nodes
+                : Array.isArray(graph)
+                    ? graph
+                    : [];
+            for (const node of nodes) {
+                if (node && typeof node === "object") collected.push(node);
+            }
+            const definitions = graph.definitions;
+            const nested = definitions && typeof definitions === "object"
+                ? definitions.subgraphs
+                : null;
+            const subgraphs = Array.isArray(nested)
+                ? nested
+                : nested && typeof nested === "object"
+                    ? Object.values(nested)
+                    : [];
+            for (const subgraph of subgraphs) visitGraph(subgraph);
+        };
+        visitGraph(document);
+        if (collected.length === 0 && document && typeof document === "object") {
+            for (const value of Object.values(document)) {
+                if (value && typeof value === "object") collected.push(value);
+            }
+        }
+        return collected;
+    };
+    const nodesArray = collectNodes(workflow);
+
+    const loadCatalog = async () => {
+        let nodePacks = {};
+        try {
+            const res = await fetch(`/customnode/getlist?mode=${mode}`);
+            if (res.ok) {
+                const data = await res.json();
+                if (data && data.node_packs) nodePacks = data.node_packs;
+            }
+        } catch (err) {}
+        let mappings = {};
+        try {
+            const res = await fetch(`/customnode/getmappings?mode=${mode}`);
+            if (res.ok) {
+                mappings = await res.json();
+            }
+        } catch (err) {}
+        return { nodePacks, mappings };
+    };
+    // Batch runs validate the whole library against one Manager catalog.
+    let catalog;
+    if (catalogKey) {
+        let shared = window.__charonNodeCatalog;
+        if (!shared || shared.key !== catalogKey) {
+            shared = window.__charonNodeCatalog = { key: catalogKey, byMode: {} };
+        }
+        shared.byMode[mode] = shared.byMode[mode] || loadCatalog();
+        catalog = await shared.byMode[mode];
+    } else {
+        catalog = await loadCatalog();
+    }
+    const nodePacks = catalog.nodePacks;
+    const mappings = catalog.mappings;
+
+    let packMeta = {};
+    for (const packId in nodePacks) {
+        const pack = nodePacks[packId];
+        packMeta[packId] = {
+            title: pack?.title || pack?.name || packId,
+            author: pack?.author || "",
+            last_update: pack?.last_update || "",
+        };
+    }
 
-        if resolved_path:
-            payload["resolved"].append(
-                {
-                    "index": index,
-                    "path": resolved_path,
-                    "category": resolved_category,
-                    "node_type": node_type,
+    // Build name -> packIds from mappings
+    const nameToPacks = {};
+    for (const url in mappings) {
+        const names = mappings[url];
+        if (Array.isArray(names) && names.length > 0) {
+            const arr = names[0];
+            if (Array.isArray(arr)) {
+                for (const n of arr) {
+                    if (typeof n === "string") {
+                        if (!nameToPacks[n]) nameToPacks[n] = [];
+                        nameToPacks[n].push(url);
+                    }
                 }
-            )
-        else:
-            payload["missing"].append(
-                {
-                    "index": index,
-                    "name": name,
-                    "category": resolved_category or category,
-                    "node_type": node_type,
-                    "attempted": list(attempted),
-                    "searched": [os.path.abspath(path) for path in attempted_dirs],
+            }
+        }
+    }
+
+    // Build regex -> pack from nodename_pattern
+    const regexToPack = [];
+    for (const packId in nodePacks) {
+        const pack = nodePacks[packId];
+        if (pack?.nodename_pattern) {
+            try {
+                regexToPack.push({
+                    regex: new RegExp(pack.nodename_pattern),
+                    url: pack.files?.[0] || pack.repository || packId,
+                });
+            } catch (err) {}
+        }
+    }
+
+    const packToRepo = {};
+    const auxToRepo = {};
+    for (const packId in nodePacks) {
+        const pack = nodePacks[packId];
+        const repo = pack?.repository || pack?.files?.[0];
+        if (repo) {
+            packToRepo[packId] = repo;
+            if (repo.startsWith("https://github.com/")) {
+                const parts = repo.split("/").filter(Boolean);
+                const org = parts[parts.length - 2];
+                const name = parts[parts.length - 1];
+                if (org && name) auxToRepo[`${org}/${name}`] = repo;
+            }
+        }
+    }
+
+    const missing = [];
+    for (const node of nodesArray) {
+        if (!node || typeof node !== "object") continue;
+        const cls = node.type || node.class_type;
+        if (!cls) continue;
+        if (!registered.has(cls)) {
+            const aux = node.properties?.aux_id || node.properties?.cnr_id || null;
+            let packIds = nameToPacks[cls] || [];
+            if (packIds.length === 0) {
+                for (const entry of regexToPack) {
+                    try {
+                        if (entry.regex.test(cls)) {
+                            packIds.push(entry.url);
+                        }
+                    } catch (err) {}
                 }
-            )
-except Exception as exc:  # pragma: no cover - defensive path
-    payload["errors"].append(f"{exc.__class__.__name__}: {exc}")
-    payload["traceback"] = traceback.format_exc()
+            }
+            const repos = [];
+            for (const pid of packIds) {
+                const repo = packToRepo[pid] || pid;
+                if (repo) repos.push(repo);
+            }
+            let repo = aux ? auxToRepo[aux] || null : null;
+            if (!repo && repos.length) repo = repos[0];
+            missing.push({
+                id: node.id ?? null,
+                class_type: cls,
+                aux_id: aux,
+                repo,
+                pack_ids: packIds,
+                pack_meta: packIds.map(pid => packMeta[pid] || {}),
+            });
+        }
+    }
 
-with open(output_path, "w", encoding="utf-8") as handle:
-    json.dump(payload, handle, indent=2)
-"""
+    let promptExport = {
+        ok: false,
+        error: missing.length
+            ? "Prompt export skipped because required node types are missing."
+            : "ComfyUI frontend did not return an API prompt.",
+        mismatches: [],
+    };
+    if (missing.length === 0) {
+        try {
+            await new Promise((resolve) => requestAnimationFrame(resolve));
+            await new Promise((resolve) => requestAnimationFrame(resolve));
+            const promptResult = await app.graphToPrompt(app.graph);
+            const output = promptResult?.output;
+            if (!output || typeof output !== "object" || Array.isArray(output)) {
+                throw new Error("ComfyUI frontend returned an empty or invalid API prompt.");
+            }
+
+            const sourceById = new Map(
+                nodesArray
+                    .filter((node) => node?.id !== undefined && node?.id !== null)
+                    .map((node) => [String(node.id), String(node.type || node.class_type || "")])
+            );
+            const mismatches = [];
+            for (const [nodeId, exportedNode] of Object.entries(output)) {
+                const expectedType = sourceById.get(String(nodeId));
+                const actualType = exportedNode && typeof exportedNode === "object"
+                    ? String(exportedNode.class_type || "")
+                    : "";
+                if (!expectedType) {
+                    mismatches.push({
+                        id: String(nodeId),
+                        expected: "<source node missing>",
+                        actual: actualType || "<missing>",
+                    });
+                } else if (actualType !== expectedType) {
+                    mismatches.push({
+                        id: String(nodeId),
+                        expected: expectedType,
+                        actual: actualType || "<missing>",
+                    });
+                }
+            }
+            promptExport = {
+                ok: mismatches.length === 0,
+                error: mismatches.length
+                    ? "ComfyUI frontend exported malformed API nodes."
+                    : "",
+                mismatches,
+                node_count: Object.keys(output).length,
+            };
+        } catch (err) {
+            promptExport = {
+                ok: false,
+                error: String(err?.message || err),
+                mismatches: [],
+            };
+        }
+    }
+
+    return {
+        missing,
+        registered_count: registered.size,
+        nodepack_count: Object.keys(nodePacks).length,
+        pack_meta: packMeta,
+        missing_models: resolvedMissingModels || [],
+        model_paths: resolvedPaths || {},
+        model_capture: {
+            invoked: capturedModels.seen || Array.isArray(resolvedMissingModels),
+        },
+        prompt_export: promptExport,
+    };
+}"""
 
 BROWSER_VALIDATOR_SCRIPT = r"""import asyncio
 import json
@@ -291,6 +444,7 @@ import sys
 WORKFLOW_PATH = sys.argv[1]
 MODE = sys.argv[2] if len(sys.argv) > 2 else "cache"
 COMFY_URL = sys.argv[3] if len(sys.argv) > 3 else "http://127.0.0.1:8188"
+VALIDATION_JS = __VALIDATION_JS__
 
 async def main():
     try:
@@ -333,289 +487,7 @@ async def main():
             await page.wait_for_timeout(1000)
 
             payload = await page.evaluate(
-                '''async ({ workflow, mode }) => {
-                    const app = window.comfyAPI.app.app;
-
-                    const capturedModels = { items: null, paths: null, seen: false };
-                    const clone = (value) => {
-                        try {
-                            return JSON.parse(JSON.stringify(value));
-                        } catch (err) {
-                            return value;
-                        }
-                    };
-                    const captureMissing = (missingModels, paths) => {
-                        capturedModels.seen = true;
-                        if (capturedModels.items === null && Array.isArray(missingModels)) {
-                            capturedModels.items = missingModels.map((item) => ({ ...(item || {}) }));
-                        }
-                        if (capturedModels.paths === null && paths && typeof paths === "object") {
-                            capturedModels.paths = clone(paths);
-                        }
-                    };
-                    const wrapMissing = (owner, attr) => {
-                        if (!owner || typeof owner[attr] !== "function") return;
-                        const original = owner[attr].bind(owner);
-                        owner[attr] = (...args) => {
-                            try {
-                                captureMissing(args[0], args[1]);
-                            } catch (err) {}
-                            try {
-                                return original(...args);
-                            } catch (err) {
-                                return undefined;
-                            }
-                        };
-                    };
-
-                    const dialogService = app?.dialogService || window.comfyAPI?.app?.dialogService || null;
-                    wrapMissing(dialogService, "showMissingModelsWarning");
-                    wrapMissing(app, "showMissingModelsError");
-                    wrapMissing(app, "showMissingModelsWarning");
-
-                    const graphData = await app.loadGraphData(workflow, true);
-
-                    let resolvedMissingModels = capturedModels.items;
-                    let resolvedPaths = capturedModels.paths;
-                    if (!resolvedMissingModels && graphData && Array.isArray(graphData?.missing_models)) {
-                        resolvedMissingModels = graphData.missing_models;
-                    } else if (!resolvedMissingModels && graphData && Array.isArray(graphData?.models_missing)) {
-                        resolvedMissingModels = graphData.models_missing;
-                    }
-                    if (!resolvedPaths && graphData && graphData?.model_paths && typeof graphData.model_paths === "object") {
-                        resolvedPaths = graphData.model_paths;
-                    }
-                    if (!resolvedMissingModels && typeof app.getMissingModelsFromGraph === "function") {
-                        try {
-                            const data = await app.getMissingModelsFromGraph(workflow);
-                            if (data) {
-                                if (!resolvedMissingModels && Array.isArray(data.missing)) {
-                                    resolvedMissingModels = data.missing.map((item) => ({ ...(item || {}) }));
-                                }
-                                if (!resolvedPaths && data.paths && typeof data.paths === "object") {
-                                    resolvedPaths = clone(data.paths);
-                                }
-                            }
-                        } catch (err) {}
-                    }
-
-                    const registry = window.LiteGraph?.registered_node_types || {};
-                    const registered = new Set(Object.keys(registry));
-
-                    const collectNodes = (document) => {
-                        const collected = [];
-                        const visitGraph = (graph) => {
-                            if (!graph || typeof graph !== "object") return;
-                            const nodes = Array.isArray(graph.nodes)
-                                ? graph.nodes
-                                : Array.isArray(graph)
-                                    ? graph
-                                    : [];
-                            for (const node of nodes) {
-                                if (node && typeof node === "object") collected.push(node);
-                            }
-                            const definitions = graph.definitions;
-                            const nested = definitions && typeof definitions === "object"
-                                ? definitions.subgraphs
-                                : null;
-                            const subgraphs = Array.isArray(nested)
-                                ? nested
-                                : nested && typeof nested === "object"
-                                    ? Object.values(nested)
-                                    : [];
-                            for (const subgraph of subgraphs) visitGraph(subgraph);
-                        };
-                        visitGraph(document);
-                        if (collected.length === 0 && document && typeof document === "object") {
-                            for (const value of Object.values(document)) {
-                                if (value && typeof value === "object") collected.push(value);
-                            }
-                        }
-                        return collected;
-                    };
-                    const nodesArray = collectNodes(workflow);
-
-                    let nodePacks = {};
-                    try {
-                        const res = await fetch(`/customnode/getlist?mode=${mode}`);
-                        if (res.ok) {
-                            const data = await res.json();
-                            if (data && data.node_packs) nodePacks = data.node_packs;
-                        }
-                    } catch (err) {}
-
-                    let packMeta = {};
-                    for (const packId in nodePacks) {
-                        const pack = nodePacks[packId];
-                        packMeta[packId] = {
-                            title: pack?.title || pack?.name || packId,
-                            author: pack?.author || "",
-                            last_update: pack?.last_update || "",
-                        };
-                    }
-
-                    let mappings = {};
-                    try {
-                        const res = await fetch(`/customnode/getmappings?mode=${mode}`);
-                        if (res.ok) {
-                            mappings = await res.json();
-                        }
-                    } catch (err) {}
-
-                    // Build name -> packIds from mappings
-                    const nameToPacks = {};
-                    for (const url in mappings) {
-                        const names = mappings[url];
-                        if (Array.isArray(names) && names.length > 0) {
-                            const arr = names[0];
-                            if (Array.isArray(arr)) {
-                                for (const n of arr) {
-                                    if (typeof n === "string") {
-                                        if (!nameToPacks[n]) nameToPacks[n] = [];
-                                        nameToPacks[n].push(url);
-                                    }
-                                }
-                            }
-                        }
-                    }
-
-                    // Build regex -> pack from nodename_pattern
-                    const regexToPack = [];
-                    for (const packId in nodePacks) {
-                        const pack = nodePacks[packId];
-                        if (pack?.nodename_pattern) {
-                            try {
-                                regexToPack.push({
-                                    regex: new RegExp(pack.nodename_pattern),
-                                    url: pack.files?.[0] || pack.repository || packId,
-                                });
-                            } catch (err) {}
-                        }
-                    }
-
-                    const packToRepo = {};
-                    const auxToRepo = {};
-                    for (const packId in nodePacks) {
-                        const pack = nodePacks[packId];
-                        const repo = pack?.repository || pack?.files?.[0];
-                        if (repo) {
-                            packToRepo[packId] = repo;
-                            if (repo.startsWith("https://github.com/")) {
-                                const parts = repo.split("/").filter(Boolean);
-                                const org = parts[parts.length - 2];
-                                const name = parts[parts.length - 1];
-                                if (org && name) auxToRepo[`${org}/${name}`] = repo;
-                            }
-                        }
-                    }
-
-                    const missing = [];
-                    for (const node of nodesArray) {
-                        if (!node || typeof node !== "object") continue;
-                        const cls = node.type || node.class_type;
-                        if (!cls) continue;
-                        if (!registered.has(cls)) {
-                            const aux = node.properties?.aux_id || node.properties?.cnr_id || null;
-                            let packIds = nameToPacks[cls] || [];
-                            if (packIds.length === 0) {
-                                for (const entry of regexToPack) {
-                                    try {
-                                        if (entry.regex.test(cls)) {
-                                            packIds.push(entry.url);
-                                        }
-                                    } catch (err) {}
-                                }
-                            }
-                            const repos = [];
-                            for (const pid of packIds) {
-                                const repo = packToRepo[pid] || pid;
-                                if (repo) repos.push(repo);
-                            }
-                            let repo = aux ? auxToRepo[aux] || null : null;
-                            if (!repo && repos.length) repo = repos[0];
-                            missing.push({
-                                id: node.id ?? null,
-                                class_type: cls,
-                                aux_id: aux,
-                                repo,
-                                pack_ids: packIds,
-                                pack_meta: packIds.map(pid => packMeta[pid] || {}),
-                            });
-                        }
-                    }
-
-                    let promptExport = {
-                        ok: false,
-                        error: missing.length
-                            ? "Prompt export skipped because required node types are missing."
-                            : "ComfyUI frontend did not return an API prompt.",
-                        mismatches: [],
-                    };
-                    if (missing.length === 0) {
-                        try {
-                            await new Promise((resolve) => requestAnimationFrame(resolve));
-                            await new Promise((resolve) => requestAnimationFrame(resolve));
-                            const promptResult = await app.graphToPrompt(app.graph);
-                            const output = promptResult?.output;
-                            if (!output || typeof output !== "object" || Array.isArray(output)) {
-                                throw new Error("ComfyUI frontend returned an empty or invalid API prompt.");
-                            }
-
-                            const sourceById = new Map(
-                                nodesArray
-                                    .filter((node) => node?.id !== undefined && node?.id !== null)
-                                    .map((node) => [String(node.id), String(node.type || node.class_type || "")])
-                            );
-                            const mismatches = [];
-                            for (const [nodeId, exportedNode] of Object.entries(output)) {
-                                const expectedType = sourceById.get(String(nodeId));
-                                const actualType = exportedNode && typeof exportedNode === "object"
-                                    ? String(exportedNode.class_type || "")
-                                    : "";
-                                if (!expectedType) {
-                                    mismatches.push({
-                                        id: String(nodeId),
-                                        expected: "<source node missing>",
-                                        actual: actualType || "<missing>",
-                                    });
-                                } else if (actualType !== expectedType) {
-                                    mismatches.push({
-                                        id: String(nodeId),
-                                        expected: expectedType,
-                                        actual: actualType || "<missing>",
-                                    });
-                                }
-                            }
-                            promptExport = {
-                                ok: mismatches.length === 0,
-                                error: mismatches.length
-                                    ? "ComfyUI frontend exported malformed API nodes."
-                                    : "",
-                                mismatches,
-                                node_count: Object.keys(output).length,
-                            };
-                        } catch (err) {
-                            promptExport = {
-                                ok: false,
-                                error: String(err?.message || err),
-                                mismatches: [],
-                            };
-                        }
-                    }
-
-                    return {
-                        missing,
-                        registered_count: registered.size,
-                        nodepack_count: Object.keys(nodePacks).length,
-                        pack_meta: packMeta,
-                        missing_models: resolvedMissingModels || [],
-                        model_paths: resolvedPaths || {},
-                        model_capture: {
-                            invoked: capturedModels.seen || Array.isArray(resolvedMissingModels),
-                        },
-                        prompt_export: promptExport,
-                    };
-                }''',
+                VALIDATION_JS,
                 {"workflow": workflow, "mode": MODE},
             )
             result.update(payload or {})
@@ -627,7 +499,7 @@ async def main():
     print(json.dumps(result, indent=2))
 
 asyncio.run(main())
-"""
+""".replace("__VALIDATION_JS__", repr(BROWSER_VALIDATION_JS))
 
 
 @dataclass
@@ -723,6 +595,7 @@ def validate_comfy_environment(
     use_cache: bool = True,
     force: bool = False,
     include_environment: bool = True,
+    node_catalog_key: str = "",
 ) -> ValidationResult:
     comfy_path = (comfy_path or "").strip()
     started = time.time()
@@ -778,6 +651,7 @@ def validate_comfy_environment(
         env_info,
         workflow_bundle,
         ping_url=ping_url,
+        node_catalog_key=node_catalog_key,
     )
     issues.append(custom_nodes_issue)
     issues.append(_validate_models_browser(env_info, workflow_bundle, browser_payload))
@@ -929,6 +803,7 @@ def _validate_custom_nodes_browser(
     *,
     mode: str = "cache",
     ping_url: Optional[str] = None,
+    node_catalog_key: str = "",
 ) -> Tuple[ValidationIssue, Optional[Dict[str, Any]]]:
     python_exe = env_info.get("python_exe")
     comfy_dir = env_info.get("comfy_dir")
@@ -972,6 +847,233 @@ def _validate_custom_nodes_browser(
             details=[],
         ), payload
 
+    payload = _run_browser_validation_warm(
+        env_info,
+        workflow,
+        mode,
+        ping_url,
+        node_catalog_key=node_catalog_key,
+    )
+    if payload is None:
+        payload, failure = _run_browser_validator_script(env_info, workflow, mode, ping_url)
+        if failure is not None:
+            return failure, payload
+
+    if payload.get("error"):
+        return ValidationIssue(
+            key="custom_nodes",
+            label="Custom nodes loaded",
+            ok=False,
+            summary="Playwright validation errored.",
+            details=[str(payload.get("error"))],
+            data=payload,
+        ), payload
+
+    missing = payload.get("missing") or []
+    registered = payload.get("registered_count")
+    nodepack_count = payload.get("nodepack_count")
+    pack_meta = payload.get("pack_meta") or {}
+    # Normalize data for UI expectations.
+    missing_nodes: List[str] = []
+    node_repos: Dict[str, str] = {}
+    node_packages: Dict[str, str] = {}
+    missing_repos: List[str] = []
+    node_meta: Dict[str, Dict[str, Any]] = {}
+    unique_missing: List[Dict[str, Any]] = []
+    pack_blocks: Dict[str, Dict[str, Any]] = {}
+    seen_classes: set[str] = set()
+    for entry in missing:
+        cls = str(entry.get("class_type") or "").strip()
+        if not cls:
+            continue
+        lowered = cls.lower()
+        if lowered in seen_classes:
+            continue
+        seen_classes.add(lowered)
+        unique_missing.append(entry)
+    for entry in unique_missing:
+        cls = str(entry.get("class_type") or "").strip()
+        if not cls:
+            continue
+        missing_nodes.append(cls)
+        repo = entry.get("repo")
+        pack_ids = entry.get("pack_ids") or []
+        pack_metas = entry.get("pack_meta") or []
+        meta_entry: Dict[str, Any] = {}
+        if pack_ids:
+            meta_entry["pack_ids"] = list(pack_ids)
+        # Prefer meta passed per-entry, fallback to pack_meta mapping.
+        candidate_meta = None
+        for meta in pack_metas:
+            if isinstance(meta, dict):
+                candidate_meta = meta
+                break
+        if not candidate_meta:
+            for pid in pack_ids:
+                meta = pack_meta.get(pid) if isinstance(pack_meta, dict) else None
+                if isinstance(meta, dict):
+                    candidate_meta = meta
+                    break
+        if isinstance(candidate_meta, dict):
+            meta_entry["package_display"] = candidate_meta.get("title") or ""
+            meta_entry["author"] = candidate_meta.get("author") or ""
+            meta_entry["last_update"] = candidate_meta.get("last_update") or ""
+        if repo:
+            lower = cls.lower()
+            node_repos[lower] = repo
+            node_packages[lower] = meta_entry.get("package_display") or _display_name_for_repo(repo)
+            if repo not in missing_repos:
+                missing_repos.append(repo)
+        if meta_entry:
+            node_meta[cls.lower()] = meta_entry
+
+        pack_id = pack_ids[0] if pack_ids else ""
+        pack_key = pack_id or repo or cls
+        pack_block = pack_blocks.get(pack_key)
+        if not pack_block:
+            pack_block = {
+                "pack": pack_id,
+                "repo": repo,
+                "pack_meta": candidate_meta if isinstance(candidate_meta, dict) else {},
+                "resolve_status": "",
+                "resolve_method": "",
+                "resolve_failed": "",
+                "nodes": [],
+            }
+            pack_blocks[pack_key] = pack_block
+        pack_block["nodes"].append(
+            {
+                "class_type": cls,
+                "id": entry.get("id"),
+            }
+        )
+
+    data = {
+        "missing": list(pack_blocks.values()),
+        "registered_count": registered,
+        "nodepack_count": nodepack_count,
+    }
+
+    if missing_nodes:
+        detail_lines = []
+        for entry in unique_missing:
+            cls = entry.get("class_type") or "Unknown node"
+            repo = entry.get("repo")
+            pack_ids = entry.get("pack_ids") or []
+            aux_id = entry.get("aux_id")
+            detail = f"{cls}"
+            if repo:
+                detail += f" -> {repo}"
+            elif pack_ids:
+                detail += f" -> {', '.join(pack_ids)}"
+            if aux_id:
+                detail += f" (aux_id: {aux_id})"
+            detail_lines.append(detail)
+        return ValidationIssue(
+            key="custom_nodes",
+            label="Custom nodes loaded",
+            ok=False,
+            summary=f"Missing {len(missing_nodes)} custom node(s).",
+            details=detail_lines,
+            data=data,
+        ), payload
+
+    prompt_export = payload.get("prompt_export") or {}
+    if not prompt_export.get("ok"):
+        mismatches = prompt_export.get("mismatches") or []
+        detail_lines = []
+        for entry in mismatches[:12]:
+            if not isinstance(entry, dict):
+                continue
+            detail_lines.append(
+                f"{entry.get('id', '?')}: {entry.get('actual', '<missing>')} != "
+                f"{entry.get('expected', '<unknown>')}"
+            )
+        error = str(prompt_export.get("error") or "ComfyUI frontend export failed.")
+        detail_lines.append(error)
+        detail_lines.append(
+            "Update or restart the configured ComfyUI backend/frontend, then validate again."
+        )
+        data["prompt_export"] = prompt_export
+        return ValidationIssue(
+            key="custom_nodes",
+            label="ComfyUI workflow export",
+            ok=False,
+            summary="ComfyUI could not serialize this workflow into a valid API prompt.",
+            details=detail_lines,
+            data=data,
+        ), payload
+
+    summary = "All custom nodes registered in the active ComfyUI session."
+    if registered:
+        summary += f" ({registered} node types loaded.)"
+    return ValidationIssue(
+        key="custom_nodes",
+        label="Custom nodes loaded",
+        ok=True,
+        summary=summary,
+        details=[],
+        data=data,
+    ), payload
+
+
+def _run_browser_validation_warm(
+    env_info: Dict[str, Any],
+    workflow: Dict[str, Any],
+    mode: str,
+    ping_url: str,
+    *,
+    node_catalog_key: str = "",
+) -> Optional[Dict[str, Any]]:
+    """Validate on the warm browser-export worker; None when it is unavailable.
+
+    Calls sharing a non-empty ``node_catalog_key`` fetch the Manager catalog
+    once per page load; the key is scoped to the worker's runtime key so a
+    changed node inventory never reuses an old answer.
+    """
+    if not getattr(config, "WORKFLOW_CONVERSION_DAEMON", True):
+        return None
+    parsed = urlparse(ping_url or "")
+    if parsed.hostname not in ("127.0.0.1", "localhost") or parsed.port != 8188:
+        # The worker's page always targets the fixed local endpoint.
+        return None
+    try:
+        daemon = get_conversion_daemon(
+            env_info.get("python_exe") or "",
+            env_info.get("comfy_dir") or "",
+            BROWSER_EXPORTER_PATH,
+        )
+        catalog_key = f"{node_catalog_key}:{daemon.runtime_key}" if node_catalog_key else ""
+        result = daemon.evaluate(
+            BROWSER_VALIDATION_JS,
+            {"workflow": workflow, "mode": mode, "catalogKey": catalog_key},
+            timeout=float(getattr(config, "COMFY_VALIDATION_BROWSER_TIMEOUT_SEC", 180)),
+        )
+    except (ConversionDaemonError, ConversionJobError) as exc:
+        system_debug(f"[Validation] Warm browser validation unavailable; spawning validator: {exc}")
+        return None
+    payload: Dict[str, Any] = {
+        "missing": [],
+        "registered_count": 0,
+        "nodepack_count": 0,
+        "missing_models": [],
+        "model_paths": {},
+        "model_capture": {"invoked": False},
+        "prompt_export": {"ok": False, "error": "Preflight did not run."},
+    }
+    payload.update(result if isinstance(result, dict) else {})
+    return payload
+
+
+def _run_browser_validator_script(
+    env_info: Dict[str, Any],
+    workflow: Dict[str, Any],
+    mode: str,
+    ping_url: str,
+) -> Tuple[Optional[Dict[str, Any]], Optional[ValidationIssue]]:
+    """Run the one-shot Playwright validator; return ``(payload, failure_issue)``."""
+    python_exe = env_info.get("python_exe")
+    comfy_dir = env_info.get("comfy_dir")
     temp_dir = tempfile.mkdtemp(prefix="charon_browser_validate_")
     try:
         workflow_path = os.path.join(temp_dir, "workflow.json")
@@ -993,195 +1095,39 @@ def _validate_custom_nodes_browser(
                 timeout=180,
             )
         except subprocess.TimeoutExpired:
-            return ValidationIssue(
+            return None, ValidationIssue(
                 key="custom_nodes",
                 label="Custom nodes loaded",
                 ok=False,
                 summary="Playwright validation timed out.",
                 details=[f"Ensure ComfyUI is running and reachable at {ping_url}."],
-            ), payload
+            )
 
         stdout = completed.stdout.strip()
         stderr = completed.stderr.strip()
         if completed.returncode != 0:
             detail = stderr or stdout or f"Exited with code {completed.returncode}"
             system_warning(f"Browser validator failed: {detail}")
-            return ValidationIssue(
+            return None, ValidationIssue(
                 key="custom_nodes",
                 label="Custom nodes loaded",
                 ok=False,
                 summary="Playwright validation failed.",
                 details=[detail],
-            ), payload
+            )
 
         try:
             payload = json.loads(stdout or "{}")
         except json.JSONDecodeError:
             system_warning("Browser validator returned non-JSON output.")
-            return ValidationIssue(
+            return None, ValidationIssue(
                 key="custom_nodes",
                 label="Custom nodes loaded",
                 ok=False,
                 summary="Playwright validation returned invalid JSON.",
                 details=[stdout[:500]],
-            ), payload
-
-        if payload.get("error"):
-            return ValidationIssue(
-                key="custom_nodes",
-                label="Custom nodes loaded",
-                ok=False,
-                summary="Playwright validation errored.",
-                details=[str(payload.get("error"))],
-                data=payload,
-            ), payload
-
-        missing = payload.get("missing") or []
-        registered = payload.get("registered_count")
-        nodepack_count = payload.get("nodepack_count")
-        pack_meta = payload.get("pack_meta") or {}
-        # Normalize data for UI expectations.
-        missing_nodes: List[str] = []
-        node_repos: Dict[str, str] = {}
-        node_packages: Dict[str, str] = {}
-        missing_repos: List[str] = []
-        node_meta: Dict[str, Dict[str, Any]] = {}
-        unique_missing: List[Dict[str, Any]] = []
-        pack_blocks: Dict[str, Dict[str, Any]] = {}
-        seen_classes: set[str] = set()
-        for entry in missing:
-            cls = str(entry.get("class_type") or "").strip()
-            if not cls:
-                continue
-            lowered = cls.lower()
-            if lowered in seen_classes:
-                continue
-            seen_classes.add(lowered)
-            unique_missing.append(entry)
-        for entry in unique_missing:
-            cls = str(entry.get("class_type") or "").strip()
-            if not cls:
-                continue
-            missing_nodes.append(cls)
-            repo = entry.get("repo")
-            pack_ids = entry.get("pack_ids") or []
-            pack_metas = entry.get("pack_meta") or []
-            meta_entry: Dict[str, Any] = {}
-            if pack_ids:
-                meta_entry["pack_ids"] = list(pack_ids)
-            # Prefer meta passed per-entry, fallback to pack_meta mapping.
-            candidate_meta = None
-            for meta in pack_metas:
-                if isinstance(meta, dict):
-                    candidate_meta = meta
-                    break
-            if not candidate_meta:
-                for pid in pack_ids:
-                    meta = pack_meta.get(pid) if isinstance(pack_meta, dict) else None
-                    if isinstance(meta, dict):
-                        candidate_meta = meta
-                        break
-            if isinstance(candidate_meta, dict):
-                meta_entry["package_display"] = candidate_meta.get("title") or ""
-                meta_entry["author"] = candidate_meta.get("author") or ""
-                meta_entry["last_update"] = candidate_meta.get("last_update") or ""
-            if repo:
-                lower = cls.lower()
-                node_repos[lower] = repo
-                node_packages[lower] = meta_entry.get("package_display") or _display_name_for_repo(repo)
-                if repo not in missing_repos:
-                    missing_repos.append(repo)
-            if meta_entry:
-                node_meta[cls.lower()] = meta_entry
-
-            pack_id = pack_ids[0] if pack_ids else ""
-            pack_key = pack_id or repo or cls
-            pack_block = pack_blocks.get(pack_key)
-            if not pack_block:
-                pack_block = {
-                    "pack": pack_id,
-                    "repo": repo,
-                    "pack_meta": candidate_meta if isinstance(candidate_meta, dict) else {},
-                    "resolve_status": "",
-                    "resolve_method": "",
-                    "resolve_failed": "",
-                    "nodes": [],
-                }
-                pack_blocks[pack_key] = pack_block
-            pack_block["nodes"].append(
-                {
-                    "class_type": cls,
-                    "id": entry.get("id"),
-                }
             )
-
-        data = {
-            "missing": list(pack_blocks.values()),
-            "registered_count": registered,
-            "nodepack_count": nodepack_count,
-        }
-
-        if missing_nodes:
-            detail_lines = []
-            for entry in unique_missing:
-                cls = entry.get("class_type") or "Unknown node"
-                repo = entry.get("repo")
-                pack_ids = entry.get("pack_ids") or []
-                aux_id = entry.get("aux_id")
-                detail = f"{cls}"
-                if repo:
-                    detail += f" -> {repo}"
-                elif pack_ids:
-                    detail += f" -> {', '.join(pack_ids)}"
-                if aux_id:
-                    detail += f" (aux_id: {aux_id})"
-                detail_lines.append(detail)
-            return ValidationIssue(
-                key="custom_nodes",
-                label="Custom nodes loaded",
-                ok=False,
-                summary=f"Missing {len(missing_nodes)} custom node(s).",
-                details=detail_lines,
-                data=data,
-            ), payload
-
-        prompt_export = payload.get("prompt_export") or {}
-        if not prompt_export.get("ok"):
-            mismatches = prompt_export.get("mismatches") or []
-            detail_lines = []
-            for entry in mismatches[:12]:
-                if not isinstance(entry, dict):
-                    continue
-                detail_lines.append(
-                    f"{entry.get('id', '?')}: {entry.get('actual', '<missing>')} != "
-                    f"{entry.get('expected', '<unknown>')}"
-                )
-            error = str(prompt_export.get("error") or "ComfyUI frontend export failed.")
-            detail_lines.append(error)
-            detail_lines.append(
-                "Update or restart the configured ComfyUI backend/frontend, then validate again."
-            )
-            data["prompt_export"] = prompt_export
-            return ValidationIssue(
-                key="custom_nodes",
-                label="ComfyUI workflow export",
-                ok=False,
-                summary="ComfyUI could not serialize this workflow into a valid API prompt.",
-                details=detail_lines,
-                data=data,
-            ), payload
-
-        summary = "All custom nodes registered in the active ComfyUI session."
-        if registered:
-            summary += f" ({registered} node types loaded.)"
-        return ValidationIssue(
-            key="custom_nodes",
-            label="Custom nodes loaded",
-            ok=True,
-            summary=summary,
-            details=[],
-            data=data,
-        ), payload
+        return payload, None
     finally:
         shutil.rmtree(temp_dir, ignore_errors=True)
 
@@ -1831,7 +1777,7 @@ def _validate_models(
             # Only try fallback searches if resolver didn't already find a mismatched file
             located, resolved = _find_model_file(models_root, comfy_dir, reference)
             if not located and index_cache is None and os.path.isdir(models_root):
-                index_cache = _build_model_index(models_root)
+                index_cache = _build_model_index(models_root, extra_model_roots(comfy_dir))
                 located, resolved = _lookup_model_in_index(index_cache, reference, models_root)
             if located and resolved:
                 if resolved not in found_set:
@@ -1979,14 +1925,51 @@ def _resolve_models_with_comfy(
     python_exe: Optional[str],
     comfy_dir: Optional[str],
     references: List[Dict[str, Any]],
+    *,
+    base_url: str = DEFAULT_PING_URL,
 ) -> Dict[str, Any]:
-    if not python_exe or not os.path.exists(python_exe):
-        return {}
     if not comfy_dir or not os.path.isdir(comfy_dir):
         return {}
     if not references:
         return {}
 
+    payload = _resolve_models_via_server(base_url, comfy_dir, references)
+    if payload is None:
+        if not python_exe or not os.path.exists(python_exe):
+            return {}
+        payload = _resolve_models_via_subprocess(python_exe, comfy_dir, references)
+        if "resolved" not in payload and payload.get("errors"):
+            return payload
+    return _parse_resolver_payload(payload)
+
+
+def _resolve_models_via_server(
+    base_url: str,
+    comfy_dir: str,
+    references: List[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    """Ask the running ComfyUI (with ComfyUI-Charon loaded) to resolve models."""
+    if not getattr(config, "COMFY_MODEL_RESOLVER_ROUTE", True):
+        return None
+    payload = ComfyUIClient(base_url, request_timeout=60).resolve_models(references)
+    if payload is None:
+        return None
+    if not _reported_identity_matches(_normalized_identity_path(comfy_dir), payload.get("comfy_dir")):
+        # Another ComfyUI owns the port; its folders say nothing about this install.
+        system_debug(
+            "[Validation] Model resolver route belongs to a different ComfyUI "
+            f"({payload.get('comfy_dir')!r}); using the embedded resolver."
+        )
+        return None
+    system_debug(f"[Validation] Resolved {len(references)} model reference(s) via {MODEL_RESOLVER_ROUTE}.")
+    return payload
+
+
+def _resolve_models_via_subprocess(
+    python_exe: str,
+    comfy_dir: str,
+    references: List[Dict[str, Any]],
+) -> Dict[str, Any]:
     temp_dir = tempfile.mkdtemp(prefix="charon_comfy_models_")
     try:
         input_path = os.path.join(temp_dir, "models.json")
@@ -1998,7 +1981,7 @@ def _resolve_models_with_comfy(
         with open(script_path, "w", encoding="utf-8") as handle:
             handle.write(MODEL_RESOLVER_SCRIPT)
 
-        command = [python_exe, script_path, input_path, output_path, comfy_dir]
+        command = [python_exe, script_path, input_path, output_path, comfy_dir, MODEL_RESOLVER_MODULE]
         system_debug(f"Running model resolver: {command}")
         completed = subprocess.run(
             command,
@@ -2021,7 +2004,7 @@ def _resolve_models_with_comfy(
             return {"errors": ["Model resolver produced no output."]}
 
         with open(output_path, "r", encoding="utf-8") as handle:
-            payload = json.load(handle)
+            return json.load(handle)
     except subprocess.TimeoutExpired:
         system_warning("Model resolver timed out.")
         return {"errors": ["Model resolver timed out."]}
@@ -2031,6 +2014,8 @@ def _resolve_models_with_comfy(
     finally:
         shutil.rmtree(temp_dir, ignore_errors=True)
 
+
+def _parse_resolver_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
     resolved_map: Dict[int, str] = {}
     category_map: Dict[int, str] = {}
     missing_map: Dict[int, Dict[str, Any]] = {}
@@ -2908,22 +2893,13 @@ def _find_model_file(
     return False, None
 
 
-def _build_model_index(models_root: str) -> Dict[str, List[str]]:
-    index: Dict[str, List[str]] = {}
-    max_depth = 6
-    for root, dirs, files in os.walk(models_root):
-        rel_root = os.path.relpath(root, models_root)
-        if rel_root == ".":
-            depth = 0
-        else:
-            depth = rel_root.count(os.sep) + 1
-        if depth >= max_depth:
-            # Stop descending instead of walking (and discarding) deeper trees.
-            dirs[:] = []
-        for file_name in files:
-            lowered = file_name.lower()
-            index.setdefault(lowered, []).append(os.path.join(root, file_name))
-    return index
+def _build_model_index(
+    models_root: str,
+    extra_roots: Iterable[str] = (),
+) -> Dict[str, List[str]]:
+    # Bounded at depth 6 like the walk it replaced; the shared index keeps the
+    # whole tree so the resolver can still reach deeper files.
+    return model_name_table([models_root, *extra_roots], max_depth=6)
 
 
 def _lookup_model_in_index(
@@ -7,17 +7,71 @@ import os
 COMFY_URL_BASE = "http://127.0.0.1:8188"
 COMFY_BATCH_TIMEOUT_SEC = 2000
 WORKFLOW_CONVERSION_TIMEOUT_SEC = 600
+# Convert workflows built only from nodes with a known /object_info widget
+# layout in Python; anything else still goes through the browser export.
+WORKFLOW_NATIVE_CONVERSION = True
+# Keep one browser-export worker with a settled ComfyUI page per install.
+WORKFLOW_CONVERSION_DAEMON = True
+WORKFLOW_CONVERSION_DAEMON_START_SEC = 300
+WORKFLOW_CONVERSION_DAEMON_IDLE_SEC = 900
+WORKFLOW_CONVERSION_DAEMON_RETRY_SEC = 300
+# Validation reuses that worker's page for custom-node checks and asks the
+# ComfyUI-Charon /charon/resolve_models route for model lookups; both fall back
+# to spawning the embedded Python when unavailable.
+COMFY_MODEL_RESOLVER_ROUTE = True
+COMFY_VALIDATION_BROWSER_TIMEOUT_SEC = 180
+# Workflows validated concurrently by `python -m charon.library_validation`;
+# browser checks still queue on the single warm page.
+LIBRARY_VALIDATION_WORKERS = 4
+# Converted prompts are indexed per (workflow hash, ComfyUI identity) so several
+# variants per workflow stay cached; least recently used prompts are evicted
+# across all workflows beyond these limits.
+CONVERSION_CACHE_MAX_MB = 1024
+CONVERSION_CACHE_MAX_ENTRIES = 2000
+# Publish converted prompts beside the workflow repository so each workflow is
+# converted once per ComfyUI build for the whole team, not once per artist.
+SHARED_CONVERSION_CACHE = True
 COMFY_QUEUE_GRACE_SEC = 30
 COMFY_RESULT_WATCH_TIMEOUT_SEC = 2000
 COMFY_RESULT_WATCH_GRACE_SEC = 60
 COMFY_DOWNLOAD_RETRIES = 4
 COMFY_DOWNLOAD_RETRY_DELAY_SEC = 0.75
 COMFY_DOWNLOAD_MIN_BYTES = 1
+# Downloads stream to disk in chunks of this size and resume with HTTP Range.
+COMFY_DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+# Artifacts of one prompt are fetched and post-processed concurrently.
+COMFY_ARTIFACT_DOWNLOAD_WORKERS = 4
+# Hardlink/clone/copy outputs straight from a ComfyUI running on this machine.
+COMFY_LOCAL_OUTPUT_FAST_PATH = True
 COMFY_UPLOAD_RETRIES = 3
 COMFY_UPLOAD_RETRY_DELAY_SEC = 1.0
+# Skip re-uploading inputs whose SHA-256 the ComfyUI server already holds.
+COMFY_UPLOAD_DEDUP = True
+# Keep-alive sockets shared by every ComfyUIClient talking to the same server.
+COMFY_HTTP_KEEP_ALIVE = True
+COMFY_HTTP_POOL_SIZE = 8  # Idle sockets kept per server; busy pools open extra connections
+COMFY_HTTP_POOL_IDLE_SEC = 30.0
+# Track prompts through ComfyUI's /ws events; /history polling stays as fallback.
+COMFY_USE_EVENT_STREAM = True
+COMFY_EVENT_CONNECT_WAIT_SEC = 2.0
+COMFY_EVENT_HISTORY_FALLBACK_SEC = 10.0
+# Frame-range/batch runs keep this many prompts queued ahead of the executing
+# one and download finished units on a small pool. 0 runs units one at a time.
+COMFY_PIPELINE_WINDOW = 2
+COMFY_PIPELINE_INGEST_WORKERS = 2
 COMFY_OUTPUT_SCAN_LIMIT = 4000
 COMFY_OUTPUT_SCAN_GRACE_SEC = 30
 COMFY_ENABLE_HISTORY_RECOVERY = False
+# Model lookups share one on-disk index per root (local models, extra paths,
+# shared repository). Lookups re-stat folders at most this often; manifests
+# are only persisted for trees with at least this many files.
+MODEL_INDEX_REFRESH_SEC = 10.0
+MODEL_INDEX_PERSIST_MIN_FILES = 500
+# Validation signatures share one runtime/custom_nodes/models snapshot across
+# every workflow; it is re-checked at most this often, and a directory listing
+# whose mtime is unchanged is reused for up to the max age.
+VALIDATION_SIGNATURE_REFRESH_SEC = 2.0
+VALIDATION_SIGNATURE_SNAPSHOT_MAX_AGE_SEC = 60.0
 STATUS_COLOR_UPDATE_INTERVAL_SEC = 0.5
 AUTO_IMPORT_MAX_OUTPUTS = 200
 AUTO_IMPORT_MAX_PER_GROUP = 120
@@ -113,6 +167,14 @@ def get_shared_models_root():
     return os.path.join(root, "shared_models")
 
 
+def get_shared_conversion_cache_root():
+    """Return the team conversion cache adjacent to the active workflows root."""
+    root = os.path.abspath(WORKFLOW_REPOSITORY_ROOT)
+    if os.path.basename(root).lower() == "workflows":
+        return os.path.join(os.path.dirname(root), "conversion_cache")
+    return os.path.join(root, ".charon_conversion_cache")
+
+
 # =============================================================================
 # ICON SETTINGS
 # =============================================================================
@@ -363,9 +425,24 @@ EXECUTION_DIALOG_OUTPUT_HEIGHT = 200  # Maximum height for output text area (pix
 
 # Background prefetch thread configuration
 CACHE_PREFETCH_THREADS = 2  # Number of background threads for prefetching (adjustable)
-CACHE_MAX_MEMORY_MB = 500   # Maximum memory usage for cache in MB
+CACHE_MAX_MEMORY_MB = 500   # Budget for the approximate deep size of cached entries, in MB
 CACHE_PREFETCH_ALL_FOLDERS = True  # If True, prefetch all folders alphabetically
 
+# The on-disk library index serves a listing without touching the share when it
+# was reconciled this recently; otherwise one directory listing reconciles it.
+LIBRARY_INDEX_RECONCILE_SEC = 30
+LIBRARY_INDEX_READ_WORKERS = 8  # Parallel .charon.json reads while reconciling
+# In-memory .charon.json cache: entries are re-validated against the file's
+# stat after this many seconds, and the least recently used beyond the limit
+# are dropped.
+METADATA_CACHE_REVALIDATE_SEC = 2.0
+METADATA_CACHE_MAX_ENTRIES = 10000
+# Library watcher: the repository root and the open folder are polled for
+# directory mtime changes every interval, every other folder once per sweep.
+LIBRARY_WATCH_ENABLED = True
+LIBRARY_WATCH_INTERVAL_SEC = 3
+LIBRARY_WATCH_SWEEP_SEC = 60
+
 # =============================================================================
 # WARNING MESSAGES
 # =============================================================================
@@ -3,11 +3,19 @@ import json
 import os
 import re
 import shutil
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 
-LOG_FILENAME = "conversion_log.md"
+from . import config, preferences
+from .charon_logger import system_warning
+from .file_lock import hold_lock_file
+from .json_io import atomic_write_json
+
+CONVERSION_INDEX_DIR = "conversion_cache"
+CONVERSION_INDEX_FILENAME = "index.json"
 CONVERTED_SUFFIX = "_converted.json"
 CACHE_FOLDER_NAME = ".charon_cache"
 CONVERSION_CACHE_SCHEMA = 2
@@ -42,6 +50,19 @@ WINDOWS_RESERVED_BASENAMES = {
 # TODO: Remove after Q1 2026 when all users have migrated
 LEGACY_CACHE_FOLDER_NAME = "_API_conversion"
 
+# A hit refreshes its entry's recency on disk at most this often.
+_TOUCH_PERSIST_SEC = 60.0
+
+# Nuke sessions and the nightly pre-warm share one index file, so every
+# read-modify-write also holds its ``.charon.lock`` file.
+_INDEX_FILE_LOCK_STALE_SEC = 60.0
+_INDEX_FILE_LOCK_TIMEOUT_SEC = 10.0
+# An unindexed prompt younger than this may belong to a writer about to index it.
+_ORPHAN_GRACE_SEC = 10 * 60.0
+
+_INDEX_LOCK = threading.RLock()
+_INDEX_STATE: Dict[str, Any] = {"path": None, "mtime_ns": None, "entries": {}}
+
 
 def _conversion_dir(folder_path: str) -> Path:
     base = _normalize_folder_path(folder_path)
@@ -77,13 +98,11 @@ def _normalize_folder_path(folder_path: str) -> Path:
         return Path(os.path.abspath(str(base)))
 
 
-def _log_path(folder_path: str) -> Path:
-    return _conversion_dir(folder_path) / LOG_FILENAME
-
-
-def _default_prompt_name(workflow_path: str, hash_value: str) -> str:
+def _default_prompt_name(workflow_path: str, hash_value: str, cache_identity: str = "") -> str:
     base = _safe_prompt_basename(workflow_path)
-    return f"{base}_{hash_value[:8]}{CONVERTED_SUFFIX}"
+    # The identity suffix lets one workflow keep a prompt per ComfyUI install.
+    suffix = f"_{cache_identity[:8]}" if cache_identity else ""
+    return f"{base}_{hash_value[:8]}{suffix}{CONVERTED_SUFFIX}"
 
 
 def _safe_prompt_basename(workflow_path: str) -> str:
@@ -149,56 +168,170 @@ def compute_comfy_cache_identity(system_stats: Any, comfy_dir: str) -> str:
     return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
 
 
+def conversion_index_path() -> str:
+    return os.path.join(
+        preferences.get_preferences_root(), CONVERSION_INDEX_DIR, CONVERSION_INDEX_FILENAME
+    )
+
+
+def _folder_key(folder_path: str) -> str:
+    return os.path.normcase(str(_normalize_folder_path(folder_path)))
+
+
+def _entry_key(folder_key: str, workflow_hash: str, cache_identity: str) -> str:
+    return f"{folder_key}|{workflow_hash}|{cache_identity}"
+
+
+def _load_index(force: bool = False) -> Dict[str, Dict[str, Any]]:
+    """Return the shared index, re-reading it only after another writer replaced it."""
+    path = conversion_index_path()
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    if not force and _INDEX_STATE["path"] == path and _INDEX_STATE["mtime_ns"] == mtime_ns:
+        return _INDEX_STATE["entries"]
+    entries: Dict[str, Dict[str, Any]] = {}
+    if mtime_ns is not None:
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            payload = None
+        if (
+            isinstance(payload, dict)
+            and payload.get("schema") == CONVERSION_CACHE_SCHEMA
+            and isinstance(payload.get("entries"), dict)
+        ):
+            entries = {
+                key: entry for key, entry in payload["entries"].items() if isinstance(entry, dict)
+            }
+    _INDEX_STATE.update(path=path, mtime_ns=mtime_ns, entries=entries)
+    return entries
+
+
+def _save_index(entries: Dict[str, Dict[str, Any]]) -> None:
+    path = conversion_index_path()
+    try:
+        atomic_write_json(path, {"schema": CONVERSION_CACHE_SCHEMA, "entries": entries}, indent=None)
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    _INDEX_STATE.update(path=path, mtime_ns=mtime_ns, entries=entries)
+
+
+def _update_index(
+    mutate: Callable[[Dict[str, Dict[str, Any]]], bool],
+) -> Dict[str, Dict[str, Any]]:
+    """Apply ``mutate`` to the index re-read under the cross-process lock; caller holds _INDEX_LOCK.
+
+    ``mutate`` returns True when it changed the entries. When another process
+    holds the lock past the timeout the change is skipped, which at worst
+    costs a reconversion.
+    """
+    path = conversion_index_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with hold_lock_file(
+            f"{path}.charon.lock",
+            _INDEX_FILE_LOCK_STALE_SEC,
+            timeout=_INDEX_FILE_LOCK_TIMEOUT_SEC,
+            log_tag="ConversionCache",
+        ):
+            entries = _load_index(force=True)
+            if mutate(entries):
+                _save_index(entries)
+            return entries
+    except (OSError, TimeoutError) as exc:
+        system_warning(f"[ConversionCache] Skipped index update | path='{path}' error='{exc}'")
+        return _load_index()
+
+
+def _evict_least_recent(entries: Dict[str, Dict[str, Any]], keep_key: str) -> Iterable[str]:
+    """Delete the least recently used prompts until the cache fits its budget.
+
+    Returns the folders whose prompts were evicted.
+    """
+    max_bytes = int(float(getattr(config, "CONVERSION_CACHE_MAX_MB", 1024)) * 1024 * 1024)
+    max_entries = int(getattr(config, "CONVERSION_CACHE_MAX_ENTRIES", 2000))
+    total = sum(int(entry.get("size") or 0) for entry in entries.values())
+    folders = set()
+    for key in sorted(entries, key=lambda item: float(entries[item].get("last_used") or 0.0)):
+        if total <= max_bytes and len(entries) <= max_entries:
+            break
+        if key == keep_key:
+            continue
+        entry = entries.pop(key)
+        total -= int(entry.get("size") or 0)
+        folders.add(str(entry.get("folder") or ""))
+        try:
+            os.remove(str(entry.get("prompt_path") or ""))
+        except OSError:
+            pass
+    folders.discard("")
+    return folders
+
+
+def _remove_unindexed_prompts(entries: Dict[str, Dict[str, Any]], folders: Iterable[str]) -> None:
+    """Delete prompts under ``folders`` that no index entry references any more."""
+    indexed = {
+        os.path.normcase(str(entry.get("prompt_path") or "")) for entry in entries.values()
+    }
+    cutoff = time.time() - _ORPHAN_GRACE_SEC
+    for folder in folders:
+        try:
+            candidates = list((Path(folder) / CACHE_FOLDER_NAME).glob(f"*{CONVERTED_SUFFIX}"))
+        except OSError:
+            continue
+        for candidate in candidates:
+            if os.path.normcase(str(candidate)) in indexed:
+                continue
+            try:
+                if candidate.stat().st_mtime < cutoff:
+                    candidate.unlink()
+            except OSError:
+                continue
+
+
 def load_cached_conversion(
     folder_path: str,
     workflow_hash: str,
     cache_identity: str = "",
 ) -> Optional[Dict[str, str]]:
     """
-    Return info about a cached conversion if the stored hash matches and the prompt exists.
+    Return info about a cached conversion if one exists for this hash and identity.
     """
-    log_file = _log_path(folder_path)
-    if not log_file.exists():
-        return None
-
-    try:
-        content = log_file.read_text(encoding="utf-8")
-    except Exception:
-        return None
-
-    hash_line = None
-    prompt_line = None
-    schema_line = None
-    identity_line = None
-    for line in content.splitlines():
-        striped = line.strip()
-        if striped.startswith("- workflow_hash:"):
-            hash_line = striped.split(":", 1)[1].strip()
-        elif striped.startswith("- prompt_file:"):
-            prompt_line = striped.split(":", 1)[1].strip()
-        elif striped.startswith("- cache_schema:"):
-            schema_line = striped.split(":", 1)[1].strip()
-        elif striped.startswith("- comfy_identity:"):
-            identity_line = striped.split(":", 1)[1].strip()
-
-    if not hash_line or not prompt_line:
-        return None
-    if schema_line != str(CONVERSION_CACHE_SCHEMA):
-        return None
-    if hash_line != workflow_hash:
-        return None
-    if cache_identity and identity_line != cache_identity:
-        return None
-
-    prompt_path = _conversion_dir(folder_path) / prompt_line
-    if not prompt_path.exists():
-        return None
-
-    return {
-        "prompt_path": str(prompt_path),
-        "prompt_filename": prompt_line,
-        "workflow_hash": workflow_hash,
-    }
+    folder_key = _folder_key(folder_path)
+    with _INDEX_LOCK:
+        entries = _load_index()
+        if cache_identity:
+            candidates = [_entry_key(folder_key, workflow_hash, cache_identity)]
+        else:
+            prefix = _entry_key(folder_key, workflow_hash, "")
+            candidates = sorted(
+                (key for key in entries if key.startswith(prefix)),
+                key=lambda key: float(entries[key].get("last_used") or 0.0),
+                reverse=True,
+            )
+        for key in candidates:
+            entry = entries.get(key)
+            if entry is None:
+                continue
+            prompt_path = Path(str(entry.get("prompt_path") or ""))
+            if not prompt_path.is_file():
+                _update_index(lambda fresh, key=key: fresh.pop(key, None) is not None)
+                continue
+            now = time.time()
+            stale_touch = now - float(entry.get("last_used") or 0.0) > _TOUCH_PERSIST_SEC
+            entry["last_used"] = now
+            if stale_touch:
+                _update_index(lambda fresh, key=key: _touch_entry(fresh, key, now))
+            return {
+                "prompt_path": str(prompt_path),
+                "prompt_filename": prompt_path.name,
+                "workflow_hash": workflow_hash,
+            }
+    return None
 
 
 def write_conversion_cache(
@@ -209,7 +342,7 @@ def write_conversion_cache(
     cache_identity: str = "",
 ) -> str:
     """
-    Record the conversion info and ensure the converted prompt lives under .charon_cache.
+    Index the converted prompt and ensure it lives under .charon_cache.
     Returns the stored prompt path.
     """
     conversion_dir = _conversion_dir(folder_path)
@@ -225,25 +358,49 @@ def write_conversion_cache(
         except FileNotFoundError:
             raise
 
-    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-    log_lines = [
-        "# Conversion Cache",
-        f"- cache_schema: {CONVERSION_CACHE_SCHEMA}",
-        f"- workflow_hash: {workflow_hash}",
-        f"- comfy_identity: {cache_identity}",
-        f"- converted_at: {timestamp}",
-        f"- prompt_file: {target_path.name}",
-    ]
-
-    log_file = _log_path(folder_path)
-    log_file.write_text("\n".join(log_lines) + "\n", encoding="utf-8")
+    try:
+        size = target_path.stat().st_size
+    except OSError:
+        size = 0
+    key = _entry_key(_folder_key(folder_path), workflow_hash, cache_identity)
+    folder = str(_normalize_folder_path(folder_path))
+
+    def _index_prompt(entries: Dict[str, Dict[str, Any]]) -> bool:
+        entries[key] = {
+            "folder": folder,
+            "workflow_hash": workflow_hash,
+            "comfy_identity": cache_identity,
+            "prompt_path": str(target_path),
+            "size": size,
+            "converted_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "last_used": time.time(),
+        }
+        evicted_folders = _evict_least_recent(entries, key)
+        _remove_unindexed_prompts(entries, {folder, *evicted_folders})
+        return True
+
+    with _INDEX_LOCK:
+        _update_index(_index_prompt)
 
     return str(target_path)
 
 
-def desired_prompt_path(folder_path: str, workflow_path: str, workflow_hash: str) -> Path:
+def _touch_entry(entries: Dict[str, Dict[str, Any]], key: str, now: float) -> bool:
+    entry = entries.get(key)
+    if entry is None:
+        return False
+    entry["last_used"] = max(now, float(entry.get("last_used") or 0.0))
+    return True
+
+
+def desired_prompt_path(
+    folder_path: str,
+    workflow_path: str,
+    workflow_hash: str,
+    cache_identity: str = "",
+) -> Path:
     conversion_dir = _conversion_dir(folder_path)
-    filename = _default_prompt_name(workflow_path, workflow_hash)
+    filename = _default_prompt_name(workflow_path, workflow_hash, cache_identity)
     return conversion_dir / filename
 
 
@@ -252,6 +409,17 @@ def clear_conversion_cache(folder_path: str) -> None:
     Remove cached conversion artifacts for the given workflow directory.
     Safe to call even when the cache is already empty.
     """
+    prefix = _folder_key(folder_path) + "|"
+
+    def _drop_folder(entries: Dict[str, Dict[str, Any]]) -> bool:
+        stale = [key for key in entries if key.startswith(prefix)]
+        for key in stale:
+            entries.pop(key, None)
+        return bool(stale)
+
+    with _INDEX_LOCK:
+        _update_index(_drop_folder)
+
     conversion_dir = _conversion_dir(folder_path)
     if not conversion_dir.exists():
         return
@@ -0,0 +1,213 @@
+"""Fill the conversion cache for every repository workflow ahead of artist use.
+
+Run nightly on a workstation with ComfyUI installed::
+
+    python -m charon.conversion_prewarm --comfy-path "D:\\ComfyUI_windows_portable\\run_nvidia_gpu.bat"
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .charon_logger import system_warning
+from .comfy_client import ComfyUIClient
+from .comfy_environment import ComfyEnvironment, resolve_comfy_runtime
+from .conversion_cache import (
+    compute_comfy_cache_identity,
+    compute_workflow_hash,
+    load_cached_conversion,
+)
+from .paths import get_charon_temp_dir
+from .processor_conversion import (
+    load_cached_prompt_payload,
+    resolve_existing_folder,
+    write_converted_prompt_payload,
+)
+from .shared_conversion_cache import (
+    load_shared_conversion,
+    publish_shared_conversion,
+    shared_conversion_enabled,
+)
+from .workflow_pipeline import (
+    BatchConversionResult,
+    convert_workflows,
+    validate_converted_workflow,
+    warm_conversion_worker,
+)
+from .workflow_runtime import discover_library_workflows, load_workflow_bundle
+
+
+PREWARM_CACHED = "cached"
+PREWARM_CONVERTED = "converted"
+PREWARM_SKIPPED = "skipped"
+PREWARM_FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class PrewarmResult:
+    folder: str
+    status: str
+    prompt_path: str = ""
+    error: str = ""
+
+
+def resolve_cache_identity(runtime: ComfyEnvironment) -> str:
+    """Fingerprint the configured ComfyUI the same way the processor does."""
+    client = ComfyUIClient(runtime.base_url)
+    stats = client.get_system_stats()
+    if not isinstance(stats, dict):
+        # Starting the conversion worker launches the configured ComfyUI.
+        try:
+            warm_conversion_worker(runtime.configured_path)
+        except Exception as exc:
+            raise RuntimeError(f"Could not start ComfyUI for conversion: {exc}") from exc
+        stats = client.get_system_stats()
+    if not isinstance(stats, dict):
+        raise RuntimeError("ComfyUI did not report system stats; cannot fingerprint conversions.")
+    return compute_comfy_cache_identity(stats, runtime.comfy_dir)
+
+
+def prewarm_conversion_cache(
+    comfy_path: Optional[str] = None,
+    *,
+    force: bool = False,
+    cache_identity: Optional[str] = None,
+    convert: Callable[[Sequence[Dict[str, Any]], str], List[BatchConversionResult]] = convert_workflows,
+) -> List[PrewarmResult]:
+    """Convert every repository workflow without a current cache entry, in one session."""
+    runtime = resolve_comfy_runtime(comfy_path)
+    identity = cache_identity if cache_identity is not None else resolve_cache_identity(runtime)
+    results: List[Optional[PrewarmResult]] = []
+    pending = []
+    for folder in discover_library_workflows():
+        try:
+            bundle = load_workflow_bundle(folder)
+        except Exception as exc:
+            results.append(PrewarmResult(folder, PREWARM_FAILED, error=str(exc)))
+            continue
+        workflow = bundle.get("workflow")
+        if not isinstance(workflow, dict) or not isinstance(workflow.get("nodes"), list):
+            results.append(PrewarmResult(folder, PREWARM_SKIPPED))
+            continue
+        # The processor caches beside the node's workflow_path, the local mirror copy.
+        workflow_path = bundle.get("workflow_path") or ""
+        cache_folder = resolve_existing_folder(workflow_path)
+        if not cache_folder:
+            # Without a workflow cache folder the prompt would only land in the debug directory.
+            results.append(PrewarmResult(folder, PREWARM_SKIPPED, error="No workflow cache folder"))
+            continue
+        workflow_hash = compute_workflow_hash(workflow)
+        cached = None if force else load_cached_conversion(cache_folder, workflow_hash, identity)
+        if cached:
+            _publish_local_prompt(folder, workflow, workflow_hash, identity, cached)
+            results.append(PrewarmResult(folder, PREWARM_CACHED, prompt_path=cached["prompt_path"]))
+            continue
+        shared = None if force else load_shared_conversion(workflow_hash, identity)
+        shared_rejected = False
+        if shared is not None:
+            # Checked like the processor checks shared hits; once copied into the
+            # local cache the processor would trust it.
+            try:
+                validate_converted_workflow(workflow, shared)
+            except Exception as exc:
+                system_warning(f"[ConversionCache] Ignoring shared prompt | folder='{folder}' error='{exc}'")
+                shared = None
+                shared_rejected = True
+        if shared is not None:
+            try:
+                prompt_path = write_converted_prompt_payload(
+                    shared,
+                    workflow_cache_folder=cache_folder,
+                    workflow_path=workflow_path,
+                    workflow_hash=workflow_hash,
+                    temp_root=get_charon_temp_dir(),
+                    current_run_id="prewarm",
+                    cache_identity=identity,
+                )
+            except Exception as exc:
+                results.append(PrewarmResult(folder, PREWARM_FAILED, error=str(exc)))
+            else:
+                results.append(PrewarmResult(folder, PREWARM_CACHED, prompt_path=prompt_path))
+            continue
+        pending.append(
+            (len(results), folder, workflow, workflow_path, cache_folder, workflow_hash, shared_rejected)
+        )
+        results.append(None)
+
+    outcomes = convert([job[2] for job in pending], runtime.configured_path) if pending else []
+    temp_root = get_charon_temp_dir()
+    for job, outcome in zip(pending, outcomes):
+        slot, folder, _workflow, workflow_path, cache_folder, workflow_hash, shared_rejected = job
+        if not outcome.ok:
+            results[slot] = PrewarmResult(folder, PREWARM_FAILED, error=outcome.error)
+            continue
+        try:
+            prompt_path = write_converted_prompt_payload(
+                outcome.converted,
+                workflow_cache_folder=cache_folder,
+                workflow_path=workflow_path,
+                workflow_hash=workflow_hash,
+                temp_root=temp_root,
+                current_run_id="prewarm",
+                cache_identity=identity,
+            )
+        except Exception as exc:
+            results[slot] = PrewarmResult(folder, PREWARM_FAILED, error=str(exc))
+            continue
+        # A rejected team prompt is replaced so other artists stop reconverting.
+        publish_shared_conversion(workflow_hash, identity, outcome.converted, replace=shared_rejected)
+        results[slot] = PrewarmResult(folder, PREWARM_CONVERTED, prompt_path=prompt_path)
+    return [result for result in results if result is not None]
+
+
+def _publish_local_prompt(
+    folder: str,
+    workflow: Dict[str, Any],
+    workflow_hash: str,
+    identity: str,
+    cached: Dict[str, str],
+) -> None:
+    """Share a local prompt the team cache lacks, e.g. converted before sharing or after a wipe."""
+    if not shared_conversion_enabled() or load_shared_conversion(workflow_hash, identity) is not None:
+        return
+    try:
+        prompt, _prompt_path = load_cached_prompt_payload(cached)
+        validate_converted_workflow(workflow, prompt)
+    except Exception as exc:
+        system_warning(f"[ConversionCache] Not sharing local prompt | folder='{folder}' error='{exc}'")
+        return
+    publish_shared_conversion(workflow_hash, identity, prompt)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Convert repository workflows ahead of time so artists never wait on a cold conversion."
+    )
+    parser.add_argument("--comfy-path", help="ComfyUI launch path; defaults to the saved preference.")
+    parser.add_argument("--force", action="store_true", help="Reconvert even when the cache is current.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    try:
+        results = prewarm_conversion_cache(args.comfy_path, force=args.force)
+    except Exception as exc:
+        print(f"[Charon] Conversion pre-warm failed: {exc}")
+        return 1
+
+    for result in results:
+        detail = result.error or result.prompt_path
+        print(f"{result.status:<9} {result.folder}" + (f"  ({detail})" if detail else ""))
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"[Charon] Conversion pre-warm finished: {summary or 'no workflows found'}")
+    return 1 if counts.get(PREWARM_FAILED) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""``.charon.lock`` files that serialize writers across sessions and workstations.
+
+A lock is a file created with ``O_EXCL`` that records its owner. Owners that
+run for a long time refresh its mtime; a lock older than the caller's stale
+window belongs to a crashed session and is reclaimed.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from .charon_logger import system_warning
+
+
+def try_acquire_lock_file(lock_path: str, stale_seconds: float, *, log_tag: str = "Lock") -> bool:
+    """Create ``lock_path`` exclusively; returns False when another owner holds it."""
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY
+    try:
+        fd = os.open(lock_path, flags)
+    except FileExistsError:
+        if not _reclaim_stale_lock(lock_path, stale_seconds, log_tag):
+            return False
+        try:
+            fd = os.open(lock_path, flags)
+        except FileExistsError:
+            return False
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        handle.write(
+            f"pid={os.getpid()} host={socket.gethostname()} started={int(time.time())}\n"
+        )
+    return True
+
+
+def release_lock_file(lock_path: str) -> None:
+    try:
+        os.remove(lock_path)
+    except OSError:
+        pass
+
+
+def touch_lock_file(lock_path: str) -> None:
+    """Refresh the lock's mtime so it is not mistaken for a crashed owner's."""
+    try:
+        os.utime(lock_path, None)
+    except OSError:
+        pass
+
+
+@contextmanager
+def hold_lock_file(
+    lock_path: str,
+    stale_seconds: float,
+    *,
+    timeout: float,
+    poll_interval: float = 0.02,
+    log_tag: str = "Lock",
+) -> Iterator[None]:
+    """Wait up to ``timeout`` seconds for the lock; raises ``TimeoutError`` if it stays held."""
+    deadline = time.monotonic() + timeout
+    while not try_acquire_lock_file(lock_path, stale_seconds, log_tag=log_tag):
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Timed out waiting for lock: {lock_path}")
+        time.sleep(poll_interval)
+    try:
+        yield
+    finally:
+        release_lock_file(lock_path)
+
+
+def _reclaim_stale_lock(lock_path: str, stale_seconds: float, log_tag: str) -> bool:
+    """Remove a lock whose owner stopped refreshing it (crashed session)."""
+    try:
+        age = time.time() - os.path.getmtime(lock_path)
+    except OSError:
+        # Lock vanished between the failed open and now.
+        return True
+    if age <= stale_seconds:
+        return False
+    try:
+        os.remove(lock_path)
+    except OSError:
+        return False
+    system_warning(f"[{log_tag}] Reclaimed stale lock | lock='{lock_path}' age={int(age)}s")
+    return True
@@ -7,9 +7,9 @@ Loads folder lists from directories without blocking the UI thread.
 from .qt_compat import QtCore, Signal
 import os
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from .cache_manager import get_cache_manager
-from .charon_logger import system_debug, system_error, log_user_action_detail
+from .charon_logger import system_error, log_user_action_detail
 import time
+from .library_index import get_library_index
 
 
 class FolderListLoader(QtCore.QThread):
@@ -74,48 +74,12 @@ class FolderListLoader(QtCore.QThread):
             self.folders_loaded.emit([])
             return
             
-        cache_manager = get_cache_manager()
         start_time = time.perf_counter()
         
         try:
-            # Check cache first for folder list
-            cache_key = f"folders:{self.base_path}"
-            cached_folders = cache_manager.get_cached_data(cache_key)
-            
-            if cached_folders is not None:
-                system_debug(f"Using cached folder list for {self.base_path}")
-                folders = cached_folders
-                log_user_action_detail(
-                    "folder_load_cache_hit",
-                    base_path=self.base_path,
-                    host=self.host,
-                    count=len(folders),
-                )
-            else:
-                # Scan directory for folders
-                folders = []
-                try:
-                    with os.scandir(self.base_path) as entries:
-                        for entry in entries:
-                            if self._should_stop:
-                                log_user_action_detail(
-                                    "folder_load_cancelled_during_scan",
-                                    base_path=self.base_path,
-                                    host=self.host,
-                                )
-                                return
-                                
-                            if entry.is_dir() and not entry.name.startswith('.'):
-                                folders.append(entry.name)
-                                
-                    # Cache the folder list
-                    cache_manager.cache_data(cache_key, folders, ttl_seconds=300)  # 5 min cache
-                    
-                except Exception as e:
-                    system_error(f"Error scanning folders in {self.base_path}: {e}")
-                    self.folders_loaded.emit([])
-                    return
-                    
+            # One listing reconciles the on-disk library index; recent ones are served from it.
+            folders = get_library_index().list_folders(self.base_path)
+
             # Sort folders alphabetically for now
             folders.sort()
             log_user_action_detail(
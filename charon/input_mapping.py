@@ -7,20 +7,17 @@ import tempfile
 from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Tuple
 
 from . import preferences, paths
 from .node_introspection import (
     NodeLibraryUnavailable,
     collect_workflow_widget_bindings,
 )
-from .api_introspection import collect_workflow_widget_bindings_from_api
-from .comfy_client import ComfyUIClient
-from .comfy_environment import resolve_comfy_runtime
+from .api_introspection import collect_workflow_widget_bindings_from_api, workflow_node_types
+from .object_info_cache import get_object_info_for_classes
 from .charon_logger import system_debug, system_error
 
-_OBJECT_INFO_CACHE_FILE = "object_info_cache.json"
-
 
 @dataclass(frozen=True)
 class ExposableAttribute:
@@ -138,50 +135,10 @@ def discover_prompt_widget_parameters(
     nodes.sort(key=lambda item: item.name.lower())
     return tuple(nodes)
 
-def _get_cache_path() -> Path:
-    return Path(paths.get_charon_temp_dir()) / _OBJECT_INFO_CACHE_FILE
-
-def _fetch_object_info_with_cache() -> Optional[Dict[str, Any]]:
-    """Try to fetch object info from API, update cache. On failure, read from cache."""
-    cache_path = _get_cache_path()
-    runtime = resolve_comfy_runtime()
-    client = ComfyUIClient(
-        runtime.base_url,
-        timeout=2,
-        request_timeout=2,
-        connect_timeout=1,
-    )
-    client.transient_retries = 0
-    
-    # Try live fetch first (non-blocking check ideally, but short timeout helps)
-    info = client.get_object_info()
-    if info:
-        try:
-            cache_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(cache_path, "w", encoding="utf-8") as f:
-                json.dump(info, f)
-            system_debug("Updated object info cache from live ComfyUI API.")
-            return info
-        except Exception as exc:
-            system_error(f"Failed to write object info cache: {exc}")
-            return info
-
-    # Fallback to cache
-    if cache_path.exists():
-        try:
-            with open(cache_path, "r", encoding="utf-8") as f:
-                info = json.load(f)
-            system_debug("Loaded object info from local cache.")
-            return info
-        except Exception as exc:
-            system_error(f"Failed to read object info cache: {exc}")
-    
-    return None
-
 def _discover_with_comfy_api(
     workflow_document: Dict[str, Any]
 ) -> Tuple[ExposableNode, ...]:
-    object_info = _fetch_object_info_with_cache()
+    object_info = get_object_info_for_classes(workflow_node_types(workflow_document))
     if not object_info:
         return tuple()
 
@@ -0,0 +1,361 @@
+"""On-disk index of the workflow library for fast panel start-up.
+
+The repository share holds ``<root>/<folder>/<workflow>/.charon.json``. Every
+workflow's metadata, tags, directory mtime and workflow-file hash is kept in
+a local SQLite database, so a panel session lists a folder from one directory
+listing and re-reads ``.charon.json`` only for workflow directories whose
+mtime moved. Listings reconciled within ``LIBRARY_INDEX_RECONCILE_SEC`` are
+served straight from the database without touching the share.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import config, preferences
+from .charon_logger import system_debug, system_error
+from .charon_metadata import load_charon_metadata
+from .stat_validation import mtime_is_racy, path_key as _key
+
+
+LIBRARY_INDEX_FILENAME = "library_index.db"
+LIBRARY_INDEX_SCHEMA = 1
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS listings (
+    path TEXT PRIMARY KEY,
+    reconciled_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS folders (
+    path TEXT PRIMARY KEY,
+    base TEXT NOT NULL,
+    name TEXT NOT NULL,
+    display_path TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS workflows (
+    path TEXT PRIMARY KEY,
+    folder TEXT NOT NULL,
+    name TEXT NOT NULL,
+    display_path TEXT NOT NULL,
+    dir_mtime_ns INTEGER NOT NULL,
+    scanned_ns INTEGER NOT NULL,
+    metadata TEXT,
+    tags TEXT NOT NULL,
+    workflow_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS folders_by_base ON folders(base);
+CREATE INDEX IF NOT EXISTS workflows_by_folder ON workflows(folder);
+"""
+
+
+@dataclass(frozen=True)
+class LibraryEntry:
+    """One workflow directory as recorded in the library index."""
+
+    folder_path: str
+    name: str
+    path: str
+    metadata: Optional[Dict[str, Any]]
+    tags: Tuple[str, ...]
+    dir_mtime_ns: int
+    workflow_hash: str
+
+
+class LibraryIndex:
+    """SQLite-backed folder → workflow → metadata index, reconciled by mtime."""
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != LIBRARY_INDEX_SCHEMA:
+                conn.executescript(
+                    "DROP TABLE IF EXISTS listings; DROP TABLE IF EXISTS folders; DROP TABLE IF EXISTS workflows;"
+                )
+            conn.executescript(_SCHEMA_SQL)
+            conn.execute(f"PRAGMA user_version = {LIBRARY_INDEX_SCHEMA}")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Yield a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def list_folders(self, base_path: str, *, max_age: Optional[float] = None) -> List[str]:
+        """Return the category folder names under ``base_path``, sorted."""
+        base_key = _key(base_path)
+        if self._listing_stale(base_key, max_age):
+            try:
+                folders = [
+                    (entry.name, entry.path)
+                    for entry in os.scandir(base_path)
+                    if entry.is_dir() and not entry.name.startswith(".")
+                ]
+            except OSError as exc:
+                system_error(f"Error scanning folders in {base_path}: {exc}")
+                return self._indexed_folder_names(base_key)
+            with self._lock, self._connect() as conn:
+                conn.execute("DELETE FROM folders WHERE base = ?", (base_key,))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO folders (path, base, name, display_path) VALUES (?, ?, ?, ?)",
+                    [(_key(path), base_key, name, path) for name, path in folders],
+                )
+                self._mark_reconciled(conn, base_key)
+        return self._indexed_folder_names(base_key)
+
+    def folder_entries(
+        self,
+        folder_path: str,
+        *,
+        max_age: Optional[float] = None,
+        stop_callback: Optional[Callable[[], bool]] = None,
+    ) -> List[LibraryEntry]:
+        """Return the workflows in ``folder_path``, re-reading only changed ones."""
+        folder_key = _key(folder_path)
+        if self._listing_stale(folder_key, max_age):
+            self._reconcile_folder(folder_path, folder_key, stop_callback)
+        return self.indexed_entries(folder_path)
+
+    def all_entries(
+        self,
+        base_path: str,
+        *,
+        max_age: Optional[float] = None,
+        stop_callback: Optional[Callable[[], bool]] = None,
+    ) -> List[LibraryEntry]:
+        """Reconcile every folder under ``base_path`` in parallel and return all workflows."""
+        base_key = _key(base_path)
+        self.list_folders(base_path, max_age=max_age)
+        with self._connect() as conn:
+            folders = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT display_path FROM folders WHERE base = ? ORDER BY name", (base_key,)
+                )
+            ]
+        stale = [path for path in folders if self._listing_stale(_key(path), max_age)]
+        if stale:
+            workers = max(1, min(int(getattr(config, "LIBRARY_INDEX_READ_WORKERS", 8)), len(stale)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="charon-library-index") as executor:
+                list(
+                    executor.map(
+                        lambda path: self._reconcile_folder(path, _key(path), stop_callback),
+                        stale,
+                    )
+                )
+        entries: List[LibraryEntry] = []
+        for path in folders:
+            entries.extend(self.indexed_entries(path))
+        return entries
+
+    def indexed_entries(self, folder_path: str) -> List[LibraryEntry]:
+        """Return what the index holds for ``folder_path`` without touching the share."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT name, display_path, metadata, tags, dir_mtime_ns, workflow_hash "
+                "FROM workflows WHERE folder = ? ORDER BY name",
+                (_key(folder_path),),
+            ).fetchall()
+        return [
+            LibraryEntry(
+                folder_path=folder_path,
+                name=name,
+                path=display_path,
+                metadata=json.loads(metadata) if metadata else None,
+                tags=tuple(json.loads(tags)),
+                dir_mtime_ns=int(dir_mtime_ns),
+                workflow_hash=workflow_hash,
+            )
+            for name, display_path, metadata, tags, dir_mtime_ns, workflow_hash in rows
+        ]
+
+    def invalidate(self, path: str) -> None:
+        """Re-list ``path`` and its parent, and re-read every workflow at or under it.
+
+        Explicit invalidation also catches in-place edits that left the
+        directory mtimes untouched.
+        """
+        key = _key(path)
+        prefix = _like_prefix(key)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "DELETE FROM listings WHERE path = ? OR path = ? OR path LIKE ? ESCAPE '\\'",
+                (key, os.path.dirname(key), prefix),
+            )
+            # A scan stamped at the mtime itself counts as racy, so it is re-read.
+            conn.execute(
+                "UPDATE workflows SET scanned_ns = dir_mtime_ns "
+                "WHERE path = ? OR folder = ? OR path LIKE ? ESCAPE '\\'",
+                (key, key, prefix),
+            )
+
+    def _reconcile_folder(
+        self,
+        folder_path: str,
+        folder_key: str,
+        stop_callback: Optional[Callable[[], bool]],
+    ) -> None:
+        scanned_ns = time.time_ns()
+        listing: List[Tuple[str, str, int]] = []
+        try:
+            for entry in os.scandir(folder_path):
+                if _cancelled(stop_callback):
+                    return
+                if not entry.is_dir() or entry.name.startswith("."):
+                    continue
+                try:
+                    mtime_ns = entry.stat().st_mtime_ns
+                except OSError:
+                    continue
+                listing.append((entry.name, entry.path, mtime_ns))
+        except OSError as exc:
+            system_error(f"Error scanning workflows in {folder_path}: {exc}")
+            return
+
+        with self._connect() as conn:
+            known = {
+                path: (int(mtime_ns), int(seen_ns))
+                for path, mtime_ns, seen_ns in conn.execute(
+                    "SELECT path, dir_mtime_ns, scanned_ns FROM workflows WHERE folder = ?",
+                    (folder_key,),
+                )
+            }
+        changed = []
+        for name, path, mtime_ns in listing:
+            previous = known.get(_key(path))
+            # A racy listing may have missed a same-tick write; re-read it.
+            if previous is None or previous[0] != mtime_ns or mtime_is_racy(*previous):
+                changed.append((name, path, mtime_ns))
+
+        rows = []
+        if changed:
+            workers = max(1, min(int(getattr(config, "LIBRARY_INDEX_READ_WORKERS", 8)), len(changed)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="charon-library-read") as executor:
+                for (name, path, mtime_ns), (metadata, workflow_hash) in zip(
+                    changed, executor.map(lambda item: _read_workflow(item[1]), changed)
+                ):
+                    if _cancelled(stop_callback):
+                        return
+                    tags = metadata.get("tags") if isinstance(metadata, dict) else None
+                    rows.append(
+                        (
+                            _key(path),
+                            folder_key,
+                            name,
+                            path,
+                            mtime_ns,
+                            scanned_ns,
+                            json.dumps(metadata) if metadata is not None else None,
+                            json.dumps([str(tag) for tag in tags] if isinstance(tags, list) else []),
+                            workflow_hash,
+                        )
+                    )
+
+        present = {_key(path) for _name, path, _mtime in listing}
+        removed = [path for path in known if path not in present]
+        with self._lock, self._connect() as conn:
+            conn.executemany("DELETE FROM workflows WHERE path = ?", [(path,) for path in removed])
+            conn.executemany(
+                "INSERT OR REPLACE INTO workflows "
+                "(path, folder, name, display_path, dir_mtime_ns, scanned_ns, metadata, tags, workflow_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._mark_reconciled(conn, folder_key)
+        if rows or removed:
+            system_debug(
+                f"Library index reconciled {folder_path}: {len(rows)} re-read, {len(removed)} removed"
+            )
+
+    def _listing_stale(self, key: str, max_age: Optional[float]) -> bool:
+        if max_age is None:
+            max_age = float(getattr(config, "LIBRARY_INDEX_RECONCILE_SEC", 30.0))
+        with self._connect() as conn:
+            row = conn.execute("SELECT reconciled_at FROM listings WHERE path = ?", (key,)).fetchone()
+        return row is None or time.time() - float(row[0]) >= max_age
+
+    @staticmethod
+    def _mark_reconciled(conn: sqlite3.Connection, key: str) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO listings (path, reconciled_at) VALUES (?, ?)",
+            (key, time.time()),
+        )
+
+    def _indexed_folder_names(self, base_key: str) -> List[str]:
+        with self._connect() as conn:
+            return [
+                row[0]
+                for row in conn.execute("SELECT name FROM folders WHERE base = ? ORDER BY name", (base_key,))
+            ]
+
+
+def _read_workflow(path: str) -> Tuple[Optional[Dict[str, Any]], str]:
+    """Return normalized metadata and the sha256 of the declared workflow file."""
+    metadata = load_charon_metadata(path)
+    workflow_file = "workflow.json"
+    if isinstance(metadata, dict):
+        workflow_file = str(metadata.get("workflow_file") or workflow_file)
+    digest = hashlib.sha256()
+    try:
+        with open(os.path.join(path, workflow_file), "rb") as handle:
+            for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except OSError:
+        return metadata, ""
+    return metadata, digest.hexdigest()
+
+
+def _cancelled(stop_callback: Optional[Callable[[], bool]]) -> bool:
+    try:
+        return bool(stop_callback and stop_callback())
+    except Exception:
+        return False
+
+
+def _like_prefix(key: str) -> str:
+    escaped = key.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + os.sep.replace("\\", "\\\\") + "%"
+
+
+_INDEX: Optional[LibraryIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def library_index_path() -> str:
+    return os.path.join(preferences.get_preferences_root(), "db", LIBRARY_INDEX_FILENAME)
+
+
+def get_library_index() -> LibraryIndex:
+    """Return the process-wide index for the current preferences root."""
+    global _INDEX
+    path = library_index_path()
+    with _INDEX_LOCK:
+        if _INDEX is None or _INDEX.db_path != path:
+            _INDEX = LibraryIndex(path)
+        return _INDEX
+
+
+def invalidate_library_paths(paths: Iterable[str]) -> None:
+    """Make the next lookup re-list and re-read the given folders or workflows."""
+    try:
+        index = get_library_index()
+        for path in paths:
+            if path:
+                index.invalidate(path)
+    except (OSError, sqlite3.Error) as exc:
+        system_error(f"Failed to invalidate library index: {exc}")
@@ -0,0 +1,138 @@
+"""Validate every repository workflow ahead of artist use.
+
+Run from a morning scheduled task on a workstation with ComfyUI installed::
+
+    python -m charon.library_validation --comfy-path "D:\\ComfyUI_windows_portable\\run_nvidia_gpu.bat"
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from . import config
+from .charon_logger import system_warning
+from .comfy_client import ComfyUIClient
+from .comfy_environment import ComfyEnvironment, resolve_comfy_runtime
+from .comfy_validation import ValidationResult, validate_comfy_environment
+from .model_file_index import extra_model_roots, model_name_table
+from .workflow_local_store import write_validation_raw, write_validation_resolve_status
+from .workflow_pipeline import warm_conversion_worker
+from .workflow_runtime import discover_library_workflows, load_workflow_bundle
+
+
+LIBRARY_VALIDATED = "validated"
+LIBRARY_NEEDS_RESOLVE = "needs_resolve"
+LIBRARY_SKIPPED = "skipped"
+LIBRARY_FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class LibraryValidationResult:
+    folder: str
+    status: str
+    error: str = ""
+
+
+def warm_validation_inputs(runtime: ComfyEnvironment) -> None:
+    """Load the inputs every workflow validation shares before the pool starts.
+
+    The warm worker's page holds ComfyUI's node registry, and the model index
+    is stat-refreshed from then on instead of walked per workflow.
+    """
+    if getattr(config, "WORKFLOW_CONVERSION_DAEMON", True):
+        try:
+            # Also launches the configured ComfyUI when it is not running yet.
+            warm_conversion_worker(runtime.configured_path)
+        except Exception as exc:
+            system_warning(f"[Validation] Warm worker unavailable; validating one-shot: {exc}")
+    if not ComfyUIClient(runtime.base_url, connect_timeout=3).test_connection():
+        raise RuntimeError(f"No ComfyUI server is responding at {runtime.base_url}.")
+    if runtime.comfy_dir:
+        models_root = runtime.models_dir or os.path.join(runtime.comfy_dir, "models")
+        model_name_table([models_root, *extra_model_roots(runtime.comfy_dir)], max_depth=6)
+
+
+def validate_workflow_library(
+    comfy_path: Optional[str] = None,
+    *,
+    workers: Optional[int] = None,
+    validate: Callable[..., ValidationResult] = validate_comfy_environment,
+    warm: Callable[[ComfyEnvironment], None] = warm_validation_inputs,
+) -> List[LibraryValidationResult]:
+    """Validate every repository workflow and persist each result for the UI."""
+    runtime = resolve_comfy_runtime(comfy_path)
+    if not runtime.configured_path:
+        raise RuntimeError("No ComfyUI launch path is configured.")
+    warm(runtime)
+    # One key per run: the page fetches the Manager catalog once for the batch.
+    catalog_key = uuid.uuid4().hex
+    folders = discover_library_workflows()
+
+    def _validate_one(folder: str) -> LibraryValidationResult:
+        try:
+            bundle = load_workflow_bundle(folder)
+        except Exception as exc:
+            return LibraryValidationResult(folder, LIBRARY_FAILED, str(exc))
+        if not isinstance(bundle.get("workflow"), dict):
+            return LibraryValidationResult(folder, LIBRARY_SKIPPED)
+        try:
+            result = validate(
+                runtime.configured_path,
+                workflow_bundle=bundle,
+                use_cache=False,
+                force=True,
+                include_environment=False,
+                node_catalog_key=catalog_key,
+            )
+        except Exception as exc:
+            return LibraryValidationResult(folder, LIBRARY_FAILED, str(exc))
+        payload: Dict[str, Any] = result.to_dict()
+        remote_folder = result.workflow_folder or folder
+        write_validation_raw(remote_folder, payload, overwrite=True)
+        write_validation_resolve_status(remote_folder, payload, overwrite=True)
+        return LibraryValidationResult(
+            folder,
+            LIBRARY_VALIDATED if result.ok else LIBRARY_NEEDS_RESOLVE,
+        )
+
+    if workers is None:
+        workers = int(getattr(config, "LIBRARY_VALIDATION_WORKERS", 4))
+    workers = max(1, min(workers, len(folders) or 1))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="charon-validate") as executor:
+        return list(executor.map(_validate_one, folders))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Validate repository workflows ahead of time so artists open them pre-validated."
+    )
+    parser.add_argument("--comfy-path", help="ComfyUI launch path; defaults to the saved preference.")
+    parser.add_argument("--workers", type=int, help="Workflows validated concurrently.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    try:
+        results = validate_workflow_library(args.comfy_path, workers=args.workers)
+    except Exception as exc:
+        print(f"[Charon] Library validation failed: {exc}")
+        return 1
+
+    for result in results:
+        print(f"{result.status:<13} {result.folder}" + (f"  ({result.error})" if result.error else ""))
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"[Charon] Library validation finished: {summary or 'no workflows found'}")
+    return 1 if counts.get(LIBRARY_FAILED) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
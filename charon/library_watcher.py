@@ -0,0 +1,215 @@
+"""Background watcher that reports workflow library changes.
+
+The repository lives on a network share where change notifications are not
+delivered, so the watcher polls and diffs directory mtimes instead:
+
+* the repository root is listed every tick; a category folder whose mtime
+  moved gained or lost workflows and is re-listed,
+* the folder the artist is looking at is re-listed every tick so edited
+  workflows (atomic writes bump the workflow directory mtime) show up,
+* every other folder is re-listed on a slower sweep.
+
+The per-user local mirror is watched the same way and reported as changes to
+the matching repository workflow, so validation state written by another
+session refreshes the row.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from . import config
+from .charon_logger import system_debug, system_error
+from .stat_validation import mtime_is_racy
+
+
+Signature = Tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class LibraryChange:
+    """One added, removed or changed folder or workflow in the repository."""
+
+    kind: str  # "added", "removed" or "changed"
+    path: str
+    is_folder: bool = False
+    local: bool = False  # Raised by the per-user mirror, not the share
+
+    @property
+    def folder_path(self) -> str:
+        return self.path if self.is_folder else os.path.dirname(self.path)
+
+
+def _list_dirs(path: str, nested: Sequence[str] = ()) -> Dict[str, Signature]:
+    """Map each visible sub-directory of ``path`` to its mtime signature."""
+    listing: Dict[str, Signature] = {}
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            try:
+                if not entry.is_dir():
+                    continue
+                signature = [entry.stat().st_mtime_ns]
+            except OSError:
+                continue
+            for name in nested:
+                try:
+                    signature.append(os.stat(os.path.join(entry.path, name)).st_mtime_ns)
+                except OSError:
+                    signature.append(0)
+            listing[entry.name] = tuple(signature)
+    return listing
+
+
+class _TreeSnapshot:
+    """Two-level ``root/<folder>/<workflow>`` listing diffed between polls."""
+
+    def __init__(self, root: str, nested: Sequence[str] = ()) -> None:
+        self.root = root
+        self.nested = tuple(nested)
+        self.folders: Optional[Dict[str, Signature]] = None
+        self.workflows: Dict[str, Dict[str, Signature]] = {}
+        self._racy: Set[str] = set()
+
+    def poll(self, active_folder: Optional[str], sweep: bool) -> List[Tuple[str, str, bool]]:
+        """Return ``(kind, relative path, is_folder)`` tuples since the last poll."""
+        listed_ns = time.time_ns()
+        try:
+            folders = _list_dirs(self.root)
+        except OSError:
+            # Share offline or mirror not created yet; keep the last snapshot.
+            return []
+
+        changes: List[Tuple[str, str, bool]] = []
+        baseline = self.folders is None
+        previous = self.folders or {}
+        for name in sorted(previous.keys() - folders.keys()):
+            self.workflows.pop(name, None)
+            changes.append(("removed", name, True))
+        for name in sorted(folders.keys() - previous.keys()):
+            if not baseline:
+                changes.append(("added", name, True))
+
+        for name, signature in sorted(folders.items()):
+            rescan = (
+                name not in self.workflows
+                or previous.get(name) != signature
+                or name == active_folder
+                or name in self._racy
+                or sweep
+            )
+            if not rescan:
+                continue
+            self._racy.discard(name)
+            try:
+                workflows = _list_dirs(os.path.join(self.root, name), self.nested)
+            except OSError:
+                continue
+            known = self.workflows.get(name)
+            self.workflows[name] = workflows
+            if known is None:
+                # New to the snapshot: either the baseline or a folder already
+                # reported as added, so its workflows are not reported one by one.
+                continue
+            for workflow in sorted(known.keys() - workflows.keys()):
+                changes.append(("removed", os.path.join(name, workflow), False))
+            for workflow in sorted(workflows.keys() - known.keys()):
+                changes.append(("added", os.path.join(name, workflow), False))
+            for workflow in sorted(workflows.keys() & known.keys()):
+                if workflows[workflow] != known[workflow]:
+                    changes.append(("changed", os.path.join(name, workflow), False))
+
+        for name, signature in folders.items():
+            # A racy listing may have missed a same-tick change; list it again next tick.
+            if mtime_is_racy(signature[0], listed_ns):
+                self._racy.add(name)
+        self.folders = folders
+        return changes
+
+
+class LibraryWatcher:
+    """Poll the repository and the local mirror, reporting batches of changes.
+
+    ``callback`` runs on the watcher thread with a non-empty list of
+    :class:`LibraryChange`; UI code should marshal it to the main thread.
+    """
+
+    def __init__(
+        self,
+        repository_root: str,
+        callback: Callable[[List[LibraryChange]], None],
+        *,
+        local_root: Optional[str] = None,
+        local_nested: Sequence[str] = (),
+    ) -> None:
+        self.repository_root = repository_root
+        self._callback = callback
+        self._repository = _TreeSnapshot(repository_root)
+        self._local = _TreeSnapshot(local_root, local_nested) if local_root else None
+        self._active_folder: Optional[str] = None
+        self._last_sweep: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def set_active_folder(self, folder_path: Optional[str]) -> None:
+        """Poll ``folder_path`` every tick; ``None`` for views like Bookmarks."""
+        if folder_path and os.path.normcase(os.path.dirname(os.path.abspath(folder_path))) == os.path.normcase(
+            os.path.abspath(self.repository_root)
+        ):
+            self._active_folder = os.path.basename(os.path.abspath(folder_path))
+        else:
+            self._active_folder = None
+
+    def poll(self) -> List[LibraryChange]:
+        """Run one polling pass and return what changed since the previous one."""
+        now = time.monotonic()
+        sweep = self._last_sweep is None or now - self._last_sweep >= float(
+            getattr(config, "LIBRARY_WATCH_SWEEP_SEC", 60)
+        )
+        if sweep:
+            self._last_sweep = now
+        active = self._active_folder
+        changes = [
+            LibraryChange(kind, os.path.join(self.repository_root, relative), is_folder)
+            for kind, relative, is_folder in self._repository.poll(active, sweep)
+        ]
+        if self._local is not None:
+            # Any mirror difference only means the workflow's local state moved.
+            seen = {change.path for change in changes}
+            for _kind, relative, is_folder in self._local.poll(active, sweep):
+                path = os.path.join(self.repository_root, relative)
+                if not is_folder and path not in seen:
+                    seen.add(path)
+                    changes.append(LibraryChange("changed", path, local=True))
+        return changes
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="CharonLibraryWatcher",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        interval = max(0.5, float(getattr(config, "LIBRARY_WATCH_INTERVAL_SEC", 3)))
+        while not self._stop.is_set():
+            try:
+                changes = self.poll()
+                if changes and not self._stop.is_set():
+                    system_debug(f"Library watcher detected {len(changes)} change(s)")
+                    self._callback(changes)
+            except Exception as exc:
+                system_error(f"Library watcher poll failed: {exc}")
+            self._stop.wait(interval)
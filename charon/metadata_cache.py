@@ -0,0 +1,186 @@
+"""Keyed in-memory cache for workflow metadata and folder tags.
+
+Entries are keyed by normalized path and validated against the stat of the
+workflow's ``.charon.json``, so a single edit invalidates one entry instead of
+the whole cache. Folder tags record which workflows they were computed from
+and are recomputed only when one of those workflows or the folder listing
+changed.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import config
+from .charon_logger import system_error
+from .charon_metadata import CHARON_METADATA_FILENAME
+from .stat_validation import mtime_is_racy, path_key as _key
+
+
+_MAX_FOLDER_TAG_ENTRIES = 1000
+
+Signature = Optional[Tuple[int, int]]
+
+
+@dataclass(frozen=True)
+class _MetadataEntry:
+    value: Optional[Dict[str, Any]]
+    signature: Signature
+    trusted: bool
+    checked_at: float
+    version: int
+
+
+@dataclass(frozen=True)
+class _FolderTagsEntry:
+    tags: Tuple[str, ...]
+    dir_mtime_ns: int
+    children: Tuple[Tuple[str, int], ...]
+    checked_at: float
+
+
+def _metadata_signature(script_path: str) -> Signature:
+    try:
+        stat = os.stat(os.path.join(script_path, CHARON_METADATA_FILENAME))
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class MetadataCache:
+    """Per-path metadata cache with stat validation and folder-tag dependencies."""
+
+    def __init__(self, loader: Callable[[str], Optional[Dict[str, Any]]]) -> None:
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _MetadataEntry]" = OrderedDict()
+        self._folder_tags: "OrderedDict[str, _FolderTagsEntry]" = OrderedDict()
+        self._version = 0
+
+    def get(self, script_path: str) -> Optional[Dict[str, Any]]:
+        """Return metadata for a workflow directory, re-reading it only when it changed."""
+        return self._entry(script_path).value
+
+    def folder_tags(self, folder_path: str) -> List[str]:
+        """Return the sorted unique tags of every workflow in ``folder_path``."""
+        key = _key(folder_path)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._folder_tags.get(key)
+            if cached is not None and now - cached.checked_at < self._revalidate_seconds():
+                self._folder_tags.move_to_end(key)
+                return list(cached.tags)
+
+        try:
+            dir_mtime_ns = os.stat(folder_path).st_mtime_ns
+            if cached is not None and cached.dir_mtime_ns == dir_mtime_ns:
+                child_paths = [path for path, _version in cached.children]
+            else:
+                with os.scandir(folder_path) as entries:
+                    child_paths = sorted(
+                        entry.path
+                        for entry in entries
+                        if entry.is_dir() and not entry.name.startswith(".")
+                    )
+        except OSError as exc:
+            system_error(f"Error getting folder tags for {folder_path}: {exc}")
+            return []
+
+        children = []
+        all_tags = set()
+        for path in child_paths:
+            entry = self._entry(path)
+            children.append((path, entry.version))
+            tags = entry.value.get("tags", []) if entry.value else []
+            if isinstance(tags, list):
+                all_tags.update(tags)
+
+        if cached is not None and cached.dir_mtime_ns == dir_mtime_ns and tuple(children) == cached.children:
+            updated = replace(cached, checked_at=now)
+        else:
+            updated = _FolderTagsEntry(
+                tags=tuple(sorted(all_tags)),
+                dir_mtime_ns=dir_mtime_ns,
+                children=tuple(children),
+                checked_at=now,
+            )
+        with self._lock:
+            self._folder_tags[key] = updated
+            self._folder_tags.move_to_end(key)
+            while len(self._folder_tags) > _MAX_FOLDER_TAG_ENTRIES:
+                self._folder_tags.popitem(last=False)
+        return list(updated.tags)
+
+    def invalidate(self, path: str) -> None:
+        """Drop cached metadata at or under ``path`` and the folder tags built from it."""
+        key = _key(path)
+        prefix = key + os.sep
+        with self._lock:
+            for entry_key in [k for k in self._entries if k == key or k.startswith(prefix)]:
+                del self._entries[entry_key]
+            stale_tags = [
+                folder_key
+                for folder_key, entry in self._folder_tags.items()
+                if folder_key == key
+                or folder_key.startswith(prefix)
+                or any(_key(child) == key for child, _version in entry.children)
+            ]
+            for folder_key in stale_tags:
+                del self._folder_tags[folder_key]
+
+    def invalidate_folder_tags(self, folder_path: str) -> None:
+        """Drop only the tag list of ``folder_path``; its workflows stay cached."""
+        with self._lock:
+            self._folder_tags.pop(_key(folder_path), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._folder_tags.clear()
+
+    def _entry(self, script_path: str) -> _MetadataEntry:
+        key = _key(script_path)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                if now - cached.checked_at < self._revalidate_seconds():
+                    return cached
+
+        signature = _metadata_signature(script_path)
+        if cached is not None and cached.trusted and cached.signature == signature:
+            refreshed = replace(cached, checked_at=now)
+            with self._lock:
+                if key in self._entries:
+                    self._entries[key] = refreshed
+            return refreshed
+
+        # Stat before reading so a write racing the read shows up next time.
+        read_started_ns = time.time_ns()
+        value = self._loader(script_path)
+        trusted = signature is None or not mtime_is_racy(signature[0], read_started_ns)
+        with self._lock:
+            self._version += 1
+            entry = _MetadataEntry(
+                value=value,
+                signature=signature,
+                trusted=trusted,
+                checked_at=now,
+                version=self._version,
+            )
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            limit = max(1, int(getattr(config, "METADATA_CACHE_MAX_ENTRIES", 10000)))
+            while len(self._entries) > limit:
+                self._entries.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def _revalidate_seconds() -> float:
+        return float(getattr(config, "METADATA_CACHE_REVALIDATE_SEC", 2.0))
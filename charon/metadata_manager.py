@@ -1,10 +1,10 @@
 import json
 import os
-import functools
 from .utilities import is_compatible_with_host
 from .charon_logger import system_error, system_warning
 from .charon_metadata import load_charon_metadata, write_charon_metadata, CHARON_METADATA_FILENAME
 from .conversion_cache import clear_conversion_cache
+from .metadata_cache import MetadataCache
 from .path_safety import resolve_relative_path_inside
 from .workflow_local_store import (
     get_local_workflow_folder,
@@ -72,27 +72,32 @@ def check_folder_compatibility_lazy(folder_path, host="None"):
     # Real check will happen in background
     return True
 
-@functools.lru_cache(maxsize=10000)
+_METADATA_CACHE = MetadataCache(lambda script_path: load_charon_metadata(script_path))
+
+
 def get_charon_config(script_path):
     """
     Load Charon metadata for the given workflow directory.
     Returns None when no `.charon.json` file exists.
     """
-    return load_charon_metadata(script_path)
+    return _METADATA_CACHE.get(script_path)
+
+def clear_metadata_cache(path=None):
+    """Clear cached metadata, or only the entries at or under ``path``."""
+    if path is None:
+        _METADATA_CACHE.clear()
+    else:
+        _METADATA_CACHE.invalidate(path)
 
-def clear_metadata_cache():
-    """Clear the entire metadata cache. Use when metadata has changed."""
-    get_charon_config.cache_clear()
+def invalidate_folder_tags(folder_path):
+    """Force the tag list of one folder to be recomputed on next access."""
+    _METADATA_CACHE.invalidate_folder_tags(folder_path)
 
 def invalidate_metadata_path(script_path):
     """Invalidate cache for a specific script path only."""
-    # This is a workaround since lru_cache doesn't support selective invalidation
-    # We'll clear the entire cache but this will be called less frequently
-    # In the future, we could implement a custom cache with selective invalidation
-    get_charon_config.cache_clear()
-    # Also clear folder tags cache if it exists
-    if hasattr(get_folder_tags, 'cache_clear'):
-        get_folder_tags.cache_clear()
+    # Drops this workflow's metadata and the tags of the folder containing it;
+    # every other cached workflow stays valid.
+    _METADATA_CACHE.invalidate(script_path)
     
     # Also invalidate persistent cache
     try:
@@ -102,11 +107,10 @@ def invalidate_metadata_path(script_path):
     except ImportError:
         pass  # Cache manager not available
 
-@functools.lru_cache(maxsize=1000)
 def get_folder_tags(folder_path):
     """
     Get all unique tags from all scripts in a folder.
-    Cached to avoid re-scanning on every folder switch.
+    Cached per folder and recomputed only when one of its workflows changed.
     
     Args:
         folder_path: Path to the folder to scan
@@ -114,25 +118,7 @@ def get_folder_tags(folder_path):
     Returns:
         list: Sorted list of unique tags
     """
-    all_tags = set()
-    
-    try:
-        # Use the cached folder modification time to detect changes
-        folder_mtime = os.path.getmtime(folder_path)
-        
-        with os.scandir(folder_path) as entries:
-            for entry in entries:
-                if entry.is_dir() and not entry.name.startswith('.'):
-                    # Use the already cached metadata
-                    metadata = get_charon_config(entry.path)
-                    if metadata:
-                        tags = metadata.get('tags', [])
-                        if isinstance(tags, list):
-                            all_tags.update(tags)
-    except Exception as e:
-        system_error(f"Error getting folder tags for {folder_path}: {e}")
-    
-    return sorted(all_tags)
+    return _METADATA_CACHE.folder_tags(folder_path)
 
 def refresh_metadata(target="current", script_path=None, folder_path=None, clear_cache=True):
     """
@@ -142,23 +128,21 @@ def refresh_metadata(target="current", script_path=None, folder_path=None, clear
         target (str): "current", "script", "folder", "all"
         script_path (str): Specific script path to refresh (for target="script")
         folder_path (str): Specific folder path to refresh (for target="folder")
-        clear_cache (bool): Whether to clear the LRU cache
+        clear_cache (bool): Whether to drop the cached entries for the target first
     """
-    # For performance: only clear cache when absolutely necessary
-    # Most of the time we don't need to clear the entire cache
     if clear_cache and target == "all":
         clear_metadata_cache()
     
     # Force reload of metadata by calling get_charon_config
     # This will repopulate the cache with fresh data
     if target == "script" and script_path:
-        # For a single script, we could invalidate just that path
-        # but for now we'll just re-read it to warm the cache
+        if clear_cache:
+            clear_metadata_cache(script_path)
         get_charon_config(script_path)
     elif target == "folder" and folder_path:
-        # For folders, we don't need to clear cache anymore
-        # The parallel loading will handle getting fresh data
-        pass
+        # Only this folder's workflows are dropped; the loaders re-read them
+        if clear_cache:
+            clear_metadata_cache(folder_path)
     elif target == "all":
         # For "all", we already cleared the cache above
         pass
@@ -0,0 +1,384 @@
+"""Persistent, incrementally refreshed index of model files by name.
+
+Validation and the resolver used to ``os.walk`` the local models folder, the
+``extra_model_paths.yaml`` roots and the shared model repository once per
+reference. Each root is now listed once and remembered together with every
+directory's mtime. Later refreshes only ``stat`` directories and relist the
+ones whose mtime moved, so a quiet NAS share costs one stat per folder
+instead of a full walk.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from . import config, preferences
+from .json_io import atomic_write_json
+from .stat_validation import RACY_MTIME_NS, path_key as _root_key
+
+
+MODEL_INDEX_DIR = "model_index"
+_INDEX_VERSION = 1
+# A directory modified within this window of its scan may hide a second change
+# in the same timestamp tick, so it is relisted.
+_RACY_MTIME_SEC = RACY_MTIME_NS / 1e9
+# A lookup that finds nothing re-checks the tree unless it was just refreshed.
+_MISS_RECHECK_SEC = 2.0
+
+_indexes: Dict[str, "RootIndex"] = {}
+_indexes_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ModelFile:
+    path: str
+    size: int
+    mtime: float
+    depth: int
+
+
+class RootIndex:
+    """Every file beneath one root, keyed by lower-cased file name."""
+
+    def __init__(self, root: str, manifest_path: Optional[str] = None):
+        self.root = os.path.abspath(root)
+        self.manifest_path = manifest_path
+        self.refreshed_at = 0.0
+        self._dirs: Dict[str, Dict[str, Any]] = {}
+        self._by_name: Dict[str, List[ModelFile]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.manifest_path:
+            return
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            return
+        if (
+            not isinstance(payload, dict)
+            or payload.get("version") != _INDEX_VERSION
+            or payload.get("root") != self.root
+            or not isinstance(payload.get("dirs"), dict)
+        ):
+            return
+        self._dirs = payload["dirs"]
+        self._rebuild()
+
+    def _save(self) -> None:
+        if not self.manifest_path:
+            return
+        minimum = int(getattr(config, "MODEL_INDEX_PERSIST_MIN_FILES", 500))
+        file_count = sum(len(entry["files"]) for entry in self._dirs.values())
+        if file_count < minimum:
+            # Small trees relist faster than the manifest would load.
+            return
+        try:
+            atomic_write_json(
+                self.manifest_path,
+                {"version": _INDEX_VERSION, "root": self.root, "dirs": self._dirs},
+                indent=0,
+            )
+        except OSError:
+            pass
+
+    def _scan_dir(self, path: str, mtime: float, now: float) -> Optional[Dict[str, Any]]:
+        files: Dict[str, List[float]] = {}
+        subdirs: List[str] = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        # Mirror os.walk: never descend through directory links.
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.is_file():
+                            info = entry.stat()
+                            files[entry.name] = [info.st_size, info.st_mtime]
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        return {"mtime": mtime, "scanned_at": now, "files": files, "subdirs": sorted(subdirs)}
+
+    def refresh(self) -> int:
+        """Relist directories whose mtime changed; return how many were listed."""
+        with self._lock:
+            previous = self._dirs
+            current: Dict[str, Dict[str, Any]] = {}
+            listed = 0
+            now = time.time()
+            pending = [""]
+            while pending:
+                relative = pending.pop()
+                path = os.path.join(self.root, relative) if relative else self.root
+                try:
+                    mtime = os.stat(path).st_mtime
+                except OSError:
+                    continue
+                entry = previous.get(relative)
+                if (
+                    entry is None
+                    or entry.get("mtime") != mtime
+                    or mtime >= entry.get("scanned_at", 0.0) - _RACY_MTIME_SEC
+                ):
+                    entry = self._scan_dir(path, mtime, now)
+                    if entry is None:
+                        continue
+                    listed += 1
+                current[relative] = entry
+                pending.extend(
+                    os.path.join(relative, name) if relative else name for name in entry["subdirs"]
+                )
+            self._dirs = current
+            self.refreshed_at = time.monotonic()
+            if listed or len(current) != len(previous):
+                self._rebuild()
+                self._save()
+            return listed
+
+    def _rebuild(self) -> None:
+        by_name: Dict[str, List[ModelFile]] = {}
+        for relative, entry in self._dirs.items():
+            folder = os.path.join(self.root, relative) if relative else self.root
+            depth = relative.count(os.sep) + 1 if relative else 0
+            for name, (size, mtime) in entry["files"].items():
+                by_name.setdefault(name.lower(), []).append(
+                    ModelFile(os.path.join(folder, name), int(size), float(mtime), depth)
+                )
+        for matches in by_name.values():
+            matches.sort(key=lambda item: (item.depth, item.path.lower()))
+        self._by_name = by_name
+
+    def mark_stale(self) -> None:
+        self.refreshed_at = 0.0
+
+    def find(
+        self,
+        file_name: str,
+        *,
+        within: Optional[str] = None,
+        max_depth: Optional[int] = None,
+    ) -> List[ModelFile]:
+        """Return files named ``file_name`` (any case), shallowest first."""
+        with self._lock:
+            matches = list(self._by_name.get(file_name.lower(), ()))
+        if within:
+            prefix = _root_key(within).rstrip(os.sep) + os.sep
+            matches = [item for item in matches if os.path.normcase(item.path).startswith(prefix)]
+        if max_depth is not None:
+            matches = [item for item in matches if item.depth <= max_depth]
+        return matches
+
+    def table(self, *, max_depth: Optional[int] = None) -> Dict[str, List[str]]:
+        """Return ``{lower-cased name: [paths]}`` for files up to ``max_depth``."""
+        with self._lock:
+            items = list(self._by_name.items())
+        table: Dict[str, List[str]] = {}
+        for name, matches in items:
+            paths = [item.path for item in matches if max_depth is None or item.depth <= max_depth]
+            if paths:
+                table[name] = paths
+        return table
+
+
+def _manifest_path(root: str) -> str:
+    digest = hashlib.sha1(_root_key(root).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(preferences.get_preferences_root(), MODEL_INDEX_DIR, f"{digest}.json")
+
+
+def get_root_index(root: str, *, max_age: Optional[float] = None) -> Optional[RootIndex]:
+    """Return the shared index for ``root``, refreshed if older than ``max_age``."""
+    if not root or not os.path.isdir(root):
+        return None
+    key = _root_key(root)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = RootIndex(root, _manifest_path(root))
+            _indexes[key] = index
+    if max_age is None:
+        max_age = float(getattr(config, "MODEL_INDEX_REFRESH_SEC", 10.0))
+    if time.monotonic() - index.refreshed_at > max_age:
+        index.refresh()
+    return index
+
+
+def _unique_roots(roots: Iterable[str]) -> List[str]:
+    unique: List[str] = []
+    seen = set()
+    for root in roots:
+        if not root:
+            continue
+        key = _root_key(root)
+        if key not in seen:
+            seen.add(key)
+            unique.append(os.path.abspath(root))
+    return unique
+
+
+def _is_within(key: str, root_key: str) -> bool:
+    return key == root_key or key.startswith(root_key.rstrip(os.sep) + os.sep)
+
+
+def _covering_root(root: str, anchors: Sequence[str]) -> str:
+    """Return the indexed tree that should answer queries for ``root``.
+
+    Category folders under an already indexed models root reuse that index
+    rather than starting a second one over the same files.
+    """
+    key = _root_key(root)
+    with _indexes_lock:
+        known = [index.root for index in _indexes.values()]
+    for candidate in [*anchors, *known]:
+        if candidate and _is_within(key, _root_key(candidate)) and os.path.isdir(candidate):
+            return os.path.abspath(candidate)
+    return root
+
+
+def find_model_files_batch(
+    file_names: Iterable[str],
+    roots: Sequence[str],
+    *,
+    anchors: Sequence[str] = (),
+    max_depth: Optional[int] = None,
+) -> Dict[str, Dict[str, List[str]]]:
+    """Look up many file names under many roots with one refresh per tree.
+
+    Returns ``{root: {file_name: [paths]}}`` keyed by the absolute roots and
+    the names as given; each path list is nearest first and only holds files
+    that still exist.
+    """
+    names = list(dict.fromkeys(name for name in file_names if name))
+    results: Dict[str, Dict[str, List[str]]] = {}
+    if not names:
+        return results
+    rechecked = set()
+    for root in _unique_roots(roots):
+        covering = _covering_root(root, anchors)
+        index = get_root_index(covering)
+        if index is None:
+            continue
+        within = None if _root_key(covering) == _root_key(root) else root
+
+        def lookup() -> Dict[str, List[ModelFile]]:
+            return {name: index.find(name, within=within, max_depth=max_depth) for name in names}
+
+        found = lookup()
+        if (
+            not all(found.values())
+            and id(index) not in rechecked
+            and time.monotonic() - index.refreshed_at > _MISS_RECHECK_SEC
+        ):
+            rechecked.add(id(index))
+            index.refresh()
+            found = lookup()
+        per_name: Dict[str, List[str]] = {}
+        for name, items in found.items():
+            paths: List[str] = []
+            for item in items:
+                if not os.path.isfile(item.path):
+                    # Removed since the last refresh; the next query relists.
+                    index.mark_stale()
+                    continue
+                paths.append(item.path)
+            per_name[name] = paths
+        results[root] = per_name
+    return results
+
+
+def find_model_files(
+    file_name: str,
+    roots: Sequence[str],
+    *,
+    anchors: Sequence[str] = (),
+    max_depth: Optional[int] = None,
+) -> List[str]:
+    """Return existing files named ``file_name`` beneath ``roots``, nearest first."""
+    if not file_name:
+        return []
+    matches: List[str] = []
+    seen = set()
+    batch = find_model_files_batch([file_name], roots, anchors=anchors, max_depth=max_depth)
+    for per_name in batch.values():
+        for path in per_name.get(file_name, ()):
+            key = os.path.normcase(path)
+            if key not in seen:
+                seen.add(key)
+                matches.append(path)
+    return matches
+
+
+def model_name_table(roots: Sequence[str], *, max_depth: Optional[int] = None) -> Dict[str, List[str]]:
+    """Return a merged ``{lower-cased name: [paths]}`` table across ``roots``."""
+    merged: Dict[str, List[str]] = {}
+    for root in _unique_roots(roots):
+        index = get_root_index(root)
+        if index is None:
+            continue
+        for name, paths in index.table(max_depth=max_depth).items():
+            merged.setdefault(name, []).extend(paths)
+    return merged
+
+
+def invalidate_model_index(*paths: str) -> None:
+    """Force the next lookup under any root containing ``paths`` to refresh."""
+    keys = [_root_key(path) for path in paths if path]
+    with _indexes_lock:
+        indexes = list(_indexes.items())
+    for root_key, index in indexes:
+        if any(_is_within(key, root_key) for key in keys):
+            index.mark_stale()
+
+
+def extra_model_roots(comfy_dir: Optional[str]) -> List[str]:
+    """Return the folders registered in ComfyUI's ``extra_model_paths.yaml``."""
+    if not comfy_dir:
+        return []
+    yaml_path = os.path.join(comfy_dir, "extra_model_paths.yaml")
+    if not os.path.isfile(yaml_path):
+        return []
+    try:
+        import yaml
+    except ImportError:
+        return []
+    try:
+        with open(yaml_path, "r", encoding="utf-8") as handle:
+            payload = yaml.safe_load(handle)
+    except (OSError, yaml.YAMLError):
+        return []
+    if not isinstance(payload, dict):
+        return []
+
+    yaml_dir = os.path.dirname(os.path.abspath(yaml_path))
+    roots: List[str] = []
+    for section in payload.values():
+        if not isinstance(section, dict):
+            continue
+        base_path = section.get("base_path")
+        base = ""
+        if isinstance(base_path, str) and base_path.strip():
+            base = os.path.expandvars(os.path.expanduser(base_path.strip()))
+            if not os.path.isabs(base):
+                base = os.path.join(yaml_dir, base)
+        for key, value in section.items():
+            if key in ("base_path", "is_default") or not isinstance(value, str):
+                continue
+            for line in value.splitlines():
+                folder = os.path.expandvars(os.path.expanduser(line.strip()))
+                if not folder:
+                    continue
+                if not os.path.isabs(folder):
+                    folder = os.path.join(base or yaml_dir, folder)
+                folder = os.path.abspath(folder)
+                if os.path.isdir(folder):
+                    roots.append(folder)
+    return _unique_roots(roots)
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import os
-import socket
 import threading
 import time
 import urllib.request
@@ -11,6 +10,9 @@ from pathlib import Path
 from typing import Callable, Dict, Optional
 
 from .charon_logger import system_debug, system_warning
+from .file_lock import release_lock_file, touch_lock_file, try_acquire_lock_file
+from .model_file_index import invalidate_model_index
+from .validation_signature import invalidate_validation_signatures
 
 
 # Transfers copy in small chunks so progress, cancellation, and the stall
@@ -346,7 +348,7 @@ class ModelTransferManager:
                     state.copied_bytes = copied
                     state.percent = min(100, int((copied / total) * 100)) if total else 0
                     state.last_activity = time.monotonic()
-                    self._touch_lock(lock_path)
+                    touch_lock_file(lock_path)
                     self._emit_progress(state)
             state.closer = None
             self._publish_temp_file(state, temp_path, destination, copied)
@@ -399,7 +401,7 @@ class ModelTransferManager:
                         state.copied_bytes = copied
                         state.percent = min(100, int((copied / total) * 100)) if total else 0
                         state.last_activity = time.monotonic()
-                        self._touch_lock(lock_path)
+                        touch_lock_file(lock_path)
                         self._emit_progress(state)
             state.closer = None
             self._publish_temp_file(state, temp_path, destination, copied)
@@ -450,43 +452,11 @@ class ModelTransferManager:
         return True
 
     def _acquire_destination_lock(self, destination: str, lock_path: str) -> None:
-        flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY
-        try:
-            fd = os.open(lock_path, flags)
-        except FileExistsError as exc:
-            if not self._reclaim_stale_lock(lock_path):
-                raise RuntimeError(
-                    f"Another workstation is already transferring this model: {destination}"
-                ) from exc
-            fd = os.open(lock_path, flags)
-        with os.fdopen(fd, "w", encoding="utf-8") as handle:
-            handle.write(
-                f"pid={os.getpid()} host={socket.gethostname()} started={int(time.time())}\n"
+        if not try_acquire_lock_file(lock_path, self.stale_lock_seconds, log_tag="Transfer"):
+            raise RuntimeError(
+                f"Another workstation is already transferring this model: {destination}"
             )
 
-    def _reclaim_stale_lock(self, lock_path: str) -> bool:
-        """Remove a lock whose owner stopped refreshing it (crashed session)."""
-        try:
-            age = time.time() - os.path.getmtime(lock_path)
-        except OSError:
-            # Lock vanished between the failed open and now.
-            return True
-        if age <= self.stale_lock_seconds:
-            return False
-        try:
-            os.remove(lock_path)
-        except OSError:
-            return False
-        system_warning(f"[Transfer] Reclaimed stale lock | lock='{lock_path}' age={int(age)}s")
-        return True
-
-    @staticmethod
-    def _touch_lock(lock_path: str) -> None:
-        try:
-            os.utime(lock_path, None)
-        except OSError:
-            pass
-
     def _publish_temp_file(
         self,
         state: TransferState,
@@ -498,14 +468,12 @@ class ModelTransferManager:
             self._finish_success(state, self._safe_size(destination))
             return
         os.replace(temp_path, destination)
+        invalidate_model_index(destination)
+        invalidate_validation_signatures()
         self._finish_success(state, copied or state.total_bytes)
 
     def _release_destination_lock(self, lock_path: str) -> None:
-        try:
-            if os.path.exists(lock_path):
-                os.remove(lock_path)
-        except OSError:
-            pass
+        release_lock_file(lock_path)
 
 
 manager = ModelTransferManager.instance()
@@ -0,0 +1,388 @@
+"""Pure-Python UI→API workflow conversion for graphs built from known nodes.
+
+The ComfyUI frontend's ``graphToPrompt()`` is the reference converter, but it
+needs a Chromium page. For workflows whose node classes all have their
+widget layout in ``/object_info`` the same prompt can be rebuilt directly:
+widget values are paired with the schema's widget inputs, links are followed
+through reroutes, Set/Get nodes, bypassed nodes and subgraphs, and muted
+nodes are dropped. Anything this module cannot reproduce exactly raises
+``NativeConversionUnsupported`` so the caller falls back to the browser.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .workflow_graph import subgraph_definitions
+
+
+class NativeConversionUnsupported(Exception):
+    """The workflow uses something only the browser frontend can convert."""
+
+
+MODE_ALWAYS = 0
+MODE_NEVER = 2
+MODE_BYPASS = 4
+
+# Ids litegraph gives a subgraph's input and output boundary nodes.
+SUBGRAPH_INPUT_NODE_ID = -10
+SUBGRAPH_OUTPUT_NODE_ID = -20
+
+_WIDGET_INPUT_TYPES = {"INT", "FLOAT", "BOOLEAN", "STRING", "COMBO"}
+_CONTROL_WIDGET_VALUES = {"fixed", "increment", "decrement", "randomize"}
+# Frontend-only nodes that never reach the API prompt.
+_NOTE_TYPES = {"Note", "MarkdownNote"}
+_REROUTE_TYPES = {"Reroute"}
+_MAX_LINK_HOPS = 256
+
+
+@dataclass(frozen=True)
+class _Link:
+    origin_id: Any
+    origin_slot: int
+    target_id: Any
+    target_slot: int
+    type: str
+
+
+@dataclass(frozen=True)
+class _WidgetInput:
+    name: str
+    kind: str
+    config: Dict[str, Any]
+
+
+class _Graph:
+    """One graph level: the root workflow or a subgraph instance's definition."""
+
+    def __init__(
+        self,
+        data: Dict[str, Any],
+        prefix: str = "",
+        parent: Optional["_Graph"] = None,
+        instance: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.data = data
+        self.prefix = prefix
+        self.parent = parent
+        self.instance = instance
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        for node in data.get("nodes") or []:
+            if isinstance(node, dict) and node.get("id") is not None:
+                self.nodes[str(node["id"])] = node
+        self.links: Dict[str, _Link] = {}
+        for raw in data.get("links") or []:
+            link_id, link = _parse_link(raw)
+            if link_id is not None:
+                self.links[link_id] = link
+
+    def api_id(self, node_id: Any) -> str:
+        return f"{self.prefix}:{node_id}" if self.prefix else str(node_id)
+
+    def input_link(self, node: Dict[str, Any], slot: int) -> Optional[_Link]:
+        inputs = node.get("inputs") or []
+        if not 0 <= slot < len(inputs) or not isinstance(inputs[slot], dict):
+            return None
+        link_id = inputs[slot].get("link")
+        if link_id is None:
+            return None
+        link = self.links.get(str(link_id))
+        if link is None:
+            raise NativeConversionUnsupported(f"Node {node.get('id')} references missing link {link_id}.")
+        return link
+
+
+def convert_ui_workflow(ui_workflow: Dict[str, Any], object_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the API prompt ``graphToPrompt()`` would produce for ``ui_workflow``.
+
+    Raises ``NativeConversionUnsupported`` when the result cannot be proven
+    identical to the browser export.
+    """
+    if not isinstance(ui_workflow, dict) or not isinstance(ui_workflow.get("nodes"), list):
+        raise NativeConversionUnsupported("Workflow is not a frontend graph.")
+    converter = _Converter(object_info, subgraph_definitions(ui_workflow))
+    converter.emit_graph(_Graph(ui_workflow))
+    prompt = converter.prompt
+    # graphToPrompt drops links into nodes it did not emit (muted or bypassed).
+    for entry in prompt.values():
+        inputs = entry["inputs"]
+        for name in [key for key, value in inputs.items() if _is_link_value(value)]:
+            if inputs[name][0] not in prompt:
+                del inputs[name]
+    if not prompt:
+        raise NativeConversionUnsupported("Workflow has no executable nodes.")
+    return prompt
+
+
+class _Converter:
+    def __init__(self, object_info: Dict[str, Any], definitions: Dict[str, Dict[str, Any]]) -> None:
+        self.object_info = object_info
+        self.definitions = definitions
+        self.prompt: Dict[str, Dict[str, Any]] = {}
+        self._layouts: Dict[str, Tuple[_WidgetInput, ...]] = {}
+
+    def emit_graph(self, graph: _Graph) -> None:
+        for node_id, node in graph.nodes.items():
+            node_type = str(node.get("type") or "")
+            mode = _node_mode(node)
+            if node_type in self.definitions:
+                if mode != MODE_ALWAYS:
+                    raise NativeConversionUnsupported(f"Subgraph node {node_id} is muted or bypassed.")
+                if graph.prefix.count(":") >= 32:
+                    raise NativeConversionUnsupported("Subgraphs are nested too deeply.")
+                self.emit_graph(_Graph(self.definitions[node_type], graph.api_id(node_id), graph, node))
+                continue
+            if self._is_virtual(node_type):
+                continue
+            if node_type not in self.object_info:
+                raise NativeConversionUnsupported(f"No schema for node class {node_type or '<missing>'}.")
+            if mode in (MODE_NEVER, MODE_BYPASS):
+                continue
+            self.prompt[graph.api_id(node_id)] = self._convert_node(graph, node, node_type)
+
+    def _convert_node(self, graph: _Graph, node: Dict[str, Any], node_type: str) -> Dict[str, Any]:
+        inputs = self._widget_values(node, node_type)
+        for slot, socket in enumerate(node.get("inputs") or []):
+            if not isinstance(socket, dict) or socket.get("link") is None:
+                continue
+            name = socket.get("name")
+            if not name:
+                raise NativeConversionUnsupported(f"Node {node.get('id')} has an unnamed input.")
+            source = self._resolve_source(
+                graph,
+                graph.input_link(node, slot),
+                str(socket.get("type") or ""),
+                widget=bool(socket.get("widget")),
+            )
+            if source is not None:
+                inputs[str(name)] = [source[0], source[1]]
+        node_def = self.object_info.get(node_type) or {}
+        title = node.get("title") or node_def.get("display_name") or node_type
+        return {"inputs": inputs, "class_type": node_type, "_meta": {"title": title}}
+
+    def _widget_values(self, node: Dict[str, Any], node_type: str) -> Dict[str, Any]:
+        layout = self._widget_layout(node_type)
+        values = node.get("widgets_values")
+        if values is None:
+            values = []
+        if not isinstance(values, list):
+            raise NativeConversionUnsupported(f"{node_type} stores widget values as a mapping.")
+        inputs: Dict[str, Any] = {}
+        index = 0
+        for position, widget in enumerate(layout):
+            if index >= len(values):
+                raise NativeConversionUnsupported(f"{node_type} has fewer widget values than its schema.")
+            value = values[index]
+            index += 1
+            if not _value_matches(widget, value):
+                raise NativeConversionUnsupported(f"{node_type}.{widget.name} value {value!r} does not fit its type.")
+            inputs[widget.name] = value
+            if widget.kind == "INT" and (
+                widget.config.get("control_after_generate") or widget.name in ("seed", "noise_seed")
+            ):
+                if index < len(values) and values[index] in _CONTROL_WIDGET_VALUES:
+                    index += 1
+            elif _has_upload_widget(widget) and len(values) - index > len(layout) - position - 1:
+                index += 1
+        if index != len(values):
+            raise NativeConversionUnsupported(f"{node_type} has widgets its schema does not describe.")
+        return inputs
+
+    def _widget_layout(self, node_type: str) -> Tuple[_WidgetInput, ...]:
+        layout = self._layouts.get(node_type)
+        if layout is not None:
+            return layout
+        node_def = self.object_info.get(node_type) or {}
+        sections = node_def.get("input") if isinstance(node_def, dict) else None
+        if not isinstance(sections, dict):
+            raise NativeConversionUnsupported(f"Schema for {node_type} has no inputs section.")
+        widgets: List[_WidgetInput] = []
+        for section in ("required", "optional"):
+            entries = sections.get(section) or {}
+            if not isinstance(entries, dict):
+                raise NativeConversionUnsupported(f"Schema for {node_type} has malformed {section} inputs.")
+            for name, raw_spec in entries.items():
+                widget = _widget_input(node_type, str(name), raw_spec)
+                if widget is not None:
+                    widgets.append(widget)
+        layout = tuple(widgets)
+        self._layouts[node_type] = layout
+        return layout
+
+    def _is_virtual(self, node_type: str) -> bool:
+        return (
+            node_type in _NOTE_TYPES
+            or node_type in _REROUTE_TYPES
+            or node_type in ("SetNode", "GetNode", "PrimitiveNode")
+        ) and node_type not in self.object_info
+
+    def _resolve_source(
+        self,
+        graph: _Graph,
+        link: Optional[_Link],
+        input_type: str,
+        *,
+        widget: bool,
+    ) -> Optional[Tuple[str, int]]:
+        """Follow ``link`` back to the emitted node output that feeds it."""
+        for _hop in range(_MAX_LINK_HOPS):
+            if link is None:
+                return None
+            origin_id = link.origin_id
+            if _same_id(origin_id, SUBGRAPH_INPUT_NODE_ID):
+                if graph.parent is None or graph.instance is None:
+                    raise NativeConversionUnsupported("Root graph link starts at a subgraph input.")
+                outer = graph.parent.input_link(graph.instance, link.origin_slot)
+                if outer is None and widget:
+                    # The frontend fills this from the instance's promoted widget.
+                    raise NativeConversionUnsupported("Unlinked subgraph input feeds a widget.")
+                graph, link = graph.parent, outer
+                continue
+            node = graph.nodes.get(str(origin_id))
+            if node is None:
+                raise NativeConversionUnsupported(f"Link starts at unknown node {origin_id}.")
+            node_type = str(node.get("type") or "")
+            if node_type in self.definitions:
+                inner = _Graph(self.definitions[node_type], graph.api_id(origin_id), graph, node)
+                graph, link = inner, _subgraph_output_link(inner, link.origin_slot)
+                continue
+            if node_type in _REROUTE_TYPES and node_type not in self.object_info:
+                link = graph.input_link(node, 0)
+                continue
+            if node_type == "SetNode" and node_type not in self.object_info:
+                link = graph.input_link(node, 0)
+                continue
+            if node_type == "GetNode" and node_type not in self.object_info:
+                link = graph.input_link(_find_setter(graph, node), 0)
+                continue
+            if node_type == "PrimitiveNode" and node_type not in self.object_info:
+                if not widget:
+                    raise NativeConversionUnsupported("Primitive node feeds a non-widget input.")
+                return None
+            if node_type not in self.object_info:
+                raise NativeConversionUnsupported(f"No schema for node class {node_type or '<missing>'}.")
+            if _node_mode(node) == MODE_BYPASS:
+                slot = _bypass_input_slot(node, link.origin_slot, input_type)
+                if slot is None:
+                    # No matching input: the link dangles and is dropped later.
+                    return graph.api_id(origin_id), link.origin_slot
+                passthrough = graph.input_link(node, slot)
+                if passthrough is None:
+                    raise NativeConversionUnsupported(f"Bypassed node {origin_id} has an unlinked passthrough.")
+                link = passthrough
+                continue
+            return graph.api_id(origin_id), link.origin_slot
+        raise NativeConversionUnsupported("Link chain is cyclic or too long.")
+
+
+def _parse_link(raw: Any) -> Tuple[Optional[str], Optional[_Link]]:
+    try:
+        if isinstance(raw, (list, tuple)) and len(raw) >= 5:
+            link_id, origin_id, origin_slot, target_id, target_slot = raw[:5]
+            link_type = raw[5] if len(raw) > 5 else ""
+        elif isinstance(raw, dict):
+            link_id = raw.get("id")
+            origin_id, origin_slot = raw.get("origin_id"), raw.get("origin_slot")
+            target_id, target_slot = raw.get("target_id"), raw.get("target_slot")
+            link_type = raw.get("type") or ""
+        else:
+            return None, None
+        link = _Link(origin_id, int(origin_slot), target_id, int(target_slot), str(link_type or ""))
+    except (TypeError, ValueError) as exc:
+        raise NativeConversionUnsupported(f"Malformed link {raw!r}.") from exc
+    if link_id is None:
+        return None, None
+    return str(link_id), link
+
+
+def _widget_input(node_type: str, name: str, raw_spec: Any) -> Optional[_WidgetInput]:
+    if not isinstance(raw_spec, (list, tuple)) or not raw_spec:
+        raise NativeConversionUnsupported(f"Schema for {node_type}.{name} is malformed.")
+    raw_type = raw_spec[0]
+    config = raw_spec[1] if len(raw_spec) > 1 and isinstance(raw_spec[1], dict) else {}
+    if isinstance(raw_type, (list, tuple)):
+        kind = "COMBO"
+    elif isinstance(raw_type, str) and raw_type in _WIDGET_INPUT_TYPES:
+        kind = raw_type
+    elif isinstance(raw_type, str) and raw_type == raw_type.upper():
+        # Socket-only types such as MODEL or IMAGE.
+        return None
+    else:
+        # Custom widget types are drawn by frontend extensions.
+        raise NativeConversionUnsupported(f"{node_type}.{name} uses widget type {raw_type!r}.")
+    if config.get("forceInput"):
+        return None
+    if kind == "COMBO" and config.get("control_after_generate"):
+        # Combo controls add a filter widget whose serialization varies by frontend.
+        raise NativeConversionUnsupported(f"{node_type}.{name} has a combo control widget.")
+    return _WidgetInput(name, kind, config)
+
+
+def _value_matches(widget: _WidgetInput, value: Any) -> bool:
+    if widget.kind in ("INT", "FLOAT"):
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if widget.kind == "BOOLEAN":
+        return isinstance(value, bool)
+    if widget.kind == "STRING":
+        if not isinstance(value, str):
+            return False
+        # Dynamic prompts are expanded (and comments stripped) by the frontend.
+        return not (widget.config.get("dynamicPrompts") and any(token in value for token in ("{", "/*", "//")))
+    return isinstance(value, (str, int, float)) and not isinstance(value, bool)
+
+
+def _has_upload_widget(widget: _WidgetInput) -> bool:
+    return any(key.endswith("_upload") and value for key, value in widget.config.items())
+
+
+def _node_mode(node: Dict[str, Any]) -> int:
+    mode = node.get("mode", MODE_ALWAYS)
+    if mode in (None, MODE_ALWAYS):
+        return MODE_ALWAYS
+    if mode in (MODE_NEVER, MODE_BYPASS):
+        return int(mode)
+    raise NativeConversionUnsupported(f"Node {node.get('id')} uses execution mode {mode!r}.")
+
+
+def _bypass_input_slot(node: Dict[str, Any], origin_slot: int, input_type: str) -> Optional[int]:
+    """Mirror the frontend: prefer the input at the output's index, then any of that type."""
+    inputs = node.get("inputs") or []
+    for slot in [origin_slot, *range(len(inputs))]:
+        if 0 <= slot < len(inputs) and isinstance(inputs[slot], dict):
+            if str(inputs[slot].get("type") or "") == input_type:
+                return slot
+    return None
+
+
+def _subgraph_output_link(graph: _Graph, output_slot: int) -> Optional[_Link]:
+    for link in graph.links.values():
+        if _same_id(link.target_id, SUBGRAPH_OUTPUT_NODE_ID) and link.target_slot == output_slot:
+            return link
+    return None
+
+
+def _find_setter(graph: _Graph, getter: Dict[str, Any]) -> Dict[str, Any]:
+    values = getter.get("widgets_values") or []
+    name = values[0] if isinstance(values, list) and values else None
+    if not name:
+        raise NativeConversionUnsupported(f"Get node {getter.get('id')} has no variable name.")
+    setters = [
+        node
+        for node in graph.nodes.values()
+        if node.get("type") == "SetNode" and (node.get("widgets_values") or [None])[0] == name
+    ]
+    if len(setters) != 1:
+        raise NativeConversionUnsupported(f"Get node {getter.get('id')} matches {len(setters)} Set nodes.")
+    return setters[0]
+
+
+def _same_id(value: Any, expected: int) -> bool:
+    try:
+        return int(value) == expected
+    except (TypeError, ValueError):
+        return False
+
+
+def _is_link_value(value: Any) -> bool:
+    return isinstance(value, list) and len(value) == 2 and isinstance(value[0], str)
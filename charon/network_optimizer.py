@@ -5,14 +5,11 @@ Provides optimized file operations for network drives by batching operations
 and minimizing individual file system calls.
 """
 
-import os
-import json
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Optional
 from .cache_manager import get_cache_manager
-from .charon_logger import system_debug, system_error, log_user_action_detail
-from .metadata_manager import get_metadata_path
+from .charon_logger import system_error, log_user_action_detail
+from .library_index import get_library_index
 
 
 class NetworkBatchReader:
@@ -24,7 +21,7 @@ class NetworkBatchReader:
     
     def batch_read_metadata(self, folder_path: str, stop_callback=None) -> Dict[str, dict]:
         """
-        Read all metadata files in a folder in parallel.
+        Return the metadata of every workflow in a folder, via the library index.
         
         Returns:
             Dict mapping script_name -> metadata
@@ -48,61 +45,18 @@ class NetworkBatchReader:
         metadata_map = {}
         
         try:
-            # First, collect all potential metadata files
-            metadata_files = []
-            def _cancelled() -> bool:
-                try:
-                    return bool(stop_callback and stop_callback())
-                except Exception:
-                    return False
-
-            with os.scandir(folder_path) as entries:
-                for entry in entries:
-                    if _cancelled():
-                        log_user_action_detail(
-                            "script_metadata_batch_cancelled_during_scan",
-                            folder_path=folder_path,
-                        )
-                        return {}
-                    if entry.is_dir() and not entry.name.startswith('.'):
-                        json_path = get_metadata_path(entry.path)
-                        metadata_files.append((entry.name, json_path))
-            log_user_action_detail(
-                "script_metadata_batch_scan_complete",
-                folder_path=folder_path,
-                candidate_count=len(metadata_files),
-            )
-            
-            # Read all metadata files in parallel
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                future_to_script = {
-                    executor.submit(self._read_json_file, path): name
-                    for name, path in metadata_files
-                }
-                
-                for future in as_completed(future_to_script):
-                    if _cancelled():
-                        for f in future_to_script:
-                            f.cancel()
-                        log_user_action_detail(
-                            "script_metadata_batch_cancelled_during_read",
-                            folder_path=folder_path,
-                            processed=len(metadata_map),
-                        )
-                        return {}
-                    script_name = future_to_script[future]
-                    try:
-                        metadata = future.result()
-                        if metadata is not None:
-                            metadata_map[script_name] = metadata
-                    except Exception as e:
-                        system_error(f"Error reading metadata for {script_name}: {e}")
-                        log_user_action_detail(
-                            "script_metadata_batch_error",
-                            folder_path=folder_path,
-                            script=script_name,
-                            error=str(e),
-                        )
+            # The library index lists the folder once and re-reads only
+            # workflows whose directory changed since the last session.
+            entries = get_library_index().folder_entries(folder_path, stop_callback=stop_callback)
+            if stop_callback and stop_callback():
+                log_user_action_detail(
+                    "script_metadata_batch_cancelled_during_scan",
+                    folder_path=folder_path,
+                )
+                return {}
+            for entry in entries:
+                if entry.metadata is not None:
+                    metadata_map[entry.name] = entry.metadata
             
             # Cache the result
             self.cache_manager.cache_data(cache_key, metadata_map, ttl_seconds=300)
@@ -122,26 +76,6 @@ class NetworkBatchReader:
                 error=str(e),
             )
             return {}
-        finally:
-            if not metadata_map:
-                log_user_action_detail(
-                    "script_metadata_batch_complete",
-                    folder_path=folder_path,
-                    result_count=len(metadata_map),
-                    duration_ms=int((time.perf_counter() - start_time) * 1000),
-                )
-    
-    def _read_json_file(self, path: str) -> Optional[dict]:
-        """Read a JSON file if it exists."""
-        try:
-            # Skip existence check - just try to open
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return None
-        except Exception as e:
-            system_error(f"Error reading {path}: {e}")
-            return None
     
 # Global instance
 _batch_reader: Optional[NetworkBatchReader] = None
@@ -0,0 +1,253 @@
+"""Process-wide cache of ComfyUI's ``/object_info`` node schema.
+
+The schema is several megabytes on a heavily extended ComfyUI but only
+changes when ComfyUI, its custom nodes, or its model folders change. It is
+kept in memory and in one compact gzip file, keyed by the conversion-cache
+identity plus the custom-node and model-folder inventories, and downloaded
+again only when that key moves. Parameter discovery usually needs a handful
+of classes, so it asks ``/object_info/<class>`` for just those instead.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Set
+
+from . import paths
+from .api_introspection import ObjectInfoIndex
+from .charon_logger import system_debug, system_error
+from .comfy_client import ComfyUIClient
+from .comfy_environment import ComfyEnvironment, resolve_comfy_runtime
+from .conversion_cache import compute_comfy_cache_identity
+from .validation_signature import get_validation_signature_service
+
+
+_OBJECT_INFO_CACHE_FILE = "object_info_cache.json.gz"
+_CLASS_FETCH_WORKERS = 8
+
+_LOCK = threading.Lock()
+_CLIENTS: Dict[str, ComfyUIClient] = {}
+_MEMORY: Optional[ObjectInfoIndex] = None
+_MEMORY_KEY = ""
+# Per-class schemas fetched for the current key, and classes the server lacks.
+_CLASS_KEY = ""
+_CLASS_SCHEMAS = ObjectInfoIndex()
+_CLASS_UNKNOWN: Set[str] = set()
+# Key the disk copy was last found stale for, so it is not re-read per lookup.
+_DISK_STALE_KEY = ""
+# Full-schema downloads in flight, so each key is downloaded by one thread.
+_DOWNLOADS: Dict[str, threading.Event] = {}
+
+
+def object_info_cache_path() -> str:
+    return os.path.join(paths.get_charon_temp_dir(), _OBJECT_INFO_CACHE_FILE)
+
+
+def get_object_info(runtime: Optional[ComfyEnvironment] = None) -> Optional[ObjectInfoIndex]:
+    """Return the running ComfyUI's schema, downloading it only when its key changed.
+
+    When ComfyUI is unreachable the last known schema is returned, as before.
+    """
+    runtime = runtime or resolve_comfy_runtime()
+    client = _client(runtime.base_url)
+    return _full_schema(client, runtime, client.get_system_stats())
+
+
+def get_object_info_for_classes(
+    node_classes: Iterable[str],
+    runtime: Optional[ComfyEnvironment] = None,
+    *,
+    strict: bool = False,
+) -> Optional[ObjectInfoIndex]:
+    """Return schemas covering ``node_classes``, fetching only the classes not cached yet.
+
+    Falls back to the full schema when it is already cached, when ComfyUI is
+    unreachable, or when the server has no per-class ``/object_info`` route.
+    With ``strict`` the last known schema is never used: None is returned
+    unless the schema belongs to the running server's current key.
+    """
+    global _CLASS_KEY, _CLASS_SCHEMAS, _CLASS_UNKNOWN
+    runtime = runtime or resolve_comfy_runtime()
+    client = _client(runtime.base_url)
+    stats = client.get_system_stats()
+    if not isinstance(stats, dict):
+        return _full_schema(client, runtime, stats, strict=strict)
+    key = object_info_key(stats, runtime)
+    with _LOCK:
+        full = _cached_full_schema(key)
+        if full is not None:
+            return full
+        if _CLASS_KEY != key:
+            _CLASS_KEY, _CLASS_SCHEMAS, _CLASS_UNKNOWN = key, ObjectInfoIndex(), set()
+        schemas, unknown = _CLASS_SCHEMAS, _CLASS_UNKNOWN
+        wanted = sorted({str(name) for name in node_classes if name})
+        missing = [name for name in wanted if name not in schemas and name not in unknown]
+    if missing:
+        workers = max(1, min(_CLASS_FETCH_WORKERS, len(missing)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="charon-object-info") as executor:
+            replies = list(executor.map(client.get_object_info_for_class, missing))
+        if any(reply is None for reply in replies):
+            system_debug("Per-class object info unavailable; fetching the full schema.")
+            return _full_schema(client, runtime, stats, key=key, strict=strict)
+        with _LOCK:
+            for name, reply in zip(missing, replies):
+                if isinstance(reply.get(name), dict):
+                    schemas[name] = reply[name]
+                else:
+                    unknown.add(name)
+    with _LOCK:
+        # Other threads keep filling the shared index; hand out a snapshot that
+        # still shares its normalized widget specs.
+        return schemas.subset(wanted)
+
+
+def _cached_full_schema(key: str) -> Optional[ObjectInfoIndex]:
+    """Return the full schema for ``key`` from memory or disk; caller holds the lock."""
+    global _MEMORY, _MEMORY_KEY, _DISK_STALE_KEY
+    if _MEMORY is not None and _MEMORY_KEY == key:
+        return _MEMORY
+    if _DISK_STALE_KEY == key:
+        return None
+    disk_key, cached = _load_disk()
+    if cached is not None and disk_key == key:
+        system_debug("Loaded object info from local cache.")
+        _MEMORY, _MEMORY_KEY = cached, key
+        return cached
+    _DISK_STALE_KEY = key
+    return None
+
+
+def _full_schema(
+    client: ComfyUIClient,
+    runtime: ComfyEnvironment,
+    stats: Any,
+    *,
+    key: Optional[str] = None,
+    strict: bool = False,
+) -> Optional[ObjectInfoIndex]:
+    global _MEMORY, _MEMORY_KEY
+    if not isinstance(stats, dict):
+        if strict:
+            return None
+        with _LOCK:
+            if _MEMORY is None:
+                _MEMORY_KEY, _MEMORY = _load_disk()
+            return _MEMORY
+
+    key = key or object_info_key(stats, runtime)
+    with _LOCK:
+        cached = _cached_full_schema(key)
+        if cached is not None:
+            return cached
+        pending = _DOWNLOADS.get(key)
+        downloading = pending is None
+        if downloading:
+            pending = _DOWNLOADS[key] = threading.Event()
+
+    if not downloading:
+        # Another thread is already downloading this key; share its result.
+        pending.wait()
+        with _LOCK:
+            cached = _cached_full_schema(key)
+            return cached if cached is not None or strict else _last_known_schema()
+
+    try:
+        info = client.get_object_info()
+        if not isinstance(info, dict):
+            if strict:
+                return None
+            with _LOCK:
+                return _last_known_schema()
+        index = ObjectInfoIndex(info)
+        _write_disk(key, info)
+        with _LOCK:
+            _MEMORY, _MEMORY_KEY = index, key
+        system_debug("Updated object info cache from live ComfyUI API.")
+        return index
+    finally:
+        with _LOCK:
+            _DOWNLOADS.pop(key, None)
+        pending.set()
+
+
+def _last_known_schema() -> Optional[ObjectInfoIndex]:
+    """Same fallback as before the key existed: the last schema on disk; caller holds the lock."""
+    return _MEMORY if _MEMORY is not None else _load_disk()[1]
+
+
+def object_info_key(stats: Dict[str, Any], runtime: ComfyEnvironment) -> str:
+    """Identity of the schema a server would return; changes with nodes and models."""
+    comfy_dir = runtime.comfy_dir
+    inventories = get_validation_signature_service()
+    payload = {
+        "identity": compute_comfy_cache_identity(stats, comfy_dir),
+        "custom_nodes": inventories.directory_inventory(os.path.join(comfy_dir, "custom_nodes"))
+        if comfy_dir
+        else [],
+        # Combo inputs list model files, so new checkpoints change the schema.
+        "model_roots": inventories.directory_inventory(
+            runtime.models_dir or os.path.join(comfy_dir, "models")
+        )
+        if comfy_dir
+        else [],
+    }
+    serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def invalidate_object_info_cache() -> None:
+    """Forget in-memory schemas so the next lookup re-checks the disk copy."""
+    global _MEMORY, _MEMORY_KEY, _CLASS_KEY, _CLASS_SCHEMAS, _CLASS_UNKNOWN, _DISK_STALE_KEY
+    with _LOCK:
+        _MEMORY, _MEMORY_KEY = None, ""
+        _CLASS_KEY, _CLASS_SCHEMAS, _CLASS_UNKNOWN = "", ObjectInfoIndex(), set()
+        _DISK_STALE_KEY = ""
+
+
+def _client(base_url: str) -> ComfyUIClient:
+    with _LOCK:
+        client = _CLIENTS.get(base_url)
+        if client is None:
+            client = ComfyUIClient(base_url, timeout=2, request_timeout=2, connect_timeout=1)
+            client.transient_retries = 0
+            _CLIENTS[base_url] = client
+        return client
+
+
+def _load_disk():
+    path = object_info_cache_path()
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except FileNotFoundError:
+        return "", None
+    except Exception as exc:
+        system_error(f"Failed to read object info cache: {exc}")
+        return "", None
+    info = payload.get("object_info") if isinstance(payload, dict) else None
+    if not isinstance(info, dict):
+        return "", None
+    return str(payload.get("key") or ""), ObjectInfoIndex(info)
+
+
+def _write_disk(key: str, info: Dict[str, Any]) -> None:
+    path = object_info_cache_path()
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(temp_path, "wt", encoding="utf-8", compresslevel=6) as handle:
+            json.dump({"key": key, "object_info": info}, handle, separators=(",", ":"))
+        os.replace(temp_path, path)
+    except Exception as exc:
+        system_error(f"Failed to write object info cache: {exc}")
+    finally:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
@@ -8,6 +8,7 @@ import uuid
 import zlib
 import shutil
 import random
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -26,6 +27,7 @@ from .paths import (
     _normalize_charon_root,
     resolve_comfy_environment,
 )
+from .shared_conversion_cache import load_shared_conversion, publish_shared_conversion
 from .workflow_runtime import convert_workflow as runtime_convert_workflow
 from .workflow_pipeline import validate_converted_workflow
 from .workflow_overrides import apply_validation_model_overrides
@@ -81,6 +83,8 @@ from .processor_output import (
     resolve_result_entries,
     run_auto_contact_sheet,
     resolve_local_output_candidate,
+    ingest_local_output,
+    is_local_comfy_url,
     sanitize_output_name,
     summarize_sequence_entries,
     write_result_manifest,
@@ -104,6 +108,8 @@ from .processor_read_nodes import (
     update_read_info,
     update_read_label,
 )
+from .processor_pipeline import run_pipelined_units
+from .upload_cache import get_upload_cache, upload_deduplicated
 from .processor_prompt_cache import PromptCacheRepository
 from .processor_recursion import handle_recursive_completion
 from .processor_trace import create_execution_trace
@@ -114,6 +120,7 @@ from .processor_status import (
 )
 from .processor_submission import build_batch_prompt, submit_prompt_or_raise
 from .comfy_client import ComfyUIClient
+from .comfy_events import PROMPT_ERROR, PROMPT_INTERRUPTED
 from .comfy_environment import resolve_comfy_runtime
 from . import config, preferences
 from .utilities import (
@@ -904,11 +911,18 @@ def _inject_png_text_chunk(image_path: str, key: str, text: str) -> None:
     if not inserted:
         rebuilt.extend(new_chunk)
 
+    # Replace rather than rewrite so outputs hardlinked from ComfyUI stay untouched.
+    temp_path = f'{image_path}.{uuid.uuid4().hex}.tmp'
     try:
-        with open(image_path, 'wb') as handle:
+        with open(temp_path, 'wb') as handle:
             handle.write(rebuilt)
+        os.replace(temp_path, image_path)
     except Exception as exc:
         log_debug(f'Failed to write PNG metadata: {exc}', 'WARNING')
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
 
 
 def embed_png_metadata(image_path: str, metadata: Dict[str, Any]) -> None:
@@ -2062,6 +2076,22 @@ def process_charonop_node(is_recursive_call=False, node_override=None):
             except Exception as exc:
                 log_debug(f"Could not fingerprint ComfyUI for conversion caching: {exc}", "WARNING")
 
+        local_output_fast_path = bool(
+            getattr(config, "COMFY_LOCAL_OUTPUT_FAST_PATH", True)
+            and comfy_output_root
+            and os.access(comfy_output_root, os.R_OK)
+            and is_local_comfy_url(comfy_client.base_url)
+        )
+        if comfy_output_root and not local_output_fast_path:
+            log_debug("ComfyUI output folder is not local to this host; fetching outputs over HTTP.")
+
+        upload_cache = None
+        if getattr(config, "COMFY_UPLOAD_DEDUP", True):
+            try:
+                upload_cache = get_upload_cache(comfy_client.base_url, conversion_cache_identity)
+            except Exception as exc:
+                log_debug(f"Upload deduplication unavailable: {exc}", "WARNING")
+
         result_file = allocate_result_manifest_path(temp_root)
 
         update_progress = status_controller.update
@@ -2131,22 +2161,47 @@ def process_charonop_node(is_recursive_call=False, node_override=None):
                             converted_prompt_path = None
 
                     if not cache_hit:
-                        trace_step("conversion_start")
-                        update_progress(0.1, 'Converting workflow')
-                        if not comfy_path:
-                            raise RuntimeError(
-                                'ComfyUI path is not configured. Open the Charon panel and set the launch path.'
-                            )
-                        try:
-                            converted_prompt = runtime_convert_workflow(workflow_data, comfy_path)
-                            trace_step("conversion_completed")
-                        except Exception as exc:
-                            trace_step("conversion_failed", error=str(exc))
-                            log_debug(f'Workflow conversion failed: {exc}', 'ERROR')
-                            raise
+                        shared_prompt = None
+                        shared_rejected = False
+                        if workflow_hash and conversion_cache_identity:
+                            try:
+                                shared_prompt = load_shared_conversion(workflow_hash, conversion_cache_identity)
+                                if shared_prompt is not None:
+                                    validate_converted_workflow(workflow_data, shared_prompt)
+                            except Exception as exc:
+                                log_debug(f'Ignoring shared conversion: {exc}', 'WARNING')
+                                shared_rejected = shared_prompt is not None
+                                shared_prompt = None
+
+                        if shared_prompt is not None:
+                            trace_step("conversion_shared_hit")
+                            update_progress(0.1, 'Using team conversion')
+                            converted_prompt = shared_prompt
+                        else:
+                            trace_step("conversion_start")
+                            update_progress(0.1, 'Converting workflow')
+                            if not comfy_path:
+                                raise RuntimeError(
+                                    'ComfyUI path is not configured. Open the Charon panel and set the launch path.'
+                                )
+                            try:
+                                converted_prompt = runtime_convert_workflow(workflow_data, comfy_path)
+                                trace_step("conversion_completed")
+                            except Exception as exc:
+                                trace_step("conversion_failed", error=str(exc))
+                                log_debug(f'Workflow conversion failed: {exc}', 'ERROR')
+                                raise
                         if not is_api_prompt(converted_prompt):
                             raise Exception('Converted workflow is invalid')
                         prompt_data = converted_prompt
+                        if shared_prompt is None and workflow_hash and conversion_cache_identity:
+                            # Published before model overrides touch prompt_data.
+                            publish_shared_conversion(
+                                workflow_hash,
+                                conversion_cache_identity,
+                                converted_prompt,
+                                replace=shared_rejected,
+                            )
 
                         try:
                             converted_prompt_path = write_converted_prompt_payload(
@@ -2172,7 +2227,7 @@ def process_charonop_node(is_recursive_call=False, node_override=None):
 
                         conversion_extra.update({
                             'converted_prompt_path': converted_prompt_path,
-                            'conversion_cached': False,
+                            'conversion_cached': shared_prompt is not None,
                         })
                         if workflow_hash and converted_prompt_path:
                             store_cached_prompt(converted_prompt_path, workflow_hash)
@@ -2257,6 +2312,7 @@ def process_charonop_node(is_recursive_call=False, node_override=None):
                 def _upload_and_assign(files_by_index, target_workflow, report_progress=True):
                     """Upload rendered inputs and wire their Comfy names into the prompt."""
                     uploaded_assets = {}
+                    reused_upload = False
                     upload_retries = max(1, int(getattr(config, "COMFY_UPLOAD_RETRIES", 3)))
                     upload_retry_delay = float(getattr(config, "COMFY_UPLOAD_RETRY_DELAY_SEC", 1.0))
                     for job in render_jobs:
@@ -2275,6 +2331,25 @@ def process_charonop_node(is_recursive_call=False, node_override=None):
                         )
                         uploaded_filename = None
                         last_upload_error = ""
+                        byte_progress = None
+                        if report_progress:
+                            uploaded_before = len(uploaded_assets)
+                            last_reported = {'fraction': 0.0}
+
+                            def _report_bytes(sent, total, uploaded_before=uploaded_before, last_reported=last_reported):
+                                fraction = (sent / total) if total else 1.0
+                                # Each callback marshals to Nuke's main thread; report in 5% steps.
+                                if fraction < 1.0 and fraction - last_reported['fraction'] < 0.05:
+                                    return
+                                last_reported['fraction'] = fraction
+                                progress = 0.2 + (0.2 * ((uploaded_before + fraction) / len(render_jobs)))
+                                update_progress(
+                                    progress,
+                                    f'Uploading {friendly_name} ({int(fraction * 100)}%)',
+                                )
+
+                            byte_progress = _report_bytes
+
                         for upload_attempt in range(upload_retries):
                             trace_step(
                                 "input_upload_attempt",
@@ -2283,7 +2358,18 @@ def process_charonop_node(is_recursive_call=False, node_override=None):
                                 total_attempts=upload_retries,
                             )
                             try:
-                                uploaded_filename = comfy_client.upload_image(temp_path)
+                                if upload_cache is not None:
+                                    uploaded_filename, reused_upload = upload_deduplicated(
+                                        comfy_client,
+                                        temp_path,
+                                        upload_cache,
+                                        progress_callback=byte_progress,
+                                    )
+                                else:
+                                    uploaded_filename = comfy_client.upload_image(
+                                        temp_path,
+                                        progress_callback=byte_progress,
+                                    )
                             except Exception as upload_exc:
                                 uploaded_filename = None
                                 last_upload_error = str(upload_exc)
@@ -2310,8 +2396,16 @@ def process_charonop_node(is_recursive_call=False, node_override=None):
                                 f"Last error: {last_upload_error or 'unknown'}"
                             )
                         uploaded_assets[idx] = uploaded_filename
-                        log_debug(f"Uploaded '{friendly_name}' as {uploaded_filename}")
-                        trace_step("input_uploaded", index=idx, uploaded_name=uploaded_filename)
+                        if reused_upload:
+                            log_debug(f"Reused '{friendly_name}' already on ComfyUI as {uploaded_filename}")
+                        else:
+                            log_debug(f"Uploaded '{friendly_name}' as {uploaded_filename}")
+                        trace_step(
+                            "input_uploaded",
+                            index=idx,
+                            uploaded_name=uploaded_filename,
+                            reused=reused_upload,
+                        )
                         if report_progress:
                             progress = 0.2 + (0.2 * (len(uploaded_assets) / len(render_jobs)))
                             update_progress(progress, f'Uploaded {len(uploaded_assets)}/{len(render_jobs)} images')
@@ -2376,13 +2470,34 @@ def process_charonop_node(is_recursive_call=False, node_override=None):
                     execution_units = [(index, None) for index in range(batch_count)]
                 per_batch_progress = 0.5 / max(1, len(execution_units))
                 sequence_version_registry: Dict[str, int] = {}
+                awaited_units = {'last_index': -1}
 
                 download_retries = int(getattr(config, "COMFY_DOWNLOAD_RETRIES", 4))
                 download_retry_delay = float(getattr(config, "COMFY_DOWNLOAD_RETRY_DELAY_SEC", 0.75))
                 download_min_bytes = int(getattr(config, "COMFY_DOWNLOAD_MIN_BYTES", 1))
                 download_hard_timeout = float(getattr(config, "COMFY_DOWNLOAD_HARD_TIMEOUT_SEC", 90.0))
 
-                for unit_index, (batch_index, unit_frame) in enumerate(execution_units):
+                event_stream = None
+                if getattr(config, "COMFY_USE_EVENT_STREAM", True) and hasattr(comfy_client, "events"):
+                    try:
+                        event_stream = comfy_client.events()
+                        event_stream.wait_connected(
+                            float(getattr(config, "COMFY_EVENT_CONNECT_WAIT_SEC", 2.0))
+                        )
+                    except Exception as exc:
+                        event_stream = None
+                        log_debug(f"ComfyUI event stream unavailable; polling instead: {exc}", "WARNING")
+                    trace_step(
+                        "event_stream_ready",
+                        connected=int(bool(event_stream is not None and event_stream.connected)),
+                    )
+                history_fallback_interval = float(
+                    getattr(config, "COMFY_EVENT_HISTORY_FALLBACK_SEC", 10.0)
+                )
+
+                def submit_unit(unit_index, execution_unit):
+                    """Upload per-frame inputs, then submit one execution unit to ComfyUI."""
+                    batch_index, unit_frame = execution_unit
                     trace_step(
                         "batch_started",
                         batch=unit_index + 1,
@@ -2432,11 +2547,15 @@ def process_charonop_node(is_recursive_call=False, node_override=None):
                             log_debug(f"Debug: Wrote prompt payload to {debug_file}")
                         except Exception as de:
                             log_debug(f"Debug: Failed to write payload file: {de}", "WARNING")
-                    
-                    update_progress(
-                        progress_for_batch(unit_index, 0.0, per_batch_progress),
-                        f'Submitting {batch_label.lower()}',
-                    )
+
+                    # Units submitted ahead of the one being awaited stay quiet so
+                    # the status line keeps following the executing prompt.
+                    report_submission = unit_index <= awaited_units['last_index'] + 1
+                    if report_submission:
+                        update_progress(
+                            progress_for_batch(unit_index, 0.0, per_batch_progress),
+                            f'Submitting {batch_label.lower()}',
+                        )
                     try:
                         prompt_id = submit_prompt_or_raise(
                             comfy_client,
@@ -2456,19 +2575,43 @@ def process_charonop_node(is_recursive_call=False, node_override=None):
                         pass
 
                     start_time = time.time()
+                    if event_stream is not None:
+                        event_stream.track(prompt_id, node_total=len(prompt_payload))
+                    if report_submission:
+                        update_progress(
+                            progress_for_batch(unit_index, 0.1, per_batch_progress),
+                            f'{batch_label}: queued on ComfyUI',
+                            extra={
+                                'prompt_id': prompt_id,
+                                'prompt_submitted_at': start_time,
+                                'batch_index': batch_index + 1,
+                                'batch_total': batch_count,
+                            },
+                        )
+                    return {
+                        'unit_index': unit_index,
+                        'batch_index': batch_index,
+                        'frame': unit_frame,
+                        'seed_offset': seed_offset,
+                        'batch_label': batch_label,
+                        'prompt_payload': prompt_payload,
+                        'prompt_payload_str': prompt_payload_str,
+                        'prompt_id': prompt_id,
+                        'start_time': start_time,
+                    }
+
+                def await_unit_artifacts(unit):
+                    """Block until the unit's prompt finishes and return its output artifacts."""
+                    unit_index = unit['unit_index']
+                    batch_index = unit['batch_index']
+                    batch_label = unit['batch_label']
+                    prompt_payload = unit['prompt_payload']
+                    prompt_id = unit['prompt_id']
+                    start_time = unit['start_time']
                     poll_iteration = 0
                     next_poll_trace_at = start_time
-                    update_progress(
-                        progress_for_batch(unit_index, 0.1, per_batch_progress),
-                        f'{batch_label}: queued on ComfyUI',
-                        extra={
-                            'prompt_id': prompt_id,
-                            'prompt_submitted_at': start_time,
-                            'batch_index': batch_index + 1,
-                            'batch_total': batch_count,
-                        },
-                    )
-
+                    next_history_check_at = start_time
+                    event_version = -1
                     while True:
                         poll_iteration += 1
                         now_poll = time.time()
@@ -2481,31 +2624,72 @@ def process_charonop_node(is_recursive_call=False, node_override=None):
                             )
                             next_poll_trace_at = now_poll + 5.0
                         status_str = None
+                        events_active = event_stream is not None and event_stream.connected
                         if hasattr(comfy_client, 'get_progress_for_prompt'):
-                            trace_step("batch_poll_progress_start", batch=batch_index + 1, iteration=poll_iteration)
-                            progress_val = comfy_client.get_progress_for_prompt(prompt_id)
-                            trace_step(
-                                "batch_poll_progress_done",
-                                batch=batch_index + 1,
-                                iteration=poll_iteration,
-                                progress=float(progress_val or 0.0),
-                            )
-                            if progress_val > 0:
-                                mapped_progress = progress_for_batch(
-                                    unit_index,
-                                    0.2 + (progress_val * 0.6),
-                                    per_batch_progress,
+                            if events_active:
+                                prompt_events = event_stream.wait(
+                                    prompt_id,
+                                    since_version=event_version,
+                                    timeout=min(1.0, history_fallback_interval),
                                 )
-                                update_progress(
-                                    mapped_progress,
-                                    f'{batch_label}: processing',
-                                    extra={
-                                        'prompt_id': prompt_id,
-                                        'batch_index': batch_index + 1,
-                                        'batch_total': batch_count,
-                                        'comfy_progress': float(progress_val),
-                                    },
+                                events_finished = False
+                                if prompt_events is not None:
+                                    event_version = prompt_events.version
+                                    events_finished = prompt_events.finished
+                                    if prompt_events.status in (PROMPT_ERROR, PROMPT_INTERRUPTED):
+                                        trace_step(
+                                            "batch_event_error",
+                                            batch=batch_index + 1,
+                                            error=prompt_events.error_message,
+                                        )
+                                        raise Exception(f'ComfyUI failed: {prompt_events.error_message}')
+                                    progress_val = prompt_events.progress
+                                    if progress_val > 0 and not events_finished:
+                                        update_progress(
+                                            progress_for_batch(
+                                                unit_index,
+                                                0.2 + (progress_val * 0.6),
+                                                per_batch_progress,
+                                            ),
+                                            f'{batch_label}: processing',
+                                            extra={
+                                                'prompt_id': prompt_id,
+                                                'batch_index': batch_index + 1,
+                                                'batch_total': batch_count,
+                                                'comfy_progress': float(progress_val),
+                                                'comfy_node': prompt_events.current_node or '',
+                                            },
+                                        )
+                                # History stays authoritative for outputs; between
+                                # events it is only re-read as a missed-event safety net.
+                                if not events_finished and time.time() < next_history_check_at:
+                                    continue
+                                next_history_check_at = time.time() + history_fallback_interval
+                            else:
+                                trace_step("batch_poll_progress_start", batch=batch_index + 1, iteration=poll_iteration)
+                                progress_val = comfy_client.get_progress_for_prompt(prompt_id)
+                                trace_step(
+                                    "batch_poll_progress_done",
+                                    batch=batch_index + 1,
+                                    iteration=poll_iteration,
+                                    progress=float(progress_val or 0.0),
                                 )
+                                if progress_val > 0:
+                                    mapped_progress = progress_for_batch(
+                                        unit_index,
+                                        0.2 + (progress_val * 0.6),
+                                        per_batch_progress,
+                                    )
+                                    update_progress(
+                                        mapped_progress,
+                                        f'{batch_label}: processing',
+                                        extra={
+                                            'prompt_id': prompt_id,
+                                            'batch_index': batch_index + 1,
+                                            'batch_total': batch_count,
+                                            'comfy_progress': float(progress_val),
+                                        },
+                                    )
 
                             trace_step("batch_poll_history_start", batch=batch_index + 1, iteration=poll_iteration)
                             history = comfy_client.get_history(prompt_id)
@@ -2527,391 +2711,524 @@ def process_charonop_node(is_recursive_call=False, node_override=None):
                                 if status_str == 'success':
                                     trace_step("batch_history_success", batch=batch_index + 1, prompt_id=prompt_id)
                                     outputs = history_data.get('outputs', {})
-                                    artifacts = (
-                                        collect_output_artifacts(
-                                            outputs,
-                                            base_prompt,
-                                            ignored_output=_is_ignored_output,
-                                            camera_extensions=CAMERA_OUTPUT_EXTENSIONS,
-                                            model_extensions=MODEL_OUTPUT_EXTENSIONS,
-                                        )
-                                        if outputs
-                                        else []
-                                    )
-                                    if not artifacts:
-                                        prefixes = []
-                                        for node_entry in prompt_payload.values():
-                                            if not isinstance(node_entry, dict):
-                                                continue
-                                            prefix_val = None
-                                            if (node_entry.get("class_type") or "").lower() == "saveimage":
-                                                prefix_val = node_entry.get("inputs", {}).get("filename_prefix")
-                                            if isinstance(prefix_val, str):
-                                                prefixes.append(prefix_val)
-                                        history_recovery_enabled = bool(
-                                            getattr(config, "COMFY_ENABLE_HISTORY_RECOVERY", False)
-                                        )
-                                        if history_recovery_enabled:
-                                            trace_step("history_recovery_start", batch=batch_index + 1)
-                                            recovery = recover_matching_history_artifacts(
-                                                comfy_client,
-                                                prompt_payload,
-                                                prompt_id,
-                                                ignored_output=_is_ignored_output,
-                                                camera_extensions=CAMERA_OUTPUT_EXTENSIONS,
-                                                model_extensions=MODEL_OUTPUT_EXTENSIONS,
-                                            )
-                                            artifacts = recovery.artifacts
-                                            if recovery.error:
-                                                log_debug(recovery.error, "WARNING")
-                                            elif recovery.prompt_id:
-                                                log_debug(
-                                                    "Reused cached ComfyUI outputs from prompt "
-                                                    f"{recovery.prompt_id}"
-                                                )
-                                            trace_step(
-                                                "history_recovery_done",
-                                                batch=batch_index + 1,
-                                                recovered=len(artifacts),
-                                            )
-                                        else:
-                                            trace_step("history_recovery_skipped", batch=batch_index + 1)
-                                        if not artifacts and prefixes:
-                                            grace = float(getattr(config, "COMFY_OUTPUT_SCAN_GRACE_SEC", 30))
-                                            scan_since = max(0.0, start_time - grace)
-                                            trace_step(
-                                                "output_dir_recovery_start",
-                                                batch=batch_index + 1,
-                                                prefixes=len(prefixes),
-                                                scan_since=f"{scan_since:.2f}",
-                                            )
-                                            artifacts = recover_artifacts_from_output_dir(
-                                                prefixes,
-                                                comfy_output_root,
-                                                scan_since,
-                                                scan_limit=int(
-                                                    getattr(config, "COMFY_OUTPUT_SCAN_LIMIT", 4000)
-                                                ),
-                                                image_extensions=IMAGE_OUTPUT_EXTENSIONS,
-                                                camera_extensions=CAMERA_OUTPUT_EXTENSIONS,
-                                                model_extensions=MODEL_OUTPUT_EXTENSIONS,
-                                            )
-                                            trace_step(
-                                                "output_dir_recovery_done",
-                                                batch=batch_index + 1,
-                                                recovered=len(artifacts),
-                                            )
-                                            if artifacts:
-                                                log_debug(
-                                                    f"Recovered {len(artifacts)} outputs from local ComfyUI output scan"
-                                                )
-                                        if not artifacts and prefixes and history_recovery_enabled:
-                                            trace_step("prefix_history_recovery_start", batch=batch_index + 1)
-                                            recovery = recover_prefixed_history_artifacts(
-                                                comfy_client,
-                                                prefixes,
-                                                ignored_output=_is_ignored_output,
-                                                camera_extensions=CAMERA_OUTPUT_EXTENSIONS,
-                                                model_extensions=MODEL_OUTPUT_EXTENSIONS,
-                                            )
-                                            artifacts = recovery.artifacts
-                                            if recovery.error:
-                                                log_debug(recovery.error, "WARNING")
-                                            elif recovery.prompt_id:
-                                                log_debug(
-                                                    "Reused cached ComfyUI outputs with prefix "
-                                                    "match from prompt "
-                                                    f"{recovery.prompt_id}"
-                                                )
-                                            trace_step(
-                                                "prefix_history_recovery_done",
-                                                batch=batch_index + 1,
-                                                recovered=len(artifacts),
-                                            )
-                                    if not artifacts:
-                                        trace_step("no_artifacts_after_recovery", batch=batch_index + 1)
-                                        raise Exception('ComfyUI did not return an output file')
+                                    break
+                                elif status_str == 'error':
+                                    error_msg = history_data.get('status', {}).get('status_message', 'Unknown error')
+                                    raise Exception(f'ComfyUI failed: {error_msg}')
+                                else:
+                                    status_str = None
+                        # With events, history lags the final event by a moment.
+                        time.sleep(0.1 if events_active else 1.0)
+                    artifacts = (
+                        collect_output_artifacts(
+                            outputs,
+                            base_prompt,
+                            ignored_output=_is_ignored_output,
+                            camera_extensions=CAMERA_OUTPUT_EXTENSIONS,
+                            model_extensions=MODEL_OUTPUT_EXTENSIONS,
+                        )
+                        if outputs
+                        else []
+                    )
+                    if not artifacts:
+                        prefixes = []
+                        for node_entry in prompt_payload.values():
+                            if not isinstance(node_entry, dict):
+                                continue
+                            prefix_val = None
+                            if (node_entry.get("class_type") or "").lower() == "saveimage":
+                                prefix_val = node_entry.get("inputs", {}).get("filename_prefix")
+                            if isinstance(prefix_val, str):
+                                prefixes.append(prefix_val)
+                        history_recovery_enabled = bool(
+                            getattr(config, "COMFY_ENABLE_HISTORY_RECOVERY", False)
+                        )
+                        if history_recovery_enabled:
+                            trace_step("history_recovery_start", batch=batch_index + 1)
+                            recovery = recover_matching_history_artifacts(
+                                comfy_client,
+                                prompt_payload,
+                                prompt_id,
+                                ignored_output=_is_ignored_output,
+                                camera_extensions=CAMERA_OUTPUT_EXTENSIONS,
+                                model_extensions=MODEL_OUTPUT_EXTENSIONS,
+                            )
+                            artifacts = recovery.artifacts
+                            if recovery.error:
+                                log_debug(recovery.error, "WARNING")
+                            elif recovery.prompt_id:
+                                log_debug(
+                                    "Reused cached ComfyUI outputs from prompt "
+                                    f"{recovery.prompt_id}"
+                                )
+                            trace_step(
+                                "history_recovery_done",
+                                batch=batch_index + 1,
+                                recovered=len(artifacts),
+                            )
+                        else:
+                            trace_step("history_recovery_skipped", batch=batch_index + 1)
+                        if not artifacts and prefixes:
+                            grace = float(getattr(config, "COMFY_OUTPUT_SCAN_GRACE_SEC", 30))
+                            scan_since = max(0.0, start_time - grace)
+                            trace_step(
+                                "output_dir_recovery_start",
+                                batch=batch_index + 1,
+                                prefixes=len(prefixes),
+                                scan_since=f"{scan_since:.2f}",
+                            )
+                            artifacts = recover_artifacts_from_output_dir(
+                                prefixes,
+                                comfy_output_root,
+                                scan_since,
+                                scan_limit=int(
+                                    getattr(config, "COMFY_OUTPUT_SCAN_LIMIT", 4000)
+                                ),
+                                image_extensions=IMAGE_OUTPUT_EXTENSIONS,
+                                camera_extensions=CAMERA_OUTPUT_EXTENSIONS,
+                                model_extensions=MODEL_OUTPUT_EXTENSIONS,
+                            )
+                            trace_step(
+                                "output_dir_recovery_done",
+                                batch=batch_index + 1,
+                                recovered=len(artifacts),
+                            )
+                            if artifacts:
+                                log_debug(
+                                    f"Recovered {len(artifacts)} outputs from local ComfyUI output scan"
+                                )
+                        if not artifacts and prefixes and history_recovery_enabled:
+                            trace_step("prefix_history_recovery_start", batch=batch_index + 1)
+                            recovery = recover_prefixed_history_artifacts(
+                                comfy_client,
+                                prefixes,
+                                ignored_output=_is_ignored_output,
+                                camera_extensions=CAMERA_OUTPUT_EXTENSIONS,
+                                model_extensions=MODEL_OUTPUT_EXTENSIONS,
+                            )
+                            artifacts = recovery.artifacts
+                            if recovery.error:
+                                log_debug(recovery.error, "WARNING")
+                            elif recovery.prompt_id:
+                                log_debug(
+                                    "Reused cached ComfyUI outputs with prefix "
+                                    "match from prompt "
+                                    f"{recovery.prompt_id}"
+                                )
+                            trace_step(
+                                "prefix_history_recovery_done",
+                                batch=batch_index + 1,
+                                recovered=len(artifacts),
+                            )
+                    if not artifacts:
+                        trace_step("no_artifacts_after_recovery", batch=batch_index + 1)
+                        raise Exception('ComfyUI did not return an output file')
+                    awaited_units['last_index'] = unit_index
+                    return artifacts
+
+                def report_download_bytes(unit, tracker, artifact_index, received, total):
+                    """Advance the unit's download progress as artifact bytes arrive."""
+                    if not total:
+                        return
+                    fraction = min(1.0, received / total)
+                    with tracker['lock']:
+                        fractions = tracker['fractions']
+                        # Each update marshals to Nuke's main thread; report in 5% steps.
+                        if fraction < 1.0 and fraction - fractions[artifact_index] < 0.05:
+                            return
+                        fractions[artifact_index] = fraction
+                        overall = sum(fractions) / len(fractions)
+                        finished = sum(1 for value in fractions if value >= 1.0)
+                    update_progress(
+                        progress_for_batch(
+                            unit['unit_index'],
+                            0.8 + (0.2 * overall),
+                            per_batch_progress,
+                        ),
+                        f"{unit['batch_label']}: downloading results "
+                        f"({finished}/{len(fractions)}) {int(overall * 100)}%",
+                        extra={
+                            'prompt_id': unit['prompt_id'],
+                            'batch_index': unit['batch_index'] + 1,
+                            'batch_total': batch_count,
+                        },
+                    )
 
-                                    for artifact_index, artifact in enumerate(artifacts):
-                                        trace_step(
-                                            "artifact_download_start",
-                                            batch=batch_index + 1,
-                                            artifact_index=artifact_index + 1,
-                                            artifact_total=len(artifacts),
-                                            filename=artifact.get("filename", ""),
-                                        )
-                                        artifact_progress = 0.8 + (0.2 * ((artifact_index + 1) / len(artifacts)))
-                                        update_progress(
-                                            progress_for_batch(
-                                                unit_index,
-                                                artifact_progress,
-                                                per_batch_progress,
-                                            ),
-                                            f'{batch_label}: downloading result ({artifact_index + 1}/{len(artifacts)})',
-                                            extra={
-                                                'prompt_id': prompt_id,
-                                                'batch_index': batch_index + 1,
-                                                'batch_total': batch_count,
-                                            },
-                                        )
-                                        raw_extension = artifact.get("extension") or ""
-                                        if not raw_extension:
-                                            raw_extension = os.path.splitext(artifact.get("filename") or "")[1] or ".png"
-                                        raw_extension_lower = raw_extension.lower()
-                                        category = (
-                                            "3D" if raw_extension_lower in THREE_D_OUTPUT_EXTENSIONS else "2D"
-                                        )
-                                        output_label = (
-                                            artifact.get("comfy_node_class")
-                                            or artifact.get("class_type")
-                                            or "Output"
+                def allocate_artifact_output(unit, artifact):
+                    """Reserve the versioned output path for one artifact."""
+                    unit_frame = unit['frame']
+                    raw_extension = artifact.get("extension") or ""
+                    if not raw_extension:
+                        raw_extension = os.path.splitext(artifact.get("filename") or "")[1] or ".png"
+                    raw_extension_lower = raw_extension.lower()
+                    category = (
+                        "3D" if raw_extension_lower in THREE_D_OUTPUT_EXTENSIONS else "2D"
+                    )
+                    output_label = (
+                        artifact.get("comfy_node_class")
+                        or artifact.get("class_type")
+                        or "Output"
+                    )
+                    if (raw_extension_lower in CAMERA_OUTPUT_EXTENSIONS) or (
+                        artifact.get("kind") == "camera"
+                    ):
+                        output_label = CAMERA_OUTPUT_LABEL
+                    output_node_name = output_label
+                    if artifact.get("node_id"):
+                        output_node_name = f"{output_label}_{artifact.get('node_id')}"
+                    # Runs on the submitting thread in unit order; the first allocation
+                    # pins the sequence version for every later frame.
+                    if custom_output_root:
+                        allocated_output_path = allocate_custom_output_path(
+                            custom_output_root,
+                            raw_extension_lower,
+                            output_node_name,
+                            output_subfolder=recursive_output_subfolder,
+                            frame=unit_frame,
+                            version_registry=sequence_version_registry,
+                        )
+                    else:
+                        allocated_output_path = allocate_charon_output_path(
+                            charon_node_id,
+                            nuke_script_name,
+                            raw_extension_lower,
+                            user_slug,
+                            workflow_display_name,
+                            category,
+                            output_node_name,
+                            output_subfolder=recursive_output_subfolder,
+                            frame=unit_frame,
+                            version_registry=sequence_version_registry,
+                        )
+                    return allocated_output_path, raw_extension_lower, category
+
+                def ingest_artifact(unit, artifact_index, artifact, target, tracker):
+                    """Fetch one artifact into its reserved path and post-process it."""
+                    batch_index = unit['batch_index']
+                    unit_frame = unit['frame']
+                    seed_offset = unit['seed_offset']
+                    prompt_id = unit['prompt_id']
+                    start_time = unit['start_time']
+                    prompt_payload_str = unit['prompt_payload_str']
+                    allocated_output_path, raw_extension_lower, category = target
+                    trace_step(
+                        "artifact_download_start",
+                        batch=batch_index + 1,
+                        artifact_index=artifact_index + 1,
+                        artifact_total=len(tracker['fractions']),
+                        filename=artifact.get("filename", ""),
+                    )
+                    log_debug(f'Resolved output path: {allocated_output_path}')
+                    source_filename = artifact.get("filename")
+                    source_is_abs = isinstance(source_filename, str) and os.path.isabs(source_filename)
+                    source_exists = source_is_abs and os.path.exists(source_filename)
+                    download_name, download_subfolder = normalize_download_target(
+                        source_filename, artifact.get("subfolder", "")
+                    )
+                    if source_is_abs and download_name:
+                        download_name = os.path.basename(download_name)
+                    success = False
+                    if source_exists:
+                        ingest_method = ingest_local_output(source_filename, allocated_output_path)
+                        success = bool(ingest_method)
+                        if success:
+                            log_debug(
+                                f'Ingested absolute output {source_filename} -> {allocated_output_path} '
+                                f'({ingest_method})'
+                            )
+                        else:
+                            log_debug(f'Failed to ingest absolute output {source_filename}', 'WARNING')
+                    else:
+                        local_candidate = resolve_local_output_candidate(
+                            comfy_output_root,
+                            download_name,
+                            download_subfolder,
+                        )
+                        ingest_method = ""
+                        if local_output_fast_path and local_candidate:
+                            # Outputs older than the prompt are stale files with the same name.
+                            ingest_method = ingest_local_output(
+                                local_candidate,
+                                allocated_output_path,
+                                produced_after=start_time,
+                            )
+                        if ingest_method:
+                            success = True
+                            log_debug(
+                                f'Ingested local output {local_candidate} -> {allocated_output_path} '
+                                f'({ingest_method})'
+                            )
+                            trace_step(
+                                "artifact_ingested_locally",
+                                batch=batch_index + 1,
+                                method=ingest_method,
+                            )
+                        else:
+                            if download_name:
+                                download_result = download_with_timeout(
+                                    comfy_client,
+                                    filename=download_name,
+                                    destination_path=allocated_output_path,
+                                    subfolder=download_subfolder,
+                                    file_type=artifact.get("type", "output"),
+                                    retries=download_retries,
+                                    retry_delay=download_retry_delay,
+                                    min_bytes=download_min_bytes,
+                                    hard_timeout=download_hard_timeout,
+                                    progress_callback=partial(
+                                        report_download_bytes,
+                                        unit,
+                                        tracker,
+                                        artifact_index,
+                                    ),
+                                )
+                                success = download_result.success
+                                if download_result.error:
+                                    log_debug(
+                                        "Comfy download raised: "
+                                        f"{download_result.error}",
+                                        "WARNING",
+                                    )
+                                if download_result.timed_out:
+                                    log_debug(
+                                        "Comfy download timed out after "
+                                        f"{download_hard_timeout:.1f}s for "
+                                        f"{download_name}; falling back to "
+                                        "local output recovery.",
+                                        "WARNING",
+                                    )
+                            if not success and download_name:
+                                recovered_local = find_output_by_basename(
+                                    comfy_output_root,
+                                    download_name,
+                                    start_time,
+                                    scan_limit=int(
+                                        getattr(
+                                            config,
+                                            "COMFY_OUTPUT_BASENAME_SCAN_LIMIT",
+                                            4000,
                                         )
-                                        if (raw_extension_lower in CAMERA_OUTPUT_EXTENSIONS) or (
-                                            artifact.get("kind") == "camera"
-                                        ):
-                                            output_label = CAMERA_OUTPUT_LABEL
-                                        output_node_name = output_label
-                                        if artifact.get("node_id"):
-                                            output_node_name = f"{output_label}_{artifact.get('node_id')}"
-                                        if custom_output_root:
-                                            allocated_output_path = allocate_custom_output_path(
-                                                custom_output_root,
-                                                raw_extension_lower,
-                                                output_node_name,
-                                                output_subfolder=recursive_output_subfolder,
-                                                frame=unit_frame,
-                                                version_registry=sequence_version_registry,
-                                            )
-                                        else:
-                                            allocated_output_path = allocate_charon_output_path(
-                                                charon_node_id,
-                                                nuke_script_name,
-                                                raw_extension_lower,
-                                                user_slug,
-                                                workflow_display_name,
-                                                category,
-                                                output_node_name,
-                                                output_subfolder=recursive_output_subfolder,
-                                                frame=unit_frame,
-                                                version_registry=sequence_version_registry,
-                                            )
-                                        log_debug(f'Resolved output path: {allocated_output_path}')
-                                        source_filename = artifact.get("filename")
-                                        source_is_abs = isinstance(source_filename, str) and os.path.isabs(source_filename)
-                                        source_exists = source_is_abs and os.path.exists(source_filename)
-                                        download_name, download_subfolder = normalize_download_target(
-                                            source_filename, artifact.get("subfolder", "")
+                                    ),
+                                )
+                                if recovered_local and os.path.exists(recovered_local):
+                                    try:
+                                        os.makedirs(
+                                            os.path.dirname(allocated_output_path),
+                                            exist_ok=True,
                                         )
-                                        if source_is_abs and download_name:
-                                            download_name = os.path.basename(download_name)
-                                        success = False
-                                        if source_exists:
-                                            try:
-                                                os.makedirs(os.path.dirname(allocated_output_path), exist_ok=True)
-                                                shutil.copyfile(source_filename, allocated_output_path)
-                                                success = True
-                                                log_debug(f'Copied absolute output {source_filename} -> {allocated_output_path}')
-                                            except Exception as copy_error:
-                                                log_debug(
-                                                    f'Failed to copy absolute output {source_filename}: {copy_error}',
-                                                    'WARNING',
-                                                )
-                                                success = False
-                                        else:
-                                            local_candidate = resolve_local_output_candidate(
-                                                comfy_output_root,
-                                                download_name,
-                                                download_subfolder,
-                                            )
-                                            if local_candidate and os.path.exists(local_candidate):
-                                                try:
-                                                    os.makedirs(os.path.dirname(allocated_output_path), exist_ok=True)
-                                                    shutil.copyfile(local_candidate, allocated_output_path)
-                                                    success = True
-                                                    log_debug(
-                                                        f'Copied local output {local_candidate} -> {allocated_output_path}'
-                                                    )
-                                                except Exception as copy_error:
-                                                    log_debug(
-                                                        f'Failed to copy local output {local_candidate}: {copy_error}',
-                                                        'WARNING',
-                                                    )
-                                                    success = False
-                                            else:
-                                                if download_name:
-                                                    download_result = download_with_timeout(
-                                                        comfy_client,
-                                                        filename=download_name,
-                                                        destination_path=allocated_output_path,
-                                                        subfolder=download_subfolder,
-                                                        file_type=artifact.get("type", "output"),
-                                                        retries=download_retries,
-                                                        retry_delay=download_retry_delay,
-                                                        min_bytes=download_min_bytes,
-                                                        hard_timeout=download_hard_timeout,
-                                                    )
-                                                    success = download_result.success
-                                                    if download_result.error:
-                                                        log_debug(
-                                                            "Comfy download raised: "
-                                                            f"{download_result.error}",
-                                                            "WARNING",
-                                                        )
-                                                    if download_result.timed_out:
-                                                        log_debug(
-                                                            "Comfy download timed out after "
-                                                            f"{download_hard_timeout:.1f}s for "
-                                                            f"{download_name}; falling back to "
-                                                            "local output recovery.",
-                                                            "WARNING",
-                                                        )
-                                                if not success and download_name:
-                                                    recovered_local = find_output_by_basename(
-                                                        comfy_output_root,
-                                                        download_name,
-                                                        start_time,
-                                                        scan_limit=int(
-                                                            getattr(
-                                                                config,
-                                                                "COMFY_OUTPUT_BASENAME_SCAN_LIMIT",
-                                                                4000,
-                                                            )
-                                                        ),
-                                                    )
-                                                    if recovered_local and os.path.exists(recovered_local):
-                                                        try:
-                                                            os.makedirs(
-                                                                os.path.dirname(allocated_output_path),
-                                                                exist_ok=True,
-                                                            )
-                                                            shutil.copyfile(recovered_local, allocated_output_path)
-                                                            success = True
-                                                            log_debug(
-                                                                f"Recovered output by basename {recovered_local} -> "
-                                                                f"{allocated_output_path}"
-                                                            )
-                                                        except Exception as copy_error:
-                                                            log_debug(
-                                                                f"Failed recovered basename copy {recovered_local}: "
-                                                                f"{copy_error}",
-                                                                "WARNING",
-                                                            )
-                                                if not success and local_candidate and os.path.exists(local_candidate):
-                                                    try:
-                                                        os.makedirs(
-                                                            os.path.dirname(allocated_output_path),
-                                                            exist_ok=True,
-                                                        )
-                                                        shutil.copyfile(local_candidate, allocated_output_path)
-                                                        success = True
-                                                        log_debug(
-                                                            f'Copied local output {local_candidate} -> {allocated_output_path}'
-                                                        )
-                                                    except Exception as copy_error:
-                                                        log_debug(
-                                                            f'Failed to copy local output {local_candidate}: {copy_error}',
-                                                            'WARNING',
-                                                        )
-                                                        success = False
-                                        if not success:
-                                            trace_step(
-                                                "artifact_download_failed",
-                                                batch=batch_index + 1,
-                                                filename=artifact.get("filename", ""),
-                                            )
-                                            raise Exception('Failed to download result file from ComfyUI')
-
-                                        final_output_path = allocated_output_path
-                                        converted_from = None
-                                        if raw_extension_lower == ".glb":
-                                            obj_target = os.path.splitext(allocated_output_path)[0] + ".obj"
-                                            log_debug(f'Converting GLB to OBJ: {allocated_output_path} -> {obj_target}')
-                                            final_output_path = _convert_glb_to_obj(allocated_output_path, obj_target)
-                                            trace_step(
-                                                "glb_converted",
-                                                batch=batch_index + 1,
-                                                source=allocated_output_path.replace("\\", "/"),
-                                                target=final_output_path.replace("\\", "/"),
-                                            )
-                                            converted_from = allocated_output_path
-
-                                        elapsed = time.time() - start_time
-                                        normalized_output_path = final_output_path.replace('\\', '/')
-                                        if _is_ignored_output(final_output_path):
-                                            log_debug(f'Skipping ignored output: {final_output_path}')
-                                            continue
-                                        if category == "2D":
-                                            metadata_payload = {
-                                                'charon_node_id': charon_node_id,
-                                                'prompt_id': prompt_id,
-                                                'run_id': current_run_id,
-                                                'script_name': nuke_script_name,
-                                                'user': user_slug,
-                                                'workflow_path': workflow_path or '',
-                                                'timestamp': time.time(),
-                                                'batch_index': batch_index + 1,
-                                                'batch_total': batch_count,
-                                                'frame': unit_frame,
-                                                'seed_offset': seed_offset,
-                                            }
-                                            embed_png_metadata(normalized_output_path, metadata_payload)
-                                            if prompt_payload_str:
-                                                embed_png_prompt(normalized_output_path, prompt_payload_str)
-                                        batch_entry = {
-                                            'batch_index': batch_index + 1,
-                                            'batch_total': batch_count,
-                                            'frame': unit_frame,
-                                            'prompt_id': prompt_id,
-                                            'output_path': normalized_output_path,
-                                            'elapsed_time': elapsed,
-                                            'output_kind': category,
-                                            'original_filename': artifact.get("filename"),
-                                            'download_path': allocated_output_path.replace('\\', '/'),
-                                            'comfy_node_id': artifact.get("node_id"),
-                                            'comfy_node_class': artifact.get("class_type"),
-                                            'comfy_output_kind': artifact.get("kind"),
-                                        }
-                                        if converted_from:
-                                            batch_entry['converted_from'] = converted_from.replace('\\', '/')
-                                        if _is_ignored_output(batch_entry.get('original_filename')):
-                                            log_debug(f"Skipped recording ignored output: {batch_entry['original_filename']}")
-                                            continue
-                                        batch_outputs.append(batch_entry)
-                                        trace_step(
-                                            "artifact_recorded",
-                                            batch=batch_index + 1,
-                                            output_path=normalized_output_path,
-                                            output_kind=category,
+                                        shutil.copyfile(recovered_local, allocated_output_path)
+                                        success = True
+                                        log_debug(
+                                            f"Recovered output by basename {recovered_local} -> "
+                                            f"{allocated_output_path}"
                                         )
-
-                                    if batch_outputs:
-                                        last_entry = batch_outputs[-1]
-                                        extra_payload = {
-                                            'output_path': last_entry.get('output_path'),
-                                            'elapsed_time': last_entry.get('elapsed_time'),
-                                            'prompt_id': prompt_id,
-                                            'batch_index': batch_index + 1,
-                                            'batch_total': batch_count,
-                                            'batch_outputs': batch_outputs.copy(),
-                                            'output_kind': last_entry.get('output_kind'),
-                                        }
-                                        update_progress(
-                                            progress_for_batch(
-                                                unit_index,
-                                                1.0,
-                                                per_batch_progress,
-                                            ),
-                                            f'{batch_label}: completed',
-                                            extra=extra_payload,
+                                    except Exception as copy_error:
+                                        log_debug(
+                                            f"Failed recovered basename copy {recovered_local}: "
+                                            f"{copy_error}",
+                                            "WARNING",
                                         )
-                                        trace_step("batch_completed", batch=batch_index + 1, outputs=len(batch_outputs))
-                                    break
-                            elif status_str == 'error':
-                                error_msg = history_data.get('status', {}).get('status_message', 'Unknown error')
-                                raise Exception(f'ComfyUI failed: {error_msg}')
-                            else:
-                                status_str = None
-                        time.sleep(1.0)
+                            if not success and local_candidate and os.path.exists(local_candidate):
+                                try:
+                                    os.makedirs(
+                                        os.path.dirname(allocated_output_path),
+                                        exist_ok=True,
+                                    )
+                                    shutil.copyfile(local_candidate, allocated_output_path)
+                                    success = True
+                                    log_debug(
+                                        f'Copied local output {local_candidate} -> {allocated_output_path}'
+                                    )
+                                except Exception as copy_error:
+                                    log_debug(
+                                        f'Failed to copy local output {local_candidate}: {copy_error}',
+                                        'WARNING',
+                                    )
+                                    success = False
+                    if not success:
+                        trace_step(
+                            "artifact_download_failed",
+                            batch=batch_index + 1,
+                            filename=artifact.get("filename", ""),
+                        )
+                        raise Exception('Failed to download result file from ComfyUI')
+                    report_download_bytes(unit, tracker, artifact_index, 1, 1)
+
+                    final_output_path = allocated_output_path
+                    converted_from = None
+                    if raw_extension_lower == ".glb":
+                        obj_target = os.path.splitext(allocated_output_path)[0] + ".obj"
+                        log_debug(f'Converting GLB to OBJ: {allocated_output_path} -> {obj_target}')
+                        final_output_path = _convert_glb_to_obj(allocated_output_path, obj_target)
+                        trace_step(
+                            "glb_converted",
+                            batch=batch_index + 1,
+                            source=allocated_output_path.replace("\\", "/"),
+                            target=final_output_path.replace("\\", "/"),
+                        )
+                        converted_from = allocated_output_path
+
+                    elapsed = time.time() - start_time
+                    normalized_output_path = final_output_path.replace('\\', '/')
+                    if _is_ignored_output(final_output_path):
+                        log_debug(f'Skipping ignored output: {final_output_path}')
+                        return None
+                    if category == "2D":
+                        metadata_payload = {
+                            'charon_node_id': charon_node_id,
+                            'prompt_id': prompt_id,
+                            'run_id': current_run_id,
+                            'script_name': nuke_script_name,
+                            'user': user_slug,
+                            'workflow_path': workflow_path or '',
+                            'timestamp': time.time(),
+                            'batch_index': batch_index + 1,
+                            'batch_total': batch_count,
+                            'frame': unit_frame,
+                            'seed_offset': seed_offset,
+                        }
+                        embed_png_metadata(normalized_output_path, metadata_payload)
+                        if prompt_payload_str:
+                            embed_png_prompt(normalized_output_path, prompt_payload_str)
+                    batch_entry = {
+                        'batch_index': batch_index + 1,
+                        'batch_total': batch_count,
+                        'frame': unit_frame,
+                        'prompt_id': prompt_id,
+                        'output_path': normalized_output_path,
+                        'elapsed_time': elapsed,
+                        'output_kind': category,
+                        'original_filename': artifact.get("filename"),
+                        'download_path': allocated_output_path.replace('\\', '/'),
+                        'comfy_node_id': artifact.get("node_id"),
+                        'comfy_node_class': artifact.get("class_type"),
+                        'comfy_output_kind': artifact.get("kind"),
+                    }
+                    if converted_from:
+                        batch_entry['converted_from'] = converted_from.replace('\\', '/')
+                    if _is_ignored_output(batch_entry.get('original_filename')):
+                        log_debug(f"Skipped recording ignored output: {batch_entry['original_filename']}")
+                        return None
+                    trace_step(
+                        "artifact_recorded",
+                        batch=batch_index + 1,
+                        output_path=normalized_output_path,
+                        output_kind=category,
+                    )
+                    return batch_entry
+
+                def await_unit_outputs(unit):
+                    """Wait for one unit, then reserve its output paths.
+
+                    Units are awaited one at a time in unit order, so reserving
+                    here keeps output versions in batch order even though the
+                    ingest workers finish in any order.
+                    """
+                    artifacts = await_unit_artifacts(unit) or []
+                    return [(artifact, allocate_artifact_output(unit, artifact)) for artifact in artifacts]
+
+                def ingest_unit_artifacts(unit, reserved):
+                    """Download and post-process one unit's reserved artifacts into batch entries."""
+                    if not reserved:
+                        return []
+                    artifacts = [artifact for artifact, _target in reserved]
+                    targets = [target for _artifact, target in reserved]
+                    update_progress(
+                        progress_for_batch(unit['unit_index'], 0.8, per_batch_progress),
+                        f"{unit['batch_label']}: downloading results (0/{len(artifacts)})",
+                        extra={
+                            'prompt_id': unit['prompt_id'],
+                            'batch_index': unit['batch_index'] + 1,
+                            'batch_total': batch_count,
+                        },
+                    )
+                    tracker = {'lock': threading.Lock(), 'fractions': [0.0] * len(artifacts)}
+                    workers = min(
+                        len(artifacts),
+                        max(1, int(getattr(config, "COMFY_ARTIFACT_DOWNLOAD_WORKERS", 4))),
+                    )
+                    if workers <= 1:
+                        results = [
+                            ingest_artifact(unit, artifact_index, artifact, targets[artifact_index], tracker)
+                            for artifact_index, artifact in enumerate(artifacts)
+                        ]
+                    else:
+                        with ThreadPoolExecutor(
+                            max_workers=workers,
+                            thread_name_prefix="charon-artifact",
+                        ) as executor:
+                            futures = [
+                                executor.submit(
+                                    ingest_artifact,
+                                    unit,
+                                    artifact_index,
+                                    artifact,
+                                    targets[artifact_index],
+                                    tracker,
+                                )
+                                for artifact_index, artifact in enumerate(artifacts)
+                            ]
+                            try:
+                                results = [future.result() for future in futures]
+                            except BaseException:
+                                for future in futures:
+                                    future.cancel()
+                                raise
+                    return [entry for entry in results if entry is not None]
+
+                def commit_unit(unit, unit_entries):
+                    """Record a finished unit's entries in execution order."""
+                    unit_index = unit['unit_index']
+                    batch_index = unit['batch_index']
+                    batch_label = unit['batch_label']
+                    prompt_id = unit['prompt_id']
+                    batch_outputs.extend(unit_entries)
+                    if batch_outputs:
+                        last_entry = batch_outputs[-1]
+                        extra_payload = {
+                            'output_path': last_entry.get('output_path'),
+                            'elapsed_time': last_entry.get('elapsed_time'),
+                            'prompt_id': prompt_id,
+                            'batch_index': batch_index + 1,
+                            'batch_total': batch_count,
+                            'batch_outputs': batch_outputs.copy(),
+                            'output_kind': last_entry.get('output_kind'),
+                        }
+                        update_progress(
+                            progress_for_batch(
+                                unit_index,
+                                1.0,
+                                per_batch_progress,
+                            ),
+                            f'{batch_label}: completed',
+                            extra=extra_payload,
+                        )
+                        trace_step("batch_completed", batch=batch_index + 1, outputs=len(batch_outputs))
+
+                def withdraw_units(units):
+                    """Remove prompts that were queued ahead of a failed unit."""
+                    prompt_ids = [unit['prompt_id'] for unit in units if unit.get('prompt_id')]
+                    if prompt_ids and hasattr(comfy_client, 'delete_queued_prompts'):
+                        comfy_client.delete_queued_prompts(prompt_ids)
+                        trace_step("pipeline_withdrawn", prompts=len(prompt_ids))
+
+                pipeline_window = max(0, int(getattr(config, "COMFY_PIPELINE_WINDOW", 2)))
+                if pipeline_window and len(execution_units) > 1:
+                    trace_step("pipeline_started", window=pipeline_window, units=len(execution_units))
+                    run_pipelined_units(
+                        execution_units,
+                        submit=submit_unit,
+                        wait=await_unit_outputs,
+                        ingest=ingest_unit_artifacts,
+                        commit=commit_unit,
+                        window=pipeline_window,
+                        ingest_workers=int(getattr(config, "COMFY_PIPELINE_INGEST_WORKERS", 2)),
+                        abandon=withdraw_units,
+                    )
+                else:
+                    for unit_index, execution_unit in enumerate(execution_units):
+                        unit = submit_unit(unit_index, execution_unit)
+                        commit_unit(unit, ingest_unit_artifacts(unit, await_unit_outputs(unit)))
                 if not batch_outputs:
                     trace_step("no_outputs_generated")
                     raise Exception('No outputs were generated by ComfyUI')
@@ -113,7 +113,12 @@ def write_converted_prompt_payload(
 ) -> str:
     """Persist a converted prompt to the conversion cache or debug fallback."""
     if workflow_hash and workflow_cache_folder and cache_identity:
-        target_path = desired_prompt_path(workflow_cache_folder, workflow_path or "", workflow_hash)
+        target_path = desired_prompt_path(
+            workflow_cache_folder,
+            workflow_path or "",
+            workflow_hash,
+            cache_identity,
+        )
         target_path.parent.mkdir(parents=True, exist_ok=True)
         with open(target_path, "w", encoding="utf-8") as handle:
             json.dump(converted_prompt, handle, indent=2)
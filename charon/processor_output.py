@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+import ipaddress
 import json
 import os
 import re
+import shutil
+import socket
+import stat
 import time
 import uuid
+import urllib.parse
 from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
+try:
+    import fcntl
+except ImportError:  # Windows; reflink is left out of the ingest methods.
+    fcntl = None
+
 
 _FRAME_SUFFIX_PATTERN = re.compile(r"\.(\d{4,})(\.[A-Za-z0-9]+)$")
 
@@ -167,6 +177,96 @@ def resolve_local_output_candidate(output_root: str, filename: str, subfolder: s
     return os.path.normpath(os.path.join(*parts))
 
 
+# Tolerance between ComfyUI's file mtime and Charon's submit clock.
+LOCAL_OUTPUT_MTIME_SLACK_SEC = 2.0
+_FICLONE = 0x40049409
+_HAS_FICLONE = hasattr(fcntl, "ioctl")
+
+
+def is_local_comfy_url(base_url: str) -> bool:
+    """Return whether ``base_url`` points at a ComfyUI server on this machine."""
+    host = (urllib.parse.urlsplit(base_url or "").hostname or "").lower()
+    if not host:
+        return False
+    if host == "localhost":
+        return True
+    try:
+        if ipaddress.ip_address(host).is_loopback:
+            return True
+    except ValueError:
+        pass
+    try:
+        local_name = socket.gethostname().lower()
+        if host in {local_name, socket.getfqdn().lower()}:
+            return True
+        local_addresses = set(socket.gethostbyname_ex(local_name)[2])
+        return bool(local_addresses & set(socket.gethostbyname_ex(host)[2]))
+    except OSError:
+        return False
+
+
+def _reflink(source: str, destination: str) -> None:
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+
+
+# Cheapest first; reflink is only offered where the FICLONE ioctl exists.
+_INGEST_METHODS: List[Tuple[str, Callable[[str, str], Any]]] = [("hardlink", os.link)]
+if _HAS_FICLONE:
+    _INGEST_METHODS.append(("reflink", _reflink))
+_INGEST_METHODS.append(("copy", shutil.copyfile))
+
+
+def ingest_local_output(
+    source: str,
+    destination: str,
+    *,
+    produced_after: Optional[float] = None,
+) -> str:
+    """Place a ComfyUI output at ``destination`` without going through HTTP.
+
+    Tries a hardlink, then a copy-on-write clone, then a plain copy, and
+    publishes the result with an atomic replace. Returns the method used, or
+    an empty string when the source is missing, predates ``produced_after``,
+    or changed while it was being ingested.
+    """
+    try:
+        before = os.stat(source)
+    except OSError:
+        return ""
+    if not stat.S_ISREG(before.st_mode) or before.st_size <= 0:
+        return ""
+    if produced_after is not None and before.st_mtime < produced_after - LOCAL_OUTPUT_MTIME_SLACK_SEC:
+        return ""
+    parent = os.path.dirname(os.path.abspath(destination))
+    os.makedirs(parent, exist_ok=True)
+    temp_path = f"{destination}.{uuid.uuid4().hex}.tmp"
+    try:
+        for method, operation in _INGEST_METHODS:
+            try:
+                operation(source, temp_path)
+            except OSError:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                continue
+            after = os.stat(source)
+            if (after.st_size, after.st_mtime_ns) != (before.st_size, before.st_mtime_ns):
+                return ""
+            if os.path.getsize(temp_path) != before.st_size:
+                return ""
+            os.replace(temp_path, destination)
+            return method
+        return ""
+    except OSError:
+        return ""
+    finally:
+        if os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+
 def summarize_sequence_entries(entries: Iterable[Any]) -> Optional[Dict[str, Any]]:
     """Return frame-sequence info for a group of output entries, or ``None``.
 
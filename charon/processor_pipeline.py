@@ -0,0 +1,69 @@
+"""Overlap submission, execution, and ingestion of processor execution units."""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, List, Optional, Sequence, Tuple
+
+
+def run_pipelined_units(
+    units: Sequence[Any],
+    *,
+    submit: Callable[[int, Any], Any],
+    wait: Callable[[Any], Any],
+    ingest: Callable[[Any, Any], Any],
+    commit: Callable[[Any, Any], None],
+    window: int,
+    ingest_workers: int,
+    abandon: Optional[Callable[[List[Any]], None]] = None,
+) -> None:
+    """Run execution units with up to ``window`` prompts queued ahead of the active one.
+
+    ``submit`` runs on the calling thread in unit order and returns the unit's
+    submission state. ``wait`` blocks until that prompt finishes on ComfyUI;
+    units are awaited in submission order because ComfyUI executes its queue
+    FIFO. ``ingest`` runs on a bounded worker pool so downloads of finished
+    units overlap execution of later ones, and ``commit`` receives ingest
+    results strictly in unit order on the calling thread.
+
+    On failure, ``abandon`` receives the states of submitted units that were
+    not yet awaited so their queued prompts can be withdrawn.
+    """
+    ahead = max(0, int(window))
+    submitted: Deque[Any] = deque()
+    ingesting: Deque[Tuple[Any, Any]] = deque()
+    next_index = 0
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, int(ingest_workers)),
+        thread_name_prefix="charon-ingest",
+    )
+
+    def commit_ready(block: bool) -> None:
+        while ingesting and (block or ingesting[0][1].done()):
+            state, future = ingesting.popleft()
+            commit(state, future.result())
+
+    try:
+        while True:
+            while next_index < len(units) and len(submitted) <= ahead:
+                submitted.append(submit(next_index, units[next_index]))
+                next_index += 1
+            commit_ready(block=False)
+            if not submitted:
+                break
+            state = submitted.popleft()
+            artifacts = wait(state)
+            ingesting.append((state, executor.submit(ingest, state, artifacts)))
+        commit_ready(block=True)
+    except BaseException:
+        for _state, future in ingesting:
+            future.cancel()
+        if abandon is not None and submitted:
+            try:
+                abandon(list(submitted))
+            except Exception:
+                pass
+        raise
+    finally:
+        executor.shutdown(wait=True)
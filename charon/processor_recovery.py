@@ -165,6 +165,7 @@ def download_with_timeout(
     retry_delay: float,
     min_bytes: int,
     hard_timeout: float,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
 ) -> DownloadResult:
     """Download one ComfyUI artifact through the shared bounded-job policy."""
 
@@ -178,6 +179,7 @@ def download_with_timeout(
                 retries=retries,
                 retry_delay=retry_delay,
                 min_bytes=min_bytes,
+                progress_callback=progress_callback,
             )
         )
 
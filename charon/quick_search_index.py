@@ -0,0 +1,156 @@
+"""Prebuilt index behind the quick search popup.
+
+Each ``(display, path, metadata)`` entry is normalized once: workflow name,
+folder, tags and description are lower-cased with separators removed, a
+bitmask of the characters they contain is kept as a cheap prefilter, and the
+browse sort key is computed up front. A query that extends the previous one
+only re-scores the previous matches.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .utilities import create_sort_key
+
+SearchResult = Tuple[str, str, Optional[Dict[str, Any]]]
+
+# Match tiers, best first.
+_TIER_NAME_EXACT = 0
+_TIER_NAME_PREFIX = 1
+_TIER_NAME_SUBSTRING = 2
+_TIER_DISPLAY_SUBSTRING = 3
+_TIER_TAG = 4
+_TIER_NAME_FUZZY = 5
+_TIER_DISPLAY_FUZZY = 6
+_TIER_DESCRIPTION = 7
+
+
+def normalize_search_text(text: str) -> str:
+    """Lower-case and drop the separators artists type inconsistently."""
+    return (text or "").lower().replace("-", "").replace("_", "").replace(" ", "")
+
+
+def _char_mask(text: str) -> int:
+    mask = 0
+    for char in text:
+        mask |= 1 << (ord(char) & 63)
+    return mask
+
+
+def _subsequence_span(query: str, text: str) -> Optional[int]:
+    """Length of the window in which ``query`` appears in order, or None."""
+    start = text.find(query[0])
+    if start < 0:
+        return None
+    position = start
+    for char in query[1:]:
+        position = text.find(char, position + 1)
+        if position < 0:
+            return None
+    return position - start + 1
+
+
+@dataclass(frozen=True)
+class SearchEntry:
+    """One quick search row with its normalized search fields."""
+
+    display: str
+    path: str
+    metadata: Optional[Dict[str, Any]]
+    name: str
+    name_key: str
+    display_key: str
+    tag_keys: Tuple[str, ...]
+    description_key: str
+    mask: int
+
+    @classmethod
+    def from_row(cls, display: str, path: str, metadata: Optional[Dict[str, Any]]) -> "SearchEntry":
+        name = display.split(" > ", 1)[1] if " > " in display else display
+        meta = metadata if isinstance(metadata, dict) else {}
+        tags = meta.get("tags") if isinstance(meta.get("tags"), list) else []
+        tag_keys = tuple(normalize_search_text(str(tag)) for tag in tags if tag)
+        description_key = normalize_search_text(str(meta.get("description") or ""))
+        display_key = normalize_search_text(display)
+        return cls(
+            display=display,
+            path=path,
+            metadata=metadata,
+            name=name,
+            name_key=normalize_search_text(name),
+            display_key=display_key,
+            tag_keys=tag_keys,
+            description_key=description_key,
+            mask=_char_mask(display_key + "".join(tag_keys) + description_key),
+        )
+
+    def score(self, query: str) -> Optional[Tuple[int, int]]:
+        """Return ``(tier, detail)`` for ``query`` (lower is better), or None."""
+        position = self.name_key.find(query)
+        if position == 0:
+            return (_TIER_NAME_EXACT if self.name_key == query else _TIER_NAME_PREFIX, 0)
+        if position > 0:
+            return (_TIER_NAME_SUBSTRING, position)
+        position = self.display_key.find(query)
+        if position >= 0:
+            return (_TIER_DISPLAY_SUBSTRING, position)
+        for tag in self.tag_keys:
+            if tag.startswith(query):
+                return (_TIER_TAG, len(tag) - len(query))
+        span = _subsequence_span(query, self.name_key)
+        if span is not None:
+            return (_TIER_NAME_FUZZY, span)
+        span = _subsequence_span(query, self.display_key)
+        if span is not None:
+            return (_TIER_DISPLAY_FUZZY, span)
+        position = self.description_key.find(query)
+        if position >= 0:
+            return (_TIER_DESCRIPTION, position)
+        return None
+
+
+class QuickSearchIndex:
+    """Ranked fuzzy search over the global workflow index."""
+
+    def __init__(self, rows: Sequence[SearchResult], host: str = "None") -> None:
+        self.entries = [SearchEntry.from_row(display, path, metadata) for display, path, metadata in rows]
+        self._order = [create_sort_key(entry, host) for entry in self.entries]
+        self._last_query = ""
+        self._last_matches: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def search(self, text: str, limit: int = 10) -> List[SearchResult]:
+        """Return the best ``limit`` rows for ``text``, best first."""
+        query = normalize_search_text(text)
+        if not query:
+            self._last_query = ""
+            self._last_matches = []
+            return []
+
+        # Every match for a longer query also matched the shorter one.
+        if self._last_query and query.startswith(self._last_query):
+            candidates = self._last_matches
+        else:
+            candidates = range(len(self.entries))
+        query_mask = _char_mask(query)
+
+        scored = []
+        for index in candidates:
+            entry = self.entries[index]
+            if entry.mask & query_mask != query_mask:
+                continue
+            score = entry.score(query)
+            if score is not None:
+                scored.append((score, self._order[index], index))
+
+        self._last_query = query
+        self._last_matches = sorted(index for _score, _order, index in scored)
+        scored.sort()
+        return [
+            (self.entries[index].display, self.entries[index].path, self.entries[index].metadata)
+            for _score, _order, index in scored[:limit]
+        ]
@@ -228,6 +228,43 @@ class ScriptTableModel(QtCore.QAbstractTableModel):
         
         return False
     
+    def add_script(self, script: ScriptItem) -> bool:
+        """Insert a single script at its sorted position without a model reset.
+        
+        Returns:
+            True if the script was inserted, False if it was already present
+        """
+        from charon.utilities import create_sort_key
+
+        if self._row_for_path(self._normalize_path(script.path)) is not None:
+            return False
+        key = create_sort_key(script, self.host)
+        row = len(self.scripts)
+        for i, existing in enumerate(self.scripts):
+            if key < create_sort_key(existing, self.host):
+                row = i
+                break
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self.scripts.insert(row, script)
+        self.endInsertRows()
+        return True
+
+    def remove_script(self, script_path: str) -> bool:
+        """Remove a single script row without a model reset.
+        
+        Returns:
+            True if the script was found and removed, False otherwise
+        """
+        normalized_path = self._normalize_path(script_path)
+        row = self._row_for_path(normalized_path)
+        if row is None:
+            return False
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        self.scripts.pop(row)
+        self.endRemoveRows()
+        self.validation_states.pop(normalized_path, None)
+        return True
+
     def update_script_tags(self, script_path: str, new_tags: list) -> bool:
         """Update tags for a single script without reloading metadata.
         
@@ -0,0 +1,114 @@
+"""Team-wide conversion cache stored beside the workflow repository.
+
+Every artist converting the same ``workflow.json`` against the same ComfyUI
+build produces the same API prompt, so the first conversion is published to
+``<repository parent>/conversion_cache/<identity>/<workflow hash>.json`` and
+later sessions copy it into their local cache instead of driving a browser.
+Writers claim an entry with the same ``.charon.lock`` files model transfers
+use; a writer that finds the lock held simply skips publishing.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, Optional
+
+from . import config
+from .charon_logger import system_debug, system_warning
+from .file_lock import release_lock_file, try_acquire_lock_file
+from .json_io import atomic_write_json
+
+
+# Identities and workflow hashes are sha256 hex; the directory name is
+# shortened to keep the UNC paths artists see well under Windows limits.
+_IDENTITY_DIR_LENGTH = 16
+# A lock older than this belongs to a crashed writer and may be reclaimed.
+STALE_LOCK_SECONDS = 10 * 60.0
+
+
+def shared_conversion_enabled() -> bool:
+    """True when sharing is enabled and the workflow repository is reachable."""
+    if not getattr(config, "SHARED_CONVERSION_CACHE", True):
+        return False
+    return os.path.isdir(config.WORKFLOW_REPOSITORY_ROOT)
+
+
+def shared_conversion_path(workflow_hash: str, cache_identity: str) -> str:
+    return os.path.join(
+        config.get_shared_conversion_cache_root(),
+        cache_identity[:_IDENTITY_DIR_LENGTH],
+        f"{workflow_hash}.json",
+    )
+
+
+def load_shared_conversion(workflow_hash: str, cache_identity: str) -> Optional[Dict[str, Any]]:
+    """Return the team's converted prompt for this hash and identity, if published."""
+    if not (workflow_hash and cache_identity and shared_conversion_enabled()):
+        return None
+    path = shared_conversion_path(workflow_hash, cache_identity)
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        system_warning(f"[ConversionCache] Ignoring unreadable shared prompt | path='{path}' error='{exc}'")
+        return None
+    if (
+        not isinstance(payload, dict)
+        or payload.get("workflow_hash") != workflow_hash
+        or payload.get("comfy_identity") != cache_identity
+        or not isinstance(payload.get("prompt"), dict)
+    ):
+        return None
+    system_debug(f"[ConversionCache] Shared prompt hit | path='{path}'")
+    return payload["prompt"]
+
+
+def publish_shared_conversion(
+    workflow_hash: str,
+    cache_identity: str,
+    prompt: Dict[str, Any],
+    *,
+    replace: bool = False,
+) -> bool:
+    """Publish a converted prompt for the team; returns True when this call wrote it.
+
+    ``replace`` overwrites a published prompt the caller found unusable.
+    Never raises: the shared cache is an optimization and a failed publish
+    only means the next artist converts locally.
+    """
+    if not (workflow_hash and cache_identity and shared_conversion_enabled()):
+        return False
+    destination = shared_conversion_path(workflow_hash, cache_identity)
+    lock_path = f"{destination}.charon.lock"
+    try:
+        if os.path.exists(destination) and not replace:
+            return False
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        if not try_acquire_lock_file(lock_path, STALE_LOCK_SECONDS, log_tag="ConversionCache"):
+            system_debug(f"[ConversionCache] Shared prompt is being published elsewhere | path='{destination}'")
+            return False
+    except OSError as exc:
+        system_warning(f"[ConversionCache] Could not publish shared prompt | path='{destination}' error='{exc}'")
+        return False
+    try:
+        # Another writer may have finished between our existence check and lock.
+        if os.path.exists(destination) and not replace:
+            return False
+        atomic_write_json(
+            destination,
+            {
+                "workflow_hash": workflow_hash,
+                "comfy_identity": cache_identity,
+                "prompt": prompt,
+            },
+            indent=None,
+        )
+        return True
+    except OSError as exc:
+        system_warning(f"[ConversionCache] Could not publish shared prompt | path='{destination}' error='{exc}'")
+        return False
+    finally:
+        release_lock_file(lock_path)
@@ -0,0 +1,21 @@
+"""Rules shared by the caches that trust a file or directory until its stat changes."""
+
+from __future__ import annotations
+
+import os
+
+
+# Filesystem clocks are coarse (NAS and FAT tick in seconds), so a read taken
+# within this many nanoseconds of the mtime it saw may have missed a later
+# write in the same tick; such a result is never trusted on stat alone.
+RACY_MTIME_NS = 2_000_000_000
+
+
+def mtime_is_racy(mtime_ns: int, observed_ns: int) -> bool:
+    """True when a read at ``observed_ns`` cannot vouch for content stamped ``mtime_ns``."""
+    return observed_ns - mtime_ns <= RACY_MTIME_NS
+
+
+def path_key(path: str) -> str:
+    """Case- and separator-insensitive cache key for a filesystem path."""
+    return os.path.normcase(os.path.abspath(path))
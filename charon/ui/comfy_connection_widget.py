@@ -13,6 +13,7 @@ from ..comfy_environment import resolve_comfy_runtime
 from ..custom_node_repair import CustomNodeRepair, repair_tracked_module_shadows
 from ..paths import extend_sys_path_with_comfy, resolve_comfy_environment
 from ..validation_resolver import enable_manager_git_url_install
+from ..workflow_conversion_daemon import reset_conversion_daemons
 import urllib.request
 import urllib.error
 
@@ -166,6 +167,7 @@ class ComfyConnectionWidget(QtWidgets.QWidget):
             return
         self._custom_node_repairs.extend(repairs)
         self._repair_restart_notice_pending = True
+        reset_conversion_daemons()
 
     def _offer_restart_after_custom_node_repair(self) -> None:
         if not self._repair_restart_notice_pending or not self._connected:
@@ -305,6 +307,8 @@ class ComfyConnectionWidget(QtWidgets.QWidget):
             self._restart_started_at = 0.0
             if status_changed:
                 system_info("ComfyUI connection established (watcher)")
+                # A (re)started server may have loaded different nodes.
+                reset_conversion_daemons()
             self.client_changed.emit(self._client)
             QtCore.QTimer.singleShot(0, self._offer_restart_after_custom_node_repair)
         else:
@@ -8,6 +8,7 @@ from .folder_panel import FolderPanel
 from .script_panel import ScriptPanel
 from .execution_history_panel import ExecutionHistoryPanel
 from .quick_search import QuickSearchDialog
+from ..quick_search_index import QuickSearchIndex
 from .tag_bar import TagBar
 from .tiny_mode_widget import TinyModeWidget
 from .resource_widget import ResourceWidget
@@ -203,11 +204,14 @@ class CharonWindow(QtWidgets.QWidget):
     WINDOW_TITLE_BASE = "Charon - Nuke/ComfyUI Integration"
     
     gpu_info_ready = QtCore.Signal(str)
+    library_changes_detected = QtCore.Signal(object)
 
     def __init__(self, global_path=None, local_path=None, host="Nuke", parent=None, startup_mode="normal"):
         super(CharonWindow, self).__init__(parent)
         self._charon_is_charon_window = True
         self.gpu_info_ready.connect(self._update_gpu_label)
+        self.library_changes_detected.connect(self._on_library_changes)
+        self._library_watcher = None
         try:
             self.setObjectName("CharonWindow")
         except Exception:
@@ -286,6 +290,9 @@ class CharonWindow(QtWidgets.QWidget):
         # Clean up missing bookmarks in background
         self._folder_probe_executor.submit(self._async_bookmark_cleanup)
 
+        # Push workflows published or removed by others into the tables
+        self._start_library_watcher()
+
         # Set window properties
         self.setWindowTitle(self.WINDOW_TITLE_BASE)
         self.resize(config.WINDOW_WIDTH, config.WINDOW_HEIGHT)
@@ -331,6 +338,77 @@ class CharonWindow(QtWidgets.QWidget):
         except Exception as e:
             system_warning(f"Bookmark cleanup failed: {e}")
 
+    def _start_library_watcher(self):
+        """Poll the repository and local mirror for changes made outside this panel."""
+        if not getattr(config, "LIBRARY_WATCH_ENABLED", True) or not self.global_path:
+            return
+        from ..library_watcher import LibraryWatcher
+        from ..workflow_local_store import (
+            CACHE_DIR_NAME,
+            VALIDATION_DIR_NAME,
+            get_local_workflow_root,
+        )
+
+        # The signal queues each batch onto the UI thread. Validation results
+        # are replaced inside validation/, which leaves .charon_cache untouched.
+        self._library_watcher = LibraryWatcher(
+            self.global_path,
+            self.library_changes_detected.emit,
+            local_root=get_local_workflow_root(ensure=False),
+            local_nested=(CACHE_DIR_NAME, os.path.join(CACHE_DIR_NAME, VALIDATION_DIR_NAME)),
+        )
+        self._library_watcher.start()
+
+    def _on_library_changes(self, changes):
+        """Patch caches, folder rows, script rows and the search index in place."""
+        from ..folder_table_model import FolderItem
+        from ..library_index import invalidate_library_paths
+
+        cache_manager = get_cache_manager()
+        user_slug = get_current_user_slug()
+        probe_folders = set()
+        for change in changes:
+            if change.local:
+                continue
+            clear_metadata_cache(change.path)
+            invalidate_library_paths([change.path])
+            folder_name = os.path.basename(change.folder_path)
+            if change.is_folder:
+                self._debug_user_action(f"Library folder {change.kind}: {change.path}")
+                if change.kind == "added":
+                    item = FolderItem(folder_name, change.path)
+                    item.original_name = folder_name
+                    item.is_current_user = bool(user_slug and folder_name.lower() == user_slug)
+                    self.folder_panel.folder_model.add_folder(item)
+                    probe_folders.add(folder_name)
+                elif change.kind == "removed":
+                    self.folder_panel.folder_model.remove_folder_by_name(folder_name)
+                    current_folder = getattr(self, "current_folder", None)
+                    if current_folder and os.path.normpath(current_folder) == os.path.normpath(change.path):
+                        self.current_folder = None
+                        self.script_panel.clear_scripts()
+                continue
+
+            self._debug_user_action(f"Library workflow {change.kind}: {change.path}")
+            if change.kind == "removed":
+                with self._index_lock:
+                    self._script_index = [
+                        entry for entry in self._script_index if entry[1] != change.path
+                    ]
+                    self._search_index = None
+            else:
+                self._update_script_in_index(change.path)
+            # Emptiness may have flipped; drop the cached probe for this folder
+            cache_manager.invalidate_cached_data(f"folder_nonempty_v2:{change.folder_path}")
+            probe_folders.add(folder_name)
+
+        if probe_folders:
+            self._apply_folder_compatibility_async(sorted(probe_folders))
+
+        current_folder = getattr(self, "current_folder", None)
+        if self.script_panel.apply_library_changes(changes) and current_folder:
+            self.tag_bar.sync_tags(get_folder_tags(current_folder))
+
     def _show_bookmark_cleanup_dialog(self, missing):
         """Show the bookmark cleanup dialog on main thread."""
         bookmark_list = "\n".join(missing)
@@ -517,6 +595,8 @@ class CharonWindow(QtWidgets.QWidget):
                 event.ignore()
                 return
 
+        if self._library_watcher is not None:
+            self._library_watcher.stop()
         if hasattr(self, 'script_panel') and hasattr(self.script_panel, 'folder_loader'):
             self.script_panel.folder_loader.stop_loading()
         if hasattr(self, 'global_indexer'):
@@ -1282,6 +1362,7 @@ QPushButton#NewWorkflowButton:pressed {{
         
         # ---------- quick search (TAB) setup ----------
         self._script_index = []
+        self._search_index = None  # QuickSearchIndex over _script_index, rebuilt lazily
         self._index_lock = threading.Lock()
         self._index_dirty = True  # Start with a dirty index
 
@@ -1991,6 +2072,8 @@ QPushButton#NewWorkflowButton:pressed {{
             # Handle bookmarks folder
             # Clear current folder for bookmarks view
             self.current_folder = None
+            if self._library_watcher is not None:
+                self._library_watcher.set_active_folder(None)
             
             # Load bookmarked scripts
             self.load_bookmarked_scripts()
@@ -2001,6 +2084,8 @@ QPushButton#NewWorkflowButton:pressed {{
         
         # Track the current folder for efficient tag loading
         self.current_folder = folder_path
+        if self._library_watcher is not None:
+            self._library_watcher.set_active_folder(folder_path)
         self._debug_user_action(f"Set current folder path: {folder_path}")
         
         if os.path.isdir(folder_path):
@@ -2082,6 +2167,7 @@ QPushButton#NewWorkflowButton:pressed {{
                 if old_path == script_path:
                     # Update in place
                     self._script_index[i] = (display, script_path, metadata)
+                    self._search_index = None
                     updated = True
                     system_debug(f"Updated script in quick search index: {script_path}")
                     break
@@ -2089,6 +2175,7 @@ QPushButton#NewWorkflowButton:pressed {{
             if not updated:
                 # Script not in index, add it
                 self._script_index.append((display, script_path, metadata))
+                self._search_index = None
                 system_debug(f"Added script to quick search index: {script_path}")
     
     def _refresh_quick_search_index_for_folder(self, folder_path: str):
@@ -2666,6 +2753,7 @@ QPushButton#NewWorkflowButton:pressed {{
         """Callback for when the global index has finished building."""
         with self._index_lock:
             self._script_index = new_index
+            self._search_index = QuickSearchIndex(new_index, self.host)
             self._index_dirty = False
         # Only print in debug mode
         if config.DEBUG_MODE:
@@ -2689,13 +2777,17 @@ QPushButton#NewWorkflowButton:pressed {{
 
         with self._index_lock:
             index_copy = self._script_index[:]
+            if self._search_index is None:
+                self._search_index = QuickSearchIndex(index_copy, self.host)
+            search_index = self._search_index
         
         # Show dialog with command mode flag
         dlg = QuickSearchDialog(
             index_copy, 
             parent=self, 
             host=self.host,
-            tiny_mode=self.keybind_manager.tiny_mode_active
+            tiny_mode=self.keybind_manager.tiny_mode_active,
+            search_index=search_index,
         )
         
         # Position the dialog
@@ -2931,7 +3023,8 @@ Cache Stats:
 - Folders cached: {stats['folder_cache_size']}
 - Tags cached: {stats['tag_cache_size']}
 - Hot folders: {stats['hot_folders']}
-- Memory usage: ~{stats['estimated_memory_mb']:.1f} MB"""
+- Memory usage: ~{stats['estimated_memory_mb']:.1f} MB
+- Hit rate: {stats['hit_rate']:.0%} ({stats['evictions']} evicted)"""
             
             self.refresh_btn.setToolTip(tooltip)
         except Exception:
@@ -2991,9 +3084,9 @@ Cache Stats:
                 self._debug_user_action(f"Refreshing current folder: {folder_path or 'Bookmarks'}")
                 self._pending_folder_selection = current_folder
                 
-                # Clear LRU cache since we're doing a refresh anyway
+                # Drop cached metadata for the refreshed folder only
                 from ..metadata_manager import clear_metadata_cache
-                clear_metadata_cache()
+                clear_metadata_cache(folder_path)
                 self._debug_user_action("Cleared metadata cache before folder refresh")
                 
                 # Clear the cached folder list to ensure we pick up new folders
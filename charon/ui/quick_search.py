@@ -1,5 +1,6 @@
 from ..qt_compat import QtWidgets, QtCore, QtGui, QShortcut, QKeySequence
-from ..utilities import get_software_color_for_metadata, create_sort_key
+from ..utilities import get_software_color_for_metadata
+from ..quick_search_index import QuickSearchIndex
 from ..icon_manager import get_icon_manager
 from .. import config
 
@@ -147,17 +148,19 @@ class QuickSearchDialog(QtWidgets.QDialog):
     script_chosen = QtCore.Signal(str)  # Emits full script path when accepted
     script_executed = QtCore.Signal(str)  # Emits script path to execute in tiny mode
 
-    def __init__(self, all_scripts, parent=None, host="None", tiny_mode=False):
+    def __init__(self, all_scripts, parent=None, host="None", tiny_mode=False, search_index=None):
         """
         all_scripts: List[Tuple[str display, str full_path, dict metadata]]
         host: Current host software for proper software selection
         tiny_mode: If True, executes scripts instead of navigating to them
+        search_index: Prebuilt QuickSearchIndex over all_scripts, built here if omitted
         """
         super(QuickSearchDialog, self).__init__(parent)
         # Remove title bar and make it frameless
         self.setWindowFlags(QtCore.Qt.WindowType.FramelessWindowHint | QtCore.Qt.WindowType.Popup)
         self.setModal(True)
         self.all_scripts = all_scripts  # raw data list
+        self.search_index = search_index if search_index is not None else QuickSearchIndex(all_scripts, host)
         self.host = host
         self.tiny_mode = tiny_mode
         
@@ -264,10 +267,6 @@ class QuickSearchDialog(QtWidgets.QDialog):
         # Let the dialog size itself initially to fit just the search box
         self.adjustSize()
         
-    def _normalize_search_string(self, text):
-        """Removes separators and converts to lowercase for consistent searching."""
-        return text.lower().replace('-', '').replace('_', '').replace(' ', '')
-
     # ---------- helpers ----------
     def update_list(self, entries):
         """Update the model and adjust the dialog size for the new entries."""
@@ -300,38 +299,7 @@ class QuickSearchDialog(QtWidgets.QDialog):
         self.adjustSize()
 
     def on_text_changed(self, text):
-        query = self._normalize_search_string(text)
-        if not query:
-            self.update_list([])
-            return
-
-        filtered = []
-        for disp, path, metadata in self.all_scripts:
-            normalized_disp = self._normalize_search_string(disp)
-            if query in normalized_disp:
-                filtered.append((disp, path, metadata))
-
-        # Sort filtered results by compatibility priority
-        def quicksearch_sort_key(entry):
-            display, path, metadata = entry
-            # Extract script name from display text (format: "folder > script")
-            if " > " in display:
-                script_name = display.split(" > ")[1]
-            else:
-                script_name = display
-            
-            # Create a mock ScriptItem-like object for sorting
-            class MockScriptItem:
-                def __init__(self, name, metadata):
-                    self.name = name
-                    self.metadata = metadata
-            
-            mock_item = MockScriptItem(script_name, metadata)
-            return create_sort_key(mock_item, self.host)
-        
-        filtered.sort(key=quicksearch_sort_key)
-        
-        self.update_list(filtered[:10])
+        self.update_list(self.search_index.search(text, limit=10))
 
     # ---------- event handling ----------
     def accept(self):
@@ -559,6 +559,81 @@ class ScriptPanel(QtWidgets.QWidget):
         self._loading = False
         self.script_view.setEnabled(True)
 
+    def apply_library_changes(self, changes) -> bool:
+        """Patch rows for watcher changes in the open folder without reloading it.
+        
+        Returns:
+            True if any row of the open folder was added, removed or refreshed
+        """
+        if self._loading or not self._active_folder_path:
+            # A load in flight lists the folder afresh anyway
+            return False
+
+        from ..metadata_manager import get_charon_config
+        from ..workflow_model import ScriptItem
+
+        active_folder = os.path.normpath(self._active_folder_path).lower()
+        if not hasattr(self, '_cached_bookmarks'):
+            self._refresh_user_data_cache()
+
+        patched = False
+        for change in changes:
+            if change.is_folder or os.path.normpath(change.folder_path).lower() != active_folder:
+                continue
+            normalized_path = os.path.normpath(change.path)
+            existing = next(
+                (script for script in self._all_scripts if os.path.normpath(script.path) == normalized_path),
+                None,
+            )
+
+            if change.kind == "removed":
+                if existing is None:
+                    continue
+                self._all_scripts.remove(existing)
+                if self.current_script and os.path.normpath(self.current_script.path) == normalized_path:
+                    self.on_script_deselected()
+                self.script_model.remove_script(existing.path)
+                patched = True
+                continue
+
+            if change.local:
+                # Only the local validation state moved; metadata is unchanged
+                if existing is None or self.script_model.get_validation_state(existing.path) == "validating":
+                    continue
+                self._clear_validation_cache(existing.path)
+                if self._read_validation_cache(existing.path):
+                    self._apply_cached_validation_states([existing])
+                else:
+                    self.script_model.set_validation_state(existing.path, "idle")
+                patched = True
+                continue
+
+            if existing is None:
+                if change.kind == "changed" or not os.path.isdir(change.path):
+                    continue
+                existing = ScriptItem(
+                    os.path.basename(change.path),
+                    change.path,
+                    get_charon_config(change.path),
+                    self.host or "None",
+                )
+                existing.is_bookmarked = normalized_path in self._cached_bookmarks
+                self._all_scripts.append(existing)
+            else:
+                existing.metadata = get_charon_config(existing.path)
+
+            if self._passes_filters(existing):
+                if not self.script_model.add_script(existing):
+                    self.script_model.update_single_script(existing.path)
+                self._apply_cached_validation_states([existing])
+            else:
+                self.script_model.remove_script(existing.path)
+            patched = True
+
+        if patched:
+            self.script_view.viewport().update()
+        return patched
+
     def on_view_selection_changed(self, selected, deselected):
         """Handle selection changes and force a repaint of items."""
         # If we're in the middle of an explicit deselection, ignore this signal
@@ -1361,32 +1436,33 @@ class ScriptPanel(QtWidgets.QWidget):
         self._active_tags = active_tags
         self._apply_tag_filter()
     
-    def _apply_tag_filter(self):
-        """Apply tag filtering to the current scripts."""
-        filtered_scripts = []
-        for script in self._all_scripts:
-            # 1. Filter by 3D Texturing mode
-            is_3d = False
+    def _passes_filters(self, script) -> bool:
+        """Return True when a script matches the 3D mode and active tag filters."""
+        # 1. Filter by 3D Texturing mode
+        is_3d = False
+        if hasattr(script, 'metadata') and script.metadata:
+            is_3d = script.metadata.get('is_3d_texturing', False)
+        
+        if self._3d_mode_enabled:
+            if not is_3d:
+                return False
+        else:
+            if is_3d:
+                return False
+
+        # 2. Filter by Tags (if any)
+        if self._active_tags:
             if hasattr(script, 'metadata') and script.metadata:
-                is_3d = script.metadata.get('is_3d_texturing', False)
-            
-            if self._3d_mode_enabled:
-                if not is_3d:
-                    continue
+                script_tags = script.metadata.get('tags', [])
+                if not any(tag in script_tags for tag in self._active_tags):
+                    return False
             else:
-                if is_3d:
-                    continue
+                return False
+        return True
 
-            # 2. Filter by Tags (if any)
-            if self._active_tags:
-                if hasattr(script, 'metadata') and script.metadata:
-                    script_tags = script.metadata.get('tags', [])
-                    if not any(tag in script_tags for tag in self._active_tags):
-                        continue
-                else:
-                    continue
-            
-            filtered_scripts.append(script)
+    def _apply_tag_filter(self):
+        """Apply tag filtering to the current scripts."""
+        filtered_scripts = [script for script in self._all_scripts if self._passes_filters(script)]
         
         # Update the model with filtered scripts (sorting is done inside updateItems)
         self.script_model.updateItems(filtered_scripts)
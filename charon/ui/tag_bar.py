@@ -186,6 +186,18 @@ class TagBar(QtWidgets.QWidget):
         # Also remove from active tags if selected
         self._active_tags.discard(tag_name)
     
+    def sync_tags(self, available_tags: List[str]):
+        """Add and remove tag buttons to match ``available_tags``, keeping the selection."""
+        wanted = {tag for tag in available_tags if tag}
+        active_before = set(self._active_tags)
+        for tag in list(self._tag_buttons):
+            if tag not in wanted:
+                self.remove_tag(tag)
+        for tag in sorted(wanted - set(self._tag_buttons)):
+            self.add_tag(tag)
+        if self._active_tags != active_before:
+            self.tags_changed.emit(list(self._active_tags))
+
     def update_tag_name(self, old_name: str, new_name: str):
         """Rename a tag button."""
         if old_name not in self._tag_buttons or new_name in self._tag_buttons:
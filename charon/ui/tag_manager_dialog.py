@@ -465,16 +465,16 @@ class TagManagerDialog(QtWidgets.QDialog):
     
     def _invalidate_folder_caches(self):
         """Invalidate all caches related to folder tags."""
-        from ..metadata_manager import get_folder_tags
+        from ..metadata_manager import invalidate_folder_tags
         from ..cache_manager import get_cache_manager
         
-        # Clear the LRU cache for get_folder_tags
-        if hasattr(get_folder_tags, 'cache_clear'):
-            get_folder_tags.cache_clear()
+        # Edited workflows already dropped their own entries; this only
+        # forces the folder's tag list to be recomputed.
+        invalidate_folder_tags(self.folder_path)
         
-        # Clear the persistent cache for this folder
+        # Clear the persistent tag cache for this folder
         cache_manager = get_cache_manager()
-        cache_manager.invalidate_folder(self.folder_path)
+        cache_manager.invalidate_folder_tags(self.folder_path)
         
         system_debug(f"Invalidated folder caches for: {self.folder_path}")
     
@@ -16,6 +16,7 @@ from ..validation_resolver import (
     ResolutionResult,
     determine_expected_model_path,
     find_local_model_matches,
+    find_model_matches_batch,
     find_shared_model_matches,
     install_custom_nodes_via_playwright,
     reference_for_shared_model,
@@ -1210,6 +1211,7 @@ class ValidationResolveDialog(QtWidgets.QDialog):
         if not queue:
             self._persist_auto_resolve_state(running=False, queue=[])
             return
+        self._prefetch_model_matches(queue)
         self._auto_resolve_running = True
         self._auto_resolve_queue = queue
         include_first = self._has_active_transfers() or (
@@ -1243,6 +1245,25 @@ class ValidationResolveDialog(QtWidgets.QDialog):
         QtWidgets.QApplication.processEvents()
         self._process_next_auto_resolve_item()
 
+    def _prefetch_model_matches(self, queue: List[Tuple[str, int]]) -> None:
+        """Look up every queued model row in one pass before resolving rows one by one."""
+        rows: Dict[int, Dict[str, Any]] = (self._issue_widgets.get("models") or {}).get("rows") or {}
+        row_infos = [rows[row] for issue_key, row in queue if issue_key == "models" and row in rows]
+        by_root: Dict[str, List[Dict[str, Any]]] = {}
+        for row_info in row_infos:
+            by_root.setdefault(row_info.get("models_root") or "", []).append(row_info)
+        for models_root, grouped in by_root.items():
+            try:
+                batch = find_model_matches_batch(
+                    [row_info.get("reference") or {} for row_info in grouped],
+                    models_root,
+                )
+            except Exception as exc:  # pragma: no cover - defensive guard
+                system_debug(f"[Validation] Batched model lookup failed: {exc}")
+                continue
+            for row_info, matches in zip(grouped, batch):
+                row_info["prefetched_matches"] = matches
+
     def _build_auto_resolve_queue(self) -> List[Tuple[str, int]]:
         queue: List[Tuple[str, int]] = []
         for issue_key in self._issue_lookup.keys():
@@ -1304,6 +1325,8 @@ class ValidationResolveDialog(QtWidgets.QDialog):
     def _finalize_auto_resolve_sequence(self) -> None:
         self._auto_resolve_running = False
         self._auto_resolve_queue = []
+        for row_info in ((self._issue_widgets.get("models") or {}).get("rows") or {}).values():
+            row_info.pop("prefetched_matches", None)
         self._persist_auto_resolve_state(running=False, queue=[])
         self._reset_auto_resolve_button()
         self._clear_installing_state()
@@ -3440,8 +3463,15 @@ class ValidationResolveDialog(QtWidgets.QDialog):
         expected_path: Optional[str] = None
         notified_manual = False
 
+        # Rows queued by "Resolve all" were looked up together up front; files
+        # moved by earlier rows since then are dropped here.
+        prefetched = row_info.pop("prefetched_matches", None)
+
         # 1) Local match
-        local_matches = find_local_model_matches(reference, models_root)
+        if prefetched is not None:
+            local_matches = [path for path in prefetched.local if os.path.isfile(path)]
+        else:
+            local_matches = find_local_model_matches(reference, models_root)
         system_debug(
             "[Validation] Auto-resolve: local scan complete | "
             f"row={row} matches={len(local_matches) if local_matches else 0}"
@@ -3548,7 +3578,10 @@ class ValidationResolveDialog(QtWidgets.QDialog):
             system_debug("[Validation] Auto-resolve: no URL provided for missing model")
 
         # 3) Global repo
-        shared_matches = find_shared_model_matches(file_name)
+        if prefetched is not None:
+            shared_matches = [path for path in prefetched.shared if os.path.isfile(path)]
+        else:
+            shared_matches = find_shared_model_matches(file_name)
         preferred_shared_path = str(reference.get("shared_path") or "").replace("\\", "/")
         if preferred_shared_path:
             shared_matches.sort(
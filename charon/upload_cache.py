@@ -0,0 +1,136 @@
+"""Content-addressed deduplication of input uploads to a ComfyUI server."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from . import preferences
+from .json_io import atomic_write_json
+
+
+UPLOAD_CACHE_DIR = "upload_cache"
+UPLOAD_NAME_PREFIX = "charon_"
+DEFAULT_MAX_ENTRIES = 4096
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+_caches: Dict[str, "UploadCache"] = {}
+_caches_lock = threading.Lock()
+
+
+def hash_file(path: str) -> str:
+    """Return the SHA-256 hex digest of ``path``."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_addressed_name(path: str, digest: str) -> str:
+    """Return the stable upload name for a file with the given content digest."""
+    extension = os.path.splitext(path)[1].lower() or ".png"
+    return f"{UPLOAD_NAME_PREFIX}{digest[:32]}{extension}"
+
+
+def server_scope(base_url: str, identity: str = "") -> str:
+    """Return a short key that separates manifests per ComfyUI install."""
+    material = f"{(base_url or '').rstrip('/').lower()}|{identity or ''}"
+    return hashlib.sha1(material.encode("utf-8")).hexdigest()[:16]
+
+
+class UploadCache:
+    """Manifest of file digests already uploaded to one ComfyUI server."""
+
+    def __init__(self, manifest_path: str, *, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.manifest_path = manifest_path
+        self.max_entries = max(1, int(max_entries))
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            return
+        entries = payload.get("entries") if isinstance(payload, dict) else None
+        if isinstance(entries, dict):
+            self._entries = {
+                digest: entry
+                for digest, entry in entries.items()
+                if isinstance(entry, dict) and entry.get("name")
+            }
+
+    def lookup(self, digest: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            return dict(entry) if entry else None
+
+    def record(self, digest: str, name: str, size: int) -> None:
+        with self._lock:
+            self._entries[digest] = {"name": name, "size": int(size), "uploaded_at": time.time()}
+            if len(self._entries) > self.max_entries:
+                oldest = sorted(self._entries, key=lambda key: self._entries[key].get("uploaded_at", 0))
+                for stale in oldest[: len(self._entries) - self.max_entries]:
+                    self._entries.pop(stale, None)
+            snapshot = {"entries": dict(self._entries)}
+        try:
+            atomic_write_json(self.manifest_path, snapshot, indent=0)
+        except OSError:
+            pass
+
+    def forget(self, digest: str) -> None:
+        with self._lock:
+            self._entries.pop(digest, None)
+
+
+def get_upload_cache(base_url: str, identity: str = "") -> UploadCache:
+    """Return the shared manifest for the ComfyUI server at ``base_url``."""
+    scope = server_scope(base_url, identity)
+    with _caches_lock:
+        cache = _caches.get(scope)
+        if cache is None:
+            root = preferences.get_preferences_root()
+            cache = UploadCache(os.path.join(root, UPLOAD_CACHE_DIR, f"{scope}.json"))
+            _caches[scope] = cache
+        return cache
+
+
+def upload_deduplicated(
+    client,
+    path: str,
+    cache: UploadCache,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> Tuple[Optional[str], bool]:
+    """Upload ``path`` unless the server already holds identical bytes.
+
+    Returns ``(uploaded_name, reused)``. Files are uploaded under a name derived
+    from their SHA-256, so a cheap existence check on the server confirms a
+    manifest hit, or finds a file uploaded by another session, before any bytes
+    are resent.
+    """
+    digest = hash_file(path)
+    size = os.path.getsize(path)
+    entry = cache.lookup(digest)
+    candidate = entry["name"] if entry else content_addressed_name(path, digest)
+    if client.input_file_exists(candidate, size=size):
+        if not entry:
+            cache.record(digest, candidate, size)
+        return candidate, True
+    if entry:
+        cache.forget(digest)
+
+    uploaded = client.upload_image(
+        path,
+        upload_name=content_addressed_name(path, digest),
+        progress_callback=progress_callback,
+    )
+    if uploaded:
+        cache.record(digest, uploaded, size)
+    return uploaded, False
@@ -14,10 +14,12 @@ from . import config
 from .charon_logger import system_debug, system_error, system_info, system_warning
 from .comfy_client import ComfyUIClient
 from .comfy_environment import resolve_comfy_runtime
+from .model_file_index import find_model_files, find_model_files_batch, invalidate_model_index
 from .model_manifest import category_from_shared_path
 from .model_paths import category_aliases
 from .path_safety import ensure_path_inside
 from .paths import resolve_comfy_environment
+from .validation_signature import invalidate_validation_signatures
 
 
 SHARED_MODELS_ROOT: Optional[str] = None
@@ -52,6 +54,47 @@ class ResolutionResult:
         }
 
 
+@dataclass
+class ModelMatches:
+    """Candidate files for one missing model reference, best first."""
+
+    local: List[str] = field(default_factory=list)
+    shared: List[str] = field(default_factory=list)
+
+
+def _local_search_roots(
+    reference: Dict[str, Any],
+    models_root: str,
+    extra_roots: Optional[Sequence[str]],
+) -> List[str]:
+    search_roots: List[str] = []
+    for root in _iter_designated_roots(reference, models_root):
+        if root not in search_roots:
+            search_roots.append(root)
+    for root in extra_roots or ():
+        normalized = os.path.abspath(root)
+        if normalized and normalized not in search_roots and os.path.isdir(normalized):
+            search_roots.append(normalized)
+    return search_roots
+
+
+def _ordered_matches(
+    lookup: Dict[str, Dict[str, List[str]]],
+    roots: Sequence[str],
+    file_name: str,
+) -> List[str]:
+    matches: List[str] = []
+    seen: set[str] = set()
+    for root in roots:
+        for candidate in lookup.get(os.path.abspath(root), {}).get(file_name, ()):
+            normalized = os.path.normcase(candidate)
+            if normalized in seen:
+                continue
+            seen.add(normalized)
+            matches.append(candidate)
+    return matches
+
+
 def find_local_model_matches(
     reference: Dict[str, Any],
     models_root: str,
@@ -68,15 +111,7 @@ def find_local_model_matches(
     if not file_name:
         return []
 
-    search_roots: List[str] = []
-    for root in _iter_designated_roots(reference, models_root):
-        if root not in search_roots:
-            search_roots.append(root)
-    for root in extra_roots or ():
-        normalized = os.path.abspath(root)
-        if normalized and normalized not in search_roots and os.path.isdir(normalized):
-            search_roots.append(normalized)
-
+    search_roots = _local_search_roots(reference, models_root, extra_roots)
     if not search_roots:
         system_debug(
             "[Validation] Local match scan skipped | "
@@ -88,14 +123,8 @@ def find_local_model_matches(
         "[Validation] Local match scan starting | "
         f"name='{file_name}' roots={search_roots}"
     )
-    matches: List[str] = []
-    seen: set[str] = set()
-    for root in search_roots:
-        for candidate in _iter_matching_files(root, file_name):
-            if candidate in seen:
-                continue
-            seen.add(candidate)
-            matches.append(candidate)
+    lookup = find_model_files_batch([file_name], search_roots, anchors=[models_root] if models_root else ())
+    matches = _ordered_matches(lookup, search_roots, file_name)
     system_debug(
         "[Validation] Local match scan finished | "
         f"name='{file_name}' matches={matches}"
@@ -123,6 +152,53 @@ def find_shared_model_matches(file_name: str) -> List[str]:
     return matches
 
 
+def find_model_matches_batch(
+    references: Sequence[Dict[str, Any]],
+    models_root: str,
+    *,
+    extra_roots: Optional[Sequence[str]] = None,
+    include_shared: bool = True,
+) -> List[ModelMatches]:
+    """
+    Resolve local and shared candidates for many references in one pass.
+
+    Every search root is consulted once for the whole set of basenames instead
+    of once per reference. Each result lists candidates in the same order
+    ``find_local_model_matches`` and ``find_shared_model_matches`` would.
+    """
+    plans: List[Tuple[str, List[str]]] = []
+    all_roots: List[str] = []
+    for reference in references:
+        file_name = os.path.basename(_safe_str((reference or {}).get("name")))
+        roots = _local_search_roots(reference or {}, models_root, extra_roots) if file_name else []
+        plans.append((file_name, roots))
+        for root in roots:
+            if root not in all_roots:
+                all_roots.append(root)
+
+    shared_root = get_shared_models_root() if include_shared else ""
+    if shared_root and os.path.isdir(shared_root):
+        shared_root = os.path.abspath(shared_root)
+        all_roots.append(shared_root)
+    else:
+        shared_root = ""
+
+    names = [file_name for file_name, _roots in plans if file_name]
+    lookup = find_model_files_batch(names, all_roots, anchors=[models_root] if models_root else ())
+    results = [
+        ModelMatches(
+            local=_ordered_matches(lookup, roots, file_name) if file_name else [],
+            shared=_ordered_matches(lookup, [shared_root], file_name) if file_name and shared_root else [],
+        )
+        for file_name, roots in plans
+    ]
+    system_debug(
+        "[Validation] Batched model match scan finished | "
+        f"references={len(plans)} roots={len(all_roots)}"
+    )
+    return results
+
+
 def select_first_model_match(matches: Sequence[str]) -> Optional[str]:
     """Return the first discovered model match according to resolver search priority."""
     return matches[0] if matches else None
@@ -216,12 +292,13 @@ def resolve_missing_models(
         result.skipped.append("No missing models were reported.")
         return result
 
+    plans: List[Tuple[str, List[Any], List[Any], Optional[str]]] = []
     for entry in missing_entries:
         if not isinstance(entry, dict):
             continue
         name = _safe_str(entry.get("name"))
         if not name:
-            result.failed.append("Encountered a model reference without a name.")
+            plans.append(("", [], [], None))
             continue
         attempted_categories = entry.get("attempted_categories") or []
         attempted_directories = entry.get("attempted_directories") or []
@@ -232,6 +309,23 @@ def resolve_missing_models(
             attempted_categories=attempted_categories,
             attempted_directories=attempted_directories,
         )
+        plans.append((name, attempted_categories, attempted_directories, target_path))
+
+    # One lookup for every missing basename across all destination folders.
+    lookup_roots = [models_root]
+    for _name, _categories, _directories, target_path in plans:
+        if target_path and os.path.dirname(target_path):
+            lookup_roots.append(os.path.dirname(target_path))
+    lookup = find_model_files_batch(
+        [os.path.basename(plan[3]) for plan in plans if plan[3]],
+        lookup_roots,
+        anchors=[models_root],
+    )
+
+    for name, attempted_categories, attempted_directories, target_path in plans:
+        if not name:
+            result.failed.append("Encountered a model reference without a name.")
+            continue
         if not target_path:
             result.failed.append(f"Unable to determine target path for '{name}'.")
             continue
@@ -239,9 +333,9 @@ def resolve_missing_models(
         dest_dir = os.path.dirname(target_path)
         dest_file = os.path.basename(target_path)
         search_root = dest_dir if dest_dir else models_root
-        candidate = _find_matching_file(search_root, dest_file)
+        candidate = _batched_matching_file(lookup, search_root, dest_file)
         if candidate is None and os.path.abspath(search_root) != os.path.abspath(models_root):
-            candidate = _find_matching_file(models_root, dest_file)
+            candidate = _batched_matching_file(lookup, models_root, dest_file)
 
         if candidate is None:
             if attempted_directories:
@@ -280,6 +374,8 @@ def resolve_missing_models(
                 )
                 shutil.copy2(candidate, target_path)
                 result.resolved.append(f"Copied {dest_file} to models directory.")
+            invalidate_model_index(candidate, target_path)
+            invalidate_validation_signatures()
         except Exception as exc:  # pragma: no cover - filesystem guard
             message = f"Failed to copy '{dest_file}': {exc}"
             system_warning(message)
@@ -339,6 +435,8 @@ def relocate_model_to_category(
 
     os.makedirs(target_dir, exist_ok=True)
     shutil.move(candidate_abs, target_path)
+    invalidate_model_index(candidate_abs, target_path)
+    invalidate_validation_signatures()
     system_warning(
         f"Relocated model '{os.path.basename(target_path)}' from "
         f"'{os.path.dirname(candidate_abs)}' to '{target_dir}' to match its "
@@ -916,16 +1014,18 @@ def _expected_model_path(
     )
 
 
-def _find_matching_file(root: str, file_name: str) -> Optional[str]:
-    if not root or not file_name:
-        return None
-    if os.path.isfile(os.path.join(root, file_name)):
-        return os.path.abspath(os.path.join(root, file_name))
-    if not os.path.isdir(root):
-        return None
-    for candidate_root, _dirs, files in os.walk(root):
-        if file_name in files:
-            return os.path.abspath(os.path.join(candidate_root, file_name))
+def _batched_matching_file(
+    lookup: Dict[str, Dict[str, List[str]]],
+    root: str,
+    file_name: str,
+) -> Optional[str]:
+    # An earlier entry may have moved a prefetched file; confirm it is still there.
+    direct = os.path.join(root, file_name)
+    if os.path.isfile(direct):
+        return os.path.abspath(direct)
+    for candidate in lookup.get(os.path.abspath(root), {}).get(file_name, ()):
+        if os.path.basename(candidate) == file_name and os.path.isfile(candidate):
+            return os.path.abspath(candidate)
     return None
 
 
@@ -941,16 +1041,12 @@ def _iter_matching_files(root: str, file_name: str) -> Iterator[str]:
         direct_candidate = os.path.abspath(direct_candidate)
         seen.add(os.path.normcase(direct_candidate))
         yield direct_candidate
-    lowered = file_name.lower()
-    for candidate_root, _dirs, files in os.walk(normalized_root):
-        for entry in files:
-            if entry.lower() == lowered:
-                candidate = os.path.abspath(os.path.join(candidate_root, entry))
-                normalized = os.path.normcase(candidate)
-                if normalized in seen:
-                    continue
-                seen.add(normalized)
-                yield candidate
+    for candidate in find_model_files(file_name, [normalized_root]):
+        normalized = os.path.normcase(candidate)
+        if normalized in seen:
+            continue
+        seen.add(normalized)
+        yield candidate
 
 
 def _normalize_repo_url(value: str) -> str:
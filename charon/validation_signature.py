@@ -0,0 +1,179 @@
+"""Session-wide memo for workflow validation signatures.
+
+A validation signature fingerprints everything that can make a validated
+workflow stale: the configured ComfyUI runtime, the installed custom nodes
+and model folders, and the workflow's own metadata and model manifest. The
+runtime half is identical for every workflow, so one refresh serves the whole
+workflow list, and each directory listing is reused while the directory's
+own mtime is unchanged.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import stat
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import config, preferences
+from .charon_metadata import CHARON_METADATA_FILENAME
+from .comfy_environment import resolve_comfy_runtime
+from .model_manifest import model_manifest_path
+from .stat_validation import mtime_is_racy, path_key
+
+
+@dataclass(frozen=True)
+class DirectorySnapshot:
+    mtime_ns: int
+    taken_ns: int
+    entries: Tuple[Tuple[str, int], ...]
+
+
+class ValidationSignatureService:
+    """Caches the stat snapshots and file digests behind validation signatures."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, DirectorySnapshot] = {}
+        self._digests: Dict[str, Tuple[int, int, int, str]] = {}
+        self._environment: Optional[Tuple[str, float, Dict[str, Any]]] = None
+
+    def signature(self, remote_folder: str) -> str:
+        comfy_path = str(preferences.get_preference("comfyui_launch_path", "") or "").strip()
+        payload = dict(self._environment_payload(comfy_path))
+        payload["metadata_hash"] = self.file_digest(
+            os.path.join(remote_folder, CHARON_METADATA_FILENAME)
+        )
+        payload["model_manifest_hash"] = self.file_digest(model_manifest_path(remote_folder))
+        serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def directory_inventory(self, root: str) -> List[Tuple[str, int]]:
+        """Return ``(lowercase name, mtime_ns)`` for each entry directly under ``root``."""
+        if not root:
+            return []
+        key = path_key(root)
+        try:
+            info = os.stat(root)
+        except OSError:
+            info = None
+        if info is None or not stat.S_ISDIR(info.st_mode):
+            with self._lock:
+                self._snapshots.pop(key, None)
+            return []
+        max_age_ns = int(float(getattr(config, "VALIDATION_SIGNATURE_SNAPSHOT_MAX_AGE_SEC", 60.0)) * 1e9)
+        now_ns = time.time_ns()
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+        # Entries' own mtimes only move the parent when entries are added or
+        # removed, so trusted snapshots still expire after max_age.
+        if (
+            snapshot is not None
+            and snapshot.mtime_ns == info.st_mtime_ns
+            and not mtime_is_racy(snapshot.mtime_ns, snapshot.taken_ns)
+            and now_ns - snapshot.taken_ns < max_age_ns
+        ):
+            return list(snapshot.entries)
+        entries = _scan_inventory(root)
+        if entries is None:
+            return []
+        with self._lock:
+            self._snapshots[key] = DirectorySnapshot(info.st_mtime_ns, now_ns, tuple(entries))
+        return entries
+
+    def file_digest(self, path: str) -> str:
+        """Return the sha256 of ``path``, rehashing only when its stat changes."""
+        key = path_key(path)
+        try:
+            info = os.stat(path)
+        except OSError:
+            with self._lock:
+                self._digests.pop(key, None)
+            return ""
+        with self._lock:
+            cached = self._digests.get(key)
+        if (
+            cached is not None
+            and cached[:2] == (info.st_mtime_ns, info.st_size)
+            and not mtime_is_racy(info.st_mtime_ns, cached[2])
+        ):
+            return cached[3]
+        hashed_ns = time.time_ns()
+        try:
+            with open(path, "rb") as handle:
+                digest = hashlib.sha256(handle.read()).hexdigest()
+        except OSError:
+            return ""
+        with self._lock:
+            self._digests[key] = (info.st_mtime_ns, info.st_size, hashed_ns, digest)
+        return digest
+
+    def invalidate(self) -> None:
+        """Forget runtime state and directory snapshots; file digests self-check."""
+        with self._lock:
+            self._environment = None
+            self._snapshots.clear()
+
+    def _environment_payload(self, comfy_path: str) -> Dict[str, Any]:
+        refresh_sec = float(getattr(config, "VALIDATION_SIGNATURE_REFRESH_SEC", 2.0))
+        with self._lock:
+            memo = self._environment
+        if memo is not None and memo[0] == comfy_path and time.monotonic() - memo[1] < refresh_sec:
+            return memo[2]
+        runtime = resolve_comfy_runtime(comfy_path)
+        comfy_dir = runtime.comfy_dir
+        models_dir = runtime.models_dir or os.path.join(comfy_dir, "models")
+        payload = {
+            "comfy_path": normalize_signature_path(comfy_path),
+            "comfy_url": runtime.base_url,
+            "server_address": runtime.server_address,
+            "comfy_dir": normalize_signature_path(comfy_dir),
+            "python_exe": normalize_signature_path(str(runtime.python_exe or "")),
+            "custom_nodes": self.directory_inventory(os.path.join(comfy_dir, "custom_nodes")),
+            "model_roots": self.directory_inventory(models_dir),
+        }
+        with self._lock:
+            self._environment = (comfy_path, time.monotonic(), payload)
+        return payload
+
+
+def _scan_inventory(root: str) -> Optional[List[Tuple[str, int]]]:
+    entries: List[Tuple[str, int]] = []
+    try:
+        for entry in os.scandir(root):
+            try:
+                mtime_ns = entry.stat(follow_symlinks=False).st_mtime_ns
+            except OSError:
+                mtime_ns = 0
+            entries.append((entry.name.lower(), mtime_ns))
+    except OSError:
+        return None
+    entries.sort()
+    return entries
+
+
+def normalize_signature_path(path: str) -> str:
+    if not path:
+        return ""
+    return os.path.normcase(os.path.abspath(os.path.normpath(path)))
+
+
+_SERVICE = ValidationSignatureService()
+
+
+def get_validation_signature_service() -> ValidationSignatureService:
+    return _SERVICE
+
+
+def compute_validation_signature(remote_folder: str) -> str:
+    """Fingerprint inputs that can make a previously validated override stale."""
+    return _SERVICE.signature(remote_folder)
+
+
+def invalidate_validation_signatures() -> None:
+    """Drop shared runtime state after Charon installs models or custom nodes."""
+    _SERVICE.invalidate()
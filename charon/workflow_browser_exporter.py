@@ -7,6 +7,7 @@ import os
 import socket
 import subprocess
 import sys
+import threading
 import time
 import urllib.error
 import urllib.request
@@ -169,92 +170,114 @@ def start_comfy_server(comfy_dir: Path, python_exe: str | None = None) -> subpro
     return proc
 
 
+async def open_settled_page(browser):
+    """Open the ComfyUI frontend and wait until its startup workflow has settled."""
+    page = await browser.new_page()
+    await page.goto("http://127.0.0.1:8188", wait_until="load", timeout=120000)
+    await page.wait_for_function(
+        "window.comfyAPI && window.comfyAPI.app && window.comfyAPI.app.app && "
+        "window.comfyAPI.app.app.graph",
+        timeout=120000,
+    )
+    await page.wait_for_function(
+        "window.LiteGraph && window.LiteGraph.registered_node_types && "
+        "Object.keys(window.LiteGraph.registered_node_types).length > 0",
+        timeout=240000,
+    )
+    # ComfyUI exposes app.graph before extension setup and its default workflow
+    # restoration have completed. Loading during that window is silently
+    # overwritten by the startup workflow a few moments later.
+    await page.wait_for_timeout(5000)
+    await page.wait_for_function(
+        """() => {
+          const types = window.LiteGraph?.registered_node_types || {};
+          const graph = window.comfyAPI?.app?.app?.graph;
+          const signature = `${Object.keys(types).length}:${graph?._nodes?.length ?? -1}`;
+          const now = Date.now();
+          const state = window.__charonFrontendSettle;
+          if (!state || state.signature !== signature) {
+            window.__charonFrontendSettle = { signature, since: now };
+            return false;
+          }
+          return Object.keys(types).length > 0 && now - state.since >= 2000;
+        }""",
+        timeout=120000,
+        polling=250,
+    )
+    return page
+
+
+async def page_is_healthy(page) -> bool:
+    """Return whether a previously settled page can still export graphs."""
+    if page.is_closed():
+        return False
+    try:
+        return bool(
+            await page.evaluate("() => Boolean(window.comfyAPI?.app?.app?.graph)")
+        )
+    except Exception:
+        return False
+
+
+async def export_graph(page, workflow: dict) -> dict:
+    """Load ``workflow`` into a settled page and return its API prompt."""
+    return await page.evaluate(
+        """async ({ workflow }) => {
+          const app = window.comfyAPI.app.app;
+          const expectedNodes = Array.isArray(workflow.nodes) ? workflow.nodes : [];
+          const expected = new Map(
+            expectedNodes
+              .filter((node) => node && node.id !== undefined && node.id !== null)
+              .map((node) => [String(node.id), String(node.type || "")])
+          );
+          if (!expected.size) {
+            throw new Error("Requested workflow contains no graph nodes");
+          }
+          app.graph.clear();
+          const loadResult = app.loadGraphData(workflow, true);
+          if (loadResult && typeof loadResult.then === "function") {
+            await loadResult;
+          }
+          const deadline = Date.now() + 60000;
+          let mismatch = "graph did not load";
+          while (Date.now() < deadline) {
+            const graphNodes = Array.isArray(app.graph?._nodes) ? app.graph._nodes : [];
+            const actual = new Map(
+              graphNodes.map((node) => [String(node.id), String(node.type || "")])
+            );
+            const missing = [];
+            const wrongTypes = [];
+            for (const [id, type] of expected) {
+              if (!actual.has(id)) missing.push(id);
+              else if (type && actual.get(id) !== type) wrongTypes.push(id);
+            }
+            if (!missing.length && !wrongTypes.length && actual.size === expected.size) {
+              await new Promise((resolve) => requestAnimationFrame(resolve));
+              await new Promise((resolve) => requestAnimationFrame(resolve));
+              const res = await app.graphToPrompt(app.graph);
+              return res.output;
+            }
+            mismatch = `missing=${missing.slice(0, 8).join(",")} ` +
+              `wrongTypes=${wrongTypes.slice(0, 8).join(",")} ` +
+              `expected=${expected.size} actual=${actual.size}`;
+            await new Promise((resolve) => setTimeout(resolve, 100));
+          }
+          throw new Error(`Loaded graph did not match requested workflow: ${mismatch}`);
+        }""",
+        {"workflow": workflow},
+    )
+
+
 async def export_workflow(playwright, workflow_path: Path, output_path: Path) -> None:
     """Drive the real ComfyUI frontend and export the workflow via graphToPrompt."""
     browser = await playwright.chromium.launch(headless=True)
     try:
-        page = await browser.new_page()
-
-        await page.goto("http://127.0.0.1:8188", wait_until="load", timeout=120000)
-        await page.wait_for_function(
-            "window.comfyAPI && window.comfyAPI.app && window.comfyAPI.app.app && "
-            "window.comfyAPI.app.app.graph",
-            timeout=120000,
-        )
-        await page.wait_for_function(
-            "window.LiteGraph && window.LiteGraph.registered_node_types && "
-            "Object.keys(window.LiteGraph.registered_node_types).length > 0",
-            timeout=240000,
-        )
-        # ComfyUI exposes app.graph before extension setup and its default workflow
-        # restoration have completed. Loading during that window is silently
-        # overwritten by the startup workflow a few moments later.
-        await page.wait_for_timeout(5000)
-        await page.wait_for_function(
-            """() => {
-              const types = window.LiteGraph?.registered_node_types || {};
-              const graph = window.comfyAPI?.app?.app?.graph;
-              const signature = `${Object.keys(types).length}:${graph?._nodes?.length ?? -1}`;
-              const now = Date.now();
-              const state = window.__charonFrontendSettle;
-              if (!state || state.signature !== signature) {
-                window.__charonFrontendSettle = { signature, since: now };
-                return false;
-              }
-              return Object.keys(types).length > 0 && now - state.since >= 2000;
-            }""",
-            timeout=120000,
-            polling=250,
-        )
+        page = await open_settled_page(browser)
 
         with open(workflow_path, "r", encoding="utf-8") as handle:
             workflow_json = json.load(handle)
 
-        prompt = await page.evaluate(
-            """async ({ workflow }) => {
-              const app = window.comfyAPI.app.app;
-              const expectedNodes = Array.isArray(workflow.nodes) ? workflow.nodes : [];
-              const expected = new Map(
-                expectedNodes
-                  .filter((node) => node && node.id !== undefined && node.id !== null)
-                  .map((node) => [String(node.id), String(node.type || "")])
-              );
-              if (!expected.size) {
-                throw new Error("Requested workflow contains no graph nodes");
-              }
-              app.graph.clear();
-              const loadResult = app.loadGraphData(workflow, true);
-              if (loadResult && typeof loadResult.then === "function") {
-                await loadResult;
-              }
-              const deadline = Date.now() + 60000;
-              let mismatch = "graph did not load";
-              while (Date.now() < deadline) {
-                const graphNodes = Array.isArray(app.graph?._nodes) ? app.graph._nodes : [];
-                const actual = new Map(
-                  graphNodes.map((node) => [String(node.id), String(node.type || "")])
-                );
-                const missing = [];
-                const wrongTypes = [];
-                for (const [id, type] of expected) {
-                  if (!actual.has(id)) missing.push(id);
-                  else if (type && actual.get(id) !== type) wrongTypes.push(id);
-                }
-                if (!missing.length && !wrongTypes.length && actual.size === expected.size) {
-                  await new Promise((resolve) => requestAnimationFrame(resolve));
-                  await new Promise((resolve) => requestAnimationFrame(resolve));
-                  const res = await app.graphToPrompt(app.graph);
-                  return res.output;
-                }
-                mismatch = `missing=${missing.slice(0, 8).join(",")} ` +
-                  `wrongTypes=${wrongTypes.slice(0, 8).join(",")} ` +
-                  `expected=${expected.size} actual=${actual.size}`;
-                await new Promise((resolve) => setTimeout(resolve, 100));
-              }
-              throw new Error(`Loaded graph did not match requested workflow: ${mismatch}`);
-            }""",
-            {"workflow": workflow_json},
-        )
+        prompt = await export_graph(page, workflow_json)
 
         with open(output_path, "w", encoding="utf-8") as handle:
             json.dump(prompt, handle, indent=2)
@@ -262,9 +285,8 @@ async def export_workflow(playwright, workflow_path: Path, output_path: Path) ->
         await browser.close()
 
 
-def run_export_sync(workflow_path: str, output_path: str, comfy_dir: str) -> None:
-    """Run the browser export end-to-end using the current interpreter."""
-    ensure_playwright_installed()
+def _acquire_comfy_server(comfy_dir: Path) -> subprocess.Popen | None:
+    """Reuse the configured ComfyUI on port 8188 or launch it; return the owned process."""
     proc: subprocess.Popen | None = None
     reuse_existing = _port_open(DEFAULT_PORT)
     if reuse_existing and not _comfy_health_ok(DEFAULT_PORT):
@@ -272,12 +294,60 @@ def run_export_sync(workflow_path: str, output_path: str, comfy_dir: str) -> Non
             "Port 8188 is already in use, but it does not look like a ComfyUI server."
         )
     if not reuse_existing:
-        proc = start_comfy_server(Path(comfy_dir))
+        proc = start_comfy_server(comfy_dir)
     try:
         if proc:
-            _wait_for_server_identity(Path(comfy_dir), DEFAULT_PORT)
+            _wait_for_server_identity(comfy_dir, DEFAULT_PORT)
         else:
-            _verify_server_identity(Path(comfy_dir), DEFAULT_PORT)
+            _verify_server_identity(comfy_dir, DEFAULT_PORT)
+    except BaseException:
+        _release_comfy_server(proc)
+        raise
+    return proc
+
+
+def _comfy_server_in_use(port: int = DEFAULT_PORT, timeout: float = 3.0) -> bool:
+    """Return whether any client has queued work on the server; unknown counts as in use."""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/queue", timeout=timeout) as response:
+            queue_state = json.loads(response.read().decode("utf-8", errors="replace"))
+        with urllib.request.urlopen(
+            f"http://127.0.0.1:{port}/history?max_items=1", timeout=timeout
+        ) as response:
+            history = json.loads(response.read().decode("utf-8", errors="replace"))
+    except (OSError, urllib.error.URLError, ValueError):
+        return True
+    if not isinstance(queue_state, dict):
+        return True
+    # Exports never queue prompts, so any queue or history entry is another client's.
+    return bool(queue_state.get("queue_running") or queue_state.get("queue_pending") or history)
+
+
+def _release_comfy_server(proc: subprocess.Popen | None, *, shared: bool = False) -> None:
+    """Stop a server this exporter launched.
+
+    A ``shared`` server was reachable by other clients for the life of a
+    serving worker; it keeps running once any of them queued work on it.
+    """
+    if proc and proc.poll() is None:
+        if shared and _comfy_server_in_use():
+            print(
+                "Leaving the ComfyUI server running; other clients have used it.",
+                file=sys.stderr,
+            )
+            return
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except Exception:
+            pass
+
+
+def run_export_sync(workflow_path: str, output_path: str, comfy_dir: str) -> None:
+    """Run the browser export end-to-end using the current interpreter."""
+    ensure_playwright_installed()
+    proc = _acquire_comfy_server(Path(comfy_dir))
+    try:
         from playwright.async_api import async_playwright
 
         async def _runner() -> None:
@@ -286,26 +356,156 @@ def run_export_sync(workflow_path: str, output_path: str, comfy_dir: str) -> Non
 
         asyncio.run(_runner())
     finally:
-        if proc:
-            proc.terminate()
+        _release_comfy_server(proc)
+
+
+async def serve_exports(playwright, read_request, send_reply, idle_timeout: float) -> None:
+    """Answer export requests from one warm, settled frontend page.
+
+    ``read_request`` returns the next request dict, or None on EOF/idle
+    timeout. Each reply echoes the request ``id``. ``convert`` exports a UI
+    workflow; ``evaluate`` runs a caller-supplied page script with ``arg``;
+    ``reload`` reopens the page so it picks up ComfyUI's current node registry.
+    """
+    browser = await playwright.chromium.launch(headless=True)
+    try:
+        page = await open_settled_page(browser)
+        send_reply({"event": "ready", "pid": os.getpid()})
+        while True:
+            request = await read_request(idle_timeout)
+            if request is None:
+                return
+            request_id = request.get("id")
+            op = request.get("op")
+            if op == "shutdown":
+                send_reply({"id": request_id, "ok": True})
+                return
+            if op == "ping":
+                send_reply({"id": request_id, "ok": True})
+                continue
+            if op == "reload":
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+                try:
+                    page = await open_settled_page(browser)
+                except Exception as exc:
+                    send_reply({"id": request_id, "ok": False, "error": f"Page reload failed: {exc}"})
+                    return
+                send_reply({"id": request_id, "ok": True})
+                continue
+            if op not in ("convert", "evaluate"):
+                send_reply({"id": request_id, "ok": False, "error": f"Unknown op: {op!r}"})
+                continue
+            if not await page_is_healthy(page):
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+                page = await open_settled_page(browser)
+            started = time.monotonic()
             try:
-                proc.wait(timeout=10)
-            except Exception:
-                pass
+                if op == "convert":
+                    reply = {"prompt": await export_graph(page, request.get("workflow") or {})}
+                else:
+                    # Charon's validator runs its own page script against the settled frontend.
+                    reply = {"result": await page.evaluate(request.get("script") or "", request.get("arg"))}
+            except Exception as exc:
+                send_reply({"id": request_id, "ok": False, "error": str(exc)})
+                continue
+            reply.update({"id": request_id, "ok": True, "seconds": round(time.monotonic() - started, 3)})
+            send_reply(reply)
+    finally:
+        await browser.close()
+
+
+def run_export_server(comfy_dir: str, idle_timeout: float = 900.0) -> None:
+    """Serve JSON-line export requests on stdin until EOF, shutdown, or idle timeout."""
+    # Replies own stdout; stray prints from libraries go to stderr instead.
+    protocol = sys.stdout
+    sys.stdout = sys.stderr
+
+    def send_reply(payload: dict) -> None:
+        protocol.write(json.dumps(payload) + "\n")
+        protocol.flush()
+
+    try:
+        ensure_playwright_installed()
+        proc = _acquire_comfy_server(Path(comfy_dir))
+    except Exception as exc:
+        send_reply({"event": "failed", "error": str(exc)})
+        return
+    try:
+        from playwright.async_api import async_playwright
+
+        async def _runner() -> None:
+            loop = asyncio.get_running_loop()
+            lines: asyncio.Queue = asyncio.Queue()
+
+            def _pump_stdin() -> None:
+                for line in sys.stdin:
+                    loop.call_soon_threadsafe(lines.put_nowait, line)
+                loop.call_soon_threadsafe(lines.put_nowait, None)
+
+            threading.Thread(target=_pump_stdin, daemon=True).start()
+
+            async def read_request(timeout: float):
+                while True:
+                    try:
+                        line = await asyncio.wait_for(lines.get(), timeout=timeout or None)
+                    except asyncio.TimeoutError:
+                        return None
+                    if line is None:
+                        return None
+                    if not line.strip():
+                        continue
+                    try:
+                        request = json.loads(line)
+                    except ValueError as exc:
+                        send_reply({"id": None, "ok": False, "error": f"Bad request: {exc}"})
+                        continue
+                    if isinstance(request, dict):
+                        return request
+
+            async with async_playwright() as p:
+                await serve_exports(p, read_request, send_reply, idle_timeout)
+
+        asyncio.run(_runner())
+    except Exception as exc:
+        send_reply({"event": "failed", "error": str(exc)})
+    finally:
+        _release_comfy_server(proc, shared=True)
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Export ComfyUI web workflow JSON to API JSON using the real frontend."
     )
-    parser.add_argument("--workflow", required=True, help="Path to the web workflow JSON.")
-    parser.add_argument("--output", required=True, help="Where to write the API JSON.")
+    parser.add_argument("--workflow", help="Path to the web workflow JSON.")
+    parser.add_argument("--output", help="Where to write the API JSON.")
     parser.add_argument(
         "--comfy-dir",
         required=True,
         help="Path to the ComfyUI directory (folder containing main.py).",
     )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Keep the frontend loaded and answer JSON-line requests on stdin.",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=900.0,
+        help="Seconds without requests before --serve exits.",
+    )
     args = parser.parse_args()
+    if args.serve:
+        run_export_server(args.comfy_dir, idle_timeout=args.idle_timeout)
+        return
+    if not args.workflow or not args.output:
+        parser.error("--workflow and --output are required unless --serve is given")
     run_export_sync(args.workflow, args.output, args.comfy_dir)
 
 
@@ -0,0 +1,320 @@
+"""Long-lived browser-export worker for UI-to-API workflow conversion."""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import itertools
+import json
+import logging
+import os
+import queue
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from . import config
+from .comfy_client import ComfyUIClient
+from .conversion_cache import compute_comfy_cache_identity
+from .paths import get_charon_temp_dir
+from .validation_signature import get_validation_signature_service
+
+
+logger = logging.getLogger(__name__)
+
+# Loads the exporter by path so Charon's package folder never lands on the
+# embedded interpreter's sys.path, mirroring the one-shot runner script.
+_BOOTSTRAP = """import importlib.util
+import sys
+
+spec = importlib.util.spec_from_file_location("workflow_browser_exporter", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+sys.argv = sys.argv[1:]
+module.main()
+"""
+
+_EOF = object()
+# The exporter's page always loads the fixed local endpoint.
+_WORKER_URL = "http://127.0.0.1:8188"
+
+
+class ConversionDaemonError(RuntimeError):
+    """The warm worker is unavailable; callers may fall back to a one-shot export."""
+
+
+class ConversionJobError(RuntimeError):
+    """The warm frontend rejected the requested job."""
+
+
+def comfy_runtime_key(comfy_dir: str) -> str:
+    """Identify the node registry a freshly loaded page would see, or "" when unknown.
+
+    Combines the running server's identity with the ``custom_nodes`` inventory,
+    so installing, removing, or updating a node pack changes the key.
+    """
+    stats = ComfyUIClient(_WORKER_URL, request_timeout=5, connect_timeout=2).get_system_stats()
+    if not isinstance(stats, dict):
+        return ""
+    payload = {
+        "identity": compute_comfy_cache_identity(stats, comfy_dir),
+        "custom_nodes": get_validation_signature_service().directory_inventory(
+            os.path.join(comfy_dir, "custom_nodes")
+        ),
+    }
+    serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class ConversionDaemon:
+    """One embedded-Python exporter process holding a settled ComfyUI page."""
+
+    def __init__(
+        self,
+        python_exe: str,
+        comfy_dir: str,
+        exporter_path: str,
+        *,
+        idle_timeout: float = 900.0,
+    ):
+        self.python_exe = python_exe
+        self.comfy_dir = comfy_dir
+        self.exporter_path = exporter_path
+        self.idle_timeout = float(idle_timeout)
+        self._process: Optional[subprocess.Popen] = None
+        self._replies: "queue.Queue[Any]" = queue.Queue()
+        self._stderr_tail: Deque[str] = deque(maxlen=200)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # Runtime key the page's node registry was loaded under.
+        self.runtime_key = ""
+        self._reload_pending = False
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self, timeout: float) -> None:
+        """Launch the worker and block until its frontend page has settled."""
+        cwd = os.path.join(get_charon_temp_dir(), "temp")
+        os.makedirs(cwd, exist_ok=True)
+        env = os.environ.copy()
+        env.setdefault("PYTHONIOENCODING", "utf-8")
+        command = [
+            self.python_exe,
+            "-u",
+            "-c",
+            _BOOTSTRAP,
+            self.exporter_path,
+            "--serve",
+            "--comfy-dir",
+            self.comfy_dir,
+            "--idle-timeout",
+            str(self.idle_timeout),
+        ]
+        logger.info("Starting warm conversion worker for %s", self.comfy_dir)
+        try:
+            self._process = subprocess.Popen(
+                command,
+                cwd=cwd,
+                env=env,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1,
+            )
+        except OSError as exc:
+            raise ConversionDaemonError(f"Could not launch conversion worker: {exc}") from exc
+        threading.Thread(
+            target=self._pump_stdout,
+            args=(self._process.stdout,),
+            name="charon-convert-out",
+            daemon=True,
+        ).start()
+        threading.Thread(
+            target=self._pump_stderr,
+            args=(self._process.stderr,),
+            name="charon-convert-err",
+            daemon=True,
+        ).start()
+        reply = self._next_reply(timeout)
+        if reply.get("event") != "ready":
+            self.close()
+            raise ConversionDaemonError(
+                f"Conversion worker failed to start: {reply.get('error') or reply}"
+            )
+
+    def mark_stale(self) -> None:
+        """Reload the page before the next job, whatever its runtime key."""
+        self._reload_pending = True
+
+    def ensure_current(self, runtime_key: str, *, timeout: float) -> None:
+        """Reload the page when ComfyUI's runtime key changed since it loaded."""
+        changed = bool(runtime_key) and runtime_key != self.runtime_key
+        if not (changed or self._reload_pending):
+            return
+        if self.runtime_key or self._reload_pending:
+            logger.info("ComfyUI nodes changed; reloading the warm conversion page")
+            try:
+                self._call({"op": "reload"}, timeout)
+            except ConversionJobError as exc:
+                # A page that cannot reload would answer from the old registry.
+                self.close()
+                raise ConversionDaemonError(f"Conversion worker could not reload: {exc}") from exc
+        self._reload_pending = False
+        if runtime_key:
+            self.runtime_key = runtime_key
+
+    def convert(self, ui_workflow: Dict[str, Any], *, timeout: float) -> Dict[str, Any]:
+        """Convert one UI workflow on the warm page and return its API prompt."""
+        reply = self._call({"op": "convert", "workflow": ui_workflow}, timeout)
+        prompt = reply.get("prompt")
+        if not isinstance(prompt, dict):
+            raise ConversionJobError("Browser export returned an unexpected payload.")
+        return prompt
+
+    def evaluate(self, script: str, arg: Any = None, *, timeout: float) -> Any:
+        """Run ``script`` on the warm page with ``arg`` and return its result."""
+        return self._call({"op": "evaluate", "script": script, "arg": arg}, timeout).get("result")
+
+    def _call(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        with self._lock:
+            if not self.alive:
+                raise ConversionDaemonError("Conversion worker is not running.")
+            request_id = next(self._ids)
+            self._send(dict(payload, id=request_id))
+            deadline = time.monotonic() + max(1.0, float(timeout))
+            while True:
+                reply = self._next_reply(deadline - time.monotonic())
+                if reply.get("id") == request_id:
+                    break
+        if not reply.get("ok"):
+            raise ConversionJobError(str(reply.get("error") or "unknown conversion error"))
+        return reply
+
+    def close(self) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            if process.poll() is None and process.stdin:
+                process.stdin.write(json.dumps({"op": "shutdown"}) + "\n")
+                process.stdin.flush()
+                process.stdin.close()
+            process.wait(timeout=10)
+        except Exception:
+            process.kill()
+
+    def stderr_tail(self, limit: int = 4000) -> str:
+        return "\n".join(self._stderr_tail)[-limit:]
+
+    def _send(self, payload: Dict[str, Any]) -> None:
+        try:
+            self._process.stdin.write(json.dumps(payload) + "\n")
+            self._process.stdin.flush()
+        except (OSError, ValueError) as exc:
+            self.close()
+            raise ConversionDaemonError(f"Conversion worker pipe closed: {exc}") from exc
+
+    def _next_reply(self, timeout: float) -> Dict[str, Any]:
+        try:
+            reply = self._replies.get(timeout=max(0.0, timeout))
+        except queue.Empty:
+            # A worker that misses its deadline is wedged; never reuse it.
+            self.close()
+            raise ConversionDaemonError("Conversion worker timed out.") from None
+        if reply is _EOF:
+            self.close()
+            detail = self.stderr_tail()
+            suffix = f"\n\nLast worker output:\n{detail}" if detail else ""
+            raise ConversionDaemonError(f"Conversion worker exited.{suffix}")
+        return reply
+
+    def _pump_stdout(self, stream) -> None:
+        try:
+            for line in stream:
+                try:
+                    reply = json.loads(line)
+                except ValueError:
+                    self._stderr_tail.append(line.rstrip())
+                    continue
+                if isinstance(reply, dict):
+                    self._replies.put(reply)
+        except (OSError, ValueError):
+            pass
+        self._replies.put(_EOF)
+
+    def _pump_stderr(self, stream) -> None:
+        try:
+            for line in stream:
+                self._stderr_tail.append(line.rstrip())
+        except (OSError, ValueError):
+            pass
+
+
+_DAEMONS: Dict[Tuple[str, str], ConversionDaemon] = {}
+_FAILED_UNTIL: Dict[Tuple[str, str], float] = {}
+_DAEMONS_LOCK = threading.Lock()
+
+
+def get_conversion_daemon(python_exe: str, comfy_dir: str, exporter_path: str) -> ConversionDaemon:
+    """Return a running worker for this ComfyUI install, starting one if needed.
+
+    A running worker whose page loaded under a different runtime key, or was
+    marked stale, reloads its page first.
+    """
+    key = (os.path.normcase(os.path.abspath(python_exe)), os.path.normcase(os.path.abspath(comfy_dir)))
+    start_timeout = float(getattr(config, "WORKFLOW_CONVERSION_DAEMON_START_SEC", 300))
+    with _DAEMONS_LOCK:
+        daemon = _DAEMONS.get(key)
+        if daemon is not None and daemon.alive:
+            daemon.ensure_current(comfy_runtime_key(comfy_dir), timeout=start_timeout)
+            return daemon
+        if time.monotonic() < _FAILED_UNTIL.get(key, 0.0):
+            raise ConversionDaemonError("Conversion worker failed recently; not retrying yet.")
+        daemon = ConversionDaemon(
+            python_exe,
+            comfy_dir,
+            exporter_path,
+            idle_timeout=float(getattr(config, "WORKFLOW_CONVERSION_DAEMON_IDLE_SEC", 900)),
+        )
+        try:
+            daemon.start(start_timeout)
+            daemon.runtime_key = comfy_runtime_key(comfy_dir)
+        except Exception:
+            _FAILED_UNTIL[key] = time.monotonic() + float(
+                getattr(config, "WORKFLOW_CONVERSION_DAEMON_RETRY_SEC", 300)
+            )
+            raise
+        _FAILED_UNTIL.pop(key, None)
+        _DAEMONS[key] = daemon
+        return daemon
+
+
+def reset_conversion_daemons() -> None:
+    """Make every warm worker reload its page before its next job.
+
+    Call after Charon repairs custom nodes or ComfyUI restarts: either can
+    change the node registry without changing the runtime key.
+    """
+    with _DAEMONS_LOCK:
+        for daemon in _DAEMONS.values():
+            daemon.mark_stale()
+        _FAILED_UNTIL.clear()
+
+
+def shutdown_conversion_daemons() -> None:
+    """Stop every warm worker started by this process."""
+    with _DAEMONS_LOCK:
+        daemons = list(_DAEMONS.values())
+        _DAEMONS.clear()
+    for daemon in daemons:
+        daemon.close()
+
+
+atexit.register(shutdown_conversion_daemons)
@@ -26,6 +26,22 @@ def iter_workflow_node_dicts(document: Dict[str, Any]) -> Iterable[Dict[str, Any
         yield node
 
 
+def subgraph_definitions(document: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Return frontend subgraph definitions, including nested ones, keyed by id."""
+    definitions: Dict[str, Dict[str, Any]] = {}
+    if not isinstance(document, dict):
+        return definitions
+    pending = list(_iter_subgraphs(document))
+    while pending:
+        subgraph = pending.pop()
+        subgraph_id = subgraph.get("id")
+        if subgraph_id is None or str(subgraph_id) in definitions:
+            continue
+        definitions[str(subgraph_id)] = subgraph
+        pending.extend(_iter_subgraphs(subgraph))
+    return definitions
+
+
 def _iter_frontend_graph_nodes(graph: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
     nodes = graph.get("nodes")
     if isinstance(nodes, list):
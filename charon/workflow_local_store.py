@@ -13,15 +13,15 @@ from . import config, preferences
 from .charon_logger import system_debug, system_warning
 from .conversion_cache import clear_conversion_cache, compute_workflow_hash
 from .json_io import atomic_write_json
-from .model_manifest import model_manifest_hash
 from .path_safety import is_path_inside, relative_path_from_root
-from .comfy_environment import resolve_comfy_runtime
+from .validation_signature import compute_validation_signature
 
 LOCAL_REPO_DIR = "Charon_repo_local"
 LOCAL_WORKFLOW_DIR = "workflow"
 VALIDATED_FILENAME = "workflow_validated.json"
 STATE_FILENAME = "workflow_state.json"
 CACHE_DIR_NAME = ".charon_cache"
+VALIDATION_DIR_NAME = "validation"
 
 # Legacy migration support (deprecated as of 2025-12-22)
 # TODO: Remove after Q1 2026 when all users have migrated
@@ -31,7 +31,6 @@ LEGACY_CACHE_SUBDIR = ".charon_cache"
 
 VALIDATION_LOG_FILENAME = "validation_log.json"
 RESOLVE_STATUS_FILENAME = "validation_resolve_status.json"
-CHARON_METADATA_FILENAME = ".charon.json"
 
 
 class WorkflowState(Dict[str, Any]):
@@ -379,59 +378,6 @@ def _write_json(path: str, payload: Dict[str, Any]) -> None:
     atomic_write_json(path, payload)
 
 
-def compute_validation_signature(remote_folder: str) -> str:
-    """Fingerprint inputs that can make a previously validated override stale."""
-    comfy_path = str(preferences.get_preference("comfyui_launch_path", "") or "").strip()
-    runtime = resolve_comfy_runtime(comfy_path)
-    comfy_dir = runtime.comfy_dir
-    models_dir = runtime.models_dir or os.path.join(comfy_dir, "models")
-    payload = {
-        "comfy_path": _normalize_signature_path(comfy_path),
-        "comfy_url": runtime.base_url,
-        "server_address": runtime.server_address,
-        "comfy_dir": _normalize_signature_path(comfy_dir),
-        "python_exe": _normalize_signature_path(str(runtime.python_exe or "")),
-        "metadata_hash": _metadata_hash(remote_folder),
-        "model_manifest_hash": model_manifest_hash(remote_folder),
-        "custom_nodes": _directory_inventory(os.path.join(comfy_dir, "custom_nodes")),
-        "model_roots": _directory_inventory(models_dir),
-    }
-    serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"))
-    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
-
-
-def _metadata_hash(remote_folder: str) -> str:
-    metadata_path = os.path.join(remote_folder, CHARON_METADATA_FILENAME)
-    try:
-        with open(metadata_path, "rb") as handle:
-            return hashlib.sha256(handle.read()).hexdigest()
-    except OSError:
-        return ""
-
-
-def _directory_inventory(root: str) -> list[tuple[str, int]]:
-    if not root or not os.path.isdir(root):
-        return []
-    entries: list[tuple[str, int]] = []
-    try:
-        for entry in os.scandir(root):
-            try:
-                mtime_ns = entry.stat(follow_symlinks=False).st_mtime_ns
-            except OSError:
-                mtime_ns = 0
-            entries.append((entry.name.lower(), mtime_ns))
-    except OSError:
-        return []
-    entries.sort()
-    return entries
-
-
-def _normalize_signature_path(path: str) -> str:
-    if not path:
-        return ""
-    return os.path.normcase(os.path.abspath(os.path.normpath(path)))
-
-
 def write_validation_raw(remote_folder: str, payload: Dict[str, Any], *, overwrite: bool = False) -> None:
     if not remote_folder or not isinstance(payload, dict):
         return
@@ -474,7 +420,7 @@ def append_validation_resolve_entry(remote_folder: str, entry: Dict[str, Any]) -
 
 def get_validation_cache_root(remote_folder: str, *, ensure: bool = True) -> Path:
     folder = Path(get_local_workflow_folder(remote_folder, ensure=ensure))
-    cache_root = folder / CACHE_DIR_NAME / "validation"
+    cache_root = folder / CACHE_DIR_NAME / VALIDATION_DIR_NAME
     if ensure:
         cache_root.mkdir(parents=True, exist_ok=True)
     return cache_root
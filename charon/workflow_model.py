@@ -1,13 +1,11 @@
 from .qt_compat import QtCore, QtGui
 from .metadata_manager import get_charon_config
 from .utilities import get_software_color_for_metadata
-from .cache_manager import get_cache_manager
-from .charon_logger import system_debug, log_user_action_detail
-from .network_optimizer import get_batch_reader
+from .charon_logger import log_user_action_detail
+from .library_index import get_library_index
 from .path_safety import is_path_inside
 import os
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 class ScriptItem:
     def __init__(self, name, path, metadata=None, host="None"):
@@ -64,8 +62,6 @@ class GlobalIndexLoader(BaseScriptLoader):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.base_path = None
-        # Be resource-aware: use a reasonable number of threads.
-        self.max_workers = min(4, (os.cpu_count() or 1))
 
     def load_index(self, base_path):
         if self.isRunning():
@@ -77,57 +73,23 @@ class GlobalIndexLoader(BaseScriptLoader):
         self._should_stop = False
         self.start()
 
-    def _scan_folder(self, folder_name, folder_path):
-        """Scans a single folder and returns a list of script data tuples."""
-        results = []
-        if not os.path.isdir(folder_path):
-            return results
-        try:
-            for script in os.listdir(folder_path):
-                if self._should_stop:
-                    break
-                script_path = os.path.join(folder_path, script)
-                if os.path.isdir(script_path):
-                    display = f"{folder_name} > {script}"
-                    metadata = get_charon_config(script_path)
-                    results.append((display, script_path, metadata))
-        except Exception as e:
-            from .charon_logger import system_error
-            system_error(f"Error scanning folder {folder_path}: {e}")
-        return results
-
     def run(self):
         if not self.base_path or not os.path.exists(self.base_path):
             self.index_loaded.emit([])
             return
 
-        all_results = []
-        folders_to_scan = []
-
         try:
-            for folder in os.listdir(self.base_path):
-                if self._should_stop: return
-                folders_to_scan.append((folder, os.path.join(self.base_path, folder)))
-
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                future_to_folder = {executor.submit(self._scan_folder, name, path): name for name, path in folders_to_scan}
-                
-                for future in as_completed(future_to_folder):
-                    if self._should_stop:
-                        for f in future_to_folder: f.cancel()
-                        return
-                    
-                    try:
-                        folder_results = future.result()
-                        if folder_results:
-                            all_results.extend(folder_results)
-                    except Exception as exc:
-                        folder_name = future_to_folder[future]
-                        from .charon_logger import system_error
-                        system_error(f'Folder {folder_name} generated an exception: {exc}')
-
+            entries = get_library_index().all_entries(
+                self.base_path,
+                stop_callback=lambda: self._should_stop,
+            )
             if not self._should_stop:
-                self.index_loaded.emit(all_results)
+                self.index_loaded.emit(
+                    [
+                        (f"{os.path.basename(entry.folder_path)} > {entry.name}", entry.path, entry.metadata)
+                        for entry in entries
+                    ]
+                )
         except Exception as e:
             from .charon_logger import system_error
             system_error(f"Error preparing global index: {e}")
@@ -257,99 +219,32 @@ class FolderLoader(BaseScriptLoader):
                 self.scripts_loaded.emit([])
             return
         
-        cache_manager = get_cache_manager()
-        batch_reader = get_batch_reader()
         start_time = time.perf_counter()
         
         try:
-            # Check cache first
-            cached_contents = cache_manager.get_folder_contents(self.folder_path)
-            
-            if cached_contents:
-                # Use cached folder contents
-                script_paths = cached_contents
-                system_debug(f"Using cached folder contents for {self.folder_path}")
-                log_user_action_detail(
-                    "script_folder_cache_hit",
-                    folder_path=self.folder_path,
-                    host=self.host,
-                    count=len(script_paths),
-                )
-            else:
-                # First pass: collect all directories
-                script_paths = []
-                with os.scandir(self.folder_path) as entries:
-                    for entry in entries:
-                        if self._should_stop:
-                            log_user_action_detail(
-                                "script_folder_cancelled_during_scan",
-                                folder_path=self.folder_path,
-                                host=self.host,
-                            )
-                            return
-                        
-                        if entry.is_dir() and not entry.name.startswith('.'):
-                            script_paths.append((entry.path, entry.name))
-                
-                # Cache the folder contents
-                cache_manager.cache_folder_contents(self.folder_path, script_paths)
-                log_user_action_detail(
-                    "script_folder_scanned",
-                    folder_path=self.folder_path,
-                    host=self.host,
-                    count=len(script_paths),
-                )
+            # The library index re-lists the folder and re-reads only changed metadata.
+            entries = get_library_index().folder_entries(
+                self.folder_path,
+                stop_callback=lambda: self._should_stop or self.isInterruptionRequested(),
+            )
+            log_user_action_detail(
+                "script_folder_indexed",
+                folder_path=self.folder_path,
+                host=self.host,
+                count=len(entries),
+            )
             
-            # Use batch operations for metadata
             items = []
-            
-            if script_paths:
-                # Check if we have cached batch metadata
-                batch_metadata_key = f"batch_metadata:{self.folder_path}"
-                cached_metadata = cache_manager.get_cached_data(batch_metadata_key)
-                
-                if cached_metadata:
-                    # Use cached metadata
-                    metadata_map = cached_metadata
-                    system_debug(f"Using cached batch metadata for {self.folder_path}")
-                    log_user_action_detail(
-                        "script_metadata_cache_hit",
-                        folder_path=self.folder_path,
-                        host=self.host,
-                        count=len(metadata_map),
-                    )
-                else:
-                    # Batch load all metadata at once (cancellable)
-                    metadata_map = batch_reader.batch_read_metadata(
-                        self.folder_path,
-                        stop_callback=lambda: self._should_stop or self.isInterruptionRequested()
-                    )
-                    # Cache it
-                    cache_manager.cache_data(batch_metadata_key, metadata_map, ttl_seconds=600)
+            for entry in entries:
+                if self._should_stop:
                     log_user_action_detail(
-                        "script_metadata_loaded",
+                        "script_folder_cancelled_during_item_build",
                         folder_path=self.folder_path,
                         host=self.host,
-                        count=len(metadata_map),
+                        built=len(items),
                     )
-                
-                # Create script items
-                for path, name in script_paths:
-                    if self._should_stop:
-                        log_user_action_detail(
-                            "script_folder_cancelled_during_item_build",
-                            folder_path=self.folder_path,
-                            host=self.host,
-                            built=len(items),
-                        )
-                        return
-                    
-                    # Get metadata from batch results
-                    metadata = metadata_map.get(name)
-                    
-                    # Create item
-                    item = self._load_script_item(path, name, metadata)
-                    items.append(item)
+                    return
+                items.append(self._load_script_item(entry.path, entry.name, entry.metadata))
             
             if not self._should_stop:
                 self.scripts_loaded.emit(items)
@@ -5,11 +5,23 @@ import json
 import logging
 import os
 import uuid
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Dict, Optional
 
 from . import config
+from .api_introspection import workflow_node_types
+from .comfy_environment import resolve_comfy_runtime
+from .native_conversion import NativeConversionUnsupported, convert_ui_workflow
+from .object_info_cache import get_object_info_for_classes
 from .paths import get_charon_temp_dir, resolve_comfy_environment
 from .process_runner import ProcessExecutionError, run_subprocess
+from .workflow_conversion_daemon import (
+    ConversionDaemonError,
+    ConversionJobError,
+    get_conversion_daemon,
+)
+from .workflow_graph import subgraph_definitions
 
 
 logger = logging.getLogger(__name__)
@@ -17,6 +29,19 @@ logger = logging.getLogger(__name__)
 SCRIPT_DIR = Path(__file__).resolve().parent
 
 
+@dataclass(frozen=True)
+class BatchConversionResult:
+    """Outcome of one workflow in a ``convert_workflows`` batch."""
+
+    index: int
+    converted: Optional[Dict[str, Any]] = None
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.converted is not None
+
+
 def _is_api_workflow(ui_workflow) -> bool:
     return ui_workflow and all(
         isinstance(value, dict) and "class_type" in value for value in ui_workflow.values()
@@ -37,10 +62,15 @@ def validate_converted_workflow(ui_workflow, converted_workflow) -> None:
         for node in source_nodes
         if isinstance(node, dict) and node.get("id") is not None
     }
+    definitions = None
     unknown_ids = []
     type_mismatches = []
     for node_id, converted_node in converted_workflow.items():
         source_node = source_by_id.get(str(node_id))
+        if source_node is None and ":" in str(node_id):
+            if definitions is None:
+                definitions = subgraph_definitions(ui_workflow)
+            source_node = _subgraph_source_node(source_by_id, definitions, str(node_id))
         if source_node is None:
             unknown_ids.append(str(node_id))
             continue
@@ -63,13 +93,47 @@ def validate_converted_workflow(ui_workflow, converted_workflow) -> None:
         )
 
 
-def convert_workflow(ui_workflow, comfy_path="", comfy_nodes_module=None):
-    if not isinstance(ui_workflow, dict):
-        return ui_workflow
+def _subgraph_source_node(source_by_id, definitions, node_id):
+    """Find the node behind a flattened subgraph id such as ``"12:4"``."""
+    parts = node_id.split(":")
+    node = source_by_id.get(parts[0])
+    for part in parts[1:]:
+        definition = definitions.get(str(node.get("type"))) if node else None
+        nodes = definition.get("nodes") if definition else None
+        if not isinstance(nodes, list):
+            return None
+        node = next(
+            (inner for inner in nodes if isinstance(inner, dict) and str(inner.get("id")) == part),
+            None,
+        )
+    return node
 
-    if _is_api_workflow(ui_workflow):
-        return copy.deepcopy(ui_workflow)
 
+def _convert_natively(ui_workflow, comfy_path):
+    """Convert without a browser when every node's widget layout is known; else None."""
+    if not getattr(config, "WORKFLOW_NATIVE_CONVERSION", True):
+        return None
+    try:
+        runtime = resolve_comfy_runtime(comfy_path or None)
+        # Only a schema fetched for the running server proves the widget layout.
+        object_info = get_object_info_for_classes(
+            workflow_node_types(ui_workflow), runtime, strict=True
+        )
+        if not object_info:
+            return None
+        converted = convert_ui_workflow(ui_workflow, object_info)
+        validate_converted_workflow(ui_workflow, converted)
+    except NativeConversionUnsupported as exc:
+        logger.info("Using browser conversion: %s", exc)
+        return None
+    except Exception as exc:
+        logger.warning("Native workflow conversion failed; using browser conversion: %s", exc)
+        return None
+    return converted
+
+
+def _resolve_export_environment(comfy_path):
+    """Return ``(python_exe, comfy_dir, exporter_path)`` for browser exports."""
     if not comfy_path:
         raise RuntimeError("ComfyUI path is required for conversion.")
 
@@ -87,7 +151,96 @@ def convert_workflow(ui_workflow, comfy_path="", comfy_nodes_module=None):
     exporter_path = SCRIPT_DIR / "workflow_browser_exporter.py"
     if not exporter_path.exists():
         raise RuntimeError(f"workflow_browser_exporter.py missing in {SCRIPT_DIR}")
+    return python_exe, comfy_dir, exporter_path
+
+
+def _convert_with_worker(ui_workflow, python_exe, comfy_dir, exporter_path, timeout):
+    """Convert on the warm worker; return None when the worker is unavailable."""
+    try:
+        daemon = get_conversion_daemon(python_exe, comfy_dir, str(exporter_path))
+        converted = daemon.convert(ui_workflow, timeout=timeout)
+    except ConversionDaemonError as exc:
+        logger.warning("Warm conversion worker unavailable; using one-shot export: %s", exc)
+        return None
+    except ConversionJobError as exc:
+        raise RuntimeError(f"Browser conversion failed: {exc}") from exc
+    validate_converted_workflow(ui_workflow, converted)
+    return converted
+
+
+def convert_workflow(ui_workflow, comfy_path="", comfy_nodes_module=None):
+    if not isinstance(ui_workflow, dict):
+        return ui_workflow
+
+    if _is_api_workflow(ui_workflow):
+        return copy.deepcopy(ui_workflow)
+
+    converted = _convert_natively(ui_workflow, comfy_path)
+    if converted is not None:
+        return converted
+
+    python_exe, comfy_dir, exporter_path = _resolve_export_environment(comfy_path)
+    timeout = getattr(config, "WORKFLOW_CONVERSION_TIMEOUT_SEC", 600)
+    if getattr(config, "WORKFLOW_CONVERSION_DAEMON", True):
+        converted = _convert_with_worker(ui_workflow, python_exe, comfy_dir, exporter_path, timeout)
+        if converted is not None:
+            return converted
+    return _convert_one_shot(ui_workflow, python_exe, comfy_dir, exporter_path, timeout)
+
+
+def convert_workflows(ui_workflows, comfy_path=""):
+    """Convert several UI workflows in one warm frontend session.
+
+    Returns one ``BatchConversionResult`` per input, in order; a failure only
+    affects its own entry.
+    """
+    workflows = list(ui_workflows)
+    results = []
+    environment = None
+    environment_error = ""
+    use_worker = getattr(config, "WORKFLOW_CONVERSION_DAEMON", True)
+    timeout = getattr(config, "WORKFLOW_CONVERSION_TIMEOUT_SEC", 600)
+    for index, ui_workflow in enumerate(workflows):
+        if not isinstance(ui_workflow, dict):
+            results.append(BatchConversionResult(index, error="Workflow payload must be a dictionary."))
+            continue
+        if _is_api_workflow(ui_workflow):
+            results.append(BatchConversionResult(index, converted=copy.deepcopy(ui_workflow)))
+            continue
+        converted = _convert_natively(ui_workflow, comfy_path)
+        if converted is not None:
+            results.append(BatchConversionResult(index, converted=converted))
+            continue
+        if environment is None and not environment_error:
+            try:
+                environment = _resolve_export_environment(comfy_path)
+            except RuntimeError as exc:
+                environment_error = str(exc)
+        if environment_error:
+            results.append(BatchConversionResult(index, error=environment_error))
+            continue
+        try:
+            converted = None
+            if use_worker:
+                converted = _convert_with_worker(ui_workflow, *environment, timeout)
+                # Once the worker is gone, skip further restart attempts this batch.
+                use_worker = converted is not None
+            if converted is None:
+                converted = _convert_one_shot(ui_workflow, *environment, timeout)
+        except Exception as exc:
+            results.append(BatchConversionResult(index, error=str(exc)))
+            continue
+        results.append(BatchConversionResult(index, converted=converted))
+    return results
+
+
+def warm_conversion_worker(comfy_path=""):
+    """Start the warm conversion worker, and the ComfyUI server it needs, ahead of use."""
+    python_exe, comfy_dir, exporter_path = _resolve_export_environment(comfy_path)
+    return get_conversion_daemon(python_exe, comfy_dir, str(exporter_path))
+
 
+def _convert_one_shot(ui_workflow, python_exe, comfy_dir, exporter_path, timeout):
     temp_root = Path(get_charon_temp_dir())
     temp_dir = temp_root / "temp"
     temp_dir.mkdir(parents=True, exist_ok=True)
@@ -124,7 +277,7 @@ module.run_export_sync(workflow_path, output_path, comfy_dir=comfy_dir)
         run_subprocess(
             command,
             cwd=str(SCRIPT_DIR),
-            timeout=getattr(config, "WORKFLOW_CONVERSION_TIMEOUT_SEC", 600),
+            timeout=timeout,
             check=True,
         )
 
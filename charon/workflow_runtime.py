@@ -25,6 +25,7 @@ from .utilities import status_to_gl_color, status_to_tile_color
 
 __all__ = [
     "discover_workflows",
+    "discover_library_workflows",
     "load_workflow_bundle",
     "convert_workflow",
     "spawn_charon_node",
@@ -85,6 +86,33 @@ def discover_workflows(base_path: Optional[str] = None) -> List[Tuple[str, str,
     return results
 
 
+def discover_library_workflows(base_path: Optional[str] = None) -> List[str]:
+    """
+    Return every workflow folder in the library, laid out as ``<root>/<category>/<workflow>``.
+    Dot folders are skipped at both levels, as the library browser does.
+    """
+    root = _resolve_root(base_path)
+    folders: List[str] = []
+    if not os.path.isdir(root):
+        return folders
+    for category in _list_visible_dirs(root):
+        folders.extend(_list_visible_dirs(category))
+    return folders
+
+
+def _list_visible_dirs(path: str) -> List[str]:
+    try:
+        names = sorted(
+            entry.name
+            for entry in os.scandir(path)
+            if entry.is_dir() and not entry.name.startswith(".")
+        )
+    except OSError as exc:
+        system_error(f"Failed to enumerate workflow directories in {path}: {exc}")
+        return []
+    return [os.path.join(path, name) for name in names]
+
+
 def load_workflow_bundle(folder_path: str) -> Dict[str, Any]:
     """
     Load `.charon.json` metadata and `workflow.json` payload for the given folder.
@@ -1,3 +1,8 @@
+try:
+    from . import routes  # noqa: F401  (registers /charon/* server routes)
+except Exception as exc:  # pragma: no cover - route support must never block node loading
+    print(f"[Charon] Server routes unavailable: {exc}")
+
 from .nodes import NODE_CLASS_MAPPINGS, NODE_DISPLAY_NAME_MAPPINGS
 
 __all__ = ['NODE_CLASS_MAPPINGS', 'NODE_DISPLAY_NAME_MAPPINGS']
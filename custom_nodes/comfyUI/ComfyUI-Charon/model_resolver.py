@@ -0,0 +1,203 @@
+"""Resolve Charon model references against ComfyUI's ``folder_paths``.
+
+Shared by the ``/charon/resolve_models`` route and by Charon's one-shot
+resolver subprocess, so both answer exactly the same way. Only the standard
+library is imported here; callers pass in the loaded ``folder_paths`` module.
+"""
+
+import os
+import traceback
+
+FALLBACK_CATEGORIES = (
+    "checkpoints",
+    "diffusion_models",
+    "unet",
+    "loras",
+    "vae",
+    "text_encoders",
+    "clip",
+    "clip_vision",
+    "latent_upscale_models",
+    "upscale_models",
+    "embeddings",
+)
+
+
+def _normalize(name):
+    return name.replace("/", os.sep).replace("\\", os.sep)
+
+
+def _iter_folder_entries(folder_paths, category):
+    mapping = getattr(folder_paths, "folder_names_and_paths", {})
+    entry = mapping.get(category)
+    if isinstance(entry, dict):
+        for key in ("folders", "paths", "path"):
+            values = entry.get(key)
+            if isinstance(values, str):
+                yield values
+            elif isinstance(values, (list, tuple, set)):
+                for value in values:
+                    if isinstance(value, str):
+                        yield value
+    elif isinstance(entry, (list, tuple, set)):
+        for value in entry:
+            if isinstance(value, str):
+                yield value
+            elif isinstance(value, (list, tuple, set)):
+                for sub in value:
+                    if isinstance(sub, str):
+                        yield sub
+
+
+def _iter_folder_paths(folder_paths, comfy_dir, category):
+    seen = set()
+    candidate_getters = (
+        "get_folder_paths",
+        "get_folder_paths_for",
+        "get_input_directory",
+    )
+    for attr in candidate_getters:
+        getter = getattr(folder_paths, attr, None)
+        if callable(getter):
+            try:
+                paths = getter(category)
+            except TypeError:
+                try:
+                    paths = getter(category, "")
+                except Exception:
+                    paths = None
+            except Exception:
+                paths = None
+            if isinstance(paths, str):
+                paths = [paths]
+            if isinstance(paths, (list, tuple, set)):
+                for path in paths:
+                    if isinstance(path, str):
+                        if not os.path.isabs(path):
+                            path = os.path.join(comfy_dir, path)
+                        norm = os.path.abspath(path)
+                        if norm not in seen and os.path.isdir(norm):
+                            seen.add(norm)
+                            yield norm
+    for path in _iter_folder_entries(folder_paths, category):
+        if isinstance(path, str):
+            if not os.path.isabs(path):
+                path = os.path.join(comfy_dir, path)
+            norm = os.path.abspath(path)
+            if norm not in seen and os.path.isdir(norm):
+                seen.add(norm)
+                yield norm
+
+
+def _record_dir(candidate, attempted_dirs):
+    directory = os.path.dirname(candidate)
+    if directory:
+        abs_dir = os.path.abspath(directory)
+        if abs_dir not in attempted_dirs:
+            attempted_dirs.append(abs_dir)
+
+
+def _try_resolve(folder_paths, comfy_dir, category, name, attempted, attempted_dirs):
+    category = (category or "").strip()
+    if not category:
+        return None
+    if category not in attempted:
+        attempted.append(category)
+    for attr in ("get_full_path", "get_file_path"):
+        getter = getattr(folder_paths, attr, None)
+        if callable(getter):
+            try:
+                candidate = getter(category, name)
+                if candidate and os.path.exists(candidate):
+                    _record_dir(candidate, attempted_dirs)
+                    return os.path.abspath(candidate)
+            except Exception:
+                pass
+    normalized = _normalize(name)
+    basename = os.path.basename(normalized)
+    for base in _iter_folder_paths(folder_paths, comfy_dir, category):
+        abs_base = os.path.abspath(base)
+        if abs_base not in attempted_dirs:
+            attempted_dirs.append(abs_base)
+        candidate = os.path.join(abs_base, normalized)
+        if os.path.exists(candidate):
+            return os.path.abspath(candidate)
+        candidate = os.path.join(abs_base, basename)
+        if os.path.exists(candidate):
+            return os.path.abspath(candidate)
+    return None
+
+
+def resolve_model_references(references, folder_paths, comfy_dir):
+    """Return ``{"resolved": [...], "missing": [...], "errors": [...], "traceback": ""}``."""
+    payload = {
+        "resolved": [],
+        "missing": [],
+        "errors": [],
+        "traceback": "",
+    }
+    try:
+        for entry in references or []:
+            if not isinstance(entry, dict):
+                continue
+            index = entry.get("index")
+            name = entry.get("name") or ""
+            category = entry.get("category") or ""
+            node_type = entry.get("node_type") or ""
+            attempted_dirs = []
+            attempted = []
+
+            if not name:
+                payload["missing"].append(
+                    {
+                        "index": index,
+                        "reason": "empty",
+                        "category": category,
+                        "node_type": node_type,
+                        "attempted": list(attempted),
+                    }
+                )
+                continue
+
+            resolved_path = None
+            resolved_category = None
+
+            if category:
+                resolved_path = _try_resolve(folder_paths, comfy_dir, category, name, attempted, attempted_dirs)
+                if resolved_path:
+                    resolved_category = category
+
+            if not resolved_path:
+                for fallback in FALLBACK_CATEGORIES:
+                    if fallback == category:
+                        continue
+                    path = _try_resolve(folder_paths, comfy_dir, fallback, name, attempted, attempted_dirs)
+                    if path:
+                        resolved_path = path
+                        resolved_category = fallback
+                        break
+
+            if resolved_path:
+                payload["resolved"].append(
+                    {
+                        "index": index,
+                        "path": resolved_path,
+                        "category": resolved_category,
+                        "node_type": node_type,
+                    }
+                )
+            else:
+                payload["missing"].append(
+                    {
+                        "index": index,
+                        "name": name,
+                        "category": resolved_category or category,
+                        "node_type": node_type,
+                        "attempted": list(attempted),
+                        "searched": [os.path.abspath(path) for path in attempted_dirs],
+                    }
+                )
+    except Exception as exc:  # pragma: no cover - defensive path
+        payload["errors"].append(f"{exc.__class__.__name__}: {exc}")
+        payload["traceback"] = traceback.format_exc()
+    return payload
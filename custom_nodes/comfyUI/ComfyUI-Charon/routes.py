@@ -0,0 +1,39 @@
+"""HTTP routes Charon calls on the running ComfyUI server.
+
+``POST /charon/resolve_models`` answers model lookups from the server's own,
+already loaded ``folder_paths`` (including ``extra_model_paths.yaml``), so
+Charon no longer starts an embedded interpreter for every validation.
+"""
+
+import asyncio
+import os
+
+import folder_paths
+from aiohttp import web
+from server import PromptServer
+
+from .model_resolver import resolve_model_references
+
+ROUTE_VERSION = 1
+
+
+def _comfy_dir():
+    return os.path.abspath(getattr(folder_paths, "base_path", "") or os.path.dirname(folder_paths.__file__))
+
+
+@PromptServer.instance.routes.post("/charon/resolve_models")
+async def charon_resolve_models(request):
+    try:
+        body = await request.json()
+    except Exception:
+        return web.json_response({"error": "Request body must be JSON."}, status=400)
+    references = body.get("references") if isinstance(body, dict) else None
+    if not isinstance(references, list):
+        return web.json_response({"error": "'references' must be a list."}, status=400)
+    comfy_dir = _comfy_dir()
+    # Lookups stat files (possibly on a network share); keep them off the event loop.
+    loop = asyncio.get_running_loop()
+    payload = await loop.run_in_executor(None, resolve_model_references, references, folder_paths, comfy_dir)
+    payload["comfy_dir"] = comfy_dir
+    payload["version"] = ROUTE_VERSION
+    return web.json_response(payload)
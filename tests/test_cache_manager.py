@@ -0,0 +1,83 @@
+import time
+import unittest
+from unittest import mock
+
+from charon.cache_manager import PersistentCacheManager, approximate_size
+
+
+class ApproximateSizeTests(unittest.TestCase):
+    def test_counts_nested_content(self):
+        small = {"tags": ["a"]}
+        large = {f"workflow_{i}": {"tags": ["light", "comp"], "description": "x" * 200} for i in range(50)}
+        self.assertGreater(approximate_size(large), 50 * approximate_size(small))
+
+    def test_counts_shared_objects_once(self):
+        shared = "y" * 10000
+        self.assertLess(approximate_size([shared, shared]), 2 * approximate_size(shared))
+
+
+class PersistentCacheManagerTests(unittest.TestCase):
+    def setUp(self):
+        self.manager = PersistentCacheManager(max_memory_mb=1)
+        self.addCleanup(self.manager.shutdown)
+        self.budget = 1024 * 1024
+
+    def test_memory_usage_tracks_entry_sizes(self):
+        self.manager.cache_folder_tags("/repo/Comp", {"comp"})
+        small = self.manager.estimated_memory_usage
+        self.manager.cache_data("batch_metadata:/repo/Lighting", {"w": "z" * 100000})
+        self.assertGreater(self.manager.estimated_memory_usage - small, 100000)
+
+        self.manager.invalidate_folder("/repo/Lighting")
+        self.assertEqual(small, self.manager.estimated_memory_usage)
+        self.manager.invalidate_folder("/repo/Comp")
+        self.assertEqual(0, self.manager.estimated_memory_usage)
+
+    def test_large_entries_evict_cold_data_before_hot_data(self):
+        self.manager.cache_folder_contents("/repo/Hot", [("/repo/Hot/Relight", "Relight")])
+        self.assertIsNotNone(self.manager.get_folder_contents("/repo/Hot"))
+
+        for index in range(6):
+            self.manager.cache_data(f"batch_metadata:/repo/F{index}", "m" * (self.budget // 4))
+
+        self.assertLessEqual(self.manager.estimated_memory_usage, self.budget)
+        self.assertIsNotNone(self.manager.get_folder_contents("/repo/Hot"))
+        self.assertIsNone(self.manager.get_cached_data("batch_metadata:/repo/F0"))
+        self.assertIsNotNone(self.manager.get_cached_data("batch_metadata:/repo/F5"))
+        self.assertGreaterEqual(self.manager.get_stats()["evictions"], 3)
+
+    def test_ttl_expires_entries(self):
+        self.manager.cache_data("compat:/repo:Lighting:nuke", True, ttl_seconds=600)
+        self.assertTrue(self.manager.get_cached_data("compat:/repo:Lighting:nuke"))
+
+        later = time.time() + 601
+        with mock.patch("charon.cache_manager.time.time", return_value=later):
+            self.assertIsNone(self.manager.get_cached_data("compat:/repo:Lighting:nuke"))
+        self.assertEqual(0, self.manager.estimated_memory_usage)
+
+    def test_expired_entries_are_evicted_before_live_ones(self):
+        self.manager.cache_data("batch_metadata:/repo/Old", "o" * (self.budget // 2), ttl_seconds=1)
+        self.manager.cache_data("batch_metadata:/repo/Live", "l" * (self.budget // 4))
+
+        later = time.time() + 5
+        with mock.patch("charon.cache_manager.time.time", return_value=later):
+            self.manager.cache_data("batch_metadata:/repo/New", "n" * (self.budget // 3))
+
+        self.assertIsNotNone(self.manager.get_cached_data("batch_metadata:/repo/Live"))
+        stats = self.manager.get_stats()
+        self.assertEqual(1, stats["expirations"])
+        self.assertEqual(0, stats["evictions"])
+
+    def test_stats_count_hits_and_misses(self):
+        self.manager.cache_script_validation("/repo/Comp/Grade", {"has_icon": False})
+        self.manager.get_script_validation("/repo/Comp/Grade")
+        self.manager.get_script_validation("/repo/Comp/Missing")
+
+        stats = self.manager.get_stats()
+        self.assertEqual(1, stats["hits"])
+        self.assertEqual(1, stats["misses"])
+        self.assertEqual(0.5, stats["hit_rate"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import base64
+import hashlib
+import json
+import socket
+import struct
+import threading
+import unittest
+
+from charon.comfy_events import (
+    PROMPT_ERROR,
+    PROMPT_RUNNING,
+    PROMPT_SUCCESS,
+    ComfyEventStream,
+)
+
+
+def _message(event, **data):
+    return {"type": event, "data": data}
+
+
+class PromptEventDispatchTests(unittest.TestCase):
+    def setUp(self):
+        self.stream = ComfyEventStream("http://127.0.0.1:1", client_id="test")
+
+    def test_progress_tracks_nodes_and_sampler_steps(self):
+        self.stream.track("p1", node_total=4)
+        self.stream.dispatch(_message("execution_start", prompt_id="p1"))
+        self.stream.dispatch(_message("execution_cached", prompt_id="p1", nodes=["1"]))
+        self.stream.dispatch(_message("executing", prompt_id="p1", node="2"))
+        self.stream.dispatch(_message("progress", prompt_id="p1", node="2", value=5, max=10))
+
+        state = self.stream.snapshot("p1")
+        self.assertEqual(PROMPT_RUNNING, state.status)
+        self.assertAlmostEqual(1.5 / 4, state.progress)
+        self.assertEqual("2", state.current_node)
+
+        self.stream.dispatch(_message("executing", prompt_id="p1", node=None))
+        state = self.stream.snapshot("p1")
+        self.assertEqual(PROMPT_SUCCESS, state.status)
+        self.assertTrue(state.finished)
+        self.assertEqual(1.0, state.progress)
+
+    def test_error_event_is_terminal(self):
+        self.stream.dispatch(
+            _message(
+                "execution_error",
+                prompt_id="p2",
+                node_type="KSampler",
+                exception_message="CUDA out of memory",
+            )
+        )
+        self.stream.dispatch(_message("executing", prompt_id="p2", node=None))
+
+        state = self.stream.snapshot("p2")
+        self.assertEqual(PROMPT_ERROR, state.status)
+        self.assertEqual(-1.0, state.progress)
+        self.assertEqual("KSampler: CUDA out of memory", state.error_message)
+
+    def test_events_for_untracked_prompts_are_kept_for_late_trackers(self):
+        self.stream.dispatch(_message("execution_success", prompt_id="p3"))
+
+        state = self.stream.track("p3", node_total=2)
+        self.assertTrue(state.finished)
+
+    def test_ignores_status_broadcasts(self):
+        self.stream.dispatch({"type": "status", "data": {"status": {"exec_info": {}}}})
+
+        self.assertIsNone(self.stream.snapshot("p1"))
+
+
+class _FakeComfySocketServer:
+    def __init__(self, messages):
+        self.messages = messages
+        self.listener = socket.socket()
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(1)
+        self.port = self.listener.getsockname()[1]
+        self.request_line = ""
+        self.release = threading.Event()
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        conn, _addr = self.listener.accept()
+        with conn:
+            data = b""
+            while b"\r\n\r\n" not in data:
+                data += conn.recv(4096)
+            lines = data.decode("latin-1").split("\r\n")
+            self.request_line = lines[0]
+            key = next(
+                line.split(":", 1)[1].strip()
+                for line in lines
+                if line.lower().startswith("sec-websocket-key")
+            )
+            accept = base64.b64encode(
+                hashlib.sha1((key + "258EAFA5-E914-47DA-95CA-C5AB0DC85B11").encode()).digest()
+            ).decode()
+            conn.sendall(
+                (
+                    "HTTP/1.1 101 Switching Protocols\r\n"
+                    "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                    f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+                ).encode()
+            )
+            conn.sendall(bytes([0x82, 3]) + b"\x00\x01\x02")
+            for message in self.messages:
+                payload = json.dumps(message).encode()
+                if len(payload) < 126:
+                    header = bytes([0x81, len(payload)])
+                else:
+                    header = bytes([0x81, 126]) + struct.pack("!H", len(payload))
+                conn.sendall(header + payload)
+            self.release.wait(5)
+
+    def close(self):
+        self.release.set()
+        self.listener.close()
+
+
+class EventStreamSocketTests(unittest.TestCase):
+    def test_receives_prompt_events_over_websocket(self):
+        server = _FakeComfySocketServer(
+            [
+                _message("execution_start", prompt_id="abc"),
+                _message("progress", prompt_id="abc", node="3", value=10, max=20, pad="x" * 200),
+                _message("executing", prompt_id="abc", node=None),
+            ]
+        )
+        stream = ComfyEventStream(f"http://127.0.0.1:{server.port}", client_id="charon-test")
+        try:
+            stream.start()
+            self.assertTrue(stream.wait_connected(5))
+            state = stream.wait("abc", since_version=-1, timeout=5)
+            while state is not None and not state.finished:
+                state = stream.wait("abc", since_version=state.version, timeout=5)
+        finally:
+            stream.stop()
+            server.close()
+
+        self.assertIn("/ws?clientId=charon-test", server.request_line)
+        self.assertIsNotNone(state)
+        self.assertEqual(PROMPT_SUCCESS, state.status)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,292 @@
+import email
+import email.policy
+import http.client
+import json
+import os
+import tempfile
+import threading
+import unittest
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from charon import config
+from charon.comfy_client import ComfyUIClient
+from charon.comfy_transport import HTTPConnectionPool, MultipartFileStream, get_connection_pool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    peers = set()
+    uploads = []
+    ranges = []
+    view_payload = b""
+    drop_first_view = False
+
+    def do_GET(self):
+        type(self).peers.add(self.client_address)
+        if self.path.startswith("/view"):
+            self._serve_view()
+            return
+        if self.path.startswith("/missing"):
+            self._reply(404, {"error": "missing"})
+            return
+        self._reply(200, {"path": self.path})
+
+    def _serve_view(self):
+        payload = type(self).view_payload
+        requested = self.headers.get("Range")
+        type(self).ranges.append(requested)
+        if requested:
+            start = int(requested.split("=", 1)[1].rstrip("-"))
+            body = payload[start:]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(payload) - 1}/{len(payload)}")
+        else:
+            body = payload
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not requested and type(self).drop_first_view:
+            type(self).drop_first_view = False
+            self.wfile.write(body[: len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        type(self).peers.add(self.client_address)
+        status = 404 if "missing" in self.path else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "0" if status == 404 else "42")
+        self.end_headers()
+
+    def do_POST(self):
+        type(self).peers.add(self.client_address)
+        length = int(self.headers.get("Content-Length") or 0)
+        if self.path.startswith("/upload/image"):
+            type(self).uploads.append((self.headers.get("Content-Type"), self.rfile.read(length)))
+            self._reply(200, {"name": "uploaded.png"})
+            return
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        self._reply(200, {"prompt_id": payload.get("prompt", {}).get("id", "")})
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        pass
+
+
+class ConnectionPoolTests(unittest.TestCase):
+    def setUp(self):
+        _Handler.peers = set()
+        _Handler.uploads = []
+        _Handler.ranges = []
+        _Handler.drop_first_view = False
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+        host, port = self.server.server_address
+        self.base_url = f"http://{host}:{port}"
+        self.pool = HTTPConnectionPool("http", host, port, max_size=2)
+
+    def tearDown(self):
+        self.pool.close()
+        get_connection_pool(self.base_url).close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_sequential_requests_reuse_one_socket(self):
+        for index in range(5):
+            with self.pool.urlopen("GET", f"{self.base_url}/history/{index}", timeout=5) as response:
+                self.assertEqual(200, response.getcode())
+                self.assertEqual(f"/history/{index}", json.loads(response.read())["path"])
+
+        self.assertEqual(1, self.pool.created)
+        self.assertEqual(1, len(_Handler.peers))
+        self.assertEqual(1, self.pool.idle_count())
+
+    def test_http_error_returns_connection_to_pool(self):
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            self.pool.urlopen("GET", f"{self.base_url}/missing", timeout=5)
+
+        self.assertEqual(404, ctx.exception.code)
+        self.assertIn(b"missing", ctx.exception.read())
+        self.assertEqual(1, self.pool.idle_count())
+
+    def test_unread_response_is_not_reused(self):
+        response = self.pool.urlopen("GET", f"{self.base_url}/queue", timeout=5)
+        response.close()
+
+        self.assertEqual(0, self.pool.idle_count())
+
+    def test_busy_pool_opens_extra_connections_and_keeps_max_size_idle(self):
+        responses = [
+            self.pool.urlopen("GET", f"{self.base_url}/history/{index}", timeout=5)
+            for index in range(4)
+        ]
+        for response in responses:
+            response.read()
+            response.close()
+
+        self.assertEqual(4, self.pool.created)
+        self.assertEqual(2, self.pool.idle_count())
+
+    def test_replays_request_when_idle_socket_was_closed(self):
+        with self.pool.urlopen("GET", f"{self.base_url}/queue", timeout=5) as response:
+            response.read()
+        connection, _released_at = self.pool._idle[0]
+        connection.sock.close()
+        connection.sock = _ClosedSocket()
+
+        with self.pool.urlopen("GET", f"{self.base_url}/queue", timeout=5) as response:
+            self.assertEqual(200, response.getcode())
+            response.read()
+
+        self.assertEqual(2, self.pool.created)
+
+    def test_lost_response_is_replayed_only_for_idempotent_methods(self):
+        with self.pool.urlopen("GET", f"{self.base_url}/queue", timeout=5) as response:
+            response.read()
+        connection, _released_at = self.pool._idle[0]
+        # The server took the request but the socket dropped before it replied.
+        connection.getresponse = mock.Mock(side_effect=http.client.RemoteDisconnected("closed"))
+
+        with self.assertRaises(http.client.RemoteDisconnected):
+            self.pool.urlopen("POST", f"{self.base_url}/prompt", body=b"{}", timeout=5)
+        self.assertEqual(1, self.pool.created)
+
+        with self.pool.urlopen("GET", f"{self.base_url}/queue", timeout=5) as response:
+            response.read()
+        connection, _released_at = self.pool._idle[0]
+        connection.getresponse = mock.Mock(side_effect=http.client.RemoteDisconnected("closed"))
+        with self.pool.urlopen("GET", f"{self.base_url}/queue", timeout=5) as response:
+            self.assertEqual(200, response.getcode())
+            response.read()
+        self.assertEqual(3, self.pool.created)
+
+    def test_client_shares_pool_across_instances(self):
+        first = ComfyUIClient(self.base_url)
+        second = ComfyUIClient(self.base_url)
+
+        self.assertEqual({"path": "/history/a"}, first.get_history("a"))
+        self.assertEqual({"path": "/history/b"}, second.get_history("b"))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with mock.patch(
+                "charon.comfy_client.get_temp_file",
+                return_value=os.path.join(temp_dir, "payload.json"),
+            ):
+                self.assertEqual("abc", second.submit_workflow({"id": "abc"}))
+
+        self.assertIs(first._connection_pool(), second._connection_pool())
+        self.assertEqual(1, len(_Handler.peers))
+
+    def test_input_exists_check_keeps_socket_alive(self):
+        client = ComfyUIClient(self.base_url)
+
+        self.assertTrue(client.input_file_exists("charon_abc.png", size=42))
+        self.assertFalse(client.input_file_exists("charon_abc.png", size=7))
+        self.assertFalse(client.input_file_exists("missing.png"))
+        self.assertEqual(1, len(_Handler.peers))
+
+    def test_upload_streams_multipart_body_with_progress(self):
+        client = ComfyUIClient(self.base_url)
+        payload = os.urandom(700 * 1024)
+        progress = []
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "plate.png")
+            with open(path, "wb") as handle:
+                handle.write(payload)
+
+            name = client.upload_image(
+                path,
+                upload_name="charon_plate.png",
+                progress_callback=lambda sent, total: progress.append((sent, total)),
+            )
+
+        self.assertEqual("uploaded.png", name)
+        content_type, body = _Handler.uploads[0]
+        message = email.message_from_bytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + body,
+            policy=email.policy.HTTP,
+        )
+        parts = {part.get_param("name", header="content-disposition"): part for part in message.iter_parts()}
+        self.assertEqual("charon_plate.png", parts["image"].get_filename())
+        self.assertEqual(payload, parts["image"].get_payload(decode=True))
+        self.assertEqual("true", parts["overwrite"].get_content().strip())
+        self.assertGreater(len(progress), 1)
+        self.assertEqual(len(body), progress[-1][0])
+        self.assertEqual(len(body), progress[-1][1])
+
+    def test_download_resumes_interrupted_transfer_with_range(self):
+        _Handler.view_payload = os.urandom(300 * 1024)
+        _Handler.drop_first_view = True
+        client = ComfyUIClient(self.base_url)
+        progress = []
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "result.glb")
+            with mock.patch.object(config, "COMFY_DOWNLOAD_CHUNK_BYTES", 16 * 1024, create=True):
+                ok = client.download_file(
+                    "result.glb",
+                    target,
+                    retries=2,
+                    retry_delay=0,
+                    progress_callback=lambda received, total: progress.append((received, total)),
+                )
+            with open(target, "rb") as handle:
+                downloaded = handle.read()
+            leftovers = os.listdir(temp_dir)
+
+        self.assertTrue(ok)
+        self.assertEqual(_Handler.view_payload, downloaded)
+        self.assertEqual(["result.glb"], leftovers)
+        self.assertIsNone(_Handler.ranges[0])
+        self.assertEqual(f"bytes={150 * 1024}-", _Handler.ranges[1])
+        self.assertEqual((len(downloaded), len(downloaded)), progress[-1])
+
+    def test_failed_download_leaves_no_files(self):
+        client = ComfyUIClient(self.base_url)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "result.png")
+            with mock.patch.object(client, "_urlopen_with_retry", side_effect=OSError("down")):
+                self.assertFalse(client.download_file("result.png", target, retries=1, retry_delay=0))
+            self.assertEqual([], os.listdir(temp_dir))
+
+
+class MultipartFileStreamTests(unittest.TestCase):
+    def test_rewinds_for_replay(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "input.png")
+            with open(path, "wb") as handle:
+                handle.write(b"pixels" * 1000)
+            with MultipartFileStream(path, field_name="image", filename="input.png") as body:
+                first = body.read(100) + body.read()
+                body.seek(0)
+                second = b"".join(iter(lambda: body.read(333), b""))
+
+        self.assertEqual(len(body), len(first))
+        self.assertEqual(first, second)
+        self.assertTrue(first.endswith(f"--{body.boundary}--\r\n".encode()))
+
+
+class _ClosedSocket:
+    def settimeout(self, _timeout):
+        pass
+
+    def sendall(self, _data):
+        raise BrokenPipeError("closed by peer")
+
+    def close(self):
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import time
+import importlib.util
 import json
 import os
 import tempfile
@@ -7,8 +8,10 @@ from types import SimpleNamespace
 from unittest import mock
 
 from charon.comfy_validation import (
+    MODEL_RESOLVER_MODULE,
     ValidationIssue,
     ValidationResult,
+    _resolve_models_with_comfy,
     _validate_custom_nodes_browser,
     _validate_server_identity,
     validate_comfy_environment,
@@ -161,5 +164,102 @@ class ComfyValidationTests(unittest.TestCase):
         self.assertTrue(issue.ok)
 
 
+    def test_browser_validation_reuses_warm_worker_page(self):
+        payload = {"missing": [], "registered_count": 12, "prompt_export": {"ok": True}}
+        daemon = mock.Mock(runtime_key="nodes-v1")
+        daemon.evaluate.return_value = payload
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with mock.patch(
+                "charon.comfy_validation.ComfyUIClient.test_connection",
+                return_value=True,
+            ), mock.patch(
+                "charon.comfy_validation.get_conversion_daemon",
+                return_value=daemon,
+            ), mock.patch("charon.comfy_validation.subprocess.run") as run:
+                issue, returned_payload = _validate_custom_nodes_browser(
+                    {"python_exe": __file__, "comfy_dir": temp_dir},
+                    {"workflow": {"nodes": [{"id": 1, "type": "KSampler"}]}},
+                    ping_url="http://127.0.0.1:8188",
+                    node_catalog_key="batch-1",
+                )
+
+        self.assertTrue(issue.ok)
+        run.assert_not_called()
+        self.assertEqual(12, returned_payload["registered_count"])
+        self.assertEqual({"invoked": False}, returned_payload["model_capture"])
+        self.assertEqual("cache", daemon.evaluate.call_args.args[1]["mode"])
+        self.assertEqual("batch-1:nodes-v1", daemon.evaluate.call_args.args[1]["catalogKey"])
+
+
+class ModelResolverRouteTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.comfy_dir = os.path.join(self.temp_dir.name, "ComfyUI")
+        os.makedirs(self.comfy_dir)
+        self.references = [{"index": 0, "name": "base.safetensors", "category": "checkpoints"}]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_uses_running_server_route_without_spawning_python(self):
+        route_payload = {
+            "resolved": [{"index": 0, "path": "/models/base.safetensors", "category": "checkpoints"}],
+            "missing": [],
+            "errors": [],
+            "comfy_dir": self.comfy_dir,
+        }
+        with mock.patch(
+            "charon.comfy_validation.ComfyUIClient.resolve_models",
+            return_value=route_payload,
+        ), mock.patch("charon.comfy_validation.subprocess.run") as run:
+            result = _resolve_models_with_comfy(None, self.comfy_dir, self.references)
+
+        run.assert_not_called()
+        self.assertEqual({0: "/models/base.safetensors"}, result["resolved"])
+        self.assertEqual({0: "checkpoints"}, result["categories"])
+
+    def test_ignores_route_served_by_another_installation(self):
+        route_payload = {"resolved": [], "missing": [], "comfy_dir": os.path.join(self.temp_dir.name, "Other")}
+        with mock.patch(
+            "charon.comfy_validation.ComfyUIClient.resolve_models",
+            return_value=route_payload,
+        ), mock.patch(
+            "charon.comfy_validation._resolve_models_via_subprocess",
+            return_value={"resolved": [], "missing": [{"index": 0, "name": "base.safetensors"}]},
+        ) as spawn:
+            result = _resolve_models_with_comfy(__file__, self.comfy_dir, self.references)
+
+        spawn.assert_called_once()
+        self.assertEqual([0], [entry["index"] for entry in result["missing"]])
+
+    def test_shared_resolver_module_searches_folder_paths(self):
+        spec = importlib.util.spec_from_file_location("charon_model_resolver_test", MODEL_RESOLVER_MODULE)
+        resolver = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(resolver)
+        loras = os.path.join(self.comfy_dir, "models", "loras")
+        os.makedirs(loras)
+        with open(os.path.join(loras, "style.safetensors"), "wb") as handle:
+            handle.write(b"weights")
+        folder_paths = SimpleNamespace(
+            folder_names_and_paths={"loras": ([loras], {".safetensors"})},
+        )
+
+        payload = resolver.resolve_model_references(
+            [
+                {"index": 0, "name": "style.safetensors", "category": "checkpoints"},
+                {"index": 1, "name": "absent.safetensors", "category": "loras"},
+            ],
+            folder_paths,
+            self.comfy_dir,
+        )
+
+        self.assertEqual(
+            [{"index": 0, "path": os.path.join(loras, "style.safetensors"), "category": "loras", "node_type": ""}],
+            payload["resolved"],
+        )
+        self.assertEqual(1, payload["missing"][0]["index"])
+        self.assertIn(loras, payload["missing"][0]["searched"])
+
+
 if __name__ == "__main__":
     unittest.main()
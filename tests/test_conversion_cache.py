@@ -1,17 +1,36 @@
+import itertools
 import json
 import os
 import tempfile
 import unittest
+from unittest import mock
 
+from charon import config
 from charon.conversion_cache import (
+    CONVERTED_SUFFIX,
     clear_conversion_cache,
     compute_comfy_cache_identity,
+    conversion_index_path,
+    desired_prompt_path,
     load_cached_conversion,
     write_conversion_cache,
 )
 
 
 class ConversionCacheTests(unittest.TestCase):
+    def setUp(self):
+        prefs = tempfile.TemporaryDirectory()
+        self.addCleanup(prefs.cleanup)
+        patcher = mock.patch.dict(os.environ, {"GALT_PLUGIN_DIR": prefs.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _write_prompt(self, folder, workflow_hash, identity, size=16):
+        path = desired_prompt_path(folder, "workflow.json", workflow_hash, identity)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x" * size, encoding="utf-8")
+        return write_conversion_cache(folder, "workflow.json", workflow_hash, str(path), identity)
+
     def test_clear_conversion_cache_preserves_workflow_state(self):
         with tempfile.TemporaryDirectory() as temp_dir:
             cache_dir = os.path.join(temp_dir, ".charon_cache")
@@ -60,6 +79,74 @@ class ConversionCacheTests(unittest.TestCase):
                 load_cached_conversion(temp_dir, "workflow-hash", "identity-b")
             )
 
+    def test_keeps_variants_per_workflow_and_identity(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first = self._write_prompt(temp_dir, "hash-a", "identity-a")
+            second = self._write_prompt(temp_dir, "hash-b", "identity-a")
+            other_install = self._write_prompt(temp_dir, "hash-a", "identity-b")
+
+            self.assertEqual(first, load_cached_conversion(temp_dir, "hash-a", "identity-a")["prompt_path"])
+            self.assertEqual(second, load_cached_conversion(temp_dir, "hash-b", "identity-a")["prompt_path"])
+            self.assertEqual(
+                other_install,
+                load_cached_conversion(temp_dir, "hash-a", "identity-b")["prompt_path"],
+            )
+
+            clear_conversion_cache(temp_dir)
+            self.assertIsNone(load_cached_conversion(temp_dir, "hash-a", "identity-a"))
+
+    def test_evicts_least_recently_used_across_folders(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            folders = [os.path.join(temp_dir, name) for name in ("alpha", "beta", "gamma")]
+            with mock.patch.object(config, "CONVERSION_CACHE_MAX_ENTRIES", 2, create=True), mock.patch(
+                "charon.conversion_cache.time.time", side_effect=itertools.count(100.0, 100.0)
+            ):
+                oldest = self._write_prompt(folders[0], "hash", "identity")
+                self._write_prompt(folders[1], "hash", "identity")
+                # A hit makes alpha the most recent, so beta is evicted next.
+                load_cached_conversion(folders[0], "hash", "identity")
+                self._write_prompt(folders[2], "hash", "identity")
+
+            self.assertTrue(os.path.exists(oldest))
+            self.assertIsNotNone(load_cached_conversion(folders[0], "hash", "identity"))
+            self.assertIsNone(load_cached_conversion(folders[1], "hash", "identity"))
+            self.assertIsNotNone(load_cached_conversion(folders[2], "hash", "identity"))
+
+    def test_rereads_index_written_by_another_process_before_updating(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self._write_prompt(temp_dir, "hash-a", "identity")
+            index_path = conversion_index_path()
+            stat = os.stat(index_path)
+            with open(index_path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+            foreign = dict(next(iter(payload["entries"].values())), workflow_hash="hash-b")
+            payload["entries"]["foreign"] = foreign
+            with open(index_path, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle)
+            # Same mtime, so only a forced re-read under the lock can see it.
+            os.utime(index_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+            self._write_prompt(temp_dir, "hash-c", "identity")
+
+            with open(index_path, "r", encoding="utf-8") as handle:
+                self.assertIn("foreign", json.load(handle)["entries"])
+            self.assertFalse(os.path.exists(f"{index_path}.charon.lock"))
+
+    def test_removes_old_unindexed_prompts(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            orphan = desired_prompt_path(temp_dir, "lost.json", "hash-lost", "identity")
+            orphan.parent.mkdir(parents=True, exist_ok=True)
+            orphan.write_text("{}", encoding="utf-8")
+            recent = orphan.with_name("recent" + CONVERTED_SUFFIX)
+            recent.write_text("{}", encoding="utf-8")
+            os.utime(orphan, (1.0, 1.0))
+
+            kept = self._write_prompt(temp_dir, "hash", "identity")
+
+            self.assertFalse(orphan.exists())
+            self.assertTrue(recent.exists())
+            self.assertTrue(os.path.exists(kept))
+
     def test_legacy_unversioned_cache_is_rejected(self):
         with tempfile.TemporaryDirectory() as temp_dir:
             cache_dir = os.path.join(temp_dir, ".charon_cache")
@@ -0,0 +1,208 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from charon import config, workflow_pipeline
+from charon.conversion_prewarm import (
+    PREWARM_CACHED,
+    PREWARM_CONVERTED,
+    PREWARM_FAILED,
+    PREWARM_SKIPPED,
+    prewarm_conversion_cache,
+)
+from charon.conversion_cache import compute_workflow_hash
+from charon.shared_conversion_cache import load_shared_conversion, publish_shared_conversion
+from charon.workflow_pipeline import BatchConversionResult, convert_workflows
+
+
+def _ui_workflow(node_type):
+    return {"nodes": [{"id": 1, "type": node_type}], "links": []}
+
+
+class ConvertWorkflowsTests(unittest.TestCase):
+    def test_reports_per_workflow_results_from_one_worker(self):
+        calls = []
+
+        def fake_worker(ui_workflow, *_environment):
+            calls.append(ui_workflow)
+            if ui_workflow["nodes"][0]["type"] == "Broken":
+                raise RuntimeError("Browser conversion failed: missing node")
+            return {"1": {"class_type": ui_workflow["nodes"][0]["type"], "inputs": {}}}
+
+        with mock.patch.object(
+            workflow_pipeline,
+            "_resolve_export_environment",
+            return_value=("python", "comfy", "exporter.py"),
+        ) as resolve, mock.patch.object(workflow_pipeline, "_convert_with_worker", side_effect=fake_worker):
+            results = convert_workflows(
+                [
+                    _ui_workflow("KSampler"),
+                    {"5": {"class_type": "SaveImage", "inputs": {}}},
+                    _ui_workflow("Broken"),
+                    "not a workflow",
+                ],
+                "comfy_path",
+            )
+
+        self.assertEqual([0, 1, 2, 3], [result.index for result in results])
+        self.assertEqual("KSampler", results[0].converted["1"]["class_type"])
+        self.assertEqual("SaveImage", results[1].converted["5"]["class_type"])
+        self.assertFalse(results[2].ok)
+        self.assertIn("missing node", results[2].error)
+        self.assertFalse(results[3].ok)
+        self.assertEqual(2, len(calls))
+        resolve.assert_called_once_with("comfy_path")
+
+    def test_falls_back_to_one_shot_once_worker_is_unavailable(self):
+        with mock.patch.object(
+            workflow_pipeline,
+            "_resolve_export_environment",
+            return_value=("python", "comfy", "exporter.py"),
+        ), mock.patch.object(
+            workflow_pipeline, "_convert_with_worker", return_value=None
+        ) as worker, mock.patch.object(
+            workflow_pipeline,
+            "_convert_one_shot",
+            side_effect=lambda workflow, *_args: {"1": {"class_type": "X", "inputs": {}}},
+        ) as one_shot:
+            results = convert_workflows([_ui_workflow("X"), _ui_workflow("X")], "comfy_path")
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(1, worker.call_count)
+        self.assertEqual(2, one_shot.call_count)
+
+
+class PrewarmConversionCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repo_root = os.path.join(self.temp_dir.name, "workflows")
+        # The library layout is <root>/<category>/<workflow>; dot folders are ignored.
+        for relative, payload in (
+            (("Lighting", "alpha"), _ui_workflow("KSampler")),
+            (("Lighting", "beta"), _ui_workflow("Broken")),
+            (("Comp", "gamma"), {"1": {"class_type": "SaveImage", "inputs": {}}}),
+            ((".trash", "old"), _ui_workflow("KSampler")),
+            (("Comp", ".draft"), _ui_workflow("KSampler")),
+        ):
+            folder = os.path.join(self.repo_root, *relative)
+            os.makedirs(folder)
+            with open(os.path.join(folder, "workflow.json"), "w", encoding="utf-8") as handle:
+                json.dump(payload, handle)
+        patches = [
+            mock.patch.object(config, "WORKFLOW_REPOSITORY_ROOT", self.repo_root),
+            mock.patch.dict(os.environ, {"GALT_PLUGIN_DIR": os.path.join(self.temp_dir.name, "prefs")}),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.converted_batches = []
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _convert(self, workflows, _comfy_path):
+        self.converted_batches.append(len(workflows))
+        results = []
+        for index, workflow in enumerate(workflows):
+            node_type = workflow["nodes"][0]["type"]
+            if node_type == "Broken":
+                results.append(BatchConversionResult(index, error="missing node"))
+            else:
+                results.append(
+                    BatchConversionResult(index, converted={"1": {"class_type": node_type, "inputs": {}}})
+                )
+        return results
+
+    def test_converts_uncached_workflows_in_one_batch_and_writes_cache(self):
+        first = prewarm_conversion_cache(comfy_path="", cache_identity="ident", convert=self._convert)
+        second = prewarm_conversion_cache(comfy_path="", cache_identity="ident", convert=self._convert)
+
+        by_folder = {os.path.basename(result.folder): result for result in first}
+        self.assertEqual({"alpha", "beta", "gamma"}, set(by_folder))
+        self.assertEqual(
+            os.path.join(self.repo_root, "Lighting", "alpha"), by_folder["alpha"].folder
+        )
+        self.assertEqual(PREWARM_CONVERTED, by_folder["alpha"].status)
+        self.assertEqual(PREWARM_FAILED, by_folder["beta"].status)
+        self.assertEqual(PREWARM_SKIPPED, by_folder["gamma"].status)
+        self.assertTrue(os.path.exists(by_folder["alpha"].prompt_path))
+
+        by_folder = {os.path.basename(result.folder): result for result in second}
+        self.assertEqual(PREWARM_CACHED, by_folder["alpha"].status)
+        self.assertEqual(PREWARM_FAILED, by_folder["beta"].status)
+        self.assertEqual([2, 1], self.converted_batches)
+
+    def test_skips_workflows_without_a_cache_folder(self):
+        with mock.patch("charon.conversion_prewarm.resolve_existing_folder", return_value=""):
+            results = prewarm_conversion_cache(comfy_path="", cache_identity="ident", convert=self._convert)
+
+        by_folder = {os.path.basename(result.folder): result for result in results}
+        self.assertEqual(PREWARM_SKIPPED, by_folder["alpha"].status)
+        self.assertEqual("", by_folder["alpha"].prompt_path)
+        self.assertEqual([], self.converted_batches)
+
+    def test_second_artist_reuses_team_conversion(self):
+        prewarm_conversion_cache(comfy_path="", cache_identity="ident", convert=self._convert)
+        with mock.patch.dict(os.environ, {"GALT_PLUGIN_DIR": os.path.join(self.temp_dir.name, "artist2")}):
+            results = prewarm_conversion_cache(comfy_path="", cache_identity="ident", convert=self._convert)
+
+        by_folder = {os.path.basename(result.folder): result for result in results}
+        self.assertEqual(PREWARM_CACHED, by_folder["alpha"].status)
+        self.assertTrue(os.path.exists(by_folder["alpha"].prompt_path))
+        # Only the failed workflow is converted again.
+        self.assertEqual([2, 1], self.converted_batches)
+
+    def test_mismatched_team_conversion_is_reconverted(self):
+        with mock.patch(
+            "charon.conversion_prewarm.load_shared_conversion",
+            return_value={"99": {"class_type": "SaveImage", "inputs": {}}},
+        ):
+            results = prewarm_conversion_cache(comfy_path="", cache_identity="ident", convert=self._convert)
+
+        by_folder = {os.path.basename(result.folder): result for result in results}
+        self.assertEqual(PREWARM_CONVERTED, by_folder["alpha"].status)
+        self.assertEqual([2], self.converted_batches)
+
+    def test_local_hit_republishes_a_wiped_team_conversion(self):
+        prewarm_conversion_cache(comfy_path="", cache_identity="ident", convert=self._convert)
+        workflow_hash = compute_workflow_hash(_ui_workflow("KSampler"))
+        shutil.rmtree(config.get_shared_conversion_cache_root())
+
+        results = prewarm_conversion_cache(comfy_path="", cache_identity="ident", convert=self._convert)
+
+        statuses = {os.path.basename(result.folder): result.status for result in results}
+        self.assertEqual(PREWARM_CACHED, statuses["alpha"])
+        self.assertEqual(
+            {"1": {"class_type": "KSampler", "inputs": {}}},
+            load_shared_conversion(workflow_hash, "ident"),
+        )
+
+    def test_rejected_team_conversion_is_replaced(self):
+        prewarm_conversion_cache(comfy_path="", cache_identity="ident", convert=self._convert)
+        workflow_hash = compute_workflow_hash(_ui_workflow("KSampler"))
+        bad = {"99": {"class_type": "SaveImage", "inputs": {}}}
+        self.assertTrue(publish_shared_conversion(workflow_hash, "ident", bad, replace=True))
+
+        with mock.patch.dict(os.environ, {"GALT_PLUGIN_DIR": os.path.join(self.temp_dir.name, "artist2")}):
+            results = prewarm_conversion_cache(comfy_path="", cache_identity="ident", convert=self._convert)
+
+        statuses = {os.path.basename(result.folder): result.status for result in results}
+        self.assertEqual(PREWARM_CONVERTED, statuses["alpha"])
+        self.assertEqual(
+            {"1": {"class_type": "KSampler", "inputs": {}}},
+            load_shared_conversion(workflow_hash, "ident"),
+        )
+
+    def test_new_comfy_identity_reconverts(self):
+        prewarm_conversion_cache(comfy_path="", cache_identity="old", convert=self._convert)
+        results = prewarm_conversion_cache(comfy_path="", cache_identity="new", convert=self._convert)
+
+        statuses = {os.path.basename(result.folder): result.status for result in results}
+        self.assertEqual(PREWARM_CONVERTED, statuses["alpha"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from charon import library_index
+from charon.library_index import get_library_index, invalidate_library_paths
+
+
+class LibraryIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.repo = os.path.join(self.temp_dir.name, "workflows")
+        self.folder = os.path.join(self.repo, "Lighting")
+        patcher = mock.patch.dict(
+            os.environ, {"GALT_PLUGIN_DIR": os.path.join(self.temp_dir.name, "prefs")}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.past = time.time() - 60
+        self._write_workflow("Relight", description="relight", tags=["light"])
+        self._write_workflow("Shadows", description="shadows")
+        self._age(self.repo)
+        self.reads = mock.patch.object(
+            library_index, "_read_workflow", wraps=library_index._read_workflow
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def _write_workflow(self, name, **meta):
+        path = os.path.join(self.folder, name)
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, ".charon.json"), "w", encoding="utf-8") as handle:
+            json.dump(meta, handle)
+        with open(os.path.join(path, "workflow.json"), "w", encoding="utf-8") as handle:
+            json.dump({"nodes": [], "name": name}, handle)
+        return path
+
+    def _age(self, root):
+        # Push mtimes out of the same-tick window so listings are trusted.
+        past = self.past
+        for folder, _dirs, files in os.walk(root):
+            for name in files:
+                os.utime(os.path.join(folder, name), (past, past))
+            os.utime(folder, (past, past))
+
+    def _read_names(self):
+        return sorted(os.path.basename(call.args[0]) for call in self.reads.call_args_list)
+
+    def test_first_scan_indexes_metadata_tags_and_hash(self):
+        index = get_library_index()
+
+        self.assertEqual(["Lighting"], index.list_folders(self.repo))
+        entries = index.folder_entries(self.folder)
+
+        self.assertEqual(["Relight", "Shadows"], [entry.name for entry in entries])
+        self.assertEqual("relight", entries[0].metadata["description"])
+        self.assertEqual(("light",), entries[0].tags)
+        self.assertEqual(64, len(entries[0].workflow_hash))
+        self.assertTrue(os.path.isfile(library_index.library_index_path()))
+
+    def test_fresh_listing_is_served_without_touching_the_share(self):
+        index = get_library_index()
+        index.all_entries(self.repo)
+        self.reads.reset_mock()
+
+        with mock.patch.object(library_index.os, "scandir", side_effect=AssertionError("share listed")):
+            entries = index.all_entries(self.repo)
+
+        self.assertEqual(2, len(entries))
+        self.reads.assert_not_called()
+
+    def test_reconcile_rereads_only_changed_directories(self):
+        index = get_library_index()
+        index.folder_entries(self.folder)
+        self.reads.reset_mock()
+
+        self._write_workflow("Relight", description="relit")
+        self._write_workflow("Fog", description="fog")
+        relight = os.path.join(self.folder, "Relight")
+        later = time.time() - 30
+        os.utime(relight, (later, later))
+        self._age(os.path.join(self.folder, "Fog"))
+        entries = index.folder_entries(self.folder, max_age=0)
+
+        self.assertEqual(["Fog", "Relight"], self._read_names())
+        self.assertEqual(["Fog", "Relight", "Shadows"], [entry.name for entry in entries])
+        self.assertEqual("relit", entries[1].metadata["description"])
+
+    def test_removed_directories_are_dropped(self):
+        index = get_library_index()
+        index.folder_entries(self.folder)
+
+        shadows = os.path.join(self.folder, "Shadows")
+        for name in os.listdir(shadows):
+            os.remove(os.path.join(shadows, name))
+        os.rmdir(shadows)
+
+        self.assertEqual(["Relight"], [entry.name for entry in index.folder_entries(self.folder, max_age=0)])
+
+    def test_invalidation_rereads_in_place_edits(self):
+        index = get_library_index()
+        index.folder_entries(self.folder)
+        self.reads.reset_mock()
+
+        # Rewriting a file in place leaves the directory mtime untouched.
+        self._write_workflow("Shadows", description="softer")
+        self._age(self.repo)
+        self.assertEqual("shadows", index.folder_entries(self.folder, max_age=0)[1].metadata["description"])
+        self.reads.assert_not_called()
+
+        invalidate_library_paths([os.path.join(self.folder, "Shadows")])
+        entries = index.folder_entries(self.folder)
+
+        self.assertEqual(["Shadows"], self._read_names())
+        self.assertEqual("softer", entries[1].metadata["description"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from charon import config
+from charon.comfy_validation import ValidationIssue, ValidationResult
+from charon.library_validation import (
+    LIBRARY_FAILED,
+    LIBRARY_NEEDS_RESOLVE,
+    LIBRARY_VALIDATED,
+    validate_workflow_library,
+)
+from charon.workflow_local_store import load_validation_resolve_status, validation_raw_path
+
+
+class ValidateWorkflowLibraryTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repo_root = os.path.join(self.temp_dir.name, "workflows")
+        # The library layout is <root>/<category>/<workflow>; dot folders are ignored.
+        for category, name in (
+            ("Lighting", "alpha"),
+            ("Lighting", "beta"),
+            ("Comp", "gamma"),
+            ("Comp", "delta"),
+            (".trash", "epsilon"),
+        ):
+            folder = os.path.join(self.repo_root, category, name)
+            os.makedirs(folder)
+            with open(os.path.join(folder, "workflow.json"), "w", encoding="utf-8") as handle:
+                json.dump({"nodes": [{"id": 1, "type": name}], "links": []}, handle)
+        patches = [
+            mock.patch.object(config, "WORKFLOW_REPOSITORY_ROOT", self.repo_root),
+            mock.patch.dict(os.environ, {"GALT_PLUGIN_DIR": os.path.join(self.temp_dir.name, "prefs")}),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.warmed = []
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _validate(self, comfy_path, *, workflow_bundle, node_catalog_key, **_kwargs):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.calls.append(node_catalog_key)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        node_type = workflow_bundle["workflow"]["nodes"][0]["type"]
+        if node_type == "gamma":
+            raise RuntimeError("ComfyUI went away")
+        missing = [{"name": f"{node_type}.safetensors", "category": "checkpoints"}] if node_type == "beta" else []
+        issue = ValidationIssue("models", "Models available", not missing, "", data={"missing_models": missing})
+        return ValidationResult(
+            comfy_path="",
+            issues=[issue],
+            started_at=1.0,
+            finished_at=2.0,
+            workflow_folder=workflow_bundle["folder"],
+        )
+
+    def test_validates_library_concurrently_and_persists_results(self):
+        results = validate_workflow_library(
+            os.path.join(self.temp_dir.name, "run_nvidia_gpu.bat"),
+            workers=4,
+            validate=self._validate,
+            warm=self.warmed.append,
+        )
+
+        statuses = {os.path.basename(result.folder): result.status for result in results}
+        self.assertEqual(
+            {
+                "alpha": LIBRARY_VALIDATED,
+                "beta": LIBRARY_NEEDS_RESOLVE,
+                "gamma": LIBRARY_FAILED,
+                "delta": LIBRARY_VALIDATED,
+            },
+            statuses,
+        )
+        self.assertEqual(1, len(self.warmed))
+        self.assertGreater(self.peak, 1)
+        self.assertEqual(1, len(set(self.calls)))
+        self.assertTrue(self.calls[0])
+
+        beta = os.path.join(self.repo_root, "Lighting", "beta")
+        with validation_raw_path(beta).open("r", encoding="utf-8") as handle:
+            raw = json.load(handle)
+        self.assertFalse(raw["payload"]["issues"][0]["ok"])
+        self.assertIsNotNone(load_validation_resolve_status(beta))
+        self.assertFalse(validation_raw_path(os.path.join(self.repo_root, "Comp", "gamma")).exists())
+
+    def test_requires_configured_comfy_path(self):
+        with mock.patch("charon.library_validation.resolve_comfy_runtime") as resolve:
+            resolve.return_value.configured_path = ""
+            with self.assertRaises(RuntimeError):
+                validate_workflow_library(validate=self._validate, warm=self.warmed.append)
+        self.assertEqual([], self.warmed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from charon import config
+from charon.json_io import atomic_write_json
+from charon.library_watcher import LibraryChange, LibraryWatcher
+
+
+class LibraryWatcherTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.repo = os.path.join(self.temp_dir.name, "workflows")
+        self.local = os.path.join(self.temp_dir.name, "local")
+        self.stamp = time.time() - 600
+        self._make(self.repo, "Lighting", "Relight")
+        self._make(self.repo, "Lighting", "Shadows")
+        self._make(self.repo, "Comp", "Grade")
+        self._make(self.local, "Lighting", "Relight")
+        patcher = mock.patch.object(config, "LIBRARY_WATCH_SWEEP_SEC", 3600, create=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.watcher = LibraryWatcher(
+            self.repo,
+            callback=mock.Mock(),
+            local_root=self.local,
+            local_nested=(".charon_cache", os.path.join(".charon_cache", "validation")),
+        )
+        self.assertEqual([], self.watcher.poll())
+
+    def _make(self, root, *parts):
+        path = os.path.join(root, *parts)
+        os.makedirs(path, exist_ok=True)
+        self._touch(path)
+        return path
+
+    def _touch(self, path):
+        # Each touch moves the mtime well outside the same-tick window.
+        self.stamp += 10
+        os.utime(path, (self.stamp, self.stamp))
+        parent = os.path.dirname(path)
+        while parent.startswith(self.temp_dir.name + os.sep):
+            os.utime(parent, (self.stamp, self.stamp))
+            parent = os.path.dirname(parent)
+
+    def _workflow(self, *parts):
+        return os.path.join(self.repo, *parts)
+
+    def test_reports_added_and_removed_workflows(self):
+        self._make(self.repo, "Lighting", "Fog")
+        os.rmdir(self._workflow("Lighting", "Shadows"))
+        self._touch(self._workflow("Lighting"))
+
+        self.assertEqual(
+            [
+                LibraryChange("removed", self._workflow("Lighting", "Shadows")),
+                LibraryChange("added", self._workflow("Lighting", "Fog")),
+            ],
+            self.watcher.poll(),
+        )
+        self.assertEqual([], self.watcher.poll())
+
+    def test_reports_folders_without_listing_their_workflows(self):
+        self._make(self.repo, "FX", "Smoke")
+        os.rmdir(self._workflow("Comp", "Grade"))
+        os.rmdir(self._workflow("Comp"))
+        self._touch(self.repo)
+
+        self.assertEqual(
+            [
+                LibraryChange("removed", self._workflow("Comp"), is_folder=True),
+                LibraryChange("added", self._workflow("FX"), is_folder=True),
+            ],
+            self.watcher.poll(),
+        )
+
+    def test_edits_are_seen_in_the_active_folder_only_until_the_sweep(self):
+        # Rewriting a workflow moves its own mtime, not the folder's.
+        relight = self._workflow("Lighting", "Relight")
+        self.stamp += 10
+        os.utime(relight, (self.stamp, self.stamp))
+        self.assertEqual([], self.watcher.poll())
+
+        self.watcher.set_active_folder(self._workflow("Lighting"))
+        self.stamp += 10
+        os.utime(relight, (self.stamp, self.stamp))
+        self.assertEqual([LibraryChange("changed", relight)], self.watcher.poll())
+
+        self.watcher.set_active_folder(None)
+        grade = self._workflow("Comp", "Grade")
+        self.stamp += 10
+        os.utime(grade, (self.stamp, self.stamp))
+        with mock.patch.object(config, "LIBRARY_WATCH_SWEEP_SEC", 0, create=True):
+            self.assertEqual([LibraryChange("changed", grade)], self.watcher.poll())
+
+    def test_local_mirror_changes_map_to_repository_workflows(self):
+        self.watcher.set_active_folder(self._workflow("Lighting"))
+        self._make(self.local, "Lighting", "Relight", ".charon_cache")
+        expected = [LibraryChange("changed", self._workflow("Lighting", "Relight"), local=True)]
+
+        self.assertEqual(expected, self.watcher.poll())
+
+        # Another session re-validates: the status file is replaced inside validation/.
+        validation = self._make(self.local, "Lighting", "Relight", ".charon_cache", "validation")
+        status_path = os.path.join(validation, "validation_resolve_status.json")
+        self.assertEqual(expected, self.watcher.poll())
+        for state in ("needs_resolve", "validated"):
+            atomic_write_json(status_path, {"state": state})
+            # Only validation/ moves; its parents keep their mtimes.
+            self.stamp += 10
+            os.utime(validation, (self.stamp, self.stamp))
+            self.assertEqual(expected, self.watcher.poll())
+
+    def test_unreachable_share_keeps_the_last_snapshot(self):
+        with mock.patch("charon.library_watcher.os.scandir", side_effect=OSError("offline")):
+            self.assertEqual([], self.watcher.poll())
+        self.assertEqual([], self.watcher.poll())
+
+
+if __name__ == "__main__":
+    unittest.main()
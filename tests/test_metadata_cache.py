@@ -0,0 +1,104 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from charon import config
+from charon.charon_metadata import load_charon_metadata
+from charon.metadata_cache import MetadataCache
+
+
+class MetadataCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.folder = os.path.join(self.temp_dir.name, "Lighting")
+        self.past = time.time() - 60
+        self.relight = self._write_workflow("Relight", tags=["light"])
+        self.shadows = self._write_workflow("Shadows", tags=["shadow"])
+        self.loader = mock.Mock(side_effect=load_charon_metadata)
+        self.cache = MetadataCache(self.loader)
+        # Revalidate against the file stat on every lookup.
+        patcher = mock.patch.object(config, "METADATA_CACHE_REVALIDATE_SEC", 0, create=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _write_workflow(self, name, mtime=None, **meta):
+        path = os.path.join(self.folder, name)
+        os.makedirs(path, exist_ok=True)
+        metadata_path = os.path.join(path, ".charon.json")
+        with open(metadata_path, "w", encoding="utf-8") as handle:
+            json.dump(meta, handle)
+        stamp = self.past if mtime is None else mtime
+        os.utime(metadata_path, (stamp, stamp))
+        os.utime(self.folder, (self.past, self.past))
+        return path
+
+    def _loaded(self):
+        return sorted(os.path.basename(call.args[0]) for call in self.loader.call_args_list)
+
+    def test_unchanged_file_is_served_from_cache(self):
+        first = self.cache.get(self.relight)
+        self.assertIs(first, self.cache.get(self.relight))
+        self.assertEqual(["Relight"], self._loaded())
+
+    def test_stat_change_rereads_only_that_workflow(self):
+        self.cache.get(self.relight)
+        self.cache.get(self.shadows)
+        self.loader.reset_mock()
+
+        self._write_workflow("Relight", mtime=self.past + 10, tags=["relit"])
+
+        self.assertEqual(["relit"], self.cache.get(self.relight)["tags"])
+        self.assertEqual(["shadow"], self.cache.get(self.shadows)["tags"])
+        self.assertEqual(["Relight"], self._loaded())
+
+    def test_recently_modified_file_is_not_trusted_on_stat(self):
+        self._write_workflow("Relight", mtime=time.time(), tags=["light"])
+        self.cache.get(self.relight)
+        self.cache.get(self.relight)
+        self.assertEqual(["Relight", "Relight"], self._loaded())
+
+    def test_folder_tags_recompute_only_the_invalidated_workflow(self):
+        self.assertEqual(["light", "shadow"], self.cache.folder_tags(self.folder))
+        self.loader.reset_mock()
+
+        # In-place rewrite with the same stat: only explicit invalidation sees it.
+        self._write_workflow("Shadows", tags=["shaded"])
+        self.assertEqual(["light", "shadow"], self.cache.folder_tags(self.folder))
+        self.cache.invalidate(self.shadows)
+
+        self.assertEqual(["light", "shaded"], self.cache.folder_tags(self.folder))
+        self.assertEqual(["Shadows"], self._loaded())
+
+    def test_invalidating_folder_tags_keeps_workflow_metadata(self):
+        self.cache.folder_tags(self.folder)
+        self.loader.reset_mock()
+
+        self.cache.invalidate_folder_tags(self.folder)
+
+        self.assertEqual(["light", "shadow"], self.cache.folder_tags(self.folder))
+        self.assertEqual([], self._loaded())
+
+    def test_new_workflow_in_folder_updates_tags(self):
+        self.cache.folder_tags(self.folder)
+        self.loader.reset_mock()
+
+        self._write_workflow("Fog", tags=["fog"])
+        os.utime(self.folder, (self.past + 10, self.past + 10))
+
+        self.assertEqual(["fog", "light", "shadow"], self.cache.folder_tags(self.folder))
+        self.assertEqual(["Fog"], self._loaded())
+
+    def test_evicts_least_recently_used_entries(self):
+        with mock.patch.object(config, "METADATA_CACHE_MAX_ENTRIES", 1, create=True):
+            self.cache.get(self.relight)
+            self.cache.get(self.shadows)
+            self.cache.get(self.relight)
+        self.assertEqual(["Relight", "Relight", "Shadows"], self._loaded())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from charon import config
+from charon.model_file_index import (
+    RootIndex,
+    extra_model_roots,
+    find_model_files,
+    invalidate_model_index,
+)
+
+
+class ModelFileIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.temp_dir.name, "models")
+        for folder in ("checkpoints", os.path.join("loras", "artist"), "vae"):
+            os.makedirs(os.path.join(self.root, folder))
+        self._write(os.path.join("checkpoints", "base.safetensors"))
+        self._write(os.path.join("loras", "artist", "Style.safetensors"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, relative):
+        path = os.path.join(self.root, relative)
+        with open(path, "wb") as handle:
+            handle.write(b"weights")
+        return path
+
+    def _age_directories(self):
+        # Push every folder mtime out of the same-tick window so a refresh trusts it.
+        past = time.time() - 60
+        for folder, _dirs, _files in os.walk(self.root):
+            os.utime(folder, (past, past))
+
+    def test_refresh_only_relists_changed_directories(self):
+        index = RootIndex(self.root)
+        self.assertEqual(5, index.refresh())
+        self._age_directories()
+        index.refresh()
+
+        self.assertEqual(0, index.refresh())
+
+        added = self._write(os.path.join("vae", "decoder.safetensors"))
+        self.assertEqual(1, index.refresh())
+        self.assertEqual([added], [item.path for item in index.find("DECODER.safetensors")])
+        self.assertEqual(
+            os.path.join(self.root, "loras", "artist", "Style.safetensors"),
+            index.find("style.safetensors")[0].path,
+        )
+
+    def test_manifest_restores_index_without_walking(self):
+        manifest = os.path.join(self.temp_dir.name, "index.json")
+        with mock.patch.object(config, "MODEL_INDEX_PERSIST_MIN_FILES", 0, create=True):
+            RootIndex(self.root, manifest).refresh()
+
+        reloaded = RootIndex(self.root, manifest)
+
+        self.assertEqual(1, len(reloaded.find("base.safetensors")))
+        self.assertEqual(1, len(reloaded.table(max_depth=1)))
+        self.assertEqual(2, len(reloaded.table()))
+
+    def test_find_model_files_skips_removed_files_and_prefers_shallow(self):
+        shallow = self._write("base.safetensors")
+        deep = os.path.join(self.root, "checkpoints", "base.safetensors")
+
+        self.assertEqual([shallow, deep], find_model_files("base.safetensors", [self.root, self.root]))
+
+        os.remove(shallow)
+        self.assertEqual([deep], find_model_files("base.safetensors", [self.root]))
+
+    def test_invalidation_picks_up_files_published_by_charon(self):
+        self.assertEqual([], find_model_files("late.safetensors", [self.root]))
+        with mock.patch.object(config, "MODEL_INDEX_REFRESH_SEC", 3600, create=True):
+            find_model_files("base.safetensors", [self.root])
+            published = self._write(os.path.join("vae", "late.safetensors"))
+            invalidate_model_index(published)
+
+            self.assertEqual([published], find_model_files("late.safetensors", [self.root]))
+
+    def test_extra_model_paths_roots(self):
+        comfy_dir = os.path.join(self.temp_dir.name, "ComfyUI")
+        shared = os.path.join(self.temp_dir.name, "share")
+        for folder in (comfy_dir, os.path.join(shared, "checkpoints"), os.path.join(shared, "loras")):
+            os.makedirs(folder)
+        with open(os.path.join(comfy_dir, "extra_model_paths.yaml"), "w", encoding="utf-8") as handle:
+            handle.write(
+                "studio:\n"
+                f"  base_path: {shared}\n"
+                "  is_default: true\n"
+                "  checkpoints: checkpoints\n"
+                "  loras: |\n"
+                "    loras\n"
+                "    missing\n"
+            )
+
+        self.assertEqual(
+            [os.path.join(shared, "checkpoints"), os.path.join(shared, "loras")],
+            extra_model_roots(comfy_dir),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
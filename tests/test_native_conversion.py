@@ -0,0 +1,280 @@
+import unittest
+from unittest import mock
+
+from charon import workflow_pipeline
+from charon.native_conversion import NativeConversionUnsupported, convert_ui_workflow
+from charon.workflow_pipeline import convert_workflow, validate_converted_workflow
+
+
+OBJECT_INFO = {
+    "CheckpointLoaderSimple": {
+        "input": {"required": {"ckpt_name": [["model.safetensors"]]}},
+        "display_name": "Load Checkpoint",
+    },
+    "CLIPTextEncode": {
+        "input": {
+            "required": {
+                "text": ["STRING", {"multiline": True, "dynamicPrompts": True}],
+                "clip": ["CLIP"],
+            }
+        }
+    },
+    "EmptyLatentImage": {
+        "input": {
+            "required": {
+                "width": ["INT", {"default": 512}],
+                "height": ["INT", {"default": 512}],
+                "batch_size": ["INT", {"default": 1}],
+            }
+        }
+    },
+    "LatentUpscaleBy": {
+        "input": {
+            "required": {
+                "samples": ["LATENT"],
+                "upscale_method": [["nearest-exact", "bilinear"]],
+                "scale_by": ["FLOAT", {"default": 1.5}],
+            }
+        }
+    },
+    "KSampler": {
+        "input": {
+            "required": {
+                "model": ["MODEL"],
+                "seed": ["INT", {"default": 0, "control_after_generate": True}],
+                "steps": ["INT", {"default": 20}],
+                "cfg": ["FLOAT", {"default": 8.0}],
+                "sampler_name": [["euler", "dpmpp_2m"]],
+                "scheduler": [["normal", "karras"]],
+                "positive": ["CONDITIONING"],
+                "negative": ["CONDITIONING"],
+                "latent_image": ["LATENT"],
+                "denoise": ["FLOAT", {"default": 1.0}],
+            }
+        }
+    },
+    "VAEDecode": {"input": {"required": {"samples": ["LATENT"], "vae": ["VAE"]}}},
+    "SaveImage": {
+        "input": {
+            "required": {"images": ["IMAGE"], "filename_prefix": ["STRING", {"default": "ComfyUI"}]},
+            "hidden": {"prompt": "PROMPT"},
+        }
+    },
+    "LoadImage": {
+        "input": {"required": {"image": [["photo.png"], {"image_upload": True}]}},
+    },
+}
+
+
+def _socket(name, socket_type, link=None, widget=False):
+    socket = {"name": name, "type": socket_type, "link": link}
+    if widget:
+        socket["widget"] = {"name": name}
+    return socket
+
+
+def _stock_workflow():
+    return {
+        "nodes": [
+            {"id": 1, "type": "CheckpointLoaderSimple", "mode": 0, "widgets_values": ["model.safetensors"]},
+            {
+                "id": 2,
+                "type": "CLIPTextEncode",
+                "mode": 0,
+                "inputs": [_socket("clip", "CLIP", 2)],
+                "widgets_values": ["a cat"],
+            },
+            {
+                "id": 3,
+                "type": "KSampler",
+                "mode": 0,
+                "title": "Main Sampler",
+                "inputs": [
+                    _socket("model", "MODEL", 10),
+                    _socket("positive", "CONDITIONING", 3),
+                    _socket("negative", "CONDITIONING", 4),
+                    _socket("latent_image", "LATENT", 7),
+                    _socket("seed", "INT", 11, widget=True),
+                ],
+                "widgets_values": [42, "randomize", 20, 7.5, "euler", "normal", 1.0],
+            },
+            {"id": 4, "type": "EmptyLatentImage", "mode": 0, "widgets_values": [768, 512, 1]},
+            {
+                "id": 5,
+                "type": "VAEDecode",
+                "mode": 0,
+                "inputs": [_socket("samples", "LATENT", 8), _socket("vae", "VAE", 9)],
+            },
+            {
+                "id": 6,
+                "type": "SaveImage",
+                "mode": 0,
+                "inputs": [_socket("images", "IMAGE", 12)],
+                "widgets_values": ["render"],
+            },
+            {"id": 7, "type": "Reroute", "mode": 0, "inputs": [_socket("", "*", 1)]},
+            {
+                "id": 8,
+                "type": "CLIPTextEncode",
+                "mode": 2,
+                "inputs": [_socket("clip", "CLIP", 5)],
+                "widgets_values": ["blurry"],
+            },
+            {
+                "id": 9,
+                "type": "LatentUpscaleBy",
+                "mode": 4,
+                "inputs": [_socket("samples", "LATENT", 6)],
+                "widgets_values": ["bilinear", 2.0],
+            },
+            {"id": 10, "type": "PrimitiveNode", "mode": 0, "widgets_values": [42, "randomize"]},
+            {"id": 11, "type": "LoadImage", "mode": 0, "widgets_values": ["photo.png", "image"]},
+            {"id": 12, "type": "Note", "mode": 0, "widgets_values": ["Render notes"]},
+        ],
+        "links": [
+            [1, 1, 0, 7, 0, "MODEL"],
+            [2, 1, 1, 2, 0, "CLIP"],
+            [3, 2, 0, 3, 1, "CONDITIONING"],
+            [4, 8, 0, 3, 2, "CONDITIONING"],
+            [5, 1, 1, 8, 0, "CLIP"],
+            [6, 4, 0, 9, 0, "LATENT"],
+            [7, 9, 0, 3, 3, "LATENT"],
+            [8, 3, 0, 5, 0, "LATENT"],
+            [9, 1, 2, 5, 1, "VAE"],
+            [10, 7, 0, 3, 0, "MODEL"],
+            [11, 10, 0, 3, 4, "INT"],
+            [12, 5, 0, 6, 0, "IMAGE"],
+        ],
+    }
+
+
+class NativeConversionTests(unittest.TestCase):
+    def test_converts_stock_graph_like_the_frontend(self):
+        prompt = convert_ui_workflow(_stock_workflow(), OBJECT_INFO)
+
+        self.assertEqual({"1", "2", "3", "4", "5", "6", "11"}, set(prompt))
+        self.assertEqual(
+            {
+                "seed": 42,
+                "steps": 20,
+                "cfg": 7.5,
+                "sampler_name": "euler",
+                "scheduler": "normal",
+                "denoise": 1.0,
+                # Rerouted model and the bypassed upscale's passthrough latent.
+                "model": ["1", 0],
+                "positive": ["2", 0],
+                "latent_image": ["4", 0],
+            },
+            prompt["3"]["inputs"],
+        )
+        self.assertEqual("Main Sampler", prompt["3"]["_meta"]["title"])
+        self.assertEqual("Load Checkpoint", prompt["1"]["_meta"]["title"])
+        self.assertEqual({"image": "photo.png"}, prompt["11"]["inputs"])
+        self.assertEqual({"samples": ["3", 0], "vae": ["1", 2]}, prompt["5"]["inputs"])
+        validate_converted_workflow(_stock_workflow(), prompt)
+
+    def test_resolves_set_and_get_nodes(self):
+        workflow = {
+            "nodes": [
+                {"id": 1, "type": "CheckpointLoaderSimple", "widgets_values": ["model.safetensors"]},
+                {"id": 2, "type": "SetNode", "inputs": [_socket("CLIP", "CLIP", 1)], "widgets_values": ["clip"]},
+                {"id": 3, "type": "GetNode", "widgets_values": ["clip"]},
+                {
+                    "id": 4,
+                    "type": "CLIPTextEncode",
+                    "inputs": [_socket("clip", "CLIP", 2)],
+                    "widgets_values": ["a cat"],
+                },
+            ],
+            "links": [[1, 1, 1, 2, 0, "CLIP"], [2, 3, 0, 4, 0, "CLIP"]],
+        }
+
+        prompt = convert_ui_workflow(workflow, OBJECT_INFO)
+
+        self.assertEqual({"1", "4"}, set(prompt))
+        self.assertEqual({"text": "a cat", "clip": ["1", 1]}, prompt["4"]["inputs"])
+
+    def test_flattens_subgraphs_with_frontend_ids(self):
+        subgraph_id = "5b1c4a4e-0000-4000-8000-000000000001"
+        workflow = {
+            "nodes": [
+                {"id": 1, "type": "CheckpointLoaderSimple", "widgets_values": ["model.safetensors"]},
+                {"id": 2, "type": subgraph_id, "inputs": [_socket("clip", "CLIP", 1)], "widgets_values": []},
+                {"id": 3, "type": "SaveImage", "inputs": [_socket("images", "IMAGE", 2)], "widgets_values": ["out"]},
+            ],
+            "links": [[1, 1, 1, 2, 0, "CLIP"], [2, 2, 0, 3, 0, "IMAGE"]],
+            "definitions": {
+                "subgraphs": [
+                    {
+                        "id": subgraph_id,
+                        "nodes": [
+                            {
+                                "id": 7,
+                                "type": "CLIPTextEncode",
+                                "inputs": [_socket("clip", "CLIP", 20)],
+                                "widgets_values": ["inside"],
+                            },
+                            {"id": 8, "type": "LoadImage", "widgets_values": ["photo.png", "image"]},
+                        ],
+                        "links": [
+                            {"id": 20, "origin_id": -10, "origin_slot": 0, "target_id": 7, "target_slot": 0, "type": "CLIP"},
+                            {"id": 21, "origin_id": 8, "origin_slot": 0, "target_id": -20, "target_slot": 0, "type": "IMAGE"},
+                        ],
+                    }
+                ]
+            },
+        }
+
+        prompt = convert_ui_workflow(workflow, OBJECT_INFO)
+
+        self.assertEqual({"1", "2:7", "2:8", "3"}, set(prompt))
+        self.assertEqual(["1", 1], prompt["2:7"]["inputs"]["clip"])
+        self.assertEqual(["2:8", 0], prompt["3"]["inputs"]["images"])
+        validate_converted_workflow(workflow, prompt)
+
+    def test_rejects_what_it_cannot_prove(self):
+        unknown = _stock_workflow()
+        unknown["nodes"][3]["type"] = "CustomLatent"
+        extra_widget = _stock_workflow()
+        extra_widget["nodes"][3]["widgets_values"].append("fixed")
+        dynamic_prompt = _stock_workflow()
+        dynamic_prompt["nodes"][1]["widgets_values"] = ["a {cat|dog}"]
+
+        for workflow in (unknown, extra_widget, dynamic_prompt):
+            with self.assertRaises(NativeConversionUnsupported):
+                convert_ui_workflow(workflow, OBJECT_INFO)
+
+
+class ConvertWorkflowNativePathTests(unittest.TestCase):
+    def test_skips_browser_when_native_conversion_succeeds(self):
+        with mock.patch.object(
+            workflow_pipeline, "get_object_info_for_classes", return_value=OBJECT_INFO
+        ) as schema, mock.patch.object(
+            workflow_pipeline, "_resolve_export_environment", side_effect=AssertionError("browser used")
+        ):
+            prompt = convert_workflow(_stock_workflow(), "comfy_path")
+
+        self.assertEqual("KSampler", prompt["3"]["class_type"])
+        self.assertIn("KSampler", schema.call_args.args[0])
+        self.assertTrue(schema.call_args.kwargs["strict"])
+
+    def test_falls_back_to_browser_for_unknown_nodes(self):
+        workflow = _stock_workflow()
+        workflow["nodes"][3]["type"] = "CustomLatent"
+        browser = {"1": {"class_type": "CheckpointLoaderSimple", "inputs": {}}}
+        with mock.patch.object(
+            workflow_pipeline, "get_object_info_for_classes", return_value=OBJECT_INFO
+        ), mock.patch.object(
+            workflow_pipeline,
+            "_resolve_export_environment",
+            return_value=("python", "comfy", "exporter.py"),
+        ), mock.patch.object(workflow_pipeline, "_convert_with_worker", return_value=browser) as worker:
+            prompt = convert_workflow(workflow, "comfy_path")
+
+        self.assertIs(browser, prompt)
+        worker.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from charon import object_info_cache
+from charon.api_introspection import ObjectInfoIndex, get_node_widget_specs_from_schema
+from charon.comfy_environment import ComfyEnvironment
+from charon.object_info_cache import (
+    get_object_info,
+    get_object_info_for_classes,
+    invalidate_object_info_cache,
+)
+
+
+OBJECT_INFO = {
+    "KSampler": {
+        "input": {
+            "required": {
+                "model": ["MODEL"],
+                "seed": ["INT", {"default": 0}],
+                "sampler_name": [["euler", "dpmpp_2m"]],
+            }
+        }
+    }
+}
+STATS = {"system": {"comfyui_version": "0.3.60", "comfy_package_versions": []}}
+
+
+class ObjectInfoCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.comfy_dir = os.path.join(self.temp_dir.name, "ComfyUI")
+        os.makedirs(os.path.join(self.comfy_dir, "custom_nodes", "ComfyUI-Charon"))
+        os.makedirs(os.path.join(self.comfy_dir, "models", "checkpoints"))
+        self.runtime = ComfyEnvironment(
+            configured_path="",
+            base_url="http://127.0.0.1:8188",
+            comfy_dir=self.comfy_dir,
+        )
+        self.client = mock.Mock()
+        self.client.get_system_stats.return_value = STATS
+        self.client.get_object_info.return_value = OBJECT_INFO
+        patches = [
+            mock.patch.object(object_info_cache, "_client", return_value=self.client),
+            mock.patch.object(
+                object_info_cache.paths,
+                "get_charon_temp_dir",
+                return_value=os.path.join(self.temp_dir.name, "temp"),
+            ),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        invalidate_object_info_cache()
+        self.addCleanup(invalidate_object_info_cache)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_downloads_once_per_identity_and_reloads_from_disk(self):
+        first = get_object_info(self.runtime)
+        second = get_object_info(self.runtime)
+        self.assertIs(first, second)
+
+        invalidate_object_info_cache()
+        reloaded = get_object_info(self.runtime)
+
+        self.assertEqual(OBJECT_INFO, reloaded)
+        self.assertEqual(1, self.client.get_object_info.call_count)
+
+    def test_new_custom_node_pack_or_comfy_version_refetches(self):
+        get_object_info(self.runtime)
+        os.makedirs(os.path.join(self.comfy_dir, "custom_nodes", "ComfyUI-Impact-Pack"))
+        get_object_info(self.runtime)
+        self.client.get_system_stats.return_value = {"system": {"comfyui_version": "0.3.61"}}
+        get_object_info(self.runtime)
+
+        self.assertEqual(3, self.client.get_object_info.call_count)
+
+    def test_offline_server_uses_last_known_schema(self):
+        get_object_info(self.runtime)
+        invalidate_object_info_cache()
+        self.client.get_system_stats.return_value = None
+
+        self.assertEqual(OBJECT_INFO, get_object_info(self.runtime))
+        self.assertEqual(1, self.client.get_object_info.call_count)
+
+    def test_fetches_only_workflow_classes_and_caches_them(self):
+        self.client.get_object_info_for_class.side_effect = (
+            lambda name: {name: OBJECT_INFO[name]} if name in OBJECT_INFO else {}
+        )
+
+        first = get_object_info_for_classes(["KSampler", "MissingNode"], self.runtime)
+        second = get_object_info_for_classes(["MissingNode", "KSampler"], self.runtime)
+
+        self.assertEqual(OBJECT_INFO, first)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertIs(first.widget_specs("KSampler"), second.widget_specs("KSampler"))
+        self.assertEqual(2, self.client.get_object_info_for_class.call_count)
+        self.client.get_object_info.assert_not_called()
+
+    def test_concurrent_lookups_share_one_download_without_blocking_the_cache(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_download():
+            started.set()
+            release.wait(5)
+            return OBJECT_INFO
+
+        self.client.get_object_info.side_effect = slow_download
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_object_info(self.runtime)))
+            for _ in range(3)
+        ]
+        threads[0].start()
+        self.assertTrue(started.wait(5))
+        for thread in threads[1:]:
+            thread.start()
+        # The module lock is free while the download runs.
+        self.assertTrue(object_info_cache._LOCK.acquire(timeout=1))
+        object_info_cache._LOCK.release()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual([OBJECT_INFO] * 3, results)
+        self.assertEqual(1, self.client.get_object_info.call_count)
+
+    def test_per_class_route_missing_falls_back_to_full_schema(self):
+        self.client.get_object_info_for_class.return_value = None
+
+        schema = get_object_info_for_classes(["KSampler"], self.runtime)
+        get_object_info_for_classes(["KSampler"], self.runtime)
+
+        self.assertEqual(OBJECT_INFO, schema)
+        self.assertEqual(1, self.client.get_object_info.call_count)
+        self.assertEqual(1, self.client.get_object_info_for_class.call_count)
+
+    def test_strict_lookup_refuses_a_stale_disk_schema(self):
+        get_object_info(self.runtime)
+        invalidate_object_info_cache()
+        self.client.get_system_stats.return_value = {"system": {"comfyui_version": "0.3.61"}}
+        self.client.get_object_info_for_class.return_value = None
+        self.client.get_object_info.return_value = None
+
+        self.assertIsNone(get_object_info_for_classes(["KSampler"], self.runtime, strict=True))
+        self.assertEqual(OBJECT_INFO, get_object_info_for_classes(["KSampler"], self.runtime))
+
+        self.client.get_system_stats.return_value = None
+        self.assertIsNone(get_object_info_for_classes(["KSampler"], self.runtime, strict=True))
+
+    def test_index_normalizes_each_class_once(self):
+        index = ObjectInfoIndex(OBJECT_INFO)
+
+        specs = get_node_widget_specs_from_schema("KSampler", index)
+
+        self.assertIs(specs, get_node_widget_specs_from_schema("KSampler", index))
+        self.assertEqual(specs, get_node_widget_specs_from_schema("KSampler", OBJECT_INFO))
+        self.assertEqual(["seed", "sampler_name"], [spec.name for spec in specs])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import time
+import unittest
+
+from charon.processor_output import ingest_local_output, is_local_comfy_url
+
+
+class LocalOutputIngestTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.temp_dir.name, "output", "ComfyUI_00001_.png")
+        os.makedirs(os.path.dirname(self.source))
+        with open(self.source, "wb") as handle:
+            handle.write(b"rendered pixels")
+        # Allocation leaves an empty placeholder at the versioned path.
+        self.destination = os.path.join(self.temp_dir.name, "_CHARON", "v001", "result.png")
+        os.makedirs(os.path.dirname(self.destination))
+        open(self.destination, "wb").close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_replaces_placeholder_with_source_bytes(self):
+        method = ingest_local_output(self.source, self.destination, produced_after=time.time())
+
+        self.assertIn(method, {"hardlink", "reflink", "copy"})
+        with open(self.destination, "rb") as handle:
+            self.assertEqual(b"rendered pixels", handle.read())
+        self.assertEqual(["result.png"], os.listdir(os.path.dirname(self.destination)))
+
+    def test_rejects_outputs_older_than_the_prompt(self):
+        stale = time.time() - 3600
+        os.utime(self.source, (stale, stale))
+
+        self.assertEqual("", ingest_local_output(self.source, self.destination, produced_after=time.time()))
+        self.assertEqual(0, os.path.getsize(self.destination))
+
+    def test_missing_or_empty_source_is_not_ingested(self):
+        empty = os.path.join(self.temp_dir.name, "output", "empty.png")
+        open(empty, "wb").close()
+
+        self.assertEqual("", ingest_local_output(empty, self.destination))
+        self.assertEqual("", ingest_local_output(empty + ".missing", self.destination))
+
+    def test_detects_loopback_servers(self):
+        self.assertTrue(is_local_comfy_url("http://127.0.0.1:8188"))
+        self.assertTrue(is_local_comfy_url("http://localhost:8188"))
+        self.assertTrue(is_local_comfy_url("http://[::1]:8188"))
+        self.assertFalse(is_local_comfy_url(""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import threading
+import time
+import unittest
+
+from charon.processor_pipeline import run_pipelined_units
+
+
+class RunPipelinedUnitsTests(unittest.TestCase):
+    def test_submits_ahead_and_commits_in_unit_order(self):
+        events = []
+        lock = threading.Lock()
+
+        def record(entry):
+            with lock:
+                events.append(entry)
+
+        def submit(index, unit):
+            record(("submit", index))
+            return {"index": index, "unit": unit}
+
+        def wait(state):
+            record(("wait", state["index"]))
+            return state["unit"] * 10
+
+        def ingest(state, artifacts):
+            # Earlier units finish downloading last to prove commit ordering.
+            time.sleep(0.02 * (4 - state["index"]))
+            return artifacts + 1
+
+        committed = []
+        run_pipelined_units(
+            [1, 2, 3, 4],
+            submit=submit,
+            wait=wait,
+            ingest=ingest,
+            commit=lambda state, result: committed.append((state["index"], result)),
+            window=2,
+            ingest_workers=4,
+        )
+
+        self.assertEqual([(0, 11), (1, 21), (2, 31), (3, 41)], committed)
+        self.assertEqual(
+            [("submit", 0), ("submit", 1), ("submit", 2), ("wait", 0)],
+            events[:4],
+        )
+
+    def test_zero_window_submits_after_each_wait(self):
+        order = []
+
+        run_pipelined_units(
+            ["a", "b"],
+            submit=lambda index, unit: order.append(f"submit-{unit}") or unit,
+            wait=lambda state: order.append(f"wait-{state}") or state,
+            ingest=lambda state, artifacts: artifacts,
+            commit=lambda state, result: order.append(f"commit-{result}"),
+            window=0,
+            ingest_workers=1,
+        )
+
+        self.assertLess(order.index("commit-a"), order.index("commit-b"))
+        self.assertLess(order.index("submit-b"), order.index("wait-b"))
+        self.assertLess(order.index("wait-a"), order.index("submit-b"))
+
+    def test_failure_withdraws_prompts_queued_ahead(self):
+        abandoned = []
+
+        def wait(state):
+            if state == 1:
+                raise RuntimeError("ComfyUI failed")
+            return state
+
+        with self.assertRaises(RuntimeError):
+            run_pipelined_units(
+                [0, 1, 2, 3],
+                submit=lambda index, unit: unit,
+                wait=wait,
+                ingest=lambda state, artifacts: artifacts,
+                commit=lambda state, result: None,
+                window=2,
+                ingest_workers=1,
+                abandon=abandoned.extend,
+            )
+
+        self.assertEqual([2, 3], abandoned)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from unittest import mock
+
+from charon import quick_search_index
+from charon.quick_search_index import QuickSearchIndex
+
+
+ROWS = [
+    ("Lighting > Relight Portrait", "/repo/Lighting/Relight Portrait", {"tags": ["light"], "description": ""}),
+    ("Lighting > Sky_Replace", "/repo/Lighting/Sky_Replace", {"tags": ["sky"], "description": "swap skies"}),
+    ("Comp > Relight", "/repo/Comp/Relight", {"tags": [], "description": ""}),
+    ("Comp > Grade Match", "/repo/Comp/Grade Match", {"tags": ["color"], "description": "match plates"}),
+    ("Comp > Depth Blur", "/repo/Comp/Depth Blur", None),
+]
+
+
+def _paths(results):
+    return [path for _display, path, _metadata in results]
+
+
+class QuickSearchIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = QuickSearchIndex(ROWS)
+
+    def test_ranks_name_matches_before_folder_tag_fuzzy_and_description(self):
+        self.assertEqual(
+            ["/repo/Comp/Relight", "/repo/Lighting/Relight Portrait"],
+            _paths(self.index.search("relight")),
+        )
+        self.assertEqual(
+            ["/repo/Lighting/Relight Portrait", "/repo/Lighting/Sky_Replace"],
+            _paths(self.index.search("lighting")),
+        )
+        self.assertEqual(["/repo/Comp/Depth Blur"], _paths(self.index.search("dpblr")))
+
+        index = QuickSearchIndex(
+            [
+                ("Paint > Denoise", "/repo/Paint/Denoise", {"description": "cleans plates"}),
+                ("Paint > Pl Lt Ate", "/repo/Paint/Pl Lt Ate", {}),
+                ("Paint > Plate Cleanup", "/repo/Paint/Plate Cleanup", {}),
+            ]
+        )
+        self.assertEqual(
+            ["/repo/Paint/Plate Cleanup", "/repo/Paint/Pl Lt Ate", "/repo/Paint/Denoise"],
+            _paths(index.search("plate")),
+        )
+        self.assertEqual(["/repo/Comp/Grade Match"], _paths(self.index.search("colo")))
+
+    def test_ignores_case_and_separators(self):
+        self.assertEqual(["/repo/Lighting/Sky_Replace"], _paths(self.index.search("sky-REPLACE")))
+        self.assertEqual([], self.index.search("  "))
+
+    def test_extended_query_only_rescores_previous_matches(self):
+        self.index.search("re")
+        with mock.patch.object(
+            quick_search_index.SearchEntry, "score", autospec=True, side_effect=quick_search_index.SearchEntry.score
+        ) as score:
+            results = self.index.search("rel")
+        scored = {entry.path for entry, _query in (call.args for call in score.call_args_list)}
+        self.assertNotIn("/repo/Comp/Depth Blur", scored)
+        self.assertEqual(
+            ["/repo/Comp/Relight", "/repo/Lighting/Relight Portrait"],
+            _paths(results)[:2],
+        )
+
+    def test_limits_results(self):
+        self.assertEqual(2, len(self.index.search("e", limit=2)))
+
+
+if __name__ == "__main__":
+    unittest.main()
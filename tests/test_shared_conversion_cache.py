@@ -0,0 +1,67 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from charon import config
+from charon.shared_conversion_cache import (
+    STALE_LOCK_SECONDS,
+    load_shared_conversion,
+    publish_shared_conversion,
+    shared_conversion_path,
+)
+
+
+PROMPT = {"1": {"class_type": "KSampler", "inputs": {}}}
+
+
+class SharedConversionCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repo_root = os.path.join(self.temp_dir.name, "workflows")
+        os.makedirs(self.repo_root)
+        patcher = mock.patch.object(config, "WORKFLOW_REPOSITORY_ROOT", self.repo_root)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_publishes_once_beside_repository_and_loads_by_hash_and_identity(self):
+        self.assertTrue(publish_shared_conversion("hash", "identity", PROMPT))
+        self.assertFalse(publish_shared_conversion("hash", "identity", {"other": {}}))
+
+        path = shared_conversion_path("hash", "identity")
+        self.assertTrue(path.startswith(os.path.join(self.temp_dir.name, "conversion_cache")))
+        self.assertFalse(os.path.exists(f"{path}.charon.lock"))
+        self.assertEqual(PROMPT, load_shared_conversion("hash", "identity"))
+        self.assertIsNone(load_shared_conversion("hash", "other-identity"))
+        self.assertIsNone(load_shared_conversion("other-hash", "identity"))
+
+    def test_held_lock_skips_publish_and_stale_lock_is_reclaimed(self):
+        path = shared_conversion_path("hash", "identity")
+        os.makedirs(os.path.dirname(path))
+        lock_path = f"{path}.charon.lock"
+        with open(lock_path, "w", encoding="utf-8") as handle:
+            handle.write("pid=1\n")
+
+        self.assertFalse(publish_shared_conversion("hash", "identity", PROMPT))
+        self.assertIsNone(load_shared_conversion("hash", "identity"))
+
+        past = time.time() - STALE_LOCK_SECONDS - 60
+        os.utime(lock_path, (past, past))
+        self.assertTrue(publish_shared_conversion("hash", "identity", PROMPT))
+        self.assertEqual(PROMPT, load_shared_conversion("hash", "identity"))
+
+    def test_disabled_or_unreachable_repository_is_ignored(self):
+        with mock.patch.object(config, "SHARED_CONVERSION_CACHE", False, create=True):
+            self.assertFalse(publish_shared_conversion("hash", "identity", PROMPT))
+        with mock.patch.object(config, "WORKFLOW_REPOSITORY_ROOT", os.path.join(self.temp_dir.name, "offline")):
+            self.assertFalse(publish_shared_conversion("hash", "identity", PROMPT))
+            self.assertIsNone(load_shared_conversion("hash", "identity"))
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir.name, "conversion_cache")))
+
+
+if __name__ == "__main__":
+    unittest.main()
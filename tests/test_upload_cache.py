@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+
+from charon.upload_cache import (
+    UploadCache,
+    content_addressed_name,
+    hash_file,
+    server_scope,
+    upload_deduplicated,
+)
+
+
+class _FakeClient:
+    def __init__(self):
+        self.inputs = {}
+        self.uploads = []
+
+    def input_file_exists(self, filename, subfolder="", size=None):
+        stored = self.inputs.get(filename)
+        return stored is not None and (size is None or stored == size)
+
+    def upload_image(self, image_path, upload_name=None, progress_callback=None):
+        name = upload_name or os.path.basename(image_path)
+        self.uploads.append(name)
+        self.inputs[name] = os.path.getsize(image_path)
+        return name
+
+
+class UploadDeduplicationTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manifest = os.path.join(self.temp_dir.name, "cache", "server.json")
+        self.client = _FakeClient()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, name, data):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "wb") as handle:
+            handle.write(data)
+        return path
+
+    def test_identical_frames_upload_once(self):
+        cache = UploadCache(self.manifest)
+        first = self._write("frame_0001.png", b"same plate")
+        second = self._write("frame_0002.png", b"same plate")
+
+        first_name, first_reused = upload_deduplicated(self.client, first, cache)
+        second_name, second_reused = upload_deduplicated(self.client, second, cache)
+
+        self.assertEqual(first_name, second_name)
+        self.assertFalse(first_reused)
+        self.assertTrue(second_reused)
+        self.assertEqual([content_addressed_name(first, hash_file(first))], self.client.uploads)
+
+    def test_manifest_persists_between_sessions(self):
+        path = self._write("input.png", b"pixels")
+        upload_deduplicated(self.client, path, UploadCache(self.manifest))
+
+        reloaded = UploadCache(self.manifest)
+
+        self.assertEqual(
+            content_addressed_name(path, hash_file(path)),
+            reloaded.lookup(hash_file(path))["name"],
+        )
+
+    def test_reuploads_when_server_lost_the_file(self):
+        cache = UploadCache(self.manifest)
+        path = self._write("input.png", b"pixels")
+        name, _reused = upload_deduplicated(self.client, path, cache)
+        self.client.inputs.clear()
+
+        again, reused = upload_deduplicated(self.client, path, cache)
+
+        self.assertEqual(name, again)
+        self.assertFalse(reused)
+        self.assertEqual(2, len(self.client.uploads))
+
+    def test_finds_file_uploaded_by_another_session(self):
+        path = self._write("input.png", b"pixels")
+        self.client.inputs[content_addressed_name(path, hash_file(path))] = os.path.getsize(path)
+
+        _name, reused = upload_deduplicated(self.client, path, UploadCache(self.manifest))
+
+        self.assertTrue(reused)
+        self.assertEqual([], self.client.uploads)
+
+    def test_scope_separates_servers_and_installs(self):
+        self.assertEqual(server_scope("http://127.0.0.1:8188/"), server_scope("http://127.0.0.1:8188"))
+        self.assertNotEqual(server_scope("http://127.0.0.1:8188"), server_scope("http://127.0.0.1:8189"))
+        self.assertNotEqual(
+            server_scope("http://127.0.0.1:8188", "a"),
+            server_scope("http://127.0.0.1:8188", "b"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,8 +4,12 @@ import unittest
 from types import SimpleNamespace
 from unittest import mock
 
+from charon import validation_resolver
 from charon.comfy_environment import ComfyEnvironment
 from charon.validation_resolver import (
+    find_local_model_matches,
+    find_model_matches_batch,
+    find_shared_model_matches,
     install_custom_nodes_via_playwright,
     relocate_model_to_category,
 )
@@ -144,5 +148,54 @@ class RelocateModelToCategoryTests(unittest.TestCase):
             self.assertTrue(os.path.isfile(stray))
 
 
+class FindModelMatchesBatchTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.models_root = os.path.join(self.temp_dir.name, "models")
+        self.shared_root = os.path.join(self.temp_dir.name, "shared_models")
+        for relative in (
+            os.path.join(self.models_root, "loras", "pack", "style.safetensors"),
+            os.path.join(self.models_root, "loras", "style.safetensors"),
+            os.path.join(self.models_root, "checkpoints", "base.safetensors"),
+            os.path.join(self.shared_root, "loras", "style.safetensors"),
+            os.path.join(self.shared_root, "checkpoints", "other.safetensors"),
+        ):
+            os.makedirs(os.path.dirname(relative), exist_ok=True)
+            with open(relative, "wb") as handle:
+                handle.write(b"weights")
+        patcher = mock.patch.object(validation_resolver, "SHARED_MODELS_ROOT", self.shared_root)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_matches_per_reference_lookups_in_one_pass(self):
+        references = [
+            {"name": "style.safetensors", "attempted_categories": ["loras"]},
+            {"name": "base.safetensors", "attempted_categories": ["checkpoints"]},
+            {"name": "other.safetensors", "attempted_categories": ["checkpoints"]},
+            {"name": ""},
+        ]
+
+        with mock.patch.object(
+            validation_resolver,
+            "find_model_files_batch",
+            wraps=validation_resolver.find_model_files_batch,
+        ) as lookup:
+            batch = find_model_matches_batch(references, self.models_root)
+
+        self.assertEqual(1, lookup.call_count)
+        for reference, matches in zip(references, batch):
+            self.assertEqual(find_local_model_matches(reference, self.models_root), matches.local)
+            self.assertEqual(find_shared_model_matches(reference["name"]), matches.shared)
+        self.assertEqual(
+            os.path.join(self.models_root, "loras", "style.safetensors"),
+            batch[0].local[0],
+        )
+        self.assertEqual([], batch[2].local)
+        self.assertEqual(1, len(batch[2].shared))
+
+
 if __name__ == "__main__":
     unittest.main()
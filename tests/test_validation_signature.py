@@ -0,0 +1,100 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from charon.comfy_environment import ComfyEnvironment
+from charon.validation_signature import ValidationSignatureService
+
+
+class ValidationSignatureServiceTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.comfy_dir = os.path.join(self.temp_dir.name, "ComfyUI")
+        self.custom_nodes = os.path.join(self.comfy_dir, "custom_nodes")
+        os.makedirs(os.path.join(self.custom_nodes, "ComfyUI-Charon"))
+        os.makedirs(os.path.join(self.comfy_dir, "models", "checkpoints"))
+        self.workflows = []
+        for name in ("alpha", "beta"):
+            folder = os.path.join(self.temp_dir.name, "workflows", name)
+            os.makedirs(folder)
+            with open(os.path.join(folder, ".charon.json"), "w", encoding="utf-8") as handle:
+                handle.write('{"workflow_file": "%s.json"}' % name)
+            self.workflows.append(folder)
+        self._age(self.temp_dir.name)
+        self.runtime = ComfyEnvironment(
+            configured_path=os.path.join(self.temp_dir.name, "run_nvidia_gpu.bat"),
+            base_url="http://127.0.0.1:8188",
+            comfy_dir=self.comfy_dir,
+        )
+        patches = [
+            mock.patch(
+                "charon.validation_signature.preferences.get_preference",
+                return_value=self.runtime.configured_path,
+            ),
+            mock.patch(
+                "charon.validation_signature.resolve_comfy_runtime",
+                return_value=self.runtime,
+            ),
+        ]
+        self.resolve = patches[1].start()
+        patches[0].start()
+        for patcher in patches:
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _age(self, root):
+        # Push mtimes out of the same-tick window so snapshots are trusted.
+        past = time.time() - 60
+        for folder, _dirs, files in os.walk(root):
+            for name in files:
+                os.utime(os.path.join(folder, name), (past, past))
+            os.utime(folder, (past, past))
+
+    def test_one_refresh_serves_every_workflow(self):
+        service = ValidationSignatureService()
+        with mock.patch("charon.validation_signature.os.scandir", wraps=os.scandir) as scandir:
+            first = [service.signature(folder) for folder in self.workflows]
+            second = [service.signature(folder) for folder in self.workflows]
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first[0], first[1])
+        self.resolve.assert_called_once()
+        self.assertEqual(2, scandir.call_count)
+
+    def test_directory_snapshot_rescans_only_when_parent_changes(self):
+        service = ValidationSignatureService()
+        service.directory_inventory(self.custom_nodes)
+        with mock.patch("charon.validation_signature.os.scandir", wraps=os.scandir) as scandir:
+            unchanged = service.directory_inventory(self.custom_nodes)
+            self.assertEqual(0, scandir.call_count)
+
+            os.makedirs(os.path.join(self.custom_nodes, "ComfyUI-Impact-Pack"))
+            changed = service.directory_inventory(self.custom_nodes)
+
+        self.assertEqual(1, scandir.call_count)
+        self.assertEqual(["comfyui-charon"], [name for name, _mtime in unchanged])
+        self.assertEqual(
+            ["comfyui-charon", "comfyui-impact-pack"],
+            [name for name, _mtime in changed],
+        )
+
+    def test_metadata_edits_and_invalidation_change_signature(self):
+        service = ValidationSignatureService()
+        before = service.signature(self.workflows[0])
+        with open(os.path.join(self.workflows[0], ".charon.json"), "w", encoding="utf-8") as handle:
+            handle.write('{"workflow_file": "alpha.json", "tags": ["new"]}')
+        edited = service.signature(self.workflows[0])
+        self.assertNotEqual(before, edited)
+
+        os.makedirs(os.path.join(self.custom_nodes, "rgthree-comfy"))
+        self.assertEqual(edited, service.signature(self.workflows[0]))
+        service.invalidate()
+        self.assertNotEqual(edited, service.signature(self.workflows[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,7 @@ import unittest
 from pathlib import Path
 from unittest import mock
 
-from charon.workflow_browser_exporter import _verify_server_identity
+from charon.workflow_browser_exporter import _release_comfy_server, _verify_server_identity
 
 
 class _Response:
@@ -59,6 +59,25 @@ class WorkflowBrowserExporterTests(unittest.TestCase):
         with self.assertRaisesRegex(RuntimeError, "different ComfyUI installation"):
             _verify_server_identity(Path(r"D:\Comfy\ComfyUI"))
 
+    @mock.patch("charon.workflow_browser_exporter.urllib.request.urlopen")
+    def test_shared_server_is_stopped_only_when_unused(self, urlopen):
+        proc = mock.Mock()
+        proc.poll.return_value = None
+        urlopen.side_effect = [
+            _Response({"queue_running": [], "queue_pending": []}),
+            _Response({}),
+        ]
+        _release_comfy_server(proc, shared=True)
+        proc.terminate.assert_called_once()
+
+        proc.reset_mock()
+        urlopen.side_effect = [
+            _Response({"queue_running": [], "queue_pending": []}),
+            _Response({"prompt-1": {"outputs": {}}}),
+        ]
+        _release_comfy_server(proc, shared=True)
+        proc.terminate.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
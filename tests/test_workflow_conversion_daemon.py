@@ -0,0 +1,162 @@
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+from unittest import mock
+
+from charon import workflow_conversion_daemon
+from charon.workflow_conversion_daemon import (
+    ConversionDaemon,
+    ConversionDaemonError,
+    ConversionJobError,
+)
+
+
+_FAKE_EXPORTER = textwrap.dedent(
+    """
+    import json
+    import os
+    import sys
+
+
+    def main():
+        assert sys.argv[1:3] == ["--serve", "--comfy-dir"], sys.argv
+        if os.environ.get("FAKE_EXPORTER_FAIL"):
+            print(json.dumps({"event": "failed", "error": "port 8188 busy"}), flush=True)
+            return
+        print("warming up frontend", flush=True)
+        print(json.dumps({"event": "ready", "pid": os.getpid()}), flush=True)
+        reloads = 0
+        for line in sys.stdin:
+            request = json.loads(line)
+            if request.get("op") == "shutdown":
+                return
+            if request.get("op") == "reload":
+                reloads += 1
+                print(json.dumps({"id": request["id"], "ok": True}), flush=True)
+                continue
+            nodes = request["workflow"].get("nodes") or []
+            if not nodes:
+                reply = {"id": request["id"], "ok": False, "error": "no graph nodes"}
+            else:
+                prompt = {
+                    str(node["id"]): {"class_type": node["type"], "pid": os.getpid(), "reloads": reloads}
+                    for node in nodes
+                }
+                reply = {"id": request["id"], "ok": True, "prompt": prompt}
+            print(json.dumps(reply), flush=True)
+    """
+)
+
+
+class ConversionDaemonTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.exporter = os.path.join(self.temp_dir.name, "fake_exporter.py")
+        with open(self.exporter, "w", encoding="utf-8") as handle:
+            handle.write(_FAKE_EXPORTER)
+        patcher = mock.patch.object(
+            workflow_conversion_daemon,
+            "get_charon_temp_dir",
+            return_value=self.temp_dir.name,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        key_patcher = mock.patch.object(
+            workflow_conversion_daemon, "comfy_runtime_key", return_value="nodes-v1"
+        )
+        self.runtime_key = key_patcher.start()
+        self.addCleanup(key_patcher.stop)
+
+    def tearDown(self):
+        workflow_conversion_daemon.shutdown_conversion_daemons()
+        workflow_conversion_daemon._FAILED_UNTIL.clear()
+        self.temp_dir.cleanup()
+
+    def test_converts_many_workflows_in_one_process(self):
+        daemon = ConversionDaemon(sys.executable, self.temp_dir.name, self.exporter)
+        daemon.start(timeout=30)
+        try:
+            first = daemon.convert({"nodes": [{"id": 1, "type": "KSampler"}]}, timeout=30)
+            second = daemon.convert({"nodes": [{"id": 7, "type": "SaveImage"}]}, timeout=30)
+        finally:
+            daemon.close()
+
+        self.assertEqual("KSampler", first["1"]["class_type"])
+        self.assertEqual("SaveImage", second["7"]["class_type"])
+        self.assertEqual(first["1"]["pid"], second["7"]["pid"])
+        self.assertFalse(daemon.alive)
+
+    def test_job_errors_keep_worker_alive(self):
+        daemon = ConversionDaemon(sys.executable, self.temp_dir.name, self.exporter)
+        daemon.start(timeout=30)
+        try:
+            with self.assertRaises(ConversionJobError):
+                daemon.convert({"nodes": []}, timeout=30)
+            self.assertTrue(daemon.alive)
+        finally:
+            daemon.close()
+
+    def test_startup_failure_is_reported_and_backed_off(self):
+        with mock.patch.dict(os.environ, {"FAKE_EXPORTER_FAIL": "1"}):
+            with self.assertRaises(ConversionDaemonError) as ctx:
+                workflow_conversion_daemon.get_conversion_daemon(
+                    sys.executable, self.temp_dir.name, self.exporter
+                )
+        self.assertIn("port 8188 busy", str(ctx.exception))
+
+        with self.assertRaises(ConversionDaemonError) as ctx:
+            workflow_conversion_daemon.get_conversion_daemon(
+                sys.executable, self.temp_dir.name, self.exporter
+            )
+        self.assertIn("failed recently", str(ctx.exception))
+
+    def test_registry_reuses_running_worker(self):
+        first = workflow_conversion_daemon.get_conversion_daemon(
+            sys.executable, self.temp_dir.name, self.exporter
+        )
+        second = workflow_conversion_daemon.get_conversion_daemon(
+            sys.executable, self.temp_dir.name, self.exporter
+        )
+
+        self.assertIs(first, second)
+        self.assertTrue(first.alive)
+
+    def test_registry_reloads_page_when_runtime_changes(self):
+        workflow = {"nodes": [{"id": 1, "type": "KSampler"}]}
+        daemon = workflow_conversion_daemon.get_conversion_daemon(
+            sys.executable, self.temp_dir.name, self.exporter
+        )
+        self.assertEqual(0, daemon.convert(workflow, timeout=30)["1"]["reloads"])
+
+        self.runtime_key.return_value = "nodes-v2"
+        daemon = workflow_conversion_daemon.get_conversion_daemon(
+            sys.executable, self.temp_dir.name, self.exporter
+        )
+        self.assertEqual(1, daemon.convert(workflow, timeout=30)["1"]["reloads"])
+
+        # Unknown runtime state keeps the loaded page.
+        self.runtime_key.return_value = ""
+        daemon = workflow_conversion_daemon.get_conversion_daemon(
+            sys.executable, self.temp_dir.name, self.exporter
+        )
+        self.assertEqual(1, daemon.convert(workflow, timeout=30)["1"]["reloads"])
+
+    def test_reset_reloads_page_with_unchanged_runtime_key(self):
+        workflow = {"nodes": [{"id": 1, "type": "KSampler"}]}
+        workflow_conversion_daemon.get_conversion_daemon(
+            sys.executable, self.temp_dir.name, self.exporter
+        )
+
+        workflow_conversion_daemon.reset_conversion_daemons()
+        daemon = workflow_conversion_daemon.get_conversion_daemon(
+            sys.executable, self.temp_dir.name, self.exporter
+        )
+
+        self.assertEqual(1, daemon.convert(workflow, timeout=30)["1"]["reloads"])
+        self.assertEqual("nodes-v1", daemon.runtime_key)
+
+
+if __name__ == "__main__":
+    unittest.main()